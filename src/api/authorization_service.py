@@ -102,7 +102,7 @@ class AuthorizationService:
         invoker_user = self.validate_user(invoker_user)
         chat_config = self.validate_chat(target_chat)
         log.d(f"Validating admin rights for user '{invoker_user.id.hex}' in chat '{chat_config.chat_id.hex}'")
-        membership = self.__di.chat_membership_service.sync(invoker_user, chat_config)
+        membership = self.__di.chat_membership_service.sync(invoker_user, chat_config, fresh = True)
         if not membership.is_admin:
             raise AuthorizationError(
                 f"User '{invoker_user.id.hex}' is not admin in '{chat_config.title}'",
@@ -118,7 +118,7 @@ class AuthorizationService:
         user = self.validate_user(user)
         chat_config = self.validate_chat(chat)
         log.d(f"Updating chat authorization for user '{user.id.hex}' in chat '{chat_config.chat_id.hex}'")
-        return self.__di.chat_membership_service.sync(user, chat_config)
+        return self.__di.chat_membership_service.sync(user, chat_config, fresh = True)
 
     def update_all_chat_authorizations(self, user: str | UUID | User) -> list[ChatMembership]:
         user = self.validate_user(user)
@@ -3,6 +3,7 @@ from datetime import datetime
 from di.di import DI
 from features.accounting.purchases.purchase_aggregates import PurchaseAggregates
 from features.accounting.purchases.purchase_record import PurchaseRecord
+from features.accounting.purchases.purchase_record_page import PurchaseRecordPage
 from util import log
 from util.error_codes import INVALID_LIMIT
 from util.errors import ValidationError
@@ -37,6 +38,30 @@ class PurchasesController:
             product_id = product_id,
         )
 
+    def fetch_purchase_record_page(
+        self,
+        user_id_hex: str,
+        cursor: str | None = None,
+        limit: int = 50,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        product_id: str | None = None,
+    ) -> PurchaseRecordPage:
+        if limit > 100:
+            raise ValidationError("limit cannot exceed 100", INVALID_LIMIT)
+        if limit < 1:
+            raise ValidationError("limit must be at least 1", INVALID_LIMIT)
+        log.d(f"Fetching a page of purchase records for user '{user_id_hex}'")
+        user = self.__di.authorization_service.authorize_for_user(self.__di.invoker, user_id_hex)
+        return self.__di.purchase_service.get_page_by_user(
+            user.id,
+            cursor = cursor,
+            limit = limit,
+            start_date = start_date,
+            end_date = end_date,
+            product_id = product_id,
+        )
+
     def fetch_purchase_aggregates(
         self,
         user_id_hex: str,
@@ -81,7 +81,7 @@ class SettingsController:
             chat_config = self.__di.invoker_chat
             if settings_type == "chat":
                 # any member can access their per-chat settings where admin rights are not required
-                self.__di.chat_membership_service.sync(self.__di.invoker, chat_config)
+                self.__di.chat_membership_service.sync(self.__di.invoker, chat_config, fresh = True)
             resource_id = self.__di.invoker.id.hex if settings_type == "user" else chat_config.chat_id.hex
             lang_iso_code = chat_config.language_iso_code or "en"
         else:
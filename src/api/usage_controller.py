@@ -3,6 +3,7 @@ from datetime import datetime
 from di.di import DI
 from features.accounting.usage.usage_aggregates import UsageAggregates
 from features.accounting.usage.usage_record import UsageRecord
+from features.accounting.usage.usage_record_page import UsageRecordPage
 from util import log
 from util.error_codes import INVALID_LIMIT
 from util.errors import ValidationError
@@ -49,6 +50,42 @@ class UsageController:
             provider_id = provider_id,
         )
 
+    def fetch_usage_record_page(
+        self,
+        user_id_hex: str,
+        cursor: str | None = None,
+        limit: int = 50,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        exclude_self: bool = False,
+        include_sponsored: bool = False,
+        include_transfers: bool = True,
+        only_transfers: bool = False,
+        tool_id: str | None = None,
+        purpose: str | None = None,
+        provider_id: str | None = None,
+    ) -> UsageRecordPage:
+        if limit > 100:
+            raise ValidationError("limit cannot exceed 100", INVALID_LIMIT)
+        if limit < 1:
+            raise ValidationError("limit must be at least 1", INVALID_LIMIT)
+        log.d(f"Fetching a page of usage records for user '{user_id_hex}'")
+        user = self.__di.authorization_service.authorize_for_user(self.__di.invoker, user_id_hex)
+        return self.__di.usage_record_repo.get_page_by_user(
+            user.id,
+            cursor = cursor,
+            limit = limit,
+            start_date = start_date,
+            end_date = end_date,
+            exclude_self = exclude_self,
+            include_sponsored = include_sponsored,
+            include_transfers = include_transfers,
+            only_transfers = only_transfers,
+            tool_id = tool_id,
+            purpose = purpose,
+            provider_id = provider_id,
+        )
+
     def fetch_usage_aggregates(
         self,
         user_id_hex: str,
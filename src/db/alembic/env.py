@@ -19,6 +19,9 @@ from db.model.chat_message import ChatMessageDB  # used by alembic  # noqa: F401
 # noinspection PyUnresolvedReferences
 from db.model.chat_message_attachment import ChatMessageAttachmentDB  # used by alembic  # noqa: F401
 
+# noinspection PyUnresolvedReferences
+from db.model.document_embedding import DocumentEmbeddingDB  # used by alembic  # noqa: F401
+
 # noinspection PyUnresolvedReferences
 from db.model.price_alert import PriceAlertDB  # used by alembic  # noqa: F401
 
@@ -31,6 +34,9 @@ from db.model.sponsorship import SponsorshipDB  # used by alembic  # noqa: F401
 # noinspection PyUnresolvedReferences
 from db.model.tools_cache import ToolsCacheDB  # noqa: F401
 
+# noinspection PyUnresolvedReferences
+from db.model.usage_daily_rollup import UsageDailyRollupDB  # used by alembic  # noqa: F401
+
 # noinspection PyUnresolvedReferences
 from db.model.usage_record import UsageRecordDB  # used by alembic  # noqa: F401
 
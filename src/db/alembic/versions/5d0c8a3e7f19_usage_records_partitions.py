@@ -0,0 +1,94 @@
+"""usage_records_partitions
+
+Revision ID: 5d0c8a3e7f19
+Revises: e81f3b6c92d4
+Create Date: 2026-10-16 17:26:08.731452
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "5d0c8a3e7f19"
+down_revision: Union[str, None] = "e81f3b6c92d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+USAGE_INDEXES = {
+    "idx_usage_records_user_timestamp": "user_id",
+    "idx_usage_records_counterpart_timestamp": "counterpart_id",
+    "idx_usage_records_payer_timestamp": "payer_id",
+}
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        raise Exception("This migration requires PostgreSQL. Current database: " + connection.dialect.name)
+
+    # the records move into a table partitioned by month, in a single copy (the table is locked meanwhile)
+    _drop_usage_indexes()
+    op.execute(text("ALTER TABLE usage_records RENAME CONSTRAINT usage_records_pkey TO usage_records_unpartitioned_pkey"))
+    op.rename_table("usage_records", "usage_records_unpartitioned")
+    op.execute(text("CREATE TABLE usage_records (LIKE usage_records_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (timestamp)"))
+    op.execute(text("ALTER TABLE usage_records ADD CONSTRAINT usage_records_pkey PRIMARY KEY (id, timestamp)"))
+
+    this_month = _month_start(datetime.now(timezone.utc).date())
+    oldest = connection.execute(text("SELECT MIN(timestamp) FROM usage_records_unpartitioned")).scalar()
+    month = min(_month_start(oldest.date()), this_month) if oldest else this_month
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        op.execute(
+            text(
+                f"CREATE TABLE usage_records_{month.year:04d}_{month.month:02d} PARTITION OF usage_records "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')",
+            ),
+        )
+        month = _add_months(month, 1)
+    op.execute(text("CREATE TABLE usage_records_default PARTITION OF usage_records DEFAULT"))
+
+    op.execute(text("INSERT INTO usage_records SELECT * FROM usage_records_unpartitioned"))
+    op.drop_table("usage_records_unpartitioned")
+    _create_usage_indexes()
+
+    # the latest history of a chat is read newest first
+    op.create_index(
+        "idx_chat_messages_chat_sent_at", "chat_messages",
+        ["chat_id", sa.literal_column("sent_at DESC")], unique = False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_chat_messages_chat_sent_at", table_name = "chat_messages")
+
+    _drop_usage_indexes()
+    op.execute(text("ALTER TABLE usage_records RENAME CONSTRAINT usage_records_pkey TO usage_records_partitioned_pkey"))
+    op.rename_table("usage_records", "usage_records_partitioned")
+    op.execute(text("CREATE TABLE usage_records (LIKE usage_records_partitioned INCLUDING DEFAULTS)"))
+    op.execute(text("ALTER TABLE usage_records ADD CONSTRAINT usage_records_pkey PRIMARY KEY (id)"))
+    op.execute(text("INSERT INTO usage_records SELECT * FROM usage_records_partitioned"))
+    op.drop_table("usage_records_partitioned")  # along with its partitions
+    _create_usage_indexes()
+
+
+def _drop_usage_indexes():
+    for index_name in USAGE_INDEXES:
+        op.drop_index(index_name, table_name = "usage_records")
+
+
+def _create_usage_indexes():
+    for index_name, column in USAGE_INDEXES.items():
+        op.create_index(index_name, "usage_records", [column, sa.literal_column("timestamp DESC")], unique = False)
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
@@ -0,0 +1,66 @@
+"""usage_daily_rollups
+
+Revision ID: 7b41d9e05c3a
+Revises: 3e8f1c2a9b7d
+Create Date: 2026-05-21 09:44:05.183920
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "7b41d9e05c3a"
+down_revision: Union[str, None] = "3e8f1c2a9b7d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_daily_rollups",
+        sa.Column("day", sa.Date(), nullable = False),
+        sa.Column("payer_id", postgresql.UUID(as_uuid = True), nullable = False),
+        sa.Column("user_id", postgresql.UUID(as_uuid = True), nullable = False),
+        sa.Column("counterpart_id", postgresql.UUID(as_uuid = True), nullable = False),
+        sa.Column("tool_id", sa.String(), nullable = False),
+        sa.Column("tool_name", sa.String(), nullable = False),
+        sa.Column("provider_id", sa.String(), nullable = False),
+        sa.Column("provider_name", sa.String(), nullable = False),
+        sa.Column("purpose", sa.String(), nullable = False),
+        sa.Column("record_count", sa.Integer(), nullable = False),
+        sa.Column("total_cost_credits", sa.Float(), nullable = False),
+        sa.Column("runtime_seconds", sa.Float(), nullable = False),
+        sa.PrimaryKeyConstraint(
+            "payer_id", "day", "user_id", "counterpart_id", "tool_id", "tool_name", "provider_id", "provider_name", "purpose",
+            name = "pk_usage_daily_rollups",
+        ),
+    )
+    op.create_index("idx_usage_daily_rollups_user_day", "usage_daily_rollups", ["user_id", "day"], unique = False)
+    op.create_index("idx_usage_daily_rollups_counterpart_day", "usage_daily_rollups", ["counterpart_id", "day"], unique = False)
+
+    # backfill from the existing usage history
+    op.execute(
+        text(
+            "INSERT INTO usage_daily_rollups ("
+            "day, payer_id, user_id, counterpart_id, tool_id, tool_name, provider_id, provider_name, purpose, "
+            "record_count, total_cost_credits, runtime_seconds"
+            ") "
+            "SELECT CAST(timestamp AS DATE), payer_id, user_id, "
+            "COALESCE(counterpart_id, 'ffffffff-ffff-ffff-ffff-ffffffffffff'::uuid), "
+            "tool_id, tool_name, provider_id, provider_name, purpose, "
+            "COUNT(*), SUM(total_cost_credits), SUM(runtime_seconds) "
+            "FROM usage_records "
+            "GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_usage_daily_rollups_counterpart_day", table_name = "usage_daily_rollups")
+    op.drop_index("idx_usage_daily_rollups_user_day", table_name = "usage_daily_rollups")
+    op.drop_table("usage_daily_rollups")
@@ -0,0 +1,34 @@
+"""user_count
+
+Revision ID: 9c2e5f7a4b13
+Revises: 5d0c8a3e7f19
+Create Date: 2026-10-16 19:48:22.905316
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2e5f7a4b13"
+down_revision: Union[str, None] = "5d0c8a3e7f19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_count",
+        sa.Column("id", sa.Integer(), nullable = False),
+        sa.Column("value", sa.Integer(), nullable = False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # the users table is locked for the backfill, so no registration can slip in between the count and the row
+    op.execute(text("LOCK TABLE simulants IN SHARE MODE"))
+    op.execute(text("INSERT INTO user_count (id, value) SELECT 1, COUNT(*) FROM simulants"))
+
+
+def downgrade() -> None:
+    op.drop_table("user_count")
@@ -0,0 +1,29 @@
+"""usage_payer_index
+
+Revision ID: c4a9e27d51f8
+Revises: 7b41d9e05c3a
+Create Date: 2026-10-16 09:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9e27d51f8"
+down_revision: Union[str, None] = "7b41d9e05c3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # sponsored usage history pages walk the payer's records newest first
+    op.create_index(
+        "idx_usage_records_payer_timestamp", "usage_records",
+        ["payer_id", sa.literal_column("timestamp DESC")], unique = False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_usage_records_payer_timestamp", table_name = "usage_records")
@@ -0,0 +1,25 @@
+"""attachments_message_index
+
+Revision ID: e81f3b6c92d4
+Revises: c4a9e27d51f8
+Create Date: 2026-10-16 14:03:51.240117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e81f3b6c92d4"
+down_revision: Union[str, None] = "c4a9e27d51f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # deleting a message looks up its attachments, both for the cleanup and for the foreign key check
+    op.create_index("idx_attachments_message", "chat_message_attachments", ["chat_id", "message_id"], unique = False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_attachments_message", table_name = "chat_message_attachments")
@@ -0,0 +1,84 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from db.sql import pool_limits
+from util import log
+from util.config import config
+from util.error_codes import DI_DEPENDENCY_NOT_MET
+from util.errors import ConfigurationError
+
+# async drivers for the sync URLs the rest of the app is configured with
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+async_engine: AsyncEngine | None = None
+AsyncLocalSession: async_sessionmaker[AsyncSession] | None = None
+
+
+def initialize_async_db(
+    db_url: str = config.db_url.get_secret_value(),
+    multi_connection_setup: bool = True,
+) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+    """
+    Sets up the async engine next to the sync one from 'initialize_db', which stays in charge of creating the schema.
+    Both share the same database, so code can move to the async path one endpoint or pipeline step at a time.
+    """
+    global async_engine, AsyncLocalSession
+    async_engine = __create_async_db_engine(to_async_url(db_url), multi_connection_setup = multi_connection_setup)
+    # noinspection PyPep8Naming
+    AsyncLocalSession = async_sessionmaker(bind = async_engine, autoflush = False, expire_on_commit = False)
+    log.i(f"Async database engine ready ({async_engine.dialect.name}+{async_engine.dialect.driver})")
+    return async_engine, AsyncLocalSession
+
+
+async def dispose_async_db():
+    global async_engine, AsyncLocalSession
+    if async_engine is not None:
+        await async_engine.dispose()
+    async_engine = None
+    AsyncLocalSession = None
+
+
+def to_async_url(db_url: str) -> str:
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return db_url  # already async, or a driver we don't know about
+    return url.set(drivername = ASYNC_DRIVERS[backend]).render_as_string(hide_password = False)
+
+
+def __create_async_db_engine(db_url: str, multi_connection_setup: bool = True) -> AsyncEngine:
+    # connections are opened lazily, 'initialize_db' has already waited for the database to come up
+    if multi_connection_setup:
+        pool_size, max_overflow = pool_limits(config.db_connection_budget, config.web_workers)
+        return create_async_engine(
+            url = db_url,  # where the DB is at
+            pool_pre_ping = True,  # check connections before using them
+            pool_recycle = 300,  # recycle connections after 5 minutes
+            pool_size = pool_size,  # start with a modest share of the connection budget
+            max_overflow = max_overflow,  # allow the rest of the share as requirements grow
+            pool_timeout = 10,  # wait for a few seconds for available connections
+        )
+    return create_async_engine(db_url)
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    if AsyncLocalSession is None:
+        raise ConfigurationError("The async database is not initialized", DI_DEPENDENCY_NOT_MET)
+    async with AsyncLocalSession() as db:
+        yield db
+
+
+@asynccontextmanager
+async def get_detached_async_session() -> AsyncGenerator[AsyncSession, None]:
+    session_generator = get_async_session()
+    db = await anext(session_generator)
+    try:
+        yield db
+    finally:
+        await session_generator.aclose()
@@ -0,0 +1,88 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import Column, ColumnElement, Table, delete, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from util import log
+
+
+class ChunkedDeletion:
+    """
+    Deletes the rows of a table that match a condition, in primary key order and in chunks of bounded size. Every chunk
+    is a short transaction of its own, so live traffic never waits long on its locks and the write-ahead log grows
+    gradually. The work stops at the deadline, and the returned key lets a later run continue from where it stopped.
+    """
+
+    @dataclass
+    class Progress:
+        table: str
+        deleted: int = 0
+        dependents_deleted: int = 0
+        chunks: int = 0
+        elapsed_s: float = 0.0
+        finished: bool = False
+        last_key: tuple | None = None  # the last deleted primary key, for resuming an unfinished table
+
+        @property
+        def rows_per_second(self) -> float:
+            return self.deleted / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    __db: Session
+    __chunk_size: int
+
+    def __init__(self, db: Session, chunk_size: int = 1000):
+        self.__db = db
+        self.__chunk_size = chunk_size
+
+    def run(
+        self,
+        table: Table,
+        condition: ColumnElement[bool],
+        deadline: float,
+        after: tuple | None = None,
+        dependents: list[tuple[Table, list[Column]]] | None = None,
+    ) -> Progress:
+        """
+        Deletes the matching rows with primary keys greater than 'after' until none are left or 'deadline' (a
+        'time.monotonic()' value) passes. Dependents are tables whose columns reference the primary key, and their
+        rows are deleted in the same chunk as the rows they reference.
+        """
+        progress = ChunkedDeletion.Progress(table = table.name, last_key = after)
+        primary_key = list(table.primary_key.columns)
+        started_at = time.monotonic()
+        while time.monotonic() < deadline:
+            query = select(*primary_key).where(condition)
+            if progress.last_key is not None:
+                last_values = [literal(value, column.type) for value, column in zip(progress.last_key, primary_key)]
+                query = query.where(tuple_(*primary_key) > tuple_(*last_values))
+            query = query.order_by(*primary_key).limit(self.__chunk_size)
+            if self.__db.get_bind().dialect.name == "postgresql":
+                # rows locked by live traffic are left for a later run instead of waiting on them
+                query = query.with_for_update(skip_locked = True, of = table)
+            keys = [tuple(row) for row in self.__db.execute(query).all()]
+            if keys:
+                for dependent, columns in dependents or []:
+                    result = self.__db.execute(delete(dependent).where(ChunkedDeletion.__key_in(columns, keys)))
+                    progress.dependents_deleted += result.rowcount
+                result = self.__db.execute(delete(table).where(ChunkedDeletion.__key_in(primary_key, keys)))
+                progress.deleted += result.rowcount
+                progress.chunks += 1
+                progress.last_key = keys[-1]
+            self.__db.commit()
+            if len(keys) < self.__chunk_size:
+                progress.finished = True
+                progress.last_key = None
+                break
+        progress.elapsed_s = time.monotonic() - started_at
+        log.d(
+            f"Deleted {progress.deleted} row(s) of '{table.name}' in {progress.chunks} chunk(s), "
+            f"{progress.rows_per_second:.0f} rows/s{'' if progress.finished else ', stopped at the deadline'}",
+        )
+        return progress
+
+    @staticmethod
+    def __key_in(columns: list[Column], keys: list[tuple]) -> ColumnElement[bool]:
+        if len(columns) == 1:
+            return columns[0].in_([key[0] for key in keys])
+        return tuple_(*columns).in_(keys)
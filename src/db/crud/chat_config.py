@@ -1,7 +1,11 @@
+import uuid
 from uuid import UUID
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from db.crud.upsert import upsert_all, upsert_all_async
 from db.model.chat_config import ChatConfigDB
 from db.schema.chat_config import ChatConfigSave
 
@@ -45,10 +49,11 @@ class ChatConfigCRUD:
         return chat_config
 
     def save(self, data: ChatConfigSave) -> ChatConfigDB:
-        updated_config = self.update(data)
-        if updated_config:
-            return updated_config  # available only if update was successful
-        return self.create(data)
+        row = data.model_dump()
+        row["chat_id"] = row["chat_id"] or uuid.uuid4()  # the column default doesn't apply to explicit None
+        chat_config = upsert_all(self._db, ChatConfigDB, [row], ["chat_id"])[0]
+        self._db.commit()
+        return chat_config
 
     def delete(self, chat_id: UUID) -> ChatConfigDB | None:
         chat_config = self.get(chat_id)
@@ -56,3 +61,36 @@ class ChatConfigCRUD:
             self._db.delete(chat_config)
             self._db.commit()
         return chat_config
+
+
+class AsyncChatConfigCRUD:
+    """
+    The async counterpart of ChatConfigCRUD, covering the reads and writes of a chat update.
+    """
+
+    _db: AsyncSession
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def get(self, chat_id: UUID) -> ChatConfigDB | None:
+        return await self._db.scalar(
+            select(ChatConfigDB).filter(
+                ChatConfigDB.chat_id == chat_id,
+            ).limit(1),
+        )
+
+    async def get_by_external_identifiers(self, external_id: str, chat_type: ChatConfigDB.ChatType) -> ChatConfigDB | None:
+        return await self._db.scalar(
+            select(ChatConfigDB).filter(
+                ChatConfigDB.external_id == external_id,
+                ChatConfigDB.chat_type == chat_type,
+            ).limit(1),
+        )
+
+    async def save(self, data: ChatConfigSave) -> ChatConfigDB:
+        row = data.model_dump()
+        row["chat_id"] = row["chat_id"] or uuid.uuid4()  # the column default doesn't apply to explicit None
+        chat_config = (await upsert_all_async(self._db, ChatConfigDB, [row], ["chat_id"]))[0]
+        await self._db.commit()
+        return chat_config
@@ -1,9 +1,10 @@
-from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import desc
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from db.crud.upsert import upsert_all, upsert_all_async
 from db.model.chat_message import ChatMessageDB
 from db.schema.chat_message import ChatMessageSave
 
@@ -54,10 +55,9 @@ class ChatMessageCRUD:
         return chat_message
 
     def save(self, data: ChatMessageSave) -> ChatMessageDB:
-        updated_message = self.update(data)
-        if updated_message:
-            return updated_message  # available only if update was successful
-        return self.create(data)
+        chat_message = upsert_all(self._db, ChatMessageDB, [data.model_dump()], ["chat_id", "message_id"])[0]
+        self._db.commit()
+        return chat_message
 
     def delete(self, chat_id: UUID, message_id: str) -> ChatMessageDB | None:
         chat_message = self.get(chat_id, message_id)
@@ -66,9 +66,37 @@ class ChatMessageCRUD:
             self._db.commit()
         return chat_message
 
-    def delete_older_than(self, cutoff: datetime) -> int:
-        deleted = self._db.query(ChatMessageDB).filter(
-            ChatMessageDB.sent_at < cutoff,
-        ).delete(synchronize_session = False)
-        self._db.commit()
-        return deleted
+
+class AsyncChatMessageCRUD:
+    """
+    The async counterpart of ChatMessageCRUD, covering the reads and writes of a chat update.
+    """
+
+    _db: AsyncSession
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def get(self, chat_id: UUID, message_id: str) -> ChatMessageDB | None:
+        return await self._db.scalar(
+            select(ChatMessageDB).filter(
+                ChatMessageDB.chat_id == chat_id,
+                ChatMessageDB.message_id == message_id,
+            ).limit(1),
+        )
+
+    async def get_latest_chat_messages(self, chat_id: UUID, skip: int = 0, limit: int = 100) -> list[ChatMessageDB]:
+        result = await self._db.scalars(
+            select(ChatMessageDB).filter(
+                ChatMessageDB.chat_id == chat_id,
+            )
+            .order_by(desc(ChatMessageDB.sent_at))
+            .offset(skip)
+            .limit(limit),
+        )
+        return list(result.all())
+
+    async def save(self, data: ChatMessageSave) -> ChatMessageDB:
+        chat_message = (await upsert_all_async(self._db, ChatMessageDB, [data.model_dump()], ["chat_id", "message_id"]))[0]
+        await self._db.commit()
+        return chat_message
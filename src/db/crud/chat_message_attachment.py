@@ -1,12 +1,14 @@
-from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select, tuple_
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db.model.chat_message import ChatMessageDB
+from db.crud.upsert import upsert_all
 from db.model.chat_message_attachment import ChatMessageAttachmentDB
 from db.schema.chat_message_attachment import ChatMessageAttachmentSave
+from util.error_codes import ATTACHMENT_NOT_FOUND
+from util.errors import NotFoundError
 from util.functions import generate_short_uuid
 
 
@@ -22,6 +24,27 @@ class ChatMessageAttachmentCRUD:
             ChatMessageAttachmentDB.id == attachment_id,
         ).first()
 
+    def get_all_by_ids(self, attachment_ids: list[str]) -> list[ChatMessageAttachmentDB]:
+        if not attachment_ids:
+            return []
+        # noinspection PyTypeChecker
+        return self._db.query(ChatMessageAttachmentDB).filter(
+            ChatMessageAttachmentDB.id.in_(attachment_ids),
+        ).all()
+
+    def require_all_by_ids(self, attachment_ids: list[str]) -> list[ChatMessageAttachmentDB]:
+        """
+        Loads the attachments in one query and returns them in the requested order, repeated references included.
+        Raises if any of them is missing.
+        """
+        attachments_by_id = {
+            attachment.id: attachment for attachment in self.get_all_by_ids(list(dict.fromkeys(attachment_ids)))
+        }
+        for attachment_id in attachment_ids:
+            if attachment_id not in attachments_by_id:
+                raise NotFoundError(f"Attachment with ID '{attachment_id}' not found in DB", ATTACHMENT_NOT_FOUND)
+        return [attachments_by_id[attachment_id] for attachment_id in attachment_ids]
+
     def get_by_external_id(self, external_id: str) -> ChatMessageAttachmentDB | None:
         return self._db.query(ChatMessageAttachmentDB).filter(
             ChatMessageAttachmentDB.external_id == external_id,
@@ -38,6 +61,15 @@ class ChatMessageAttachmentCRUD:
             ChatMessageAttachmentDB.message_id == message_id,
         ).all()
 
+    def get_by_messages(self, chat_id: UUID, message_ids: list[str]) -> list[ChatMessageAttachmentDB]:
+        if not message_ids:
+            return []
+        # noinspection PyTypeChecker
+        return self._db.query(ChatMessageAttachmentDB).filter(
+            ChatMessageAttachmentDB.chat_id == chat_id,
+            ChatMessageAttachmentDB.message_id.in_(message_ids),
+        ).all()
+
     def create(self, create_data: ChatMessageAttachmentSave) -> ChatMessageAttachmentDB:
         if not create_data.id:
             create_data.id = generate_short_uuid()
@@ -59,10 +91,19 @@ class ChatMessageAttachmentCRUD:
         return attachment
 
     def save(self, data: ChatMessageAttachmentSave) -> ChatMessageAttachmentDB:
-        updated_attachment = self.update(data)
-        if updated_attachment:
-            return updated_attachment  # available only if update was successful
-        return self.create(data)
+        return self.save_all([data])[0]
+
+    def save_all(self, data: list[ChatMessageAttachmentSave]) -> list[ChatMessageAttachmentDB]:
+        rows_by_id: dict[str, dict] = {}
+        for item in data:
+            if not item.id:
+                item.id = generate_short_uuid()
+            rows_by_id[item.id] = item.model_dump()  # one statement can't touch the same row twice, last one wins
+        attachments = upsert_all(self._db, ChatMessageAttachmentDB, list(rows_by_id.values()), ["id"])
+        self._db.commit()
+        # RETURNING order is not guaranteed, hand them back in the order they were given
+        attachments_by_id = {attachment.id: attachment for attachment in attachments}
+        return [attachments_by_id[str(item.id)] for item in data]
 
     def delete(self, attachment_id: str) -> ChatMessageAttachmentDB | None:
         attachment = self.get(attachment_id)
@@ -71,12 +112,24 @@ class ChatMessageAttachmentCRUD:
             self._db.commit()
         return attachment
 
-    def delete_by_old_messages(self, cutoff: datetime) -> int:
-        old_message_pairs = select(ChatMessageDB.chat_id, ChatMessageDB.message_id).where(
-            ChatMessageDB.sent_at < cutoff,
+
+class AsyncChatMessageAttachmentCRUD:
+    """
+    The async counterpart of ChatMessageAttachmentCRUD, covering the reads of the chat history.
+    """
+
+    _db: AsyncSession
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def get_by_messages(self, chat_id: UUID, message_ids: list[str]) -> list[ChatMessageAttachmentDB]:
+        if not message_ids:
+            return []
+        result = await self._db.scalars(
+            select(ChatMessageAttachmentDB).filter(
+                ChatMessageAttachmentDB.chat_id == chat_id,
+                ChatMessageAttachmentDB.message_id.in_(message_ids),
+            ),
         )
-        deleted = self._db.query(ChatMessageAttachmentDB).filter(
-            tuple_(ChatMessageAttachmentDB.chat_id, ChatMessageAttachmentDB.message_id).in_(old_message_pairs),
-        ).delete(synchronize_session = False)
-        self._db.commit()
-        return deleted
+        return list(result.all())
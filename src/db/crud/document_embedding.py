@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from db.model.document_embedding import DocumentEmbeddingDB
+from db.schema.document_embedding import DocumentEmbeddingSave
+
+
+class DocumentEmbeddingCRUD:
+
+    _db: Session
+
+    def __init__(self, db: Session):
+        self._db = db
+
+    def get_document(self, content_hash: str, embedding_model: str) -> list[DocumentEmbeddingDB]:
+        # noinspection PyTypeChecker
+        return self._db.query(DocumentEmbeddingDB).filter(
+            DocumentEmbeddingDB.content_hash == content_hash,
+            DocumentEmbeddingDB.embedding_model == embedding_model,
+        ).order_by(DocumentEmbeddingDB.page_index).all()
+
+    def create_all(self, create_data: list[DocumentEmbeddingSave], commit: bool = True) -> int:
+        if not create_data:
+            return 0
+        self._db.add_all([DocumentEmbeddingDB(**data.model_dump()) for data in create_data])
+        self._db.flush()
+        if commit:
+            self._db.commit()
+        return len(create_data)
+
+    def touch_document(self, content_hash: str, embedding_model: str, used_at: datetime, commit: bool = True) -> int:
+        touched = self._db.query(DocumentEmbeddingDB).filter(
+            DocumentEmbeddingDB.content_hash == content_hash,
+            DocumentEmbeddingDB.embedding_model == embedding_model,
+        ).update({DocumentEmbeddingDB.last_used_at: used_at}, synchronize_session = False)
+        if commit:
+            self._db.commit()
+        return touched
+
+    def delete_document(self, content_hash: str, embedding_model: str, commit: bool = True) -> int:
+        deleted = self._db.query(DocumentEmbeddingDB).filter(
+            DocumentEmbeddingDB.content_hash == content_hash,
+            DocumentEmbeddingDB.embedding_model == embedding_model,
+        ).delete(synchronize_session = "evaluate")  # the deleted pages leave the session, their keys may come back
+        if commit:
+            self._db.commit()
+        return deleted
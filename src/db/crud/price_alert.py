@@ -1,6 +1,6 @@
-from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Session
 
 from db.model.price_alert import PriceAlertDB
@@ -25,6 +25,15 @@ class PriceAlertCRUD:
         # noinspection PyTypeChecker
         return self._db.query(PriceAlertDB).offset(skip).limit(limit).all()
 
+    def get_all_after(self, last_alert: PriceAlertDB | None = None, limit: int = 500) -> list[PriceAlertDB]:
+        key_columns = (PriceAlertDB.chat_id, PriceAlertDB.base_currency, PriceAlertDB.desired_currency)
+        query = self._db.query(PriceAlertDB)
+        if last_alert:
+            last_key = (last_alert.chat_id, last_alert.base_currency, last_alert.desired_currency)
+            query = query.filter(tuple_(*key_columns) > tuple_(*last_key))
+        # noinspection PyTypeChecker
+        return query.order_by(*key_columns).limit(limit).all()
+
     def get_alerts_by_chat(self, chat_id: UUID) -> list[PriceAlertDB]:
         # noinspection PyTypeChecker
         return self._db.query(PriceAlertDB).filter(
@@ -47,6 +56,26 @@ class PriceAlertCRUD:
             self._db.refresh(price_alert)
         return price_alert
 
+    def update_last_prices(self, updates: list[PriceAlertSave]) -> int:
+        if not updates:
+            return 0
+        # bulk update by primary key, a single round-trip and commit for all rows
+        self._db.execute(
+            update(PriceAlertDB),
+            [
+                {
+                    "chat_id": data.chat_id,
+                    "base_currency": data.base_currency,
+                    "desired_currency": data.desired_currency,
+                    "last_price": data.last_price,
+                    "last_price_time": data.last_price_time,
+                }
+                for data in updates
+            ],
+        )
+        self._db.commit()
+        return len(updates)
+
     def save(self, data: PriceAlertSave) -> PriceAlertDB:
         updated_alert = self.update(data)
         if updated_alert:
@@ -59,10 +88,3 @@ class PriceAlertCRUD:
             self._db.delete(price_alert)
             self._db.commit()
         return price_alert
-
-    def delete_stale(self, cutoff: datetime) -> int:
-        deleted = self._db.query(PriceAlertDB).filter(
-            PriceAlertDB.last_price_time < cutoff,
-        ).delete(synchronize_session = False)
-        self._db.commit()
-        return deleted
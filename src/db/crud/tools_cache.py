@@ -1,10 +1,12 @@
 import base64
-from datetime import datetime
 
 from sqlalchemy.orm import Session
 
+from db.crud.tools_cache_memory_tier import ToolsCacheMemoryTier, shared_memory_tier
+from db.crud.upsert import upsert_all
 from db.model.tools_cache import ToolsCacheDB
 from db.schema.tools_cache import ToolsCacheSave
+from db.unit_of_work import run_after_commit
 from util.functions import digest_md5
 
 KEY_DELIMITER = "~"
@@ -13,14 +15,23 @@ KEY_DELIMITER = "~"
 class ToolsCacheCRUD:
 
     _db: Session
+    _memory_tier: ToolsCacheMemoryTier | None
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, memory_tier: ToolsCacheMemoryTier | None = None):
         self._db = db
+        self._memory_tier = memory_tier
 
     def get(self, key: str) -> ToolsCacheDB | None:
-        return self._db.query(ToolsCacheDB).filter(
-            ToolsCacheDB.key == key,
-        ).first()
+        if self._memory_tier:
+            cached = self._memory_tier.get(key)
+            if cached:
+                return cached
+        tools_cache = self.__get_stored(key)
+        if self._memory_tier:
+            self._memory_tier.record_db_lookup(key, found = tools_cache is not None)
+        if tools_cache:
+            self.__remember(tools_cache)
+        return tools_cache
 
     def get_all(self, skip: int = 0, limit: int = 100) -> list[ToolsCacheDB]:
         # noinspection PyTypeChecker
@@ -31,39 +42,56 @@ class ToolsCacheCRUD:
         self._db.add(tools_cache)
         self._db.commit()
         self._db.refresh(tools_cache)
+        self.__remember(tools_cache)
         return tools_cache
 
     def update(self, update_data: ToolsCacheSave) -> ToolsCacheDB | None:
-        tools_cache = self.get(update_data.key)
+        tools_cache = self.__get_stored(update_data.key)
         if tools_cache:
             for key, value in update_data.model_dump().items():
                 setattr(tools_cache, key, value)
             self._db.commit()
             self._db.refresh(tools_cache)
+            self.__remember(tools_cache)
         return tools_cache
 
     def save(self, data: ToolsCacheSave) -> ToolsCacheDB:
-        updated_cache = self.update(data)
-        if updated_cache:
-            return updated_cache
-        return self.create(data)
+        if self._memory_tier:
+            # identical hot entries are already persisted, no need for another write
+            cached = self._memory_tier.peek(data.key)
+            if cached and cached.value == data.value and cached.expires_at == data.expires_at:
+                return cached
+        tools_cache = upsert_all(self._db, ToolsCacheDB, [data.model_dump()], ["key"])[0]
+        self._db.commit()
+        self.__remember(tools_cache)
+        return tools_cache
 
     def delete(self, key: str) -> ToolsCacheDB | None:
-        tools_cache = self.get(key)
+        if self._memory_tier:
+            self._memory_tier.invalidate(key)
+        tools_cache = self.__get_stored(key)
         if tools_cache:
             self._db.delete(tools_cache)
             self._db.commit()
         return tools_cache
 
-    def delete_expired(self) -> int:
-        expired = self._db.query(ToolsCacheDB).filter(
-            ToolsCacheDB.expires_at < datetime.now(),
-        ).delete(synchronize_session = False)
-        self._db.commit()
-        return expired
+    def __get_stored(self, key: str) -> ToolsCacheDB | None:
+        return self._db.query(ToolsCacheDB).filter(
+            ToolsCacheDB.key == key,
+        ).first()
+
+    def __remember(self, tools_cache: ToolsCacheDB):
+        if not self._memory_tier:
+            return
+        # a unit of work might still roll back, the memory tier only ever serves committed entries
+        memory_tier = self._memory_tier
+        key, value, created_at, expires_at = tools_cache.key, tools_cache.value, tools_cache.created_at, tools_cache.expires_at
+        run_after_commit(self._db, lambda: memory_tier.put(key, value, created_at, expires_at))
 
     @staticmethod
     def create_key(prefix: str, identifier: str) -> str:
         prefix_b64 = base64.b64encode(prefix.encode()).decode()
         identifier_b64 = base64.b64encode(identifier.encode()).decode()
-        return digest_md5(f"{prefix_b64}{KEY_DELIMITER}{identifier_b64}")
+        key = digest_md5(f"{prefix_b64}{KEY_DELIMITER}{identifier_b64}")
+        shared_memory_tier.remember_prefix(key, prefix)
+        return key
@@ -0,0 +1,182 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from db.model.tools_cache import ToolsCacheDB
+from util.config import config
+
+UNKNOWN_PREFIX = "unknown"
+
+
+class ToolsCacheMemoryTier:
+    """
+    Bounded, TTL-aware, in-process LRU that sits in front of the tools cache table.
+    Entries are capped by count and total value size, and never outlive their 'expires_at'.
+    """
+
+    @dataclass(frozen = True)
+    class Entry:
+        key: str
+        value: str
+        created_at: datetime
+        expires_at: datetime | None
+        stored_at: datetime
+        size: int
+
+    @dataclass
+    class PrefixStats:
+        memory_hits: int = 0
+        db_hits: int = 0
+        misses: int = 0
+
+        @property
+        def hit_ratio(self) -> float:
+            total = self.memory_hits + self.db_hits + self.misses
+            return (self.memory_hits / total) if total else 0.0
+
+    __entries: OrderedDict[str, Entry]
+    __key_prefixes: OrderedDict[str, str]
+    __stats: dict[str, PrefixStats]
+    __total_size: int
+    __max_entries: int
+    __max_size_bytes: int
+    __max_age: timedelta
+    __now: Callable[[], datetime]
+    __lock: threading.Lock
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_size_bytes: int,
+        max_age_s: int,
+        now: Callable[[], datetime] = datetime.now,
+    ):
+        self.__entries = OrderedDict()
+        self.__key_prefixes = OrderedDict()
+        self.__stats = {}
+        self.__total_size = 0
+        self.__max_entries = max_entries
+        self.__max_size_bytes = max_size_bytes
+        self.__max_age = timedelta(seconds = max_age_s)
+        self.__now = now
+        self.__lock = threading.Lock()
+
+    def remember_prefix(self, key: str, prefix: str):
+        with self.__lock:
+            self.__key_prefixes[key] = prefix
+            self.__key_prefixes.move_to_end(key)
+            # keys are only tracked for stats, a few times the entry cap is more than enough
+            while len(self.__key_prefixes) > self.__max_entries * 4:
+                self.__key_prefixes.popitem(last = False)
+
+    def get(self, key: str) -> ToolsCacheDB | None:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if self.__is_stale(entry):
+                self.__remove(key)
+                return None
+            self.__entries.move_to_end(key)
+            self.__stats_for(key).memory_hits += 1
+            return self.__to_db_model(entry)
+
+    def peek(self, key: str) -> ToolsCacheDB | None:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or self.__is_stale(entry):
+                return None
+            return self.__to_db_model(entry)
+
+    def record_db_lookup(self, key: str, found: bool):
+        with self.__lock:
+            stats = self.__stats_for(key)
+            if found:
+                stats.db_hits += 1
+            else:
+                stats.misses += 1
+
+    def put(self, key: str, value: str, created_at: datetime, expires_at: datetime | None):
+        now = self.__now()
+        if expires_at is not None and expires_at <= now:
+            return
+        size = len(value.encode("utf-8"))
+        if size > self.__max_size_bytes:
+            return
+        with self.__lock:
+            self.__remove(key)
+            self.__entries[key] = ToolsCacheMemoryTier.Entry(
+                key = key,
+                value = value,
+                created_at = created_at,
+                expires_at = expires_at,
+                stored_at = now,
+                size = size,
+            )
+            self.__total_size += size
+            while len(self.__entries) > self.__max_entries or self.__total_size > self.__max_size_bytes:
+                oldest_key = next(iter(self.__entries))
+                self.__remove(oldest_key)
+
+    def invalidate(self, key: str):
+        with self.__lock:
+            self.__remove(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__total_size = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def total_size_bytes(self) -> int:
+        return self.__total_size
+
+    def stats(self) -> dict[str, PrefixStats]:
+        with self.__lock:
+            return {
+                prefix: ToolsCacheMemoryTier.PrefixStats(stats.memory_hits, stats.db_hits, stats.misses)
+                for prefix, stats in self.__stats.items()
+            }
+
+    def __is_stale(self, entry: Entry) -> bool:
+        now = self.__now()
+        if entry.expires_at is not None and entry.expires_at <= now:
+            return True
+        return now - entry.stored_at > self.__max_age
+
+    def __remove(self, key: str):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__total_size -= entry.size
+
+    def __stats_for(self, key: str) -> PrefixStats:
+        prefix = self.__key_prefixes.get(key, UNKNOWN_PREFIX)
+        stats = self.__stats.get(prefix)
+        if stats is None:
+            stats = ToolsCacheMemoryTier.PrefixStats()
+            self.__stats[prefix] = stats
+        return stats
+
+    @staticmethod
+    def __to_db_model(entry: Entry) -> ToolsCacheDB:
+        # detached copy, never attached to a session
+        return ToolsCacheDB(
+            key = entry.key,
+            value = entry.value,
+            created_at = entry.created_at,
+            expires_at = entry.expires_at,
+        )
+
+
+# every server worker keeps its own tier, together they stay within the configured limits
+shared_memory_tier = ToolsCacheMemoryTier(
+    max_entries = max(1, config.tools_cache_memory_max_entries // config.web_workers),
+    max_size_bytes = config.tools_cache_memory_max_size_bytes // config.web_workers,
+    max_age_s = config.tools_cache_memory_max_age_s,
+)
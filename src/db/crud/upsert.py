@@ -0,0 +1,51 @@
+from typing import Any, Sequence, TypeVar
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+ModelT = TypeVar("ModelT")
+
+
+def upsert_all(
+    db: Session,
+    model: type[ModelT],
+    rows: list[dict[str, Any]],
+    conflict_columns: Sequence[str],
+) -> list[ModelT]:
+    """
+    Inserts or updates all rows with a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement.
+    All rows must carry the same columns. Does not commit.
+    """
+    if not rows:
+        return []
+    statement = __upsert_statement(db.get_bind().dialect.name, model, rows, conflict_columns)
+    returned = db.scalars(statement, execution_options = {"populate_existing": True}).all()
+    return list(returned)
+
+
+async def upsert_all_async(
+    db: AsyncSession,
+    model: type[ModelT],
+    rows: list[dict[str, Any]],
+    conflict_columns: Sequence[str],
+) -> list[ModelT]:
+    """
+    The same as 'upsert_all', for async sessions. Does not commit.
+    """
+    if not rows:
+        return []
+    statement = __upsert_statement(db.get_bind().dialect.name, model, rows, conflict_columns)
+    returned = await db.scalars(statement, execution_options = {"populate_existing": True})
+    return list(returned.all())
+
+
+def __upsert_statement(dialect_name: str, model: type, rows: list[dict[str, Any]], conflict_columns: Sequence[str]):
+    # SQLite is only used locally and in tests, it understands the same upsert syntax
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    statement = insert(model).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements = list(conflict_columns),
+        set_ = {column: statement.excluded[column] for column in rows[0] if column not in conflict_columns},
+    )
+    return statement.returning(model)
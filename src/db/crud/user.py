@@ -1,10 +1,15 @@
-from typing import Callable
+from typing import Any, Callable
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer_group
 
-from db.model.user import UserDB
+from db.model.user import SECRETS_GROUP, UserDB
+from db.model.user_count import UserCountDB
 from db.schema.user import UserSave
+from db.unit_of_work import commit_durable
 from util.error_codes import USER_NOT_FOUND
 from util.errors import NotFoundError
 
@@ -21,12 +26,24 @@ class UserCRUD:
             UserDB.id == user_id,
         ).first()
 
+    def get_all_by_ids(self, user_ids: list[UUID]) -> list[UserDB]:
+        if not user_ids:
+            return []
+        # noinspection PyTypeChecker
+        return self._db.query(UserDB).filter(
+            UserDB.id.in_(user_ids),
+        ).all()
+
     def get_all(self, skip: int = 0, limit: int = 100) -> list[UserDB]:
         # noinspection PyTypeChecker
         return self._db.query(UserDB).offset(skip).limit(limit).all()
 
     def count(self) -> int:
-        return self._db.query(UserDB).count()
+        value = self._db.scalar(select(UserCountDB.value).where(UserCountDB.id == UserCountDB.SINGLETON_ID))
+        if value is None:
+            self.__seed_count()
+            value = self._db.scalar(select(UserCountDB.value).where(UserCountDB.id == UserCountDB.SINGLETON_ID))
+        return value
 
     def get_by_telegram_user_id(self, telegram_user_id: int) -> UserDB | None:
         return self._db.query(UserDB).filter(
@@ -53,10 +70,20 @@ class UserCRUD:
             UserDB.connect_key == connect_key,
         ).first()
 
-    def create(self, create_data: UserSave) -> UserDB:
+    def create(self, create_data: UserSave, capacity: int | None = None) -> UserDB:
+        """
+        Creates the user and counts it in. With a capacity, users created beyond it are put on the waitlist.
+        Concurrent registrations queue up on the count, so the capacity can't be exceeded by a race.
+        The registration commits right away, also inside a unit of work.
+        """
         user = UserDB(**create_data.model_dump())
+        user_count = self.__change_count(1)
+        if capacity is not None and user_count > capacity:
+            user.is_on_waitlist = True
         self._db.add(user)
-        self._db.commit()
+        # the count stays locked until the transaction ends and other registrations wait on it, so this can't wait
+        # for the end of a unit of work (membership checks, message saves)
+        commit_durable(self._db)
         self._db.refresh(user)
         return user
 
@@ -73,11 +100,23 @@ class UserCRUD:
                 self._db.commit()
         return user
 
-    def save(self, data: UserSave) -> UserDB:
+    def update_fields(self, user_id: UUID, changes: dict[str, Any], commit: bool = True) -> UserDB | None:
+        user = self.get(user_id)
+        if user:
+            # only the given columns end up in the UPDATE, untouched encrypted columns are not re-encrypted
+            for key, value in changes.items():
+                setattr(user, key, value)
+            self._db.flush()
+            self._db.refresh(user)
+            if commit:
+                self._db.commit()
+        return user
+
+    def save(self, data: UserSave, capacity: int | None = None) -> UserDB:
         updated_user = self.update(data)
         if updated_user:
             return updated_user  # available only if update was successful
-        return self.create(data)
+        return self.create(data, capacity = capacity)
 
     def update_locked(self, user_id: UUID, update_fn: Callable[[UserDB], None]) -> UserDB:
         user = self._db.query(UserDB).filter(
@@ -86,7 +125,7 @@ class UserCRUD:
         if user is None:
             raise NotFoundError(f"User {user_id} not found", USER_NOT_FOUND)
         update_fn(user)
-        self._db.commit()
+        commit_durable(self._db)  # balances must not wait for the end of a unit of work, and the row lock is released
         self._db.refresh(user)
         return user
 
@@ -108,7 +147,7 @@ class UserCRUD:
         mapped_first = first if first.id == first_id else second
         mapped_second = second if second.id == second_id else first
         update_fn(mapped_first, mapped_second)
-        self._db.commit()
+        commit_durable(self._db)
         self._db.refresh(mapped_first)
         self._db.refresh(mapped_second)
         return mapped_first, mapped_second
@@ -118,6 +157,64 @@ class UserCRUD:
         if user:
             self._db.delete(user)
             self._db.flush()
+            self.__change_count(-1)
             if commit:
                 self._db.commit()
         return user
+
+    def __change_count(self, delta: int) -> int:
+        # the update locks the count until the end of the transaction
+        statement = (
+            update(UserCountDB)
+            .where(UserCountDB.id == UserCountDB.SINGLETON_ID)
+            .values(value = UserCountDB.value + delta)
+            .returning(UserCountDB.value)
+        )
+        value = self._db.scalar(statement)
+        if value is None:
+            self.__seed_count()
+            value = self._db.scalar(statement)
+        return value
+
+    def __seed_count(self):
+        # schemas created without the migrations start from the users that already exist
+        insert = postgresql.insert if self._db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        # the WHERE clause tells SQLite's parser that ON CONFLICT belongs to the INSERT, not to a join
+        existing = select(literal(UserCountDB.SINGLETON_ID), func.count(UserDB.id)).where(true())
+        self._db.execute(insert(UserCountDB).from_select(["id", "value"], existing).on_conflict_do_nothing(index_elements = ["id"]))
+
+
+class AsyncUserCRUD:
+    """
+    The async counterpart of UserCRUD, covering the user lookups of a chat update.
+    Async sessions can't load deferred columns on access, so the secrets are loaded with the user.
+    """
+
+    _db: AsyncSession
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def get(self, user_id: UUID) -> UserDB | None:
+        return await self.__first(UserDB.id == user_id)
+
+    async def get_all_by_ids(self, user_ids: list[UUID]) -> list[UserDB]:
+        if not user_ids:
+            return []
+        result = await self._db.scalars(
+            select(UserDB).options(undefer_group(SECRETS_GROUP)).filter(
+                UserDB.id.in_(user_ids),
+            ),
+        )
+        return list(result.all())
+
+    async def get_by_telegram_user_id(self, telegram_user_id: int) -> UserDB | None:
+        return await self.__first(UserDB.telegram_user_id == telegram_user_id)
+
+    async def get_by_whatsapp_user_id(self, whatsapp_user_id: str) -> UserDB | None:
+        return await self.__first(UserDB.whatsapp_user_id == whatsapp_user_id)
+
+    async def __first(self, condition) -> UserDB | None:
+        return await self._db.scalar(
+            select(UserDB).options(undefer_group(SECRETS_GROUP)).filter(condition).limit(1),
+        )
@@ -0,0 +1,113 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import Column, Engine, LargeBinary, Table, and_, bindparam, func, literal, or_, select, tuple_, type_coerce, update
+
+from db.envelope_cipher import BACKEND_APP, EnvelopeCipher
+from db.model.base import BaseModel
+from db.model.encrypted_string import EncryptedString
+from util import log
+from util.error_codes import INVALID_ENCRYPTION_CONFIG
+from util.errors import ConfigurationError
+
+
+class EncryptionMigration:
+    """
+    Re-encrypts stored values into the configured backend, in small batches and while the app keeps serving traffic.
+    Values are read through EncryptedString (which understands both formats) and written back through it, so the
+    migration is resumable and can run at any time. Moving to the app backend also re-encrypts values written
+    under older master keys, which makes it the tool for key rotations too.
+    """
+
+    @dataclass
+    class Progress:
+        table: str
+        migrated: int = 0
+        batches: int = 0
+
+    __engine: Engine
+    __backend: str
+    __cipher: EnvelopeCipher | None
+    __batch_size: int
+    __pause_s: float
+
+    def __init__(
+        self,
+        engine: Engine,
+        backend: str,
+        cipher: EnvelopeCipher | None,
+        batch_size: int = 500,
+        pause_s: float = 0.0,
+    ):
+        self.__engine = engine
+        self.__backend = backend
+        self.__cipher = cipher
+        self.__batch_size = batch_size
+        self.__pause_s = pause_s
+
+    @staticmethod
+    def encrypted_tables() -> dict[Table, list[Column]]:
+        tables: dict[Table, list[Column]] = {}
+        for table in BaseModel.metadata.sorted_tables:
+            columns = [column for column in table.columns if isinstance(column.type, EncryptedString)]
+            if columns:
+                tables[table] = columns
+        return tables
+
+    def run(self) -> list[Progress]:
+        return [self.migrate_table(table, columns) for table, columns in self.encrypted_tables().items()]
+
+    def migrate_table(self, table: Table, columns: list[Column]) -> Progress:
+        progress = EncryptionMigration.Progress(table = table.name)
+        primary_key = list(table.primary_key.columns)
+        statement = update(table).where(
+            and_(*[column == bindparam(f"key_{column.name}") for column in primary_key]),
+        ).values({column.name: bindparam(f"new_{column.name}", type_ = column.type) for column in columns})
+
+        last_key: tuple | None = None
+        while True:
+            # each batch is a short transaction of its own, rows locked by live traffic are picked up in a later run
+            with self.__engine.begin() as connection:
+                query = select(*primary_key, *columns).where(self.__needs_migration(columns))
+                if last_key is not None:
+                    last_values = [literal(value, column.type) for value, column in zip(last_key, primary_key)]
+                    query = query.where(tuple_(*primary_key) > tuple_(*last_values))
+                query = query.order_by(*primary_key).limit(self.__batch_size)
+                if connection.dialect.name == "postgresql":
+                    query = query.with_for_update(skip_locked = True, of = table)
+                rows = connection.execute(query).all()
+                if not rows:
+                    break
+                connection.execute(
+                    statement,
+                    [
+                        {
+                            **{f"key_{column.name}": row[index] for index, column in enumerate(primary_key)},
+                            **{f"new_{column.name}": row[len(primary_key) + index] for index, column in enumerate(columns)},
+                        }
+                        for row in rows
+                    ],
+                )
+            last_key = tuple(rows[-1][:len(primary_key)])
+            progress.migrated += len(rows)
+            progress.batches += 1
+            log.d(f"Re-encrypted {progress.migrated} row(s) of '{table.name}' so far")
+            if self.__pause_s:
+                time.sleep(self.__pause_s)
+        log.i(f"Re-encrypted {progress.migrated} row(s) of '{table.name}' in {progress.batches} batch(es)")
+        return progress
+
+    def __needs_migration(self, columns: list[Column]):
+        conditions = []
+        for column in columns:
+            raw = type_coerce(column, LargeBinary)
+            if self.__backend == BACKEND_APP:
+                if self.__cipher is None:
+                    raise ConfigurationError("Migrating to the app backend needs encryption keys", INVALID_ENCRYPTION_CONFIG)
+                header = self.__cipher.header()
+                prefix = func.substr(raw, 1, len(header))
+                conditions.append(and_(column.is_not(None), prefix != literal(header, LargeBinary)))
+            else:
+                prefix = func.substr(raw, 1, len(EnvelopeCipher.MARKER))
+                conditions.append(prefix == literal(EnvelopeCipher.MARKER, LargeBinary))
+        return or_(*conditions)
@@ -0,0 +1,118 @@
+import base64
+import os
+import struct
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from util.config import config
+from util.error_codes import DECRYPTION_FAILED, INVALID_ENCRYPTION_CONFIG
+from util.errors import ConfigurationError, InternalError
+
+BACKEND_PGCRYPTO = "pgcrypto"
+BACKEND_APP = "app"
+
+
+class EnvelopeCipher:
+    """
+    Application-side envelope encryption for stored values, done in the app workers instead of the database.
+    Every value gets a fresh AES-GCM data key, which is wrapped by a versioned master key. The blob carries
+    a header with the master key version, so values written under older keys stay readable during rotations.
+
+    Layout: marker (3) | format (1) | key version (2) | wrap nonce (12) | wrapped data key (48) | nonce (12) | ciphertext
+    """
+
+    # 0xFF never occurs in UTF-8 and doesn't start an OpenPGP packet, so the marker can't clash with pgcrypto values
+    MARKER = b"\xffAE"
+    FORMAT = 1
+
+    __HEADER = struct.Struct(">3sBH")
+    __NONCE_SIZE = 12
+    __DATA_KEY_SIZE = 32
+
+    __master_keys: dict[int, AESGCM]
+    __active_version: int
+
+    def __init__(self, master_keys: dict[int, bytes], active_version: int):
+        if active_version not in master_keys:
+            raise ConfigurationError(f"No encryption key configured for version {active_version}", INVALID_ENCRYPTION_CONFIG)
+        for version, key in master_keys.items():
+            if not 0 < version < 2 ** 16 or len(key) not in (16, 24, 32):
+                raise ConfigurationError(f"Invalid encryption key for version {version}", INVALID_ENCRYPTION_CONFIG)
+        self.__master_keys = {version: AESGCM(key) for version, key in master_keys.items()}
+        self.__active_version = active_version
+
+    @property
+    def active_version(self) -> int:
+        return self.__active_version
+
+    @staticmethod
+    def parse_keys(raw_keys: str) -> dict[int, bytes]:
+        """Parses 'version:base64-key' entries separated by commas, e.g. '1:3q2+7w==,2:yv66vg=='."""
+        master_keys: dict[int, bytes] = {}
+        for entry in raw_keys.split(","):
+            if not entry.strip():
+                continue
+            try:
+                version, encoded_key = entry.split(":", 1)
+                master_keys[int(version)] = base64.b64decode(encoded_key.strip(), validate = True)
+            except ValueError as e:
+                raise ConfigurationError("Encryption keys must look like 'version:base64-key'", INVALID_ENCRYPTION_CONFIG) from e
+        return master_keys
+
+    @classmethod
+    def is_envelope(cls, blob: bytes | None) -> bool:
+        return blob is not None and blob[:len(cls.MARKER)] == cls.MARKER
+
+    def header(self) -> bytes:
+        """The header of values written now, values starting with anything else are due for re-encryption."""
+        return self.__HEADER.pack(self.MARKER, self.FORMAT, self.__active_version)
+
+    def key_version(self, blob: bytes) -> int:
+        _, _, version = self.__HEADER.unpack_from(blob)
+        return version
+
+    def encrypt(self, plaintext: str) -> bytes:
+        header = self.header()
+        data_key = AESGCM.generate_key(bit_length = self.__DATA_KEY_SIZE * 8)
+        wrap_nonce = os.urandom(self.__NONCE_SIZE)
+        wrapped_data_key = self.__master_keys[self.__active_version].encrypt(wrap_nonce, data_key, header)
+        nonce = os.urandom(self.__NONCE_SIZE)
+        ciphertext = AESGCM(data_key).encrypt(nonce, plaintext.encode("utf-8"), header)
+        return header + wrap_nonce + wrapped_data_key + nonce + ciphertext
+
+    def decrypt(self, blob: bytes) -> str:
+        if not self.is_envelope(blob):
+            raise InternalError("Value is not in the envelope format", DECRYPTION_FAILED)
+        header = blob[:self.__HEADER.size]
+        _, format_version, key_version = self.__HEADER.unpack(header)
+        master_key = self.__master_keys.get(key_version)
+        if format_version != self.FORMAT or master_key is None:
+            raise InternalError(f"No decryption key for format {format_version}, key version {key_version}", DECRYPTION_FAILED)
+        offset = self.__HEADER.size
+        wrap_nonce = blob[offset:offset + self.__NONCE_SIZE]
+        offset += self.__NONCE_SIZE
+        wrapped_data_key = blob[offset:offset + self.__DATA_KEY_SIZE + 16]  # GCM appends a 16-byte tag
+        offset += self.__DATA_KEY_SIZE + 16
+        nonce = blob[offset:offset + self.__NONCE_SIZE]
+        offset += self.__NONCE_SIZE
+        try:
+            data_key = master_key.decrypt(wrap_nonce, wrapped_data_key, header)
+            return AESGCM(data_key).decrypt(nonce, blob[offset:], header).decode("utf-8")
+        except InvalidTag as e:
+            raise InternalError(f"Unable to decrypt a value with key version {key_version}", DECRYPTION_FAILED) from e
+
+
+def create_envelope_cipher() -> EnvelopeCipher | None:
+    if config.db_encryption_backend not in (BACKEND_PGCRYPTO, BACKEND_APP):
+        raise ConfigurationError(f"Unknown encryption backend '{config.db_encryption_backend}'", INVALID_ENCRYPTION_CONFIG)
+    raw_keys = config.db_encryption_keys.get_secret_value()
+    if raw_keys in ("", "invalid"):
+        if config.db_encryption_backend == BACKEND_APP:
+            raise ConfigurationError("The app encryption backend needs DB_ENCRYPTION_KEYS", INVALID_ENCRYPTION_CONFIG)
+        return None
+    return EnvelopeCipher(EnvelopeCipher.parse_keys(raw_keys), config.db_encryption_key_version)
+
+
+# configured once per process; when keys are present, both storage formats can be read
+envelope_cipher: EnvelopeCipher | None = create_envelope_cipher()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKeyConstraint, PrimaryKeyConstraint, String, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKeyConstraint, Index, PrimaryKeyConstraint, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -20,4 +20,5 @@ class ChatMessageDB(BaseModel):
         UniqueConstraint(chat_id, message_id, name = "uq_message_per_chat"),
         ForeignKeyConstraint([chat_id], ["chat_configs.chat_id"], name = "chat_messages_chat_id_fkey"),
         ForeignKeyConstraint([author_id], ["simulants.id"], name = "chat_messages_author_id_fkey"),
+        Index("idx_chat_messages_chat_sent_at", chat_id, sent_at.desc()),
     )
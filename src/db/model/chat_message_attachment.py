@@ -25,4 +25,5 @@ class ChatMessageAttachmentDB(BaseModel):
             name = "chat_message_attachments_message_fkey",
         ),
         Index("idx_external_id", external_id),
+        Index("idx_attachments_message", chat_id, message_id),
     )
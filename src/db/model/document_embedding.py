@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, PrimaryKeyConstraint, String
+
+from db.model.base import BaseModel
+
+
+class DocumentEmbeddingDB(BaseModel):
+    __tablename__ = "document_embeddings"
+
+    content_hash = Column(String, nullable = False)
+    embedding_model = Column(String, nullable = False)
+    page_index = Column(Integer, nullable = False)
+    page_number = Column(Integer, nullable = True)
+    embedding = Column(LargeBinary, nullable = False)
+    last_used_at = Column(DateTime, nullable = False)  # set on creation, refreshed when the document is reused
+
+    __table_args__ = (
+        PrimaryKeyConstraint(content_hash, embedding_model, page_index, name = "pk_document_embeddings"),
+        Index("idx_document_embeddings_last_used_at", last_used_at),
+    )
@@ -1,10 +1,19 @@
-from sqlalchemy import Text, TypeDecorator, func
+from sqlalchemy import LargeBinary, Text, TypeDecorator, case, func, literal, type_coerce
 from sqlalchemy.dialects.postgresql import BYTEA
 
+import db.envelope_cipher as envelope
+from db.envelope_cipher import BACKEND_APP, EnvelopeCipher
 from util.config import config
+from util.error_codes import DECRYPTION_FAILED
+from util.errors import InternalError
 
 
 class EncryptedString(TypeDecorator):
+    """
+    Encrypts values at rest, either with pgcrypto inside the database (the default)
+    or with the application-side envelope cipher (DB_ENCRYPTION_BACKEND=app).
+    When envelope keys are configured, reads understand both formats, so rows can be migrated online.
+    """
 
     impl = Text  # Default implementation
     cache_ok = True
@@ -22,41 +31,60 @@ class EncryptedString(TypeDecorator):
             return dialect.type_descriptor(Text())
 
     def bind_expression(self, bindparam):
-        # Only use pgcrypto functions for PostgreSQL
-        if self._is_postgresql:
-            return func.pgp_sym_encrypt(bindparam, config.token_encrypt_secret.get_secret_value())
+        # Only use pgcrypto functions for PostgreSQL, and only when the app is not encrypting
+        if self._is_postgresql and not self.__encrypts_in_app():
+            # typed as text, drivers that cast their parameters (asyncpg) would otherwise send bytea
+            return func.pgp_sym_encrypt(type_coerce(bindparam, Text), config.token_encrypt_secret.get_secret_value())
         # For other databases, return the value as-is (for testing)
         return bindparam
 
     def column_expression(self, column):
         # Only use pgcrypto functions for PostgreSQL
         if self._is_postgresql:
-            return func.pgp_sym_decrypt(column, config.token_encrypt_secret.get_secret_value())
+            secret = config.token_encrypt_secret.get_secret_value()
+            if envelope.envelope_cipher is None:
+                return func.pgp_sym_decrypt(column, secret)
+            # envelope values pass through to the app, older values are still decrypted by pgcrypto
+            raw = type_coerce(column, LargeBinary)
+            marker = literal(EnvelopeCipher.MARKER, LargeBinary)
+            return case(
+                (func.substr(raw, 1, len(EnvelopeCipher.MARKER)) == marker, raw),
+                else_ = func.pgp_sym_decrypt_bytea(raw, secret),
+            )
         # For other databases, return the column as-is (for testing)
         return column
 
     def bind_processor(self, dialect):
-        if not self._is_postgresql:
-            # For non-PostgreSQL databases, just return the value as-is
-            def bind_process(value):
-                return value
-            return bind_process
-        return None
+        if self._is_postgresql and not self.__encrypts_in_app():
+            return None
+
+        def bind_process(value):
+            if value is not None and self.__encrypts_in_app():
+                return self.__require_cipher().encrypt(value)
+            # For non-PostgreSQL databases without app encryption, just return the value as-is
+            return value
+        return bind_process
 
     def result_processor(self, dialect, coltype):
-        if not self._is_postgresql:
-            # For non-PostgreSQL databases, just return the value as-is
-            def result_process_plain(value):
-                return value
-            return result_process_plain
-        else:
-            # For PostgreSQL, convert decrypted bytes to string
-            def result_process_decrypt(value):
-                if value is None:
-                    return None
-                if isinstance(value, memoryview):
-                    return value.tobytes().decode("utf-8")
-                elif isinstance(value, bytes):
-                    return value.decode("utf-8")
-                return str(value) if value is not None else None
-            return result_process_decrypt
+        def result_process(value):
+            if value is None:
+                return None
+            if isinstance(value, memoryview):
+                value = value.tobytes()
+            if isinstance(value, bytes):
+                if EnvelopeCipher.is_envelope(value):
+                    return self.__require_cipher().decrypt(value)
+                # For PostgreSQL, convert the bytes decrypted by pgcrypto to string
+                return value.decode("utf-8")
+            return str(value)
+        return result_process
+
+    @staticmethod
+    def __encrypts_in_app() -> bool:
+        return config.db_encryption_backend == BACKEND_APP
+
+    @staticmethod
+    def __require_cipher() -> EnvelopeCipher:
+        if envelope.envelope_cipher is None:
+            raise InternalError("Found an envelope-encrypted value, but no encryption keys are configured", DECRYPTION_FAILED)
+        return envelope.envelope_cipher
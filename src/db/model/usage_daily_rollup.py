@@ -0,0 +1,38 @@
+import uuid
+
+from sqlalchemy import Column, Date, Float, Index, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from db.model.base import BaseModel
+
+
+class UsageDailyRollupDB(BaseModel):
+    __tablename__ = "usage_daily_rollups"
+
+    # stands in for a missing counterpart, so that it can be a part of the primary key
+    NO_COUNTERPART = uuid.UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
+
+    # rollup dimensions
+    day = Column(Date, nullable = False)
+    payer_id = Column(UUID(as_uuid = True), nullable = False)
+    user_id = Column(UUID(as_uuid = True), nullable = False)
+    counterpart_id = Column(UUID(as_uuid = True), nullable = False)
+    tool_id = Column(String, nullable = False)
+    tool_name = Column(String, nullable = False)
+    provider_id = Column(String, nullable = False)
+    provider_name = Column(String, nullable = False)
+    purpose = Column(String, nullable = False)
+
+    # rolled up values
+    record_count = Column(Integer, nullable = False)
+    total_cost_credits = Column(Float, nullable = False)
+    runtime_seconds = Column(Float, nullable = False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint(
+            payer_id, day, user_id, counterpart_id, tool_id, tool_name, provider_id, provider_name, purpose,
+            name = "pk_usage_daily_rollups",
+        ),
+        Index("idx_usage_daily_rollups_user_day", user_id, day),
+        Index("idx_usage_daily_rollups_counterpart_day", counterpart_id, day),
+    )
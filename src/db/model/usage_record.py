@@ -1,16 +1,18 @@
 import uuid
+from datetime import datetime, timezone
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Index, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, Index, Integer, PrimaryKeyConstraint, String, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
 from db.model.base import BaseModel
+from db.time_partitions import TimePartitions
 
 
 class UsageRecordDB(BaseModel):
     __tablename__ = "usage_records"
 
-    id = Column(UUID(as_uuid = True), primary_key = True, default = uuid.uuid4)
+    id = Column(UUID(as_uuid = True), nullable = False, default = uuid.uuid4)
 
     # core properties
     user_id = Column(UUID(as_uuid = True), nullable = False)
@@ -52,6 +54,19 @@ class UsageRecordDB(BaseModel):
     participant_details = Column(JSON, nullable = True)
 
     __table_args__ = (
+        # Postgres partitions the records by month, and the partition key has to be part of the primary key
+        PrimaryKeyConstraint(id, timestamp, name = "usage_records_pkey"),
         Index("idx_usage_records_user_timestamp", user_id, timestamp.desc()),
         Index("idx_usage_records_counterpart_timestamp", counterpart_id, timestamp.desc()),
+        Index("idx_usage_records_payer_timestamp", payer_id, timestamp.desc()),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
+
+
+@event.listens_for(UsageRecordDB.__table__, "after_create")
+def _create_usage_record_partitions(target, connection, **_):
+    # schemas created without migrations need partitions to insert into as well
+    partitions = TimePartitions(connection, target.name)
+    if partitions.is_partitioned():
+        partitions.create_months(datetime.now(timezone.utc).date())
+        partitions.create_default()
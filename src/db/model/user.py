@@ -5,10 +5,28 @@ from enum import Enum
 from sqlalchemy import BigInteger, Boolean, Column, Date, Float, String, text
 from sqlalchemy import Enum as EnumSQL
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import column_property, deferred
 
 from db.model.base import BaseModel
 from db.model.encrypted_string import EncryptedString
 
+# encrypted columns are loaded (and decrypted) together, only when one of them is first accessed
+SECRETS_GROUP = "secrets"
+SECRET_COLUMNS = [
+    "about_me",
+    "custom_prompt",
+    "whatsapp_phone_number",
+    "open_ai_key",
+    "anthropic_key",
+    "google_ai_key",
+    "perplexity_key",
+    "replicate_key",
+    "rapid_api_key",
+    "coinmarketcap_key",
+    "x_key",
+    "x_ai_key",
+]
+
 
 class UserDB(BaseModel):
     __tablename__ = "simulants"
@@ -37,28 +55,28 @@ class UserDB(BaseModel):
 
     id = Column(UUID(as_uuid = True), primary_key = True, default = uuid.uuid4)
     full_name = Column(String, nullable = True)
-    about_me = Column(EncryptedString, nullable = True)
-    custom_prompt = Column(EncryptedString, nullable = True)
+    about_me = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    custom_prompt = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
 
     telegram_username = Column(String, nullable = True)  # can be changed in Telegram
     telegram_chat_id = Column(String, nullable = True)  # can be changed in Telegram
     telegram_user_id = Column(BigInteger, unique = True, nullable = True, index = True)
 
     whatsapp_user_id = Column(String, unique = True, nullable = True, index = True)
-    whatsapp_phone_number = Column(EncryptedString, nullable = True)
+    whatsapp_phone_number = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
 
     # not secret, used to connect multiple user profiles
     connect_key = Column(String, nullable = False, unique = True, index = True)
 
-    open_ai_key = Column(EncryptedString, nullable = True)
-    anthropic_key = Column(EncryptedString, nullable = True)
-    google_ai_key = Column(EncryptedString, nullable = True)
-    perplexity_key = Column(EncryptedString, nullable = True)
-    replicate_key = Column(EncryptedString, nullable = True)
-    rapid_api_key = Column(EncryptedString, nullable = True)
-    coinmarketcap_key = Column(EncryptedString, nullable = True)
-    x_key = Column(EncryptedString, nullable = True)
-    x_ai_key = Column(EncryptedString, nullable = True)
+    open_ai_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    anthropic_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    google_ai_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    perplexity_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    replicate_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    rapid_api_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    coinmarketcap_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    x_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
+    x_ai_key = deferred(Column(EncryptedString, nullable = True), group = SECRETS_GROUP)
 
     # in sync with features.external_tools.external_tool.ToolType
     tool_choice_chat = Column(String, nullable = True)
@@ -84,3 +102,8 @@ class UserDB(BaseModel):
     created_at = Column(Date, default = date.today)
 
     __table_args__ = ()
+
+
+# cheap presence flags, loaded eagerly so that unset secrets are known without decrypting anything
+for _secret_column in SECRET_COLUMNS:
+    setattr(UserDB, f"has_{_secret_column}", column_property(UserDB.__table__.c[_secret_column].is_not(None)))
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer
+
+from db.model.base import BaseModel
+
+
+class UserCountDB(BaseModel):
+    """
+    A single row holding the number of users, kept in step by the user CRUD in the same transaction as every
+    insert and delete. Reading it replaces counting the users table, and updating it serializes registrations.
+    """
+    __tablename__ = "user_count"
+
+    SINGLETON_ID = 1
+
+    id = Column(Integer, primary_key = True, default = SINGLETON_ID)
+    value = Column(Integer, nullable = False, default = 0)
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DocumentEmbeddingBase(BaseModel):
+    content_hash: str
+    embedding_model: str
+    page_index: int
+    page_number: int | None = None
+    embedding: bytes
+    last_used_at: datetime = datetime.now()
+
+
+class DocumentEmbeddingSave(DocumentEmbeddingBase):
+    pass
+
+
+class DocumentEmbedding(DocumentEmbeddingBase):
+    model_config = ConfigDict(from_attributes = True)
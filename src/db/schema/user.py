@@ -1,10 +1,13 @@
 import secrets
 from datetime import date
+from typing import Any, Callable
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, SecretStr, model_validator
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
 
-from db.model.user import UserDB
+from db.model.user import SECRET_COLUMNS, UserDB
 
 
 def generate_connect_key() -> str:
@@ -14,6 +17,44 @@ def generate_connect_key() -> str:
     return f"{''.join(key_chars[0:4])}-{''.join(key_chars[4:8])}-{''.join(key_chars[8:12])}"
 
 
+class LazySecretStr(SecretStr):
+    """A SecretStr that loads (and decrypts) its value only when it is first read."""
+
+    def __init__(self, load: Callable[[], str | None]):
+        # the base initializer is skipped on purpose, it would store the value eagerly
+        self.__load = load
+        self.__value: str | None = None
+
+    @property
+    def _secret_value(self) -> str:
+        if self.__value is None:
+            self.__value = self.__load() or ""
+        return self.__value
+
+    @_secret_value.setter
+    def _secret_value(self, value: str):
+        self.__value = value
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__value is not None
+
+    def __eq__(self, other: Any) -> bool:
+        # plain and lazy secrets with the same value are equal, in both directions
+        return isinstance(other, SecretStr) and self.get_secret_value() == other.get_secret_value()
+
+    def __hash__(self) -> int:
+        return hash(self.get_secret_value())
+
+
+def _load_secret(user_db: UserDB, field: str, bind: Any) -> str | None:
+    if bind is None or not inspect(user_db).detached:
+        return getattr(user_db, field)
+    # the session that loaded the user is gone (e.g. a deferred reply runs later), so the secret is read by user ID
+    with Session(bind) as db:
+        return db.scalar(select(getattr(UserDB, field)).where(UserDB.id == user_db.id))
+
+
 class UserBase(BaseModel):
     full_name: str | None = None
     about_me: SecretStr | None = None
@@ -91,6 +132,24 @@ class UserSave(UserBase):
                 data[field] = data[field].get_secret_value() if hasattr(data[field], "get_secret_value") else data[field]
         return data
 
+    def changed_fields(self, stored: "User") -> dict[str, Any]:
+        # only the columns that differ from the stored user, ready for a narrow update
+        changes: dict[str, Any] = {}
+        for field in type(self).model_fields:
+            if field == "id":
+                continue
+            value = getattr(self, field)
+            stored_value = getattr(stored, field, None)
+            if value is stored_value:
+                continue  # copied over unchanged, this also keeps lazy secrets from being decrypted
+            if hasattr(value, "get_secret_value"):
+                value = value.get_secret_value()
+            if hasattr(stored_value, "get_secret_value"):
+                stored_value = stored_value.get_secret_value()
+            if value != stored_value:
+                changes[field] = value
+        return changes
+
 
 class User(UserBase):
     id: UUID
@@ -98,6 +157,35 @@ class User(UserBase):
     connect_key: str = Field(default_factory = generate_connect_key)
     model_config = ConfigDict(from_attributes = True)
 
+    @model_validator(mode = "before")
+    @classmethod
+    def _defer_secrets(cls, data: Any) -> Any:
+        # secrets that the ORM has not loaded yet stay encrypted until they are read
+        if not isinstance(data, UserDB):
+            return data
+        unloaded = inspect(data).unloaded
+        if not unloaded.intersection(SECRET_COLUMNS):
+            return data
+        session = inspect(data).session
+        bind = session.get_bind() if session else None
+        values: dict[str, Any] = {}
+        for field in cls.model_fields:
+            if field not in SECRET_COLUMNS or field not in unloaded:
+                values[field] = getattr(data, field)
+            elif getattr(data, f"has_{field}"):
+                values[field] = LazySecretStr(lambda name = field: _load_secret(data, name, bind))
+            else:
+                values[field] = None
+        return values
+
+    def load_secrets(self) -> "User":
+        # reads the lazy secrets now, e.g. before the user is handed over to other threads or sessions
+        for field in SECRET_COLUMNS:
+            value = getattr(self, field)
+            if isinstance(value, LazySecretStr):
+                value.get_secret_value()
+        return self
+
     def has_any_api_key(self) -> bool:
         api_key_fields = [
             "open_ai_key",
@@ -7,11 +7,15 @@ from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
 
 from db.model.base import BaseModel
+from db.unit_of_work import UnitOfWorkSession
 from util import log
 from util.config import config
 from util.error_codes import DI_DEPENDENCY_NOT_MET
 from util.errors import ConfigurationError
 
+# only the sync engine here serves traffic, count the async one from 'db.async_sql' once an endpoint moves to it
+ENGINES_PER_WORKER = 1
+
 engine: Engine
 LocalSession: sessionmaker
 
@@ -19,15 +23,27 @@ LocalSession: sessionmaker
 def initialize_db(
     db_url: str = config.db_url.get_secret_value(),
     multi_connection_setup: bool = True,
+    create_schema: bool = True,
 ) -> tuple[Engine, sessionmaker]:
     global engine, LocalSession
     engine = __create_db_engine(db_url, multi_connection_setup = multi_connection_setup)
     # noinspection PyPep8Naming
-    LocalSession = sessionmaker(autocommit = False, autoflush = False, bind = engine)
-    BaseModel.metadata.create_all(bind = engine)
+    LocalSession = sessionmaker(autocommit = False, autoflush = False, bind = engine, class_ = UnitOfWorkSession)
+    if create_schema:
+        BaseModel.metadata.create_all(bind = engine)
     return engine, LocalSession
 
 
+def pool_limits(connection_budget: int, workers: int) -> tuple[int, int]:
+    """
+    Splits the global connection budget between the server workers and their engines.
+    Returns the pool size and the overflow of a single engine, the default budget gives one worker 3 + 10.
+    """
+    per_engine = max(2, connection_budget // (max(1, workers) * ENGINES_PER_WORKER))
+    pool_size = max(1, per_engine // 4)
+    return pool_size, per_engine - pool_size
+
+
 def __create_db_engine(
     db_url: str,
     max_retries: int = 7,
@@ -38,12 +54,13 @@ def __create_db_engine(
     while retries < max_retries:
         try:
             if multi_connection_setup:
+                pool_size, max_overflow = pool_limits(config.db_connection_budget, config.web_workers)
                 created_engine = create_engine(
                     url = db_url,  # where the DB is at
                     pool_pre_ping = True,  # check connections before using them
                     pool_recycle = 300,  # recycle connections after 5 minutes
-                    pool_size = 3,  # start with a modest pool size
-                    max_overflow = 10,  # allow more connections as requirements grow
+                    pool_size = pool_size,  # start with a modest share of the connection budget
+                    max_overflow = max_overflow,  # allow the rest of the share as requirements grow
                     pool_timeout = 10,  # wait for a few seconds for available connections
                 )
             else:
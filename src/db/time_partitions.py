@@ -0,0 +1,147 @@
+from datetime import date, datetime
+
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+from util import log
+
+MONTHS_AHEAD = 3
+LOCK_TIMEOUT = "5s"
+
+
+class TimePartitions:
+    """
+    Manages the monthly range partitions of a Postgres table partitioned by a timestamp column. Partitions are named
+    '<table>_<yyyy>_<mm>' and cover one calendar month, and a default partition keeps rows outside of them insertable.
+    Expired months are dropped as whole tables, which is instant and leaves no dead rows behind for vacuum to chase.
+    Rows that landed in the default partition before their month existed are moved into it once it gets created.
+    Partition DDL briefly locks the parent table, so it gives up after a short lock timeout instead of queueing the
+    live queries behind a long-running one. Tables that are not partitioned (and all of SQLite) are left alone.
+    """
+
+    __db: Session | Connection
+    __table: str
+    __column: str
+
+    def __init__(self, db: Session | Connection, table: str, column: str = "timestamp"):
+        self.__db = db
+        self.__table = table
+        self.__column = column
+
+    def is_partitioned(self) -> bool:
+        dialect = self.__db.get_bind().dialect if isinstance(self.__db, Session) else self.__db.dialect
+        if dialect.name != "postgresql":
+            return False
+        return bool(
+            self.__db.execute(
+                text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+                {"table": self.__table},
+            ).scalar(),
+        )
+
+    def partition_name(self, month: date) -> str:
+        return f"{self.__table}_{month.year:04d}_{month.month:02d}"
+
+    def default_name(self) -> str:
+        return f"{self.__table}_default"
+
+    def get_months(self) -> list[date]:
+        """Returns the first days of the months that have a partition, in order."""
+        return self.__months_of(self.__get_partition_names())
+
+    def __months_of(self, names: list[str]) -> list[date]:
+        months = []
+        for name in names:
+            suffix = name.removeprefix(f"{self.__table}_")
+            year, _, month = suffix.partition("_")
+            if suffix != name and year.isdigit() and month.isdigit():
+                months.append(date(int(year), int(month), 1))
+        return sorted(months)
+
+    def __get_partition_names(self) -> list[str]:
+        return self.__db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = to_regclass(:table)",
+            ),
+            {"table": self.__table},
+        ).scalars().all()
+
+    def create_months(self, first_month: date, count: int = MONTHS_AHEAD + 1) -> list[str]:
+        """
+        Creates the missing partitions of 'count' months from the month of 'first_month' on. Postgres refuses to create
+        a month while the default partition holds rows of it, so those rows are moved into the new month's table
+        before it gets attached.
+        """
+        names = self.__get_partition_names()
+        existing = set(self.__months_of(names))
+        has_default_rows = self.default_name() in names and self.__has_default_rows()
+        if has_default_rows:
+            log.w(f"Default partition '{self.default_name()}' holds rows, a month partition was missing when they came in")
+        created = []
+        for offset in range(count):
+            month = _add_months(_month_start(first_month), offset)
+            if month in existing:
+                continue
+            bounds = f"FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            if has_default_rows and self.__has_default_rows(month):
+                self.__create_from_default_rows(month, bounds)
+            else:
+                self.__set_lock_timeout()
+                self.__db.execute(
+                    text(f'CREATE TABLE "{self.partition_name(month)}" PARTITION OF "{self.__table}" FOR VALUES {bounds}'),
+                )
+            created.append(self.partition_name(month))
+        return created
+
+    def create_default(self):
+        self.__set_lock_timeout()
+        self.__db.execute(text(f'CREATE TABLE IF NOT EXISTS "{self.default_name()}" PARTITION OF "{self.__table}" DEFAULT'))
+
+    def drop_before(self, cutoff: datetime) -> list[str]:
+        """Drops the partitions of the months that ended before the cutoff, keeping the one the cutoff falls in."""
+        dropped = []
+        for month in self.get_months():
+            if datetime.combine(_add_months(month, 1), datetime.min.time()) > cutoff:
+                break
+            self.__set_lock_timeout()
+            self.__db.execute(text(f'DROP TABLE "{self.partition_name(month)}"'))
+            dropped.append(self.partition_name(month))
+        return dropped
+
+    def __has_default_rows(self, month: date | None = None) -> bool:
+        condition = f" WHERE {self.__month_condition(month)}" if month else ""
+        return bool(self.__db.execute(text(f'SELECT EXISTS (SELECT 1 FROM "{self.default_name()}"{condition})')).scalar())
+
+    def __create_from_default_rows(self, month: date, bounds: str):
+        log.w(f"Moving the rows of {month.isoformat()[:7]} from '{self.default_name()}' into '{self.partition_name(month)}'")
+        # the month starts as a plain table, attaching it checks that the default no longer holds any of its rows
+        self.__db.execute(text(f'CREATE TABLE "{self.partition_name(month)}" (LIKE "{self.__table}" INCLUDING DEFAULTS)'))
+        self.__set_lock_timeout()
+        self.__db.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{self.default_name()}" WHERE {self.__month_condition(month)} RETURNING *) '
+                f'INSERT INTO "{self.partition_name(month)}" SELECT * FROM moved',
+            ),
+        )
+        self.__db.execute(
+            text(f'ALTER TABLE "{self.__table}" ATTACH PARTITION "{self.partition_name(month)}" FOR VALUES {bounds}'),
+        )
+
+    def __month_condition(self, month: date) -> str:
+        return (
+            f"\"{self.__column}\" >= '{month.isoformat()}' AND \"{self.__column}\" < '{_add_months(month, 1).isoformat()}'"
+        )
+
+    def __set_lock_timeout(self):
+        self.__db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from typing import Callable, Generator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from util import log
+
+DEFERRED_KEY = "unit_of_work_deferred"
+AFTER_COMMIT_KEY = "unit_of_work_after_commit"
+
+
+class UnitOfWorkSession(Session):
+    """
+    Session whose commits can be deferred to the boundaries of a unit of work.
+    While a unit of work is active, a plain 'commit()' only flushes, so the write is visible
+    inside the transaction and becomes durable at the next boundary.
+    """
+
+    def commit(self) -> None:
+        if self.info.get(DEFERRED_KEY):
+            self.flush()
+            return
+        super().commit()
+
+    def commit_durable(self) -> None:
+        # ends the current unit early, together with all writes pending before it
+        super().commit()
+
+
+def commit_durable(db: Session):
+    """Commits right away, even inside a unit of work. Use for writes that must not wait, like credit deductions."""
+    if isinstance(db, UnitOfWorkSession):
+        db.commit_durable()
+    else:
+        db.commit()
+
+
+def run_after_commit(db: Session, callback: Callable[[], None]):
+    """
+    Runs the callback once the writes made so far are durable. Outside of a unit of work the last 'commit()' already
+    made them durable, so it runs right away. Inside, it waits for the transaction to commit and is dropped on rollback.
+    Use it to mirror stored data elsewhere (e.g. in-memory caches). The callback must not touch the session.
+    """
+    if not db.info.get(DEFERRED_KEY):
+        callback()
+        return
+    callbacks = db.info.get(AFTER_COMMIT_KEY)
+    if callbacks is None:
+        callbacks = db.info[AFTER_COMMIT_KEY] = []
+        event.listen(db, "after_commit", _run_after_commit_callbacks)
+        event.listen(db, "after_soft_rollback", _drop_after_commit_callbacks)
+    callbacks.append(callback)
+
+
+def _run_after_commit_callbacks(db: Session):
+    callbacks = db.info.get(AFTER_COMMIT_KEY) or []
+    db.info[AFTER_COMMIT_KEY] = []
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            log.w("Post-commit callback failed", e)
+
+
+def _drop_after_commit_callbacks(db: Session, *_):
+    if db.info.get(AFTER_COMMIT_KEY):
+        db.info[AFTER_COMMIT_KEY] = []
+
+
+class UnitOfWork:
+
+    __db: Session
+    __commits: int
+
+    def __init__(self, db: Session):
+        self.__db = db
+        self.__commits = 0
+
+    @property
+    def commits(self) -> int:
+        return self.__commits
+
+    def checkpoint(self):
+        commit_durable(self.__db)
+
+    def _on_commit(self, _: Session):
+        self.__commits += 1
+
+
+@contextmanager
+def unit_of_work(db: Session, label: str = "unit of work") -> Generator[UnitOfWork, None, None]:
+    """
+    Accumulates the writes made through 'db' and commits them once, when the block ends.
+    Call 'checkpoint()' to commit at a well-defined boundary in between. On errors, pending writes are rolled back.
+    """
+    work = UnitOfWork(db)
+    was_deferred = db.info.get(DEFERRED_KEY, False)
+    db.info[DEFERRED_KEY] = True
+    event.listen(db, "after_commit", work._on_commit)
+    try:
+        yield work
+        db.info[DEFERRED_KEY] = was_deferred
+        if not was_deferred:
+            commit_durable(db)
+    except Exception:
+        db.info[DEFERRED_KEY] = was_deferred
+        # a unit that never reached the database has nothing to roll back, but its callbacks must go too
+        _drop_after_commit_callbacks(db)
+        db.rollback()
+        raise
+    finally:
+        event.remove(db, "after_commit", work._on_commit)
+        log.d(f"Finished {label} with {work.commits} commit(s)")
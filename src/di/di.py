@@ -31,6 +31,7 @@ if TYPE_CHECKING:
     from db.crud.chat_config import ChatConfigCRUD
     from db.crud.chat_message import ChatMessageCRUD
     from db.crud.chat_message_attachment import ChatMessageAttachmentCRUD
+    from db.crud.document_embedding import DocumentEmbeddingCRUD
     from db.crud.price_alert import PriceAlertCRUD
     from db.crud.sponsorship import SponsorshipCRUD
     from db.crud.tools_cache import ToolsCacheCRUD
@@ -53,12 +54,16 @@ if TYPE_CHECKING:
     from features.audio.audio_transcriber import AudioTranscriber
     from features.chat.chat_agent import ChatAgent
     from features.chat.chat_attachment_processor import ChatAttachmentProcessor
+    from features.chat.chat_history_loader import ChatHistoryLoader
     from features.chat.chat_image_edit_service import ChatImageEditService
     from features.chat.chat_progress_notifier import ChatProgressNotifier
+    from features.chat.chat_progress_scheduler import ChatProgressScheduler
     from features.chat.command_processor import CommandProcessor
     from features.chat.currency_alert_service import CurrencyAlertService
     from features.chat.dev_announcements_service import DevAnnouncementsService
     from features.chat.llm_tools.llm_tool_library import LLMToolLibrary
+    from features.chat.llm_tools.tool_call_executor import ToolCallExecutor
+    from features.chat.membership.chat_access_cache import ChatAccessCache
     from features.chat.membership.chat_membership_repo import ChatMembershipRepository
     from features.chat.membership.chat_membership_service import ChatMembershipService
     from features.chat.telegram.domain_langchain_mapper import DomainLangchainMapper
@@ -74,6 +79,7 @@ if TYPE_CHECKING:
     from features.cleanup.cleanup_service import CleanupService
     from features.connect.profile_connect_service import ProfileConnectService
     from features.currencies.exchange_rate_fetcher import ExchangeRateFetcher
+    from features.documents.document_embedding_index import DocumentEmbeddingIndex
     from features.documents.document_search import DocumentSearch
     from features.documents.langchain_embeddings_adapter import LangChainEmbeddingsAdapter
     from features.external_tools.access_token_resolver import AccessTokenResolver
@@ -94,6 +100,8 @@ if TYPE_CHECKING:
     from features.web_browsing.twitter_status_fetcher import TwitterStatusFetcher
     from features.web_browsing.url_shortener import UrlShortener
     from features.web_browsing.web_fetcher import WebFetcher
+    from util.debounce_scheduler import DebounceScheduler
+    from util.rate_limiter import RateLimiter
     from util.translations_cache import TranslationsCache
 
 
@@ -120,6 +128,7 @@ class DI:
     _sponsorship_crud: "SponsorshipCRUD | None"
     _tools_cache_crud: "ToolsCacheCRUD | None"
     _price_alert_crud: "PriceAlertCRUD | None"
+    _document_embedding_crud: "DocumentEmbeddingCRUD | None"
     _usage_record_repo: "UsageRecordRepository | None"
     _purchase_record_repo: "PurchaseRecordRepository | None"
     # Services
@@ -131,6 +140,7 @@ class DI:
     _usage_tracking_service: "UsageTrackingService | None"
     _purchase_service: "PurchaseService | None"
     _spending_service: "SpendingService | None"
+    _document_embedding_index: "DocumentEmbeddingIndex | None"
     # Controllers
     _settings_controller: "SettingsController | None"
     _sponsorships_controller: "SponsorshipsController | None"
@@ -147,8 +157,10 @@ class DI:
     _whatsapp_domain_mapper: "WhatsAppDomainMapper | None"
     _telegram_data_resolver: "TelegramDataResolver | None"
     _whatsapp_data_resolver: "WhatsAppDataResolver | None"
+    _chat_history_loader: "ChatHistoryLoader | None"
     # Features & Dynamic Instances
     _llm_tool_library: "LLMToolLibrary | None"
+    _tool_call_executor: "ToolCallExecutor | None"
     _command_processor: "CommandProcessor | None"
     _exchange_rate_fetcher: "ExchangeRateFetcher | None"
 
@@ -179,6 +191,7 @@ class DI:
         self._sponsorship_crud = None
         self._tools_cache_crud = None
         self._price_alert_crud = None
+        self._document_embedding_crud = None
         self._usage_record_repo = None
         self._purchase_record_repo = None
         # Services
@@ -190,6 +203,7 @@ class DI:
         self._usage_tracking_service = None
         self._purchase_service = None
         self._spending_service = None
+        self._document_embedding_index = None
         # Controllers
         self._settings_controller = None
         self._sponsorships_controller = None
@@ -206,8 +220,10 @@ class DI:
         self._whatsapp_domain_mapper = None
         self._telegram_data_resolver = None
         self._whatsapp_data_resolver = None
+        self._chat_history_loader = None
         # Features & Dynamic Instances
         self._llm_tool_library = None
+        self._tool_call_executor = None
         self._command_processor = None
         self._exchange_rate_fetcher = None
 
@@ -394,7 +410,8 @@ class DI:
     def tools_cache_crud(self) -> "ToolsCacheCRUD":
         if self._tools_cache_crud is None:
             from db.crud.tools_cache import ToolsCacheCRUD
-            self._tools_cache_crud = ToolsCacheCRUD(self.db)
+            from db.crud.tools_cache_memory_tier import shared_memory_tier
+            self._tools_cache_crud = ToolsCacheCRUD(self.db, shared_memory_tier)
         return self._tools_cache_crud
 
     @property
@@ -404,6 +421,20 @@ class DI:
             self._price_alert_crud = PriceAlertCRUD(self.db)
         return self._price_alert_crud
 
+    @property
+    def document_embedding_crud(self) -> "DocumentEmbeddingCRUD":
+        if self._document_embedding_crud is None:
+            from db.crud.document_embedding import DocumentEmbeddingCRUD
+            self._document_embedding_crud = DocumentEmbeddingCRUD(self.db)
+        return self._document_embedding_crud
+
+    @property
+    def document_embedding_index(self) -> "DocumentEmbeddingIndex":
+        if self._document_embedding_index is None:
+            from features.documents.document_embedding_index import DocumentEmbeddingIndex
+            self._document_embedding_index = DocumentEmbeddingIndex(self)
+        return self._document_embedding_index
+
     @property
     def usage_record_repo(self) -> "UsageRecordRepository":
         if self._usage_record_repo is None:
@@ -548,6 +579,21 @@ class DI:
         from util.translations_cache import TranslationsCache
         return TranslationsCache()
 
+    @property
+    def debounce_scheduler(self) -> "DebounceScheduler":
+        from util.debounce_scheduler import debounce_scheduler
+        return debounce_scheduler
+
+    @property
+    def chat_access_cache(self) -> "ChatAccessCache":
+        from features.chat.membership.chat_access_cache import chat_access_cache
+        return chat_access_cache
+
+    @property
+    def rate_limiter(self) -> "RateLimiter":
+        from util.rate_limiter import rate_limiter
+        return rate_limiter
+
     @property
     def domain_langchain_mapper(self) -> "DomainLangchainMapper":
         if self._domain_langchain_mapper is None:
@@ -583,6 +629,13 @@ class DI:
             self._whatsapp_data_resolver = WhatsAppDataResolver(self)
         return self._whatsapp_data_resolver
 
+    @property
+    def chat_history_loader(self) -> "ChatHistoryLoader":
+        if self._chat_history_loader is None:
+            from features.chat.chat_history_loader import ChatHistoryLoader
+            self._chat_history_loader = ChatHistoryLoader(self)
+        return self._chat_history_loader
+
     # === Features & Dynamic Instances ===
 
     def chat_langchain_model(self, configured_tool: ConfiguredTool) -> "ChatModelUsageTrackingDecorator":
@@ -731,10 +784,22 @@ class DI:
             self._llm_tool_library = LLMToolLibrary(self)
         return self._llm_tool_library
 
+    @property
+    def tool_call_executor(self) -> "ToolCallExecutor":
+        if self._tool_call_executor is None:
+            from features.chat.llm_tools.tool_call_executor import ToolCallExecutor
+            self._tool_call_executor = ToolCallExecutor(self)
+        return self._tool_call_executor
+
     def platform_bot_sdk(self) -> "PlatformBotSDK":
         from features.integrations.platform_bot_sdk import PlatformBotSDK
         return PlatformBotSDK(di = self)
 
+    @property
+    def chat_progress_scheduler(self) -> "ChatProgressScheduler":
+        from features.chat.chat_progress_scheduler import chat_progress_scheduler
+        return chat_progress_scheduler
+
     def chat_progress_notifier(
         self,
         message_id: str,
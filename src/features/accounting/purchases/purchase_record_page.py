@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+from features.accounting.purchases.purchase_record import PurchaseRecord
+
+
+@dataclass(kw_only = True)
+class PurchaseRecordPage:
+    records: list[PurchaseRecord]
+    next_cursor: str | None = None  # None on the last page
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
 from db.model.purchase_record import PurchaseRecordDB
@@ -12,6 +12,7 @@ from features.accounting.purchases.purchase_aggregates import (
 )
 from features.accounting.purchases.purchase_record import PurchaseRecord
 from features.accounting.purchases.purchase_record_mapper import db, domain
+from features.accounting.purchases.purchase_record_page import PurchaseRecordPage
 from util.error_codes import (
     LICENSE_ALREADY_BOUND,
     LICENSE_FROM_PREORDER,
@@ -20,6 +21,7 @@ from util.error_codes import (
     LICENSE_REFUNDED,
 )
 from util.errors import NotFoundError, ValidationError
+from util.page_cursor import decode_cursor, encode_cursor
 
 
 class PurchaseRecordRepository:
@@ -93,6 +95,44 @@ class PurchaseRecordRepository:
         db_models = query.order_by(PurchaseRecordDB.sale_timestamp.desc()).offset(skip).limit(limit).all()
         return [domain(db_model) for db_model in db_models]
 
+    def get_page_by_user(
+        self,
+        user_id: UUID,
+        cursor: str | None = None,
+        limit: int = 50,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        product_id: str | None = None,
+    ) -> PurchaseRecordPage:
+        """
+        Pages through the same records as 'get_by_user', newest first, continuing after the cursor instead of skipping.
+        """
+        query = self._db.query(PurchaseRecordDB).filter(PurchaseRecordDB.user_id == user_id)
+
+        if start_date is not None:
+            query = query.filter(PurchaseRecordDB.sale_timestamp >= start_date)
+        if end_date is not None:
+            query = query.filter(PurchaseRecordDB.sale_timestamp <= end_date)
+        if product_id:
+            query = query.filter(PurchaseRecordDB.product_id == product_id)
+        if cursor:
+            after_timestamp, after_id = decode_cursor(cursor)
+            query = query.filter(
+                PurchaseRecordDB.sale_timestamp <= after_timestamp,  # keeps the index range scan
+                or_(PurchaseRecordDB.sale_timestamp < after_timestamp, PurchaseRecordDB.id < after_id),
+            )
+
+        db_models = (
+            query.order_by(PurchaseRecordDB.sale_timestamp.desc(), PurchaseRecordDB.id.desc())
+            .limit(limit + 1)  # one extra row tells whether there is a next page
+            .all()
+        )
+        next_cursor: str | None = None
+        if len(db_models) > limit:
+            db_models = db_models[:limit]
+            next_cursor = encode_cursor(db_models[-1].sale_timestamp, db_models[-1].id)
+        return PurchaseRecordPage(records = [domain(db_model) for db_model in db_models], next_cursor = next_cursor)
+
     def get_aggregates_by_user(
         self,
         user_id: UUID,
@@ -5,6 +5,7 @@ from api.model.gumroad_ping_payload import GumroadPingPayload
 from di.di import DI
 from features.accounting.purchases.purchase_aggregates import PurchaseAggregates
 from features.accounting.purchases.purchase_record import PurchaseRecord
+from features.accounting.purchases.purchase_record_page import PurchaseRecordPage
 from features.announcements.sys_announcements_service import SysAnnouncementsService
 from features.external_tools.intelligence_presets import default_tool_for
 from features.integrations.integration_config import THE_AGENT
@@ -39,6 +40,24 @@ class PurchaseService:
             product_id = product_id,
         )
 
+    def get_page_by_user(
+        self,
+        user_id: UUID,
+        cursor: str | None = None,
+        limit: int = 50,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        product_id: str | None = None,
+    ) -> PurchaseRecordPage:
+        return self.__di.purchase_record_repo.get_page_by_user(
+            user_id,
+            cursor = cursor,
+            limit = limit,
+            start_date = start_date,
+            end_date = end_date,
+            product_id = product_id,
+        )
+
     def get_aggregates_by_user(
         self,
         user_id: UUID,
@@ -7,6 +7,7 @@ from features.accounting.spending.spending_service import SpendingService
 from features.accounting.usage.usage_tracking_service import UsageTrackingService
 from features.external_tools.configured_tool import ConfiguredTool
 from util import log
+from util.http_transport import http_transport
 
 
 class HTTPUsageTrackingDecorator:
@@ -29,7 +30,7 @@ class HTTPUsageTrackingDecorator:
         self.__spending_service.validate_pre_flight(self.__configured_tool)
         start_time = time()
         try:
-            response = requests.get(url, **kwargs)
+            response = http_transport.get(url, **kwargs)
             runtime_seconds = time() - start_time
             record = self.__tracking_service.track_api_call(
                 tool = self.__configured_tool.definition,
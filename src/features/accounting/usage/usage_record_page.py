@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+from features.accounting.usage.usage_record import UsageRecord
+
+
+@dataclass(kw_only = True)
+class UsageRecordPage:
+    records: list[UsageRecord]
+    next_cursor: str | None = None  # None on the last page
@@ -1,14 +1,23 @@
-from datetime import datetime
+from datetime import date, datetime, time, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import ColumnElement, and_, func, or_
-from sqlalchemy.orm import Query, Session
+from sqlalchemy import ColumnElement, and_, func, not_, or_, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session, aliased
 
+from db.model.usage_daily_rollup import UsageDailyRollupDB
 from db.model.usage_record import UsageRecordDB
+from db.time_partitions import TimePartitions
 from features.accounting.usage.usage_aggregates import AggregateStats, ProviderInfo, ToolInfo, UsageAggregates
 from features.accounting.usage.usage_record import UsageRecord
 from features.accounting.usage.usage_record_mapper import db, domain
+from features.accounting.usage.usage_record_page import UsageRecordPage
 from features.external_tools.external_tool import ToolType
+from util.page_cursor import decode_cursor, encode_cursor
+
+ROLLUP_KEY_COLUMNS = (
+    "day", "payer_id", "user_id", "counterpart_id", "tool_id", "tool_name", "provider_id", "provider_name", "purpose",
+)
 
 
 class UsageRecordRepository:
@@ -25,6 +34,7 @@ class UsageRecordRepository:
     def create(self, record: UsageRecord) -> UsageRecord:
         db_model = db(record)
         self._db.add(db_model)
+        self.__add_to_rollups([db_model])
         self._db.commit()
         self._db.refresh(db_model)
         return domain(db_model)
@@ -33,6 +43,7 @@ class UsageRecordRepository:
         db_models = [db(record) for record in records]
         for db_model in db_models:
             self._db.add(db_model)
+        self.__add_to_rollups(db_models)
         self._db.commit()
         for db_model in db_models:
             self._db.refresh(db_model)
@@ -70,6 +81,67 @@ class UsageRecordRepository:
         db_models = base_query.order_by(UsageRecordDB.timestamp.desc()).offset(skip).limit(limit).all()
         return [domain(db_model) for db_model in db_models]
 
+    def get_page_by_user(
+        self,
+        user_id: UUID,
+        cursor: str | None = None,
+        limit: int = 50,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        exclude_self: bool = False,
+        include_sponsored: bool = False,
+        include_transfers: bool = True,
+        only_transfers: bool = False,
+        tool_id: str | None = None,
+        purpose: str | None = None,
+        provider_id: str | None = None,
+    ) -> UsageRecordPage:
+        """
+        Pages through the same records as 'get_by_user', newest first, continuing after the cursor instead of skipping.
+        Every ownership path reads at most one page from its own (id, timestamp) index, so deep pages cost the same
+        as the first one. The paths are disjoint, so their pages merge with UNION ALL instead of an OR over both.
+        """
+        filters: list[ColumnElement[bool]] = []
+        if start_date is not None:
+            filters.append(UsageRecordDB.timestamp >= start_date)
+        if end_date is not None:
+            filters.append(UsageRecordDB.timestamp <= end_date)
+        if tool_id:
+            filters.append(UsageRecordDB.tool_id == tool_id)
+        if purpose:
+            filters.append(UsageRecordDB.purpose == purpose)
+        if provider_id:
+            filters.append(UsageRecordDB.provider_id == provider_id)
+        if cursor:
+            after_timestamp, after_id = decode_cursor(cursor)
+            filters += [
+                UsageRecordDB.timestamp <= after_timestamp,  # keeps the index range scan, the rest breaks timestamp ties
+                or_(UsageRecordDB.timestamp < after_timestamp, UsageRecordDB.id < after_id),
+            ]
+
+        branches = self._build_user_branches(user_id, exclude_self, include_sponsored, include_transfers, only_transfers)
+        branch_queries = [
+            select(UsageRecordDB)
+            .where(*branch_filters, *filters)
+            .order_by(UsageRecordDB.timestamp.desc(), UsageRecordDB.id.desc())
+            .limit(limit + 1)  # one extra row tells whether there is a next page
+            .subquery()
+            for branch_filters in branches
+        ]
+        merged = aliased(UsageRecordDB, union_all(*[select(branch_query) for branch_query in branch_queries]).subquery())
+        db_models = (
+            self._db.query(merged)
+            .order_by(merged.timestamp.desc(), merged.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor: str | None = None
+        if len(db_models) > limit:
+            db_models = db_models[:limit]
+            next_cursor = encode_cursor(db_models[-1].timestamp, db_models[-1].id)
+        return UsageRecordPage(records = [domain(db_model) for db_model in db_models], next_cursor = next_cursor)
+
     def get_aggregates_by_user(
         self,
         user_id: UUID,
@@ -83,93 +155,92 @@ class UsageRecordRepository:
         purpose: str | None = None,
         provider_id: str | None = None,
     ) -> UsageAggregates:
-        # unfiltered query for all_*_used lists (dropdown options)
-        unfiltered_query = self._build_user_query(
-            user_id, start_date, end_date,
-            exclude_self, include_sponsored,
-            include_transfers, only_transfers,
-        )
-        unfiltered_subquery = unfiltered_query.subquery()
+        # closed days that are fully covered by the date range come from the daily rollups,
+        # the rest (partial days at the range edges and the current day) from the raw records
+        today = datetime.now(timezone.utc).date()
+        first_rollup_day: date | None = None
+        if start_date is not None:
+            start_utc = _to_utc_naive(start_date)
+            first_rollup_day = start_utc.date() if start_utc.time() == time.min else start_utc.date() + timedelta(days = 1)
+        end_rollup_day = today if end_date is None else min(today, _to_utc_naive(end_date).date())
+        use_rollups = first_rollup_day is None or first_rollup_day < end_rollup_day
 
-        # filtered query for totals and by_* breakdowns
-        filtered_query = self._build_user_query(
+        raw_query = self._build_user_query(
             user_id, start_date, end_date,
             exclude_self, include_sponsored,
             include_transfers, only_transfers,
         )
-        if tool_id:
-            filtered_query = filtered_query.filter(UsageRecordDB.tool_id == tool_id)
-        if purpose:
-            filtered_query = filtered_query.filter(UsageRecordDB.purpose == purpose)
-        if provider_id:
-            filtered_query = filtered_query.filter(UsageRecordDB.provider_id == provider_id)
-        filtered_subquery = filtered_query.subquery()
+        if use_rollups:
+            raw_outside_rollups = UsageRecordDB.timestamp >= datetime.combine(end_rollup_day, time.min)
+            if first_rollup_day is not None:
+                raw_outside_rollups = or_(
+                    raw_outside_rollups,
+                    UsageRecordDB.timestamp < datetime.combine(first_rollup_day, time.min),
+                )
+            raw_query = raw_query.filter(raw_outside_rollups)
+        raw_subquery = raw_query.subquery()
+        grouped_rows = self._db.query(
+            raw_subquery.c.tool_id,
+            raw_subquery.c.tool_name,
+            raw_subquery.c.purpose,
+            raw_subquery.c.provider_id,
+            raw_subquery.c.provider_name,
+            func.count(raw_subquery.c.id),
+            func.sum(raw_subquery.c.total_cost_credits),
+            func.sum(raw_subquery.c.runtime_seconds),
+        ).group_by(*UsageRecordRepository.__group_columns(raw_subquery.c)).all()
 
-        # totals from filtered query
-        total_records = int(self._db.query(func.count(filtered_subquery.c.id)).scalar() or 0)
-        total_cost = float(self._db.query(func.sum(filtered_subquery.c.total_cost_credits)).scalar() or 0.0)
-        total_runtime = float(self._db.query(func.sum(filtered_subquery.c.runtime_seconds)).scalar() or 0.0)
-
-        # per-tool aggregated stats from filtered query (keyed by tool_id)
-        by_tool: dict[str, AggregateStats] = {}
-        tool_stats = self._db.query(
-            filtered_subquery.c.tool_id,
-            func.count(filtered_subquery.c.id).label("count"),
-            func.sum(filtered_subquery.c.total_cost_credits).label("total_cost"),
-        ).group_by(filtered_subquery.c.tool_id).all()
-        for tool_id_val, count, total_cost_val in tool_stats:
-            by_tool[str(tool_id_val)] = AggregateStats(
-                record_count = int(count),
-                total_cost = float(total_cost_val or 0),
+        if use_rollups:
+            rollup_query = self._db.query(
+                UsageDailyRollupDB.tool_id,
+                UsageDailyRollupDB.tool_name,
+                UsageDailyRollupDB.purpose,
+                UsageDailyRollupDB.provider_id,
+                UsageDailyRollupDB.provider_name,
+                func.sum(UsageDailyRollupDB.record_count),
+                func.sum(UsageDailyRollupDB.total_cost_credits),
+                func.sum(UsageDailyRollupDB.runtime_seconds),
+            ).filter(
+                *self._build_user_filters(
+                    UsageDailyRollupDB, user_id,
+                    exclude_self, include_sponsored,
+                    include_transfers, only_transfers,
+                ),
+                UsageDailyRollupDB.day < end_rollup_day,
             )
+            if first_rollup_day is not None:
+                rollup_query = rollup_query.filter(UsageDailyRollupDB.day >= first_rollup_day)
+            grouped_rows += rollup_query.group_by(*UsageRecordRepository.__group_columns(UsageDailyRollupDB)).all()
 
-        # per-purpose aggregated stats from filtered query
+        total_records = 0
+        total_cost = 0.0
+        total_runtime = 0.0
+        by_tool: dict[str, AggregateStats] = {}
         by_purpose: dict[str, AggregateStats] = {}
-        purpose_stats = self._db.query(
-            filtered_subquery.c.purpose,
-            func.count(filtered_subquery.c.id).label("count"),
-            func.sum(filtered_subquery.c.total_cost_credits).label("total_cost"),
-        ).group_by(filtered_subquery.c.purpose).all()
-        for purpose_val, count, total_cost_val in purpose_stats:
-            by_purpose[str(purpose_val)] = AggregateStats(
-                record_count = int(count),
-                total_cost = float(total_cost_val or 0),
-            )
-
-        # per-provider aggregated stats from filtered query (keyed by provider_id)
         by_provider: dict[str, AggregateStats] = {}
-        provider_stats = self._db.query(
-            filtered_subquery.c.provider_id,
-            func.count(filtered_subquery.c.id).label("count"),
-            func.sum(filtered_subquery.c.total_cost_credits).label("total_cost"),
-        ).group_by(filtered_subquery.c.provider_id).all()
-        for provider_id_val, count, total_cost_val in provider_stats:
-            by_provider[str(provider_id_val)] = AggregateStats(
-                record_count = int(count),
-                total_cost = float(total_cost_val or 0),
-            )
-
-        # all_*_used lists from UNFILTERED query (for dropdown population)
-        all_tools_db = self._db.query(
-            unfiltered_subquery.c.tool_id,
-            unfiltered_subquery.c.tool_name,
-        ).distinct().all()
-        all_tools_used = sorted(
-            [ToolInfo(id = str(row[0]), name = str(row[1])) for row in all_tools_db],
-            key = lambda x: x.name,
-        )
-        all_purposes_db = self._db.query(
-            unfiltered_subquery.c.purpose,
-        ).distinct().all()
-        all_purposes_used = sorted([str(row[0]) for row in all_purposes_db])
-        all_providers_db = self._db.query(
-            unfiltered_subquery.c.provider_id,
-            unfiltered_subquery.c.provider_name,
-        ).distinct().all()
-        all_providers_used = sorted(
-            [ProviderInfo(id = str(row[0]), name = str(row[1])) for row in all_providers_db],
-            key = lambda x: x.name,
-        )
+        all_tools: set[tuple[str, str]] = set()
+        all_purposes: set[str] = set()
+        all_providers: set[tuple[str, str]] = set()
+        for row_tool_id, row_tool_name, row_purpose, row_provider_id, row_provider_name, count, cost, runtime in grouped_rows:
+            # all_*_used lists ignore the tool/purpose/provider filters (for dropdown population)
+            all_tools.add((str(row_tool_id), str(row_tool_name)))
+            all_purposes.add(str(row_purpose))
+            all_providers.add((str(row_provider_id), str(row_provider_name)))
+            if tool_id and row_tool_id != tool_id:
+                continue
+            if purpose and row_purpose != purpose:
+                continue
+            if provider_id and row_provider_id != provider_id:
+                continue
+            count = int(count or 0)
+            cost = float(cost or 0.0)
+            total_records += count
+            total_cost += cost
+            total_runtime += float(runtime or 0.0)
+            for stats_by_key, key in ((by_tool, row_tool_id), (by_purpose, row_purpose), (by_provider, row_provider_id)):
+                stats = stats_by_key.setdefault(str(key), AggregateStats(record_count = 0, total_cost = 0.0))
+                stats.record_count += count
+                stats.total_cost += cost
 
         return UsageAggregates(
             total_records = total_records,
@@ -178,9 +249,9 @@ class UsageRecordRepository:
             by_tool = by_tool,
             by_purpose = by_purpose,
             by_provider = by_provider,
-            all_tools_used = all_tools_used,
-            all_purposes_used = all_purposes_used,
-            all_providers_used = all_providers_used,
+            all_tools_used = sorted([ToolInfo(id = id, name = name) for id, name in all_tools], key = lambda x: x.name),
+            all_purposes_used = sorted(all_purposes),
+            all_providers_used = sorted([ProviderInfo(id = id, name = name) for id, name in all_providers], key = lambda x: x.name),
         )
 
     def _build_user_query(
@@ -193,33 +264,13 @@ class UsageRecordRepository:
         include_transfers: bool = True,
         only_transfers: bool = False,
     ) -> Query:
-        ownership_filter: ColumnElement[bool]
-        if not include_sponsored:
-            ownership_filter = UsageRecordDB.user_id == user_id
-        elif exclude_self:
-            ownership_filter = and_(UsageRecordDB.payer_id == user_id, UsageRecordDB.user_id != user_id)
-        else:
-            ownership_filter = UsageRecordDB.payer_id == user_id
-
-        transfer_purpose = ToolType.credit_transfer.value
-        counterpart_transfer_filter = and_(
-            UsageRecordDB.counterpart_id == user_id,
-            UsageRecordDB.purpose == transfer_purpose,
+        base_query = self._db.query(UsageRecordDB).filter(
+            *self._build_user_filters(
+                UsageRecordDB, user_id,
+                exclude_self, include_sponsored,
+                include_transfers, only_transfers,
+            ),
         )
-        if only_transfers:
-            base_query = self._db.query(UsageRecordDB).filter(
-                or_(ownership_filter, counterpart_transfer_filter),
-                UsageRecordDB.purpose == transfer_purpose,
-            )
-        elif include_transfers:
-            base_query = self._db.query(UsageRecordDB).filter(
-                or_(ownership_filter, counterpart_transfer_filter),
-            )
-        else:
-            base_query = self._db.query(UsageRecordDB).filter(
-                ownership_filter,
-                UsageRecordDB.purpose != transfer_purpose,
-            )
 
         if start_date is not None:
             base_query = base_query.filter(UsageRecordDB.timestamp >= start_date)
@@ -229,9 +280,176 @@ class UsageRecordRepository:
 
         return base_query
 
-    def delete_older_than(self, cutoff: datetime) -> int:
-        deleted = self._db.query(UsageRecordDB).filter(
-            UsageRecordDB.timestamp < cutoff,
+    @staticmethod
+    def _build_user_filters(
+        model: type[UsageRecordDB] | type[UsageDailyRollupDB],
+        user_id: UUID,
+        exclude_self: bool,
+        include_sponsored: bool,
+        include_transfers: bool,
+        only_transfers: bool,
+    ) -> list[ColumnElement[bool]]:
+        # raw records and daily rollups share the column names used here
+        ownership_filter = UsageRecordRepository.__ownership_filter(model, user_id, exclude_self, include_sponsored)
+        transfer_purpose = ToolType.credit_transfer.value
+        counterpart_transfer_filter = UsageRecordRepository.__counterpart_transfer_filter(model, user_id)
+        if only_transfers:
+            return [or_(ownership_filter, counterpart_transfer_filter), model.purpose == transfer_purpose]
+        if include_transfers:
+            return [or_(ownership_filter, counterpart_transfer_filter)]
+        return [ownership_filter, model.purpose != transfer_purpose]
+
+    @staticmethod
+    def _build_user_branches(
+        user_id: UUID,
+        exclude_self: bool,
+        include_sponsored: bool,
+        include_transfers: bool,
+        only_transfers: bool,
+    ) -> list[list[ColumnElement[bool]]]:
+        # the same records as '_build_user_filters', split into disjoint filters that each fit one index
+        ownership_filter = UsageRecordRepository.__ownership_filter(UsageRecordDB, user_id, exclude_self, include_sponsored)
+        transfer_purpose = ToolType.credit_transfer.value
+        counterpart_transfer_branch = [
+            UsageRecordRepository.__counterpart_transfer_filter(UsageRecordDB, user_id),
+            not_(ownership_filter),  # already listed by the ownership branch
+        ]
+        if only_transfers:
+            return [[ownership_filter, UsageRecordDB.purpose == transfer_purpose], counterpart_transfer_branch]
+        if include_transfers:
+            return [[ownership_filter], counterpart_transfer_branch]
+        return [[ownership_filter, UsageRecordDB.purpose != transfer_purpose]]
+
+    @staticmethod
+    def __ownership_filter(
+        model: type[UsageRecordDB] | type[UsageDailyRollupDB],
+        user_id: UUID,
+        exclude_self: bool,
+        include_sponsored: bool,
+    ) -> ColumnElement[bool]:
+        if not include_sponsored:
+            return model.user_id == user_id
+        if exclude_self:
+            return and_(model.payer_id == user_id, model.user_id != user_id)
+        return model.payer_id == user_id
+
+    @staticmethod
+    def __counterpart_transfer_filter(
+        model: type[UsageRecordDB] | type[UsageDailyRollupDB],
+        user_id: UUID,
+    ) -> ColumnElement[bool]:
+        return and_(model.counterpart_id == user_id, model.purpose == ToolType.credit_transfer.value)
+
+    def maintain_partitions(self, cutoff: datetime) -> int:
+        """
+        Drops the monthly partitions that ended before the cutoff and creates those of the coming months.
+        Returns the number of dropped partitions, and does nothing where the records are not partitioned (SQLite).
+        """
+        partitions = TimePartitions(self._db, UsageRecordDB.__tablename__)
+        if not partitions.is_partitioned():
+            return 0
+        dropped = partitions.drop_before(_to_utc_naive(cutoff))
+        self._db.commit()
+        partitions.create_months(datetime.now(timezone.utc).date())
+        self._db.commit()
+        return len(dropped)
+
+    def prune_rollups(self, cutoff: datetime):
+        # follows the deletion of the records before the cutoff
+        cutoff_day = _to_utc_naive(cutoff).date()
+        self._db.query(UsageDailyRollupDB).filter(
+            UsageDailyRollupDB.day < cutoff_day,
         ).delete(synchronize_session = False)
+        # the cutoff day lost only some of its records
+        self.__rebuild_rollups(cutoff_day)
         self._db.commit()
-        return deleted
+
+    def __add_to_rollups(self, db_models: list[UsageRecordDB]):
+        deltas: dict[tuple, list] = {}
+        for db_model in db_models:
+            key = (
+                _to_utc_naive(db_model.timestamp).date(),
+                db_model.payer_id,
+                db_model.user_id,
+                db_model.counterpart_id or UsageDailyRollupDB.NO_COUNTERPART,
+                db_model.tool_id,
+                db_model.tool_name,
+                db_model.provider_id,
+                db_model.provider_name,
+                db_model.purpose,
+            )
+            delta = deltas.setdefault(key, [0, 0.0, 0.0])
+            delta[0] += 1
+            delta[1] += db_model.total_cost_credits
+            delta[2] += db_model.runtime_seconds
+        if not deltas:
+            return
+
+        values = [
+            dict(zip(ROLLUP_KEY_COLUMNS, key), record_count = count, total_cost_credits = cost, runtime_seconds = runtime)
+            for key, (count, cost, runtime) in deltas.items()
+        ]
+        dialect_insert = postgresql.insert if self._db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(UsageDailyRollupDB)
+        statement = statement.on_conflict_do_update(
+            index_elements = list(ROLLUP_KEY_COLUMNS),
+            set_ = {
+                column: getattr(UsageDailyRollupDB, column) + getattr(statement.excluded, column)
+                for column in ("record_count", "total_cost_credits", "runtime_seconds")
+            },
+        )
+        self._db.execute(statement, values)
+
+    def __rebuild_rollups(self, day: date):
+        self._db.query(UsageDailyRollupDB).filter(UsageDailyRollupDB.day == day).delete(synchronize_session = False)
+        day_start = datetime.combine(day, time.min)
+        grouped_rows = self._db.query(
+            UsageRecordDB.payer_id,
+            UsageRecordDB.user_id,
+            UsageRecordDB.counterpart_id,
+            *UsageRecordRepository.__group_columns(UsageRecordDB),
+            func.count(UsageRecordDB.id),
+            func.sum(UsageRecordDB.total_cost_credits),
+            func.sum(UsageRecordDB.runtime_seconds),
+        ).filter(
+            UsageRecordDB.timestamp >= day_start,
+            UsageRecordDB.timestamp < day_start + timedelta(days = 1),
+        ).group_by(
+            UsageRecordDB.payer_id,
+            UsageRecordDB.user_id,
+            UsageRecordDB.counterpart_id,
+            *UsageRecordRepository.__group_columns(UsageRecordDB),
+        ).all()
+        self._db.add_all(
+            [
+                UsageDailyRollupDB(
+                    day = day,
+                    payer_id = payer_id,
+                    user_id = row_user_id,
+                    counterpart_id = counterpart_id or UsageDailyRollupDB.NO_COUNTERPART,
+                    tool_id = row_tool_id,
+                    tool_name = tool_name,
+                    purpose = row_purpose,
+                    provider_id = row_provider_id,
+                    provider_name = provider_name,
+                    record_count = count,
+                    total_cost_credits = cost,
+                    runtime_seconds = runtime,
+                )
+                for (
+                    payer_id, row_user_id, counterpart_id,
+                    row_tool_id, tool_name, row_purpose, row_provider_id, provider_name,
+                    count, cost, runtime,
+                ) in grouped_rows
+            ],
+        )
+
+    @staticmethod
+    def __group_columns(columns) -> list:
+        return [columns.tool_id, columns.tool_name, columns.purpose, columns.provider_id, columns.provider_name]
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo = None)
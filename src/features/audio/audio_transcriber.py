@@ -2,7 +2,6 @@ import io
 import os
 from urllib.parse import urlparse
 
-import requests
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from openai import OpenAI
@@ -21,6 +20,7 @@ from features.web_browsing.web_fetcher import DEFAULT_HEADERS
 from util import log
 from util.error_codes import LLM_UNEXPECTED_RESPONSE
 from util.errors import ExternalServiceError
+from util.http_transport import http_transport
 
 
 # Not tested as it's just a proxy
@@ -58,7 +58,7 @@ class AudioTranscriber:
 
     def __validate_content(self, audio_url: str, audio_content: bytes | None):
         log.t(f"Fetching and validating audio from URL '{audio_url}'")
-        self.__audio_content = audio_content or requests.get(audio_url, headers = DEFAULT_HEADERS).content
+        self.__audio_content = audio_content or http_transport.get(audio_url, headers = DEFAULT_HEADERS).content
 
         if self.__extension not in SUPPORTED_AUDIO_FORMATS.keys():
             log.t(f"  Unsupported audio format: '.{self.__extension}'")
@@ -1,11 +1,10 @@
 import random
 import re
-import time
 from dataclasses import dataclass
-from typing import Any, TypeVar
+from typing import TypeVar
 
 from langchain_core.language_models import LanguageModelInput
-from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage, ToolCall, ToolMessage
 from langchain_core.runnables import Runnable
 
 from db.schema.chat_message import ChatMessage
@@ -80,9 +79,10 @@ class ChatAgent:
         return self.__messages[-1]
 
     def __has_newer_burst_message(self) -> bool:
+        # the debounce wait itself happens in the debounce scheduler, before the reply is attempted;
+        # this catches burst messages that were scheduled elsewhere (e.g. by another worker)
         if config.chat_debounce_delay_s <= 0.0:
             return False
-        time.sleep(config.chat_debounce_delay_s)
         chat_id = self.__di.require_invoker_chat().chat_id
         # iterate newest-to-oldest, skipping messages from other authors, to find the
         # most recent message from this invoker - only the same author messages form a burst
@@ -96,19 +96,27 @@ class ChatAgent:
         return False
 
     def execute(self) -> AIMessage | None:
+        command_handling = self.handle_commands()
+        if command_handling.is_handled:
+            return command_handling.reply
+        return self.reply()
+
+    def handle_commands(self) -> CommandHandlingResult:
         log.t(f"Starting chat completion for '{self.__last_message.content}'")
 
         # drop empty or self-authored messages before anything else
         if not self.__is_dispatchable():
-            return None
+            return ChatAgent.CommandHandlingResult(is_handled = True)
 
         # commands run eagerly when the bot is directly addressed, so a later
         # message in the same burst does not swallow the command
         if self.__is_addressable():
             command_handling = self.process_commands()
             if command_handling.is_handled:
-                return command_handling.reply
+                return command_handling
+        return ChatAgent.CommandHandlingResult(is_handled = False)
 
+    def reply(self) -> AIMessage | None:
         # burst gate: only the latest message in a burst reaches LLM processing
         if self.__has_newer_burst_message():
             return None
@@ -180,18 +188,16 @@ class ChatAgent:
                 log.d(f"Iteration #{iteration} has tool calls, processing...")
                 iteration += 1
 
+                # independent tool calls of the same turn run in parallel, results keep the call order
                 # noinspection Pydantic
-                for tool_call in answer.tool_calls:  # type: ignore
-                    tool_id: Any = tool_call["id"]
-                    tool_name: Any = tool_call["name"]
-                    tool_args: Any = tool_call["args"]
-
-                    log.t(f"  Processing {tool_id} / '{tool_name}' tool call")
-                    tool_result: str | None = self.__di.llm_tool_library.invoke(tool_name, tool_args)
+                tool_calls: list[ToolCall] = answer.tool_calls  # type: ignore
+                log.t(f"  Processing {len(tool_calls)} tool call(s): {[tool_call['name'] for tool_call in tool_calls]}")
+                tool_results = self.__di.tool_call_executor.execute(tool_calls)
+                for tool_call, tool_result in zip(tool_calls, tool_results):
                     if not tool_result:
-                        log.w(f"Tool {tool_name} not invoked!")
+                        log.w(f"Tool {tool_call['name']} not invoked!")
                         continue
-                    self.__add_message(ToolMessage(tool_result, tool_call_id = tool_id))
+                    self.__add_message(ToolMessage(tool_result, tool_call_id = tool_call["id"]))
 
                 if not isinstance(self.__last_message, ToolMessage):
                     raise NotFoundError("Couldn't find tools to invoke!", TOOL_NOT_FOUND)
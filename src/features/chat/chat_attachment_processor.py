@@ -2,8 +2,6 @@ import base64
 from datetime import datetime, timedelta
 from enum import Enum
 
-import requests
-
 from db.schema.chat_message_attachment import ChatMessageAttachment
 from db.schema.tools_cache import ToolsCache, ToolsCacheSave
 from di.di import DI
@@ -16,6 +14,7 @@ from features.images.computer_vision_analyzer import ComputerVisionAnalyzer
 from features.web_browsing.web_fetcher import DEFAULT_HEADERS
 from util import log
 from util.functions import digest_md5
+from util.http_transport import http_transport
 
 CACHE_PREFIX = "attachments-analyzer"
 CACHE_TTL = timedelta(weeks = 13)
@@ -126,7 +125,7 @@ class ChatAttachmentProcessor:
             image_b64s: list[str] = []
             image_mime_types: list[str] = []
             for attachment in image_attachments:
-                contents = requests.get(str(attachment.last_url), headers = DEFAULT_HEADERS).content
+                contents = http_transport.get(str(attachment.last_url), headers = DEFAULT_HEADERS).content
                 image_b64s.append(base64.b64encode(contents).decode("utf-8"))
                 image_mime_types.append(str(attachment.mime_type))
             configured_tool = self.__di.tool_choice_resolver.require_tool(
@@ -188,7 +187,7 @@ class ChatAttachmentProcessor:
         log.t(f"Resolving text content for attachment '{attachment.id}'")
 
         # fetching binary contents will also validate the URL
-        contents = requests.get(str(attachment.last_url), headers = DEFAULT_HEADERS).content
+        contents = http_transport.get(str(attachment.last_url), headers = DEFAULT_HEADERS).content
 
         # handle audio
         if attachment.mime_type in KNOWN_AUDIO_FORMATS.values() or attachment.extension in KNOWN_AUDIO_FORMATS.keys():
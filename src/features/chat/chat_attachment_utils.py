@@ -19,12 +19,11 @@ def resolve_remote_attachments(urls: list[str], di: DI) -> list[ChatMessageAttac
 
 
 def resolve_local_attachments(attachment_ids: list[str], di: DI) -> list[ChatMessageAttachment]:
-    stale: list[ChatMessageAttachment] = []
-    for attachment_id in attachment_ids:
-        if not attachment_id:
-            raise ValidationError("Malformed LLM Input Error: Attachment ID cannot be empty. You may retry only once!", MALFORMED_ATTACHMENT_ID)  # noqa: E501
-        attachment_db = di.chat_message_attachment_crud.get(attachment_id)
-        if not attachment_db:
-            raise NotFoundError(f"Malformed LLM Input Error: Attachment '{attachment_id}' not found in DB. You may retry only once!", ATTACHMENT_NOT_FOUND)  # noqa: E501
-        stale.append(ChatMessageAttachment.model_validate(attachment_db))
-    return di.platform_bot_sdk().refresh_attachment_instances(stale)
+    if not all(attachment_ids):
+        raise ValidationError("Malformed LLM Input Error: Attachment ID cannot be empty. You may retry only once!", MALFORMED_ATTACHMENT_ID)  # noqa: E501
+    try:
+        attachments_db = di.chat_message_attachment_crud.require_all_by_ids(attachment_ids)
+    except NotFoundError as e:
+        raise NotFoundError("Malformed LLM Input Error: Attachment not found in DB. You may retry only once!", ATTACHMENT_NOT_FOUND) from e  # noqa: E501
+    attachments = [ChatMessageAttachment.model_validate(attachment_db) for attachment_db in attachments_db]
+    return di.platform_bot_sdk().refresh_attachment_instances(attachments)
@@ -0,0 +1,77 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.crud.chat_message import AsyncChatMessageCRUD
+from db.crud.chat_message_attachment import AsyncChatMessageAttachmentCRUD
+from db.crud.user import AsyncUserCRUD
+from db.schema.chat_message import ChatMessage
+from db.schema.chat_message_attachment import ChatMessageAttachment
+from db.schema.user import User
+from di.di import DI
+from util import log
+
+
+class ChatHistoryLoader:
+    """
+    Loads the latest chat history together with its attachments and authors.
+    The number of queries is fixed and does not depend on the history depth.
+    """
+
+    class Result(BaseModel):
+        messages: list[ChatMessage]  # newest first, same as storage ordering
+        attachments: list[ChatMessageAttachment]
+        authors: dict[UUID, User]
+
+        def author_of(self, message: ChatMessage) -> User | None:
+            if not message.author_id:
+                return None
+            return self.authors.get(message.author_id)
+
+    __di: DI
+
+    def __init__(self, di: DI):
+        self.__di = di
+
+    def load(self, chat_id: UUID, limit: int) -> Result:
+        log.t(f"Loading up to {limit} history messages for chat '{chat_id.hex}'")
+        messages_db = self.__di.chat_message_crud.get_latest_chat_messages(chat_id = chat_id, limit = limit)
+        messages = [ChatMessage.model_validate(message_db) for message_db in messages_db]
+        if not messages:
+            return ChatHistoryLoader.Result(messages = [], attachments = [], authors = {})
+
+        message_ids = [message.message_id for message in messages]
+        attachments_db = self.__di.chat_message_attachment_crud.get_by_messages(chat_id, message_ids)
+        authors_db = self.__di.user_crud.get_all_by_ids(self.__author_ids(messages))
+        return self.__assemble(messages, attachments_db, authors_db)
+
+    async def load_async(self, db: AsyncSession, chat_id: UUID, limit: int) -> Result:
+        """
+        The same as 'load', on the async database path. The given session replaces the sync one from DI.
+        """
+        log.t(f"Loading up to {limit} history messages for chat '{chat_id.hex}' (async)")
+        messages_db = await AsyncChatMessageCRUD(db).get_latest_chat_messages(chat_id = chat_id, limit = limit)
+        messages = [ChatMessage.model_validate(message_db) for message_db in messages_db]
+        if not messages:
+            return ChatHistoryLoader.Result(messages = [], attachments = [], authors = {})
+
+        message_ids = [message.message_id for message in messages]
+        attachments_db = await AsyncChatMessageAttachmentCRUD(db).get_by_messages(chat_id, message_ids)
+        authors_db = await AsyncUserCRUD(db).get_all_by_ids(self.__author_ids(messages))
+        return self.__assemble(messages, attachments_db, authors_db)
+
+    @staticmethod
+    def __author_ids(messages: list[ChatMessage]) -> list[UUID]:
+        return list(dict.fromkeys(message.author_id for message in messages if message.author_id))
+
+    @staticmethod
+    def __assemble(messages: list[ChatMessage], attachments_db: list, authors_db: list) -> Result:
+        attachments = [ChatMessageAttachment.model_validate(attachment_db) for attachment_db in attachments_db]
+        # keep the attachments in the same order as their messages
+        message_positions = {message.message_id: position for position, message in enumerate(messages)}
+        attachments.sort(key = lambda attachment: message_positions[attachment.message_id])
+        authors = {author_db.id: User.model_validate(author_db) for author_db in authors_db}
+
+        log.t(f"  Loaded {len(messages)} messages, {len(attachments)} attachments and {len(authors)} authors")
+        return ChatHistoryLoader.Result(messages = messages, attachments = attachments, authors = authors)
@@ -1,6 +1,4 @@
-import random
-import time
-from threading import Event, Lock, Thread
+from threading import Lock
 from typing import Literal
 
 from db.model.chat_config import ChatConfigDB
@@ -32,8 +30,7 @@ class ChatProgressNotifier:
     __next_reaction_index: int
     __total_cycles: int
     __lock: Lock
-    __thread: Thread | None
-    __signal: Event
+    __job_id: int | None
     __di: DI
 
     def __init__(
@@ -48,9 +45,8 @@ class ChatProgressNotifier:
         self.__last_reaction_time = None
         self.__next_reaction_index = 0
         self.__total_cycles = 0
-        self.__thread = None
+        self.__job_id = None
         self.__lock = Lock()
-        self.__signal = Event()
         resolved_timing = resolve_reaction_timing(self.__di.require_invoker_chat_type())
         if resolved_timing is None:
             self.__initial_delay_s = None
@@ -62,79 +58,64 @@ class ChatProgressNotifier:
             self.start()
 
     def start(self):
-        log.d("Acquiring start lock...")
-        if self.__thread and self.__thread.is_alive():
-            log.d(f"  Thread {self.__thread.name} is already running (before lock)")
-            return
         with self.__lock:
-            log.t("  Acquired")
-            if self.__thread and self.__thread.is_alive():
-                log.d(f"  Thread {self.__thread.name} is already running (after lock)")
+            if self.__job_id is not None:
+                log.d(f"Progress notifier for {self.__message_id} is already running")
                 return
-            log.t("  Starting a new thread...")
-            self.__signal.clear()
-            thread_name = f"chat-progress-notifier-{random.randint(1000, 9999)}"
-            self.__thread = Thread(name = thread_name, target = self.__run, daemon = True)
-            self.__thread.start()  # fire and forget
-            log.t(f"  Started thread {thread_name}")
+            self.__job_id = self.__di.chat_progress_scheduler.schedule(self.__tick)
+            log.t(f"Scheduled progress notifier job {self.__job_id}")
 
     def stop(self):
-        log.t("Acquiring stop lock...")
-        if not self.__thread:
-            log.t("  No thread running (before lock)")
-            return
         with self.__lock:
-            log.t("  Acquired")
-            log.t(f"  Stopping thread {self.__thread.name}...")
-            self.__signal.set()
-            if not self.__thread:
-                log.t("  No thread running (after lock)")
-                return
-            self.__thread.join(timeout = 1)  # wait for up to 1 second and proceed anyway
-            if self.__thread.is_alive():
-                log.t("  Thread did not stop in time, proceeding...")
-                self.__total_cycles = MAX_CYCLES
-            log.t(f"  Stopped thread {self.__thread.name}")
+            job_id = self.__job_id
+            self.__job_id = None
+        if job_id is None:
+            log.t("No progress notifier running")
+            return
+        scheduler = self.__di.chat_progress_scheduler
+        scheduler.cancel(job_id)
+        log.t(f"Cancelled progress notifier job {job_id}")
+        # remove the stale reaction in the background, the reply shouldn't wait for it
+        scheduler.dispatch(self.__clear_reaction)
+
+    def __tick(self, now: float) -> float | None:
+        if self.__job_id is None or self.__total_cycles >= MAX_CYCLES:
+            return None
+        if self.__start_time is None:
+            self.__start_time = now
+
+        # let's try to notify with a reaction
+        # both interval and delay are always set together, or both are None
+        if self.__reaction_interval_s is not None and self.__initial_delay_s is not None:
+            if self.__last_reaction_time is None:
+                # we haven't reacted yet, so check initial delay
+                elapsed_time_s = now - self.__start_time
+                if elapsed_time_s >= self.__initial_delay_s:
+                    self.__send_reaction()
+                    self.__last_reaction_time = now
+            else:
+                # we have reacted before, so check interval
+                elapsed_time_s = now - self.__last_reaction_time
+                if elapsed_time_s >= self.__reaction_interval_s:
+                    self.__send_reaction()
+                    self.__last_reaction_time = now
+
+        # always notify the typing status because it resets automatically (once per chat is enough)
+        chat_id = self.__di.require_invoker_chat().chat_id
+        if self.__di.chat_progress_scheduler.claim_ping(f"{chat_id}/typing", TYPING_STATUS_INTERVAL_S):
+            self.__set_chat_action("typing")
+        self.__total_cycles += 1
+        return TYPING_STATUS_INTERVAL_S if self.__total_cycles < MAX_CYCLES else None
+
+    def __clear_reaction(self):
         # noinspection TryExceptPass
-        # remove the stale reaction (sometimes fails due to API race condition but doesn't matter)
+        # sometimes fails due to API race condition but doesn't matter
         try:
             platform_sdk = self.__di.platform_bot_sdk()
             platform_sdk.set_reaction(str(self.__di.require_invoker_chat().external_id), self.__message_id, None)
         except:  # noqa: E722
             pass
 
-    def __run(self):
-        # both interval and delay are always set together, or both are None
-        are_intervals_set = self.__reaction_interval_s is not None and self.__initial_delay_s is not None
-
-        while not self.__signal.is_set() and self.__total_cycles < MAX_CYCLES:
-            current_time_s = time.time()
-            if self.__start_time is None:
-                self.__start_time = current_time_s
-
-            # let's try to notify with a reaction
-            if are_intervals_set:
-                assert self.__reaction_interval_s is not None  # linter is stupid
-                assert self.__initial_delay_s is not None  # linter is stupid
-
-                if self.__last_reaction_time is None:
-                    # we haven't reacted yet, so check initial delay
-                    elapsed_time_s = current_time_s - self.__start_time
-                    if elapsed_time_s >= self.__initial_delay_s:
-                        self.__send_reaction()
-                        self.__last_reaction_time = current_time_s
-                else:
-                    # we have reacted before, so check interval
-                    elapsed_time_s = current_time_s - self.__last_reaction_time
-                    if elapsed_time_s >= self.__reaction_interval_s:
-                        self.__send_reaction()
-                        self.__last_reaction_time = current_time_s
-
-            # always notify the typing status because it resets automatically, and wait
-            self.__set_chat_action("typing")
-            self.__total_cycles += 1
-            self.__signal.wait(TYPING_STATUS_INTERVAL_S)
-
     def __set_chat_action(self, action: Literal["typing", "upload_photo"]):
         log.t(f"Setting \"{action}\" action")
         try:
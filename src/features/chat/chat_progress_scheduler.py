@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable
+
+from util import log
+from util.timer_heap import TimerHeap
+
+MAX_PING_WORKERS = 4
+
+# a tick receives the current clock time and returns the delay until its next run (None to finish)
+Tick = Callable[[float], float | None]
+
+
+class ChatProgressScheduler:
+    """
+    Process-wide timer heap driving the progress pings (typing status, reactions) of all active chats.
+    A single timer thread tracks the deadlines and hands due pings to a small worker pool,
+    so waiting conversations don't hold any threads. Duplicate pings for the same chat can be coalesced.
+    """
+
+    __jobs: set[int]
+    __ping_expiries: dict[str, float]
+    __sequence: int
+    __lock: threading.Lock
+    __timers: TimerHeap
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        use_timer: bool = True,
+    ):
+        self.__jobs = set()
+        self.__ping_expiries = {}
+        self.__sequence = 0
+        self.__lock = threading.Lock()
+        self.__timers = TimerHeap(
+            name = "chat-progress",
+            workers = MAX_PING_WORKERS,
+            failure_message = "Chat progress work failed",
+            executor = executor,
+            clock = clock,
+            use_timer = use_timer,
+        )
+
+    def schedule(self, tick: Tick, delay_s: float = 0.0) -> int:
+        with self.__lock:
+            self.__sequence += 1
+            job_id = self.__sequence
+            self.__timers.schedule(job_id, delay_s, lambda: self.__run_tick(job_id, tick))
+            self.__jobs.add(job_id)
+            return job_id
+
+    def cancel(self, job_id: int) -> bool:
+        with self.__lock:
+            # a job that is ticking right now is off the heap, but it won't be scheduled again
+            self.__timers.cancel(job_id)
+            if job_id not in self.__jobs:
+                return False
+            self.__jobs.discard(job_id)
+            return True
+
+    def dispatch(self, work: Callable[[], None]):
+        self.__timers.dispatch(work)
+
+    def claim_ping(self, key: str, interval_s: float) -> bool:
+        with self.__lock:
+            now = self.__timers.now()
+            expiry = self.__ping_expiries.get(key)
+            if expiry is not None and now < expiry:
+                return False
+            if len(self.__ping_expiries) > 2 * len(self.__jobs) + 64:
+                self.__ping_expiries = {
+                    ping_key: ping_expiry for ping_key, ping_expiry in self.__ping_expiries.items() if ping_expiry > now
+                }
+            self.__ping_expiries[key] = now + interval_s
+            return True
+
+    def active_count(self) -> int:
+        with self.__lock:
+            return len(self.__jobs)
+
+    def run_due(self) -> int:
+        return self.__timers.run_due()
+
+    def shutdown(self, wait: bool = True):
+        with self.__lock:
+            self.__jobs.clear()
+        self.__timers.shutdown(wait = wait)
+
+    def reset_after_fork(self):
+        # the timers reset themselves, and no pings are inherited from the parent
+        self.__jobs = set()
+        self.__ping_expiries = {}
+        self.__lock = threading.Lock()
+        self.__timers.reset_after_fork()
+
+    def __run_tick(self, job_id: int, tick: Tick):
+        try:
+            next_delay_s = tick(self.__timers.now())
+        except Exception as e:
+            log.e("Chat progress ping failed", e)
+            next_delay_s = None
+        with self.__lock:
+            if next_delay_s is None:
+                self.__jobs.discard(job_id)
+            elif job_id in self.__jobs:
+                self.__timers.schedule(job_id, next_delay_s, lambda: self.__run_tick(job_id, tick))
+
+
+chat_progress_scheduler = ChatProgressScheduler()
+os.register_at_fork(after_in_child = chat_progress_scheduler.reset_after_fork)
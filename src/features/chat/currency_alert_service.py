@@ -9,12 +9,16 @@ from db.model.price_alert import PriceAlertDB
 from db.schema.chat_config import ChatConfig
 from db.schema.price_alert import PriceAlert, PriceAlertSave
 from di.di import DI
+from features.currencies.exchange_rate_fetcher import DEFAULT_FIAT
+from features.currencies.supported_currencies import SUPPORTED_CRYPTO
 from features.integrations.integrations import resolve_agent_user
 from util import log
 from util.error_codes import BOT_CANNOT_SET_ALERTS, NO_PRIVATE_CHAT
 from util.errors import AuthorizationError
 
 DATETIME_PRINT_FORMAT = "%Y-%m-%d %H:%M %Z"
+ALERTS_PAGE_SIZE = 500
+MAX_RATE_ATTEMPTS_PER_PAIR = 3
 
 
 class CurrencyAlertService:
@@ -110,7 +114,7 @@ class CurrencyAlertService:
             price_alerts_db = self.__di.price_alert_crud.get_alerts_by_chat(self.__target_chat_config.chat_id)
         else:
             log.d("Listing all price alerts")
-            price_alerts_db = self.__di.price_alert_crud.get_all()
+            price_alerts_db = self.__get_all_alerts()
         price_alerts = [PriceAlert.model_validate(price_alert_db) for price_alert_db in price_alerts_db]
         return [
             CurrencyAlertService.ActiveAlert(
@@ -128,47 +132,131 @@ class CurrencyAlertService:
     def get_triggered_alerts(self) -> list[TriggeredAlert]:
         log.d("Checking triggered price alerts")
 
-        active_alerts = self.get_active_alerts()
+        alerts_by_pair: dict[tuple[str, str], list[CurrencyAlertService.ActiveAlert]] = {}
+        for alert in self.get_active_alerts():
+            alerts_by_pair.setdefault((alert.base_currency, alert.desired_currency), []).append(alert)
+        log.t(f"  Evaluating alerts across {len(alerts_by_pair)} distinct currency pairs")
+
+        scoped_dis: dict[tuple[UUID, UUID], DI] = {}
+        self.__prefetch_crypto_prices(alerts_by_pair, scoped_dis)
+
+        now = datetime.now()
         triggered_alerts: list[CurrencyAlertService.TriggeredAlert] = []
-        for alert in active_alerts:
-            try:
-                scoped_di = self.__di.clone(invoker_id = alert.owner_id.hex, invoker_chat_id = alert.chat_id.hex)
-                current_rate: float = scoped_di.exchange_rate_fetcher.execute(alert.base_currency, alert.desired_currency)["rate"]
+        updated_alerts: list[PriceAlertSave] = []
+        for (base_currency, desired_currency), alerts in alerts_by_pair.items():
+            current_rate = self.__resolve_rate(base_currency, desired_currency, alerts, scoped_dis)
+            if current_rate is None:
+                continue
+            for alert in alerts:
                 price_change_percent: int
                 if alert.last_price == 0:
                     price_change_percent = int(math.ceil(current_rate * 100))
                 else:
                     change_ratio = (current_rate - alert.last_price) / alert.last_price
                     price_change_percent = int(math.ceil(change_ratio * 100))
+                if abs(price_change_percent) < alert.threshold_percent:
+                    continue
+
+                triggered_alerts.append(
+                    CurrencyAlertService.TriggeredAlert(
+                        chat_id = alert.chat_id,
+                        owner_id = alert.owner_id,
+                        base_currency = alert.base_currency,
+                        desired_currency = alert.desired_currency,
+                        threshold_percent = alert.threshold_percent,
+                        old_rate = alert.last_price,
+                        old_rate_time = alert.last_price_time,
+                        new_rate = current_rate,
+                        new_rate_time = now.strftime(DATETIME_PRINT_FORMAT),
+                        price_change_percent = price_change_percent,
+                    ),
+                )
+                updated_alerts.append(
+                    PriceAlertSave(
+                        chat_id = alert.chat_id,
+                        owner_id = alert.owner_id,
+                        base_currency = alert.base_currency,
+                        desired_currency = alert.desired_currency,
+                        threshold_percent = alert.threshold_percent,
+                        last_price = current_rate,
+                        last_price_time = now,
+                    ),
+                )
 
-                if abs(price_change_percent) >= alert.threshold_percent:
-                    triggered_alerts.append(
-                        CurrencyAlertService.TriggeredAlert(
-                            chat_id = alert.chat_id,
-                            owner_id = alert.owner_id,
-                            base_currency = alert.base_currency,
-                            desired_currency = alert.desired_currency,
-                            threshold_percent = alert.threshold_percent,
-                            old_rate = alert.last_price,
-                            old_rate_time = alert.last_price_time,
-                            new_rate = current_rate,
-                            new_rate_time = datetime.now().strftime(DATETIME_PRINT_FORMAT),
-                            price_change_percent = price_change_percent,
-                        ),
-                    )
-                    self.__di.price_alert_crud.update(
-                        PriceAlertSave(
-                            chat_id = alert.chat_id,
-                            owner_id = alert.owner_id,
-                            base_currency = alert.base_currency,
-                            desired_currency = alert.desired_currency,
-                            threshold_percent = alert.threshold_percent,
-                            last_price = current_rate,
-                            last_price_time = datetime.now(),
-                        ),
-                    )
+        if updated_alerts:
+            try:
+                self.__di.price_alert_crud.update_last_prices(updated_alerts)
             except Exception as e:
-                currency_pair = f"{alert.base_currency}/{alert.desired_currency}"
-                log.w(f"Failed to check chat '{alert.chat_id}' alert '{currency_pair}'", e)
-                continue
+                log.e(f"Failed to update last prices for {len(updated_alerts)} triggered alerts", e)
         return triggered_alerts
+
+    def __get_all_alerts(self) -> list[PriceAlertDB]:
+        price_alerts_db: list[PriceAlertDB] = []
+        page = self.__di.price_alert_crud.get_all_after(limit = ALERTS_PAGE_SIZE)
+        while page:
+            price_alerts_db.extend(page)
+            if len(page) < ALERTS_PAGE_SIZE:
+                break
+            page = self.__di.price_alert_crud.get_all_after(page[-1], limit = ALERTS_PAGE_SIZE)
+        return price_alerts_db
+
+    def __scoped_di(self, alert: ActiveAlert, scoped_dis: dict[tuple[UUID, UUID], DI]) -> DI:
+        scope = (alert.owner_id, alert.chat_id)
+        scoped_di = scoped_dis.get(scope)
+        if scoped_di is None:
+            scoped_di = self.__di.clone(invoker_id = alert.owner_id.hex, invoker_chat_id = alert.chat_id.hex)
+            scoped_dis[scope] = scoped_di
+        return scoped_di
+
+    def __prefetch_crypto_prices(
+        self,
+        alerts_by_pair: dict[tuple[str, str], list[ActiveAlert]],
+        scoped_dis: dict[tuple[UUID, UUID], DI],
+    ):
+        # each owner pays only for the symbols of their own alerts, and those already covered by others are skipped
+        codes_by_scope: dict[tuple[UUID, UUID], set[str]] = {}
+        alert_by_scope: dict[tuple[UUID, UUID], CurrencyAlertService.ActiveAlert] = {}
+        for pair, alerts in alerts_by_pair.items():
+            crypto_codes = {code for code in pair if code != DEFAULT_FIAT and code in SUPPORTED_CRYPTO}
+            if not crypto_codes:
+                continue
+            for alert in alerts:
+                scope = (alert.owner_id, alert.chat_id)
+                codes_by_scope.setdefault(scope, set()).update(crypto_codes)
+                alert_by_scope.setdefault(scope, alert)
+
+        covered_codes: set[str] = set()
+        for scope, crypto_codes in codes_by_scope.items():
+            missing_codes = crypto_codes - covered_codes
+            if not missing_codes:
+                continue
+            try:
+                scoped_di = self.__scoped_di(alert_by_scope[scope], scoped_dis)
+                prefetched = scoped_di.exchange_rate_fetcher.prefetch_crypto_prices(sorted(missing_codes))
+                covered_codes.update(missing_codes)
+                log.t(f"  Prefetched {prefetched} crypto prices for owner '{scope[0]}'")
+            except Exception as e:
+                log.w(f"Failed to prefetch crypto prices for owner '{scope[0]}', falling back to per-pair lookups", e)
+
+    def __resolve_rate(
+        self,
+        base_currency: str,
+        desired_currency: str,
+        alerts: list[ActiveAlert],
+        scoped_dis: dict[tuple[UUID, UUID], DI],
+    ) -> float | None:
+        # any alert owner can resolve the rate, we only fall back to others when a lookup fails
+        tried_scopes: set[tuple[UUID, UUID]] = set()
+        for alert in alerts:
+            scope = (alert.owner_id, alert.chat_id)
+            if scope in tried_scopes:
+                continue
+            tried_scopes.add(scope)
+            try:
+                scoped_di = self.__scoped_di(alert, scoped_dis)
+                return scoped_di.exchange_rate_fetcher.execute(base_currency, desired_currency)["rate"]
+            except Exception as e:
+                log.w(f"Failed to check chat '{alert.chat_id}' alert '{base_currency}/{desired_currency}'", e)
+            if len(tried_scopes) >= MAX_RATE_ATTEMPTS_PER_PAIR:
+                break
+        return None
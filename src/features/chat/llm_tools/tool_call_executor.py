@@ -0,0 +1,100 @@
+import json
+import os
+import time
+from concurrent.futures import Executor, Future, wait
+from typing import Any
+
+from langchain_core.messages import ToolCall
+
+from db.schema.chat_config import ChatConfig
+from db.schema.user import User
+from db.sql import get_detached_session
+from di.di import DI
+from util import log
+from util.config import config
+from util.error_codes import TOOL_CALL_TIMED_OUT
+from util.errors import ExternalServiceError
+from util.shared_executor import SharedExecutor
+
+# media tools are much slower than the rest, they get more time than the default
+SLOW_TOOL_TIMEOUTS_S: dict[str, float] = {
+    "generate_image": 300.0,
+    "process_media": 300.0,
+    "render_social_post": 180.0,
+}
+
+
+class ToolCallExecutor:
+    """
+    Runs the tool calls of one LLM turn in parallel, keeping the results in call order. All calls, a lone one too,
+    run on one process-wide pool so that every call is held to its timeout. Each gets its own DB session and DI scope,
+    so usage tracking stays correct for each call. The pool bound also caps the extra DB connections of all turns.
+    """
+
+    __di: DI
+    __executor: Executor | None
+
+    def __init__(self, di: DI, executor: Executor | None = None):
+        self.__di = di
+        self.__executor = executor
+
+    def execute(self, tool_calls: list[ToolCall]) -> list[str | None]:
+        if not tool_calls:
+            return []
+        # resolve the invoker context up front, the request's session must not be shared with workers
+        # (this includes the invoker's lazily decrypted secrets)
+        invoker = self.__di.invoker.load_secrets()
+        invoker_chat = self.__di.invoker_chat
+        executor = self.__executor or tool_call_pool
+        submitted_at = time.monotonic()
+        futures = [
+            executor.submit(self.__invoke_scoped, tool_call["name"], tool_call["args"], invoker, invoker_chat)
+            for tool_call in tool_calls
+        ]
+        # every call's deadline counts from the submission, no matter how long the others took
+        deadlines = {
+            future: submitted_at + self.__timeout_of(tool_call["name"])
+            for tool_call, future in zip(tool_calls, futures)
+        }
+        timed_out = self.__await_deadlines(deadlines)
+        return [
+            self.__timed_out_result(tool_call["name"], future) if future in timed_out else future.result()
+            for tool_call, future in zip(tool_calls, futures)
+        ]
+
+    def __invoke_scoped(self, tool_name: str, tool_args: Any, invoker: User, invoker_chat: ChatConfig | None) -> str | None:
+        with get_detached_session() as db:
+            scoped_di = self.__di.clone(db = db)
+            scoped_di.inject_invoker(invoker)
+            scoped_di.inject_invoker_chat(invoker_chat)
+            return scoped_di.llm_tool_library.invoke(tool_name, tool_args)
+
+    @staticmethod
+    def __await_deadlines(deadlines: dict[Future, float]) -> set[Future]:
+        pending = set(deadlines)
+        timed_out: set[Future] = set()
+        for deadline in sorted(set(deadlines.values())):
+            if not pending:
+                break
+            _, pending = wait(pending, timeout = max(0.0, deadline - time.monotonic()))
+            expired = {future for future in pending if deadlines[future] <= deadline}
+            timed_out |= expired
+            pending -= expired
+        return timed_out
+
+    @staticmethod
+    def __timeout_of(tool_name: str) -> float:
+        return max(config.chat_tool_timeout_s, SLOW_TOOL_TIMEOUTS_S.get(tool_name, 0.0))
+
+    @staticmethod
+    def __timed_out_result(tool_name: str, future: Future) -> str:
+        # calls that haven't started are dropped, running ones finish in the background and nobody waits for them
+        future.cancel()
+        timeout_s = ToolCallExecutor.__timeout_of(tool_name)
+        error = ExternalServiceError(f"Tool '{tool_name}' timed out after {timeout_s:.0f}s", TOOL_CALL_TIMED_OUT)
+        log.w(error.to_log_string())
+        return json.dumps(error.to_llm_dict())
+
+
+tool_call_pool = SharedExecutor(max_workers = max(1, config.chat_tool_concurrency), thread_name_prefix = "tool-call")
+os.register_at_fork(after_in_child = tool_call_pool.reset_after_fork)
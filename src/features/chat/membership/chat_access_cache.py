@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+from uuid import UUID
+
+from features.integrations.platform_bot_sdk import ChatAccess
+from util.config import config
+
+
+class ChatAccessCache:
+    """
+    Bounded, TTL-aware, in-process cache of platform chat access lookups, keyed by (chat, user).
+    Keeps group chats at one platform lookup per member per TTL window instead of one per message.
+    Only found access is cached, missing access is looked up again on the next message.
+    """
+
+    @dataclass(frozen = True)
+    class Entry:
+        access: ChatAccess | None
+        stored_at: datetime
+
+    @dataclass
+    class Stats:
+        hits: int = 0
+        misses: int = 0
+
+        @property
+        def saved_calls(self) -> int:
+            return self.hits
+
+        @property
+        def hit_ratio(self) -> float:
+            total = self.hits + self.misses
+            return (self.hits / total) if total else 0.0
+
+    __entries: OrderedDict[tuple[UUID, UUID], Entry]
+    __stats: Stats
+    __max_entries: int
+    __ttl: timedelta
+    __now: Callable[[], datetime]
+    __lock: threading.Lock
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_s: int,
+        now: Callable[[], datetime] = datetime.now,
+    ):
+        self.__entries = OrderedDict()
+        self.__stats = ChatAccessCache.Stats()
+        self.__max_entries = max_entries
+        self.__ttl = timedelta(seconds = ttl_s)
+        self.__now = now
+        self.__lock = threading.Lock()
+
+    def get_or_resolve(
+        self,
+        chat_id: UUID,
+        user_id: UUID,
+        resolve: Callable[[], ChatAccess | None],
+    ) -> ChatAccess | None:
+        key = (chat_id, user_id)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and self.__now() - entry.stored_at <= self.__ttl:
+                self.__entries.move_to_end(key)
+                self.__stats.hits += 1
+                return entry.access
+            self.__stats.misses += 1
+        # the platform lookup is a network call, don't hold the lock while doing it
+        access = resolve()
+        if access is None:
+            # a failed lookup (timeout, rate limit) looks the same as no access, so it's not kept for the whole TTL
+            return None
+        with self.__lock:
+            self.__entries[key] = ChatAccessCache.Entry(access = access, stored_at = self.__now())
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last = False)
+        return access
+
+    def invalidate(self, chat_id: UUID, user_id: UUID):
+        with self.__lock:
+            self.__entries.pop((chat_id, user_id), None)
+
+    def invalidate_chat(self, chat_id: UUID):
+        with self.__lock:
+            for key in [key for key in self.__entries if key[0] == chat_id]:
+                del self.__entries[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    @property
+    def size(self) -> int:
+        return len(self.__entries)
+
+    def stats(self) -> Stats:
+        with self.__lock:
+            return ChatAccessCache.Stats(self.__stats.hits, self.__stats.misses)
+
+
+chat_access_cache = ChatAccessCache(
+    max_entries = config.chat_access_cache_max_entries,
+    ttl_s = config.chat_access_cache_ttl_s,
+)
@@ -17,9 +17,16 @@ class ChatMembershipService:
     def __init__(self, di: DI):
         self.__di = di
 
-    def sync(self, user: User, chat: ChatConfig) -> ChatMembership:
+    def sync(self, user: User, chat: ChatConfig, fresh: bool = False) -> ChatMembership:
         existing = self.__di.chat_membership_repo.get(user.id, chat.chat_id)
-        access = self.__di.platform_bot_sdk().resolve_chat_access(chat, user)
+        if fresh:
+            # permission-sensitive callers must not act on a cached platform answer
+            self.__di.chat_access_cache.invalidate(chat.chat_id, user.id)
+        access = self.__di.chat_access_cache.get_or_resolve(
+            chat.chat_id,
+            user.id,
+            lambda: self.__di.platform_bot_sdk().resolve_chat_access(chat, user),
+        )
         if existing is None and access is None:
             raise AuthorizationError(
                 f"User '{user.id.hex}' is not a participant of chat '{chat.chat_id.hex}'",
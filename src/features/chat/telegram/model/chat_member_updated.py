@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+from features.chat.telegram.model.chat import Chat
+from features.chat.telegram.model.chat_member import ChatMember
+from features.chat.telegram.model.user import User
+
+
+class ChatMemberUpdated(BaseModel):
+    """https://core.telegram.org/bots/api#chatmemberupdated"""
+    chat: Chat
+    from_user: User = Field(alias = "from")
+    date: int
+    old_chat_member: ChatMember
+    new_chat_member: ChatMember
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 
+from features.chat.telegram.model.chat_member_updated import ChatMemberUpdated
 from features.chat.telegram.model.message import Message
 
 
@@ -8,3 +9,5 @@ class Update(BaseModel):
     update_id: int
     message: Message | None = None
     edited_message: Message | None = None
+    my_chat_member: ChatMemberUpdated | None = None
+    chat_member: ChatMemberUpdated | None = None
@@ -1,4 +1,3 @@
-import requests
 from pydantic import TypeAdapter
 from requests import RequestException, Response
 
@@ -7,6 +6,7 @@ from features.chat.telegram.model.chat_member import ChatMember
 from features.chat.telegram.telegram_markdown_utils import escape_markdown
 from util import log
 from util.config import config
+from util.http_transport import http_transport
 
 
 class TelegramBotAPI:
@@ -20,7 +20,7 @@ class TelegramBotAPI:
     def get_file_info(self, file_id: str) -> File:
         log.t(f"Getting file info for file_id: {file_id}")
         url = f"{self.__bot_api_url}/getFile"
-        response = requests.get(url, params = {"file_id": file_id})
+        response = http_transport.get(url, params = {"file_id": file_id})
         self.__raise_for_status(response)
         return File(**response.json()["result"])
 
@@ -48,7 +48,7 @@ class TelegramBotAPI:
             "disable_notification": disable_notification,
             "link_preview_options": link_preview_options,
         }
-        response = requests.post(url, json = payload, timeout = config.web_timeout_s)
+        response = http_transport.post(url, json = payload, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
@@ -70,7 +70,7 @@ class TelegramBotAPI:
         if caption:
             payload["caption"] = escape_markdown(caption)
             payload["parse_mode"] = parse_mode
-        response = requests.post(url, json = payload, timeout = config.web_timeout_s)
+        response = http_transport.post(url, json = payload, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
@@ -95,7 +95,7 @@ class TelegramBotAPI:
         if caption:
             payload["caption"] = escape_markdown(caption)
             payload["parse_mode"] = parse_mode
-        response = requests.post(url, json = payload, timeout = config.web_timeout_s)
+        response = http_transport.post(url, json = payload, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
@@ -105,7 +105,7 @@ class TelegramBotAPI:
             "chat_id": chat_id,
             "action": "typing",
         }
-        response = requests.post(url, json = payload, timeout = config.web_timeout_s)
+        response = http_transport.post(url, json = payload, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
@@ -115,7 +115,7 @@ class TelegramBotAPI:
             "chat_id": chat_id,
             "action": "upload_photo",
         }
-        response = requests.post(url, json = payload, timeout = config.web_timeout_s)
+        response = http_transport.post(url, json = payload, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
@@ -127,7 +127,7 @@ class TelegramBotAPI:
             "message_id": message_id,
             "reaction": reactions_list,
         }
-        response = requests.post(url, json = payload, timeout = config.web_timeout_s)
+        response = http_transport.post(url, json = payload, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
@@ -144,20 +144,20 @@ class TelegramBotAPI:
                 ]],
             },
         }
-        response = requests.post(f"{self.__bot_api_url}/sendMessage", json = payload, timeout = config.web_timeout_s)
+        response = http_transport.post(f"{self.__bot_api_url}/sendMessage", json = payload, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
     def get_chat_member(self, chat_id: int | str, user_id: int | str) -> ChatMember:
         url = f"{self.__bot_api_url}/getChatMember"
-        response = requests.get(url, params = {"chat_id": chat_id, "user_id": user_id})
+        response = http_transport.get(url, params = {"chat_id": chat_id, "user_id": user_id})
         self.__raise_for_status(response)
         member_info = response.json()["result"]
         return TypeAdapter(ChatMember).validate_python(member_info)
 
     def get_chat_administrators(self, chat_id: int | str) -> list[ChatMember]:
         url = f"{self.__bot_api_url}/getChatAdministrators"
-        response = requests.get(url, params = {"chat_id": chat_id})
+        response = http_transport.get(url, params = {"chat_id": chat_id})
         self.__raise_for_status(response)
         admins_info = response.json()["result"]
         return TypeAdapter(list[ChatMember]).validate_python(admins_info)
@@ -1,9 +1,8 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Literal
 
-import requests
-
 from db.schema.chat_message import ChatMessage
 from db.schema.chat_message_attachment import ChatMessageAttachment, ChatMessageAttachmentSave
 from di.di import DI
@@ -12,11 +11,15 @@ from features.chat.telegram.model.attachment.file import File
 from features.chat.telegram.model.chat_member import ChatMember
 from features.chat.telegram.model.message import Message
 from features.chat.telegram.model.update import Update
+from features.chat.telegram.sdk.telegram_bot_api import TelegramBotAPI
 from util import log
 from util.config import config
-from util.error_codes import ATTACHMENT_NOT_FOUND, MISSING_EXTERNAL_ATTACHMENT_ID, NO_ATTACHMENT_INSTANCE, PLATFORM_MAPPING_FAILED
-from util.errors import InternalError, NotFoundError
+from util.error_codes import MISSING_EXTERNAL_ATTACHMENT_ID, NO_ATTACHMENT_INSTANCE, PLATFORM_MAPPING_FAILED
+from util.errors import InternalError
 from util.functions import first_key_with_value
+from util.http_transport import http_transport
+
+MAX_REFRESH_WORKERS = 4
 
 
 class TelegramBotSDK:
@@ -131,17 +134,34 @@ class TelegramBotSDK:
 
     def refresh_attachments_by_ids(self, attachment_ids: list[str]) -> list[ChatMessageAttachment]:
         log.d(f"Refreshing {len(attachment_ids)} attachments by IDs")
-        attachments: list[ChatMessageAttachment] = []
-        for attachment_id in attachment_ids:
-            attachment_db = self.__di.chat_message_attachment_crud.get(attachment_id)
-            if not attachment_db:
-                raise NotFoundError(f"Attachment with ID '{attachment_id}' not found in DB", ATTACHMENT_NOT_FOUND)
-            attachments.append(ChatMessageAttachment.model_validate(attachment_db))
+        attachments = [
+            ChatMessageAttachment.model_validate(attachment_db)
+            for attachment_db in self.__di.chat_message_attachment_crud.require_all_by_ids(attachment_ids)
+        ]
         return self.refresh_attachment_instances(attachments)
 
     def refresh_attachment_instances(self, attachments: list[ChatMessageAttachment]) -> list[ChatMessageAttachment]:
         log.d(f"Refreshing {len(attachments)} attachment instances")
-        return [self.refresh_attachment(attachment) for attachment in attachments]
+        if not attachments:
+            return []
+        instance_saves = [ChatMessageAttachmentSave(**attachment.model_dump()) for attachment in attachments]
+        # repeated references to a stale attachment are looked up once and share the result
+        stale_by_id: dict[str, ChatMessageAttachmentSave] = {}
+        for instance_save in instance_saves:
+            if instance_save.has_stale_data:
+                stale_by_id.setdefault(str(instance_save.id), instance_save)
+        instance_saves = [stale_by_id.get(str(instance_save.id), instance_save) for instance_save in instance_saves]
+        stale = list(stale_by_id.values())
+        if stale:
+            # resolved once up front, the lazy DI getter is not safe to race from the workers
+            telegram_bot_api = self.__di.telegram_bot_api
+            workers = min(len(stale), MAX_REFRESH_WORKERS)
+            with ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "attachment-refresh") as executor:
+                # the lookups only fill in the save instances, the first failure is raised here
+                list(executor.map(lambda instance_save: self.__fetch_remote_data(instance_save, telegram_bot_api), stale))
+        # fresh ones are stored too because they may contain fresh data from the API
+        results_db = self.__di.chat_message_attachment_crud.save_all(instance_saves)
+        return [ChatMessageAttachment.model_validate(result_db) for result_db in results_db]
 
     def refresh_attachment(
         self,
@@ -171,10 +191,18 @@ class TelegramBotSDK:
             return ChatMessageAttachment.model_validate(instance_db)
 
         # data is stale or missing, we need to fetch the attachment data from remote
+        self.__fetch_remote_data(instance_save, self.__di.telegram_bot_api)
+
+        # final version of the attachment is ready, store it
+        result_db = self.__di.chat_message_attachment_crud.save(instance_save)
+        return ChatMessageAttachment.model_validate(result_db)
+
+    def __fetch_remote_data(self, instance_save: ChatMessageAttachmentSave, telegram_bot_api: TelegramBotAPI) -> None:
+        """Populates a stale attachment with the file data from the API, without storing it."""
         if not instance_save.external_id:
             raise InternalError("No external ID provided for the attachment", MISSING_EXTERNAL_ATTACHMENT_ID)
         log.t(f"Refreshing attachment data for external ID '{instance_save.external_id}'")
-        api_file: File = self.__di.telegram_bot_api.get_file_info(instance_save.external_id)
+        api_file: File = telegram_bot_api.get_file_info(instance_save.external_id)
 
         # let's populate the attachment with the data from the API
         instance_save.size = api_file.file_size or instance_save.size
@@ -198,10 +226,6 @@ class TelegramBotSDK:
             elif instance_save.last_url:
                 self._detect_and_set_image_format(instance_save)
 
-        # final version of the attachment is ready, store it
-        result_db = self.__di.chat_message_attachment_crud.save(instance_save)
-        return ChatMessageAttachment.model_validate(result_db)
-
     @staticmethod
     def _detect_image_format_from_bytes(content: bytes) -> str | None:
         """Detect image format from magic bytes"""
@@ -232,7 +256,7 @@ class TelegramBotSDK:
         if not instance_save.last_url:
             return
         try:
-            response = requests.get(instance_save.last_url, timeout = 10)
+            response = http_transport.get(instance_save.last_url, timeout = 10)
             if response.status_code == 200:
                 detected_format = self._detect_image_format_from_bytes(response.content)
                 if detected_format and detected_format in KNOWN_FILE_FORMATS:
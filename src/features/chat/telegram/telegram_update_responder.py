@@ -1,15 +1,12 @@
-from itertools import chain
-
 from fastapi import HTTPException
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage
 
 from db.model.chat_config import ChatConfigDB
-from db.schema.chat_message import ChatMessage
-from db.schema.chat_message_attachment import ChatMessageAttachment
-from db.schema.user import User
 from db.sql import get_detached_session
+from db.unit_of_work import unit_of_work
 from di.di import DI
 from features.chat.chat_agent import ChatAgent
+from features.chat.chat_history_loader import ChatHistoryLoader
 from features.chat.telegram.model.update import Update
 from features.chat.telegram.telegram_data_resolver import TelegramDataResolver
 from features.external_tools.intelligence_presets import default_tool_for
@@ -25,17 +22,12 @@ def respond_to_update(update: Update) -> bool:
     if config.log_telegram_update:
         log.t(f"Received a Telegram update: `{update}`")
 
-    with get_detached_session() as db:
+    with get_detached_session() as db, unit_of_work(db, "Telegram update") as work:
         di = DI(db)
 
-        def map_to_langchain(message) -> HumanMessage | AIMessage:
-            author_db = di.user_crud.get(message.author_id)
-            author = User.model_validate(author_db) if author_db else None
-            return di.domain_langchain_mapper.map_to_langchain(
-                author = author,
-                message = message,
-                chat_type = ChatConfigDB.ChatType.telegram,
-            )
+        if update.chat_member or update.my_chat_member:
+            __invalidate_chat_access(di, update)
+            return False
 
         resolved_domain_data: TelegramDataResolver.Result | None = None
         try:
@@ -51,56 +43,130 @@ def respond_to_update(update: Update) -> bool:
                 return False
             di.inject_invoker(resolved_domain_data.author)
             di.inject_invoker_chat(resolved_domain_data.chat)
+            # stored inbound data must be durable before the (possibly deferred) reply reads it
+            work.checkpoint()
 
-            # fetch latest messages to prepare a response
-            past_messages_db = di.chat_message_crud.get_latest_chat_messages(
-                chat_id = resolved_domain_data.chat.chat_id,
-                limit = config.chat_history_depth,
-            )
-            past_messages = [ChatMessage.model_validate(chat_message) for chat_message in past_messages_db]
-            # now we flat-map to get attachments: chat_message_attachment_dao.get_by_message(chat_id, message_id)
-            # but we only have a singular get by 1 message, so we need to fetch all attachments for each message
-            past_attachments_db = list(
-                chain.from_iterable(
-                    di.chat_message_attachment_crud.get_by_message(message.chat_id, message.message_id)
-                    for message in past_messages
-                ),
-            )
-            past_attachment_ids = [ChatMessageAttachment.model_validate(attachment).id for attachment in past_attachments_db]
-            # DB sorting is date descending
-            langchain_messages = [map_to_langchain(message) for message in past_messages][::-1]
-
-            # process the update using LLM; get instead of require to allow the first message to be sent
-            tool = di.tool_choice_resolver.get_tool(ChatAgent.TOOL_TYPE, default_tool_for(ChatAgent.TOOL_TYPE))
-            chat_agent = di.chat_agent(
-                messages = list(langchain_messages),
-                raw_last_message = domain_update.message.text,  # excludes the resolver formatting
-                last_message_id = domain_update.message.message_id,
-                attachment_ids = past_attachment_ids,
-                configured_tool = tool,
-            )
-            answer = chat_agent.execute()
-            if not answer or not answer.content:
-                log.d("No LLM response needed (command handled or no reply required)")
+            # commands run eagerly, the LLM reply waits for the author's message burst to settle
+            raw_last_message = domain_update.message.text  # excludes the resolver formatting
+            last_message_id = domain_update.message.message_id
+            chat_agent, history = __prepare_chat_agent(di, resolved_domain_data, raw_last_message, last_message_id)
+            command_handling = chat_agent.handle_commands()
+            if command_handling.is_handled:
+                return __send_answer(di, resolved_domain_data, command_handling.reply, len(history.messages))
+            if config.chat_debounce_delay_s > 0.0:
+                burst_data = resolved_domain_data
+                di.debounce_scheduler.submit(
+                    f"{burst_data.chat.chat_id}/{burst_data.author.id}",
+                    config.chat_debounce_delay_s,
+                    lambda: __reply_after_burst(update, burst_data, raw_last_message, last_message_id),
+                )
+                log.d(f"Reply to '{last_message_id}' scheduled after the message burst")
                 return False
-
-            # send and store the response[s]
-            sent_messages: int = 0
-            domain_messages = di.domain_langchain_mapper.map_bot_message_to_storage(resolved_domain_data.chat, answer)
-            for message in domain_messages:
-                di.telegram_bot_sdk.send_text_message(str(resolved_domain_data.chat.external_id), message.text)
-                sent_messages += 1
-
-            agent = resolve_agent_user(resolved_domain_data.chat.chat_type)
-            log.t(f"Finished responding to updates. \n[{agent.full_name}]: {answer.content}")
-            log.i(f"Used {len(past_messages_db)} and sent {sent_messages} messages")
-            return True
+            return __send_answer(di, resolved_domain_data, chat_agent.reply(), len(history.messages))
         except Exception as e:
             log.e(f"Failed to ingest: {update}", e)
             __notify_of_errors(di, resolved_domain_data, e)
             return False
 
 
+@silent
+def __invalidate_chat_access(di: DI, update: Update):
+    member_update = update.chat_member or update.my_chat_member
+    if not member_update:
+        return
+    chat_config_db = di.chat_config_crud.get_by_external_identifiers(
+        external_id = str(member_update.chat.id),
+        chat_type = ChatConfigDB.ChatType.telegram,
+    )
+    if not chat_config_db:
+        log.t(f"Ignoring membership change in unknown chat '{member_update.chat.id}'")
+        return
+    if update.my_chat_member:
+        # the bot's own status changed, so no cached answer for this chat can be trusted
+        log.d(f"Invalidating cached chat access for chat '{chat_config_db.chat_id}'")
+        di.chat_access_cache.invalidate_chat(chat_config_db.chat_id)
+        return
+    user_db = di.user_crud.get_by_telegram_user_id(member_update.new_chat_member.user.id)
+    if user_db:
+        log.d(f"Invalidating cached chat access for user '{user_db.id}' in chat '{chat_config_db.chat_id}'")
+        di.chat_access_cache.invalidate(chat_config_db.chat_id, user_db.id)
+
+
+def __reply_after_burst(
+    update: Update,
+    resolved_domain_data: TelegramDataResolver.Result,
+    raw_last_message: str,
+    last_message_id: str,
+) -> bool:
+    with get_detached_session() as db, unit_of_work(db, "Telegram reply"):
+        di = DI(db)
+        try:
+            di.inject_invoker(resolved_domain_data.author)
+            di.inject_invoker_chat(resolved_domain_data.chat)
+            chat_agent, history = __prepare_chat_agent(di, resolved_domain_data, raw_last_message, last_message_id)
+            return __send_answer(di, resolved_domain_data, chat_agent.reply(), len(history.messages))
+        except Exception as e:
+            log.e(f"Failed to reply: {update}", e)
+            __notify_of_errors(di, resolved_domain_data, e)
+            return False
+
+
+def __prepare_chat_agent(
+    di: DI,
+    resolved_domain_data: TelegramDataResolver.Result,
+    raw_last_message: str,
+    last_message_id: str,
+) -> tuple[ChatAgent, ChatHistoryLoader.Result]:
+    # fetch latest messages to prepare a response (DB sorting is date descending)
+    history = di.chat_history_loader.load(
+        chat_id = resolved_domain_data.chat.chat_id,
+        limit = config.chat_history_depth,
+    )
+    past_attachment_ids = [attachment.id for attachment in history.attachments]
+    langchain_messages = [
+        di.domain_langchain_mapper.map_to_langchain(
+            author = history.author_of(message),
+            message = message,
+            chat_type = ChatConfigDB.ChatType.telegram,
+        )
+        for message in history.messages
+    ][::-1]
+
+    # get instead of require to allow the first message to be sent
+    tool = di.tool_choice_resolver.get_tool(ChatAgent.TOOL_TYPE, default_tool_for(ChatAgent.TOOL_TYPE))
+    chat_agent = di.chat_agent(
+        messages = list(langchain_messages),
+        raw_last_message = raw_last_message,
+        last_message_id = last_message_id,
+        attachment_ids = past_attachment_ids,
+        configured_tool = tool,
+    )
+    return chat_agent, history
+
+
+def __send_answer(
+    di: DI,
+    resolved_domain_data: TelegramDataResolver.Result,
+    answer: AIMessage | None,
+    used_messages: int,
+) -> bool:
+    if not answer or not answer.content:
+        log.d("No LLM response needed (command handled or no reply required)")
+        return False
+
+    # send and store the response[s]
+    sent_messages: int = 0
+    domain_messages = di.domain_langchain_mapper.map_bot_message_to_storage(resolved_domain_data.chat, answer)
+    for message in domain_messages:
+        di.telegram_bot_sdk.send_text_message(str(resolved_domain_data.chat.external_id), message.text)
+        sent_messages += 1
+
+    agent = resolve_agent_user(resolved_domain_data.chat.chat_type)
+    log.t(f"Finished responding to updates. \n[{agent.full_name}]: {answer.content}")
+    log.i(f"Used {used_messages} and sent {sent_messages} messages")
+    return True
+
+
 @silent
 def __notify_of_errors(
     di: DI,
@@ -1,8 +1,6 @@
 import urllib.parse
 from uuid import UUID
 
-import requests
-
 from db.schema.chat_message_attachment import ChatMessageAttachment
 from di.di import DI
 from features.chat.supported_files import KNOWN_FILE_FORMATS
@@ -11,6 +9,7 @@ from util.config import config
 from util.error_codes import UNSUPPORTED_MEDIA_TYPE
 from util.errors import ValidationError
 from util.functions import digest_md5
+from util.http_transport import http_transport
 
 
 class UrlAttachmentResolver:
@@ -42,7 +41,7 @@ class UrlAttachmentResolver:
 
     def __mime_from_head(self) -> str | None:
         try:
-            response = requests.head(
+            response = http_transport.head(
                 self.__url,
                 headers = DEFAULT_HEADERS,
                 timeout = config.web_timeout_s,
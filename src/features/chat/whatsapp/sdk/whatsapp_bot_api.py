@@ -1,10 +1,10 @@
-import requests
 from requests import RequestException, Response
 
 from features.chat.whatsapp.model.media_info import MediaInfo
 from features.chat.whatsapp.model.response import MarkAsReadResponse, MessageResponse
 from util import log
 from util.config import config
+from util.http_transport import http_transport
 
 API_VERSION = "v23.0"
 
@@ -104,7 +104,7 @@ class WhatsAppBotAPI:
         log.t(f"Getting media info for #{media_id}")
         media_url = f"https://graph.facebook.com/{API_VERSION}/{media_id}"
         headers = {"Authorization": f"Bearer {config.whatsapp_bot_token.get_secret_value()}"}
-        response = requests.get(media_url, headers = headers, timeout = config.web_timeout_s)
+        response = http_transport.get(media_url, headers = headers, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         media_data = response.json()
         if "url" not in media_data:
@@ -118,7 +118,7 @@ class WhatsAppBotAPI:
     ) -> bytes | None:
         log.t("Downloading media bytes from URL")
         headers = {"Authorization": f"Bearer {config.whatsapp_bot_token.get_secret_value()}"}
-        file_response = requests.get(media_url, headers = headers, timeout = config.web_timeout_s)
+        file_response = http_transport.get(media_url, headers = headers, timeout = config.web_timeout_s)
         self.__raise_for_status(file_response)
         log.t(f"Media downloaded successfully ({len(file_response.content)} bytes)")
         return file_response.content
@@ -146,7 +146,7 @@ class WhatsAppBotAPI:
             "Authorization": f"Bearer {config.whatsapp_bot_token.get_secret_value()}",
             "Content-Type": "application/json",
         }
-        response = requests.post(self.__bot_api_url, json = payload, headers = headers, timeout = config.web_timeout_s)
+        response = http_transport.post(self.__bot_api_url, json = payload, headers = headers, timeout = config.web_timeout_s)
         self.__raise_for_status(response)
         return response.json()
 
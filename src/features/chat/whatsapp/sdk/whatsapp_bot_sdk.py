@@ -1,8 +1,6 @@
 from datetime import datetime, timedelta
 from uuid import UUID
 
-import requests
-
 from db.model.chat_config import ChatConfigDB
 from db.schema.chat_config import ChatConfig
 from db.schema.chat_message import ChatMessage, ChatMessageSave
@@ -15,7 +13,6 @@ from features.integrations.integration_config import THE_AGENT
 from util import log
 from util.config import config
 from util.error_codes import (
-    ATTACHMENT_NOT_FOUND,
     CHAT_CONFIG_NOT_FOUND,
     MEDIA_DOWNLOAD_FAILED,
     MEDIA_INFO_FAILED,
@@ -24,6 +21,7 @@ from util.error_codes import (
 )
 from util.errors import ExternalServiceError, InternalError, NotFoundError
 from util.functions import first_key_with_value
+from util.http_transport import http_transport
 
 ATTACHMENT_URL_EXPIRATION = 23 * 60 * 60  # 23 hours in seconds
 WHATSAPP_MEDIA_URL_EXPIRATION = 5 * 60  # 5 minutes in seconds
@@ -166,7 +164,7 @@ class WhatsAppBotSDK:
         detected_format: str | None = None
         detected_mime_type: str | None = None
         try:
-            response = requests.get(media_url, timeout = config.web_timeout_s * 3)
+            response = http_transport.get(media_url, timeout = config.web_timeout_s * 3)
             if response.status_code == 200:
                 media_bytes = response.content
                 if media_bytes:
@@ -200,12 +198,10 @@ class WhatsAppBotSDK:
 
     def refresh_attachments_by_ids(self, attachment_ids: list[str]) -> list[ChatMessageAttachment]:
         log.d(f"Refreshing {len(attachment_ids)} attachments by IDs")
-        attachments: list[ChatMessageAttachment] = []
-        for attachment_id in attachment_ids:
-            attachment_db = self.__di.chat_message_attachment_crud.get(attachment_id)
-            if not attachment_db:
-                raise NotFoundError(f"Attachment with ID '{attachment_id}' not found in DB", ATTACHMENT_NOT_FOUND)
-            attachments.append(ChatMessageAttachment.model_validate(attachment_db))
+        attachments = [
+            ChatMessageAttachment.model_validate(attachment_db)
+            for attachment_db in self.__di.chat_message_attachment_crud.require_all_by_ids(attachment_ids)
+        ]
         return self.refresh_attachment_instances(attachments)
 
     def refresh_attachment_instances(self, attachments: list[ChatMessageAttachment]) -> list[ChatMessageAttachment]:
@@ -304,7 +300,7 @@ class WhatsAppBotSDK:
         if not instance_save.last_url:
             return
         try:
-            response = requests.get(instance_save.last_url, timeout = 10)
+            response = http_transport.get(instance_save.last_url, timeout = 10)
             if response.status_code == 200:
                 detected_format = self._detect_image_format_from_bytes(response.content)
                 if detected_format and detected_format in KNOWN_FILE_FORMATS:
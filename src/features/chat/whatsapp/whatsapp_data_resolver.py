@@ -6,7 +6,7 @@ from db.model.chat_config import ChatConfigDB
 from db.schema.chat_config import ChatConfig, ChatConfigSave
 from db.schema.chat_message import ChatMessage, ChatMessageSave
 from db.schema.chat_message_attachment import ChatMessageAttachment, ChatMessageAttachmentSave
-from db.schema.user import User, UserSave
+from db.schema.user import LazySecretStr, User, UserSave
 from di.di import DI
 from features.chat.whatsapp.whatsapp_domain_mapper import WhatsAppDomainMapper
 from features.integrations.integrations import is_the_agent
@@ -113,6 +113,7 @@ class WhatsAppDataResolver:
             self.__di.user_crud.get_by_whatsapp_phone_number(whatsapp_phone_number or "")
         )
 
+        old_user: User | None = None
         if old_user_db:
             old_user = User.model_validate(old_user_db)
             # reset the attributes that are not normally changed through the WhatsApp API
@@ -152,14 +153,15 @@ class WhatsAppDataResolver:
             mapped_data.are_policies_accepted = old_user.are_policies_accepted
             mapped_data.group = old_user.group
         else:
-            user_count = self.__di.user_crud.count()
-            at_capacity = user_count >= config.max_users
-            mapped_data.is_on_waitlist = at_capacity
+            # the waitlist is decided against the capacity when the user is created
+            mapped_data.is_on_waitlist = False
             mapped_data.is_invited_to_start = False
             mapped_data.are_policies_accepted = False
 
         # reset token values to None if they are non-null but contain only whitespace
         def is_empty_secret(secret):
+            if isinstance(secret, LazySecretStr) and not secret.is_loaded:
+                return False  # stored as-is, not worth decrypting just to check
             if hasattr(secret, "get_secret_value"):
                 return not secret.get_secret_value().strip()
             return not secret.strip() if isinstance(secret, str) else False
@@ -208,7 +210,16 @@ class WhatsAppDataResolver:
         if mapped_data.tool_choice_api_twitter is not None and not mapped_data.tool_choice_api_twitter.strip():
             log.w("Resetting tool_choice_api_twitter to None because it is empty")
             mapped_data.tool_choice_api_twitter = None
-        return User.model_validate(self.__di.user_crud.save(mapped_data))
+
+        if old_user:
+            changes = mapped_data.changed_fields(old_user)
+            if not changes:
+                log.t("  User is unchanged, skipping the write")
+                return old_user
+            updated_user_db = self.__di.user_crud.update_fields(old_user.id, changes)
+            if updated_user_db:
+                return User.model_validate(updated_user_db)
+        return User.model_validate(self.__di.user_crud.save(mapped_data, capacity = config.max_users))
 
     def resolve_chat_message(self, mapped_data: ChatMessageSave) -> ChatMessage:
         log.t(f"  Resolving chat message: {mapped_data}")
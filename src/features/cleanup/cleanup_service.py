@@ -1,9 +1,27 @@
+import json
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Callable
 
+from sqlalchemy import Column, ColumnElement, Table, and_
+
+from db.chunked_deletion import ChunkedDeletion
+from db.crud.tools_cache import ToolsCacheCRUD
+from db.model.chat_message import ChatMessageDB
+from db.model.chat_message_attachment import ChatMessageAttachmentDB
+from db.model.document_embedding import DocumentEmbeddingDB
+from db.model.price_alert import PriceAlertDB
+from db.model.sponsorship import SponsorshipDB
+from db.model.tools_cache import ToolsCacheDB
+from db.model.usage_record import UsageRecordDB
+from db.schema.tools_cache import ToolsCacheSave
 from util import log
 from util.config import config
 
+CHECKPOINT_CACHE_KEY = ToolsCacheCRUD.create_key("cleanup", "checkpoint")
+CHECKPOINT_MAX_AGE = timedelta(days = 7)
+
 
 @dataclass
 class CleanupResult:
@@ -13,9 +31,28 @@ class CleanupResult:
     usage_records_deleted: int = field(default = 0)
     price_alerts_deleted: int = field(default = 0)
     sponsorships_deleted: int = field(default = 0)
+    document_embeddings_deleted: int = field(default = 0)
+    usage_partitions_dropped: int = field(default = 0)
+    rows_per_second: dict[str, float] = field(default_factory = dict)
+    completed: bool = field(default = True)  # False when the time budget ran out, the next run resumes
+
+
+@dataclass(frozen = True)
+class CleanupPhase:
+    name: str
+    table: Table
+    condition: ColumnElement[bool]
+    result_field: str
+    dependents: list[tuple[Table, list[Column]]] = field(default_factory = list)
+    dependents_result_field: str | None = None
+    on_finished: Callable[[], None] | None = None
 
 
 class CleanupService:
+    """
+    Deletes expired data in small primary key ordered chunks within a time budget per run (see ChunkedDeletion).
+    Runs resume from a checkpoint: the phase and the last deleted key where the previous run ran out of time.
+    """
 
     def __init__(self, di):
         self.__di = di
@@ -23,41 +60,134 @@ class CleanupService:
     def run(self) -> CleanupResult:
         result = CleanupResult()
         log.i("Cleanup starting...")
+        deadline = time.monotonic() + config.cleanup_time_budget_s
+        deletion = ChunkedDeletion(self.__di.db, chunk_size = config.cleanup_chunk_size)
 
-        message_cutoff = datetime.now() - timedelta(days = config.cleanup_message_retention_days)
+        # whole months of usage records go at once, the chunks below only see the month the cutoff falls in
         try:
-            result.attachments_deleted = self.__di.chat_message_attachment_crud.delete_by_old_messages(message_cutoff)
-            log.i(f"  Cleanup phase 1A: deleted {result.attachments_deleted} attachments")
-            result.messages_deleted = self.__di.chat_message_crud.delete_older_than(message_cutoff)
-            log.i(f"  Cleanup phase 1B: deleted {result.messages_deleted} messages")
+            usage_cutoff = datetime.now() - timedelta(days = config.cleanup_message_retention_days)
+            result.usage_partitions_dropped = self.__di.usage_record_repo.maintain_partitions(usage_cutoff)
+            log.i(f"  Cleanup dropped {result.usage_partitions_dropped} usage record partition(s)")
         except Exception as e:
-            log.e(f"  Cleanup phase 1 (messages / attachments) failed: {e}")
+            self.__di.db.rollback()
+            log.e(f"  Cleanup of usage record partitions failed: {e}")
 
-        try:
-            result.cache_entries_cleared = self.__di.tools_cache_crud.delete_expired()
-            log.i(f"  Cleanup phase 2: cleared {result.cache_entries_cleared} cache entries")
-        except Exception as e:
-            log.e(f"  Cleanup phase 2 (cache) failed: {e}")
+        phases = self.__phases()
+        start_index, after = self.__load_checkpoint(phases)
+        for index, phase in enumerate(phases[start_index:] + phases[:start_index]):
+            try:
+                progress = deletion.run(
+                    phase.table,
+                    phase.condition,
+                    deadline,
+                    after = after if index == 0 else None,
+                    dependents = phase.dependents,
+                )
+            except Exception as e:
+                self.__di.db.rollback()
+                log.e(f"  Cleanup phase '{phase.name}' failed: {e}")
+                continue
+            setattr(result, phase.result_field, progress.deleted)
+            if phase.dependents_result_field:
+                setattr(result, phase.dependents_result_field, progress.dependents_deleted)
+            result.rows_per_second[phase.name] = round(progress.rows_per_second, 1)
+            log.i(f"  Cleanup phase '{phase.name}': deleted {progress.deleted} rows, {progress.rows_per_second:.0f} rows/s")
+            if not progress.finished:
+                log.i(f"  Cleanup ran out of time in phase '{phase.name}', the next run resumes there")
+                self.__save_checkpoint(phase, progress.last_key)
+                result.completed = False
+                break
+            if phase.on_finished:
+                try:
+                    phase.on_finished()
+                except Exception as e:
+                    self.__di.db.rollback()
+                    log.e(f"  Cleanup phase '{phase.name}' failed to finish: {e}")
+        if result.completed:
+            self.__di.tools_cache_crud.delete(CHECKPOINT_CACHE_KEY)
 
-        try:
-            result.usage_records_deleted = self.__di.usage_record_repo.delete_older_than(message_cutoff)
-            log.i(f"  Cleanup phase 3: deleted {result.usage_records_deleted} usage records")
-        except Exception as e:
-            log.e(f"  Cleanup phase 3 (usage records) failed: {e}")
+        log.i("Cleanup completed." if result.completed else "Cleanup paused.")
+        return result
 
-        try:
-            price_alert_cutoff = datetime.now() - timedelta(days = config.cleanup_price_alert_staleness_days)
-            result.price_alerts_deleted = self.__di.price_alert_crud.delete_stale(price_alert_cutoff)
-            log.i(f"  Cleanup phase 4: deleted {result.price_alerts_deleted} price alerts")
-        except Exception as e:
-            log.e(f"  Cleanup phase 4 (price alerts) failed: {e}")
+    def __phases(self) -> list[CleanupPhase]:
+        now = datetime.now()
+        message_cutoff = now - timedelta(days = config.cleanup_message_retention_days)
+        price_alert_cutoff = now - timedelta(days = config.cleanup_price_alert_staleness_days)
+        sponsorship_cutoff = now - timedelta(days = config.cleanup_sponsorship_staleness_days)
+        document_embedding_cutoff = now - timedelta(days = config.cleanup_document_embedding_retention_days)
+        attachments = ChatMessageAttachmentDB.__table__
+        return [
+            CleanupPhase(
+                name = "messages",
+                table = ChatMessageDB.__table__,
+                condition = ChatMessageDB.sent_at < message_cutoff,
+                result_field = "messages_deleted",
+                # attachments reference their messages, so they go first, in the same chunk
+                dependents = [(attachments, [attachments.c.chat_id, attachments.c.message_id])],
+                dependents_result_field = "attachments_deleted",
+            ),
+            CleanupPhase(
+                name = "tools_cache",
+                table = ToolsCacheDB.__table__,
+                condition = ToolsCacheDB.expires_at < now,
+                result_field = "cache_entries_cleared",
+            ),
+            CleanupPhase(
+                name = "usage_records",
+                table = UsageRecordDB.__table__,
+                condition = UsageRecordDB.timestamp < message_cutoff,
+                result_field = "usage_records_deleted",
+                on_finished = lambda: self.__di.usage_record_repo.prune_rollups(message_cutoff),
+            ),
+            CleanupPhase(
+                name = "price_alerts",
+                table = PriceAlertDB.__table__,
+                condition = PriceAlertDB.last_price_time < price_alert_cutoff,
+                result_field = "price_alerts_deleted",
+            ),
+            CleanupPhase(
+                name = "sponsorships",
+                table = SponsorshipDB.__table__,
+                condition = and_(SponsorshipDB.accepted_at.is_(None), SponsorshipDB.sponsored_at < sponsorship_cutoff),
+                result_field = "sponsorships_deleted",
+            ),
+            CleanupPhase(
+                name = "document_embeddings",
+                table = DocumentEmbeddingDB.__table__,
+                condition = DocumentEmbeddingDB.last_used_at < document_embedding_cutoff,
+                result_field = "document_embeddings_deleted",
+            ),
+        ]
 
+    def __load_checkpoint(self, phases: list[CleanupPhase]) -> tuple[int, tuple | None]:
         try:
-            sponsorship_cutoff = datetime.now() - timedelta(days = config.cleanup_sponsorship_staleness_days)
-            result.sponsorships_deleted = self.__di.sponsorship_crud.delete_unaccepted_older_than(sponsorship_cutoff)
-            log.i(f"  Cleanup phase 5: deleted {result.sponsorships_deleted} sponsorships")
+            cached = self.__di.tools_cache_crud.get(CHECKPOINT_CACHE_KEY)
+            if not cached or (cached.expires_at is not None and cached.expires_at < datetime.now()):
+                return 0, None
+            checkpoint = json.loads(cached.value)
+            index = [phase.name for phase in phases].index(checkpoint["phase"])
+            after: tuple | None = None
+            if checkpoint["after"] is not None:
+                primary_key = list(phases[index].table.primary_key.columns)
+                after = tuple(CleanupService.__parse_key_value(column, value) for column, value in zip(primary_key, checkpoint["after"]))
+            log.i(f"  Cleanup resuming phase '{checkpoint['phase']}'")
+            return index, after
         except Exception as e:
-            log.e(f"  Cleanup phase 5 (sponsorships) failed: {e}")
+            log.w(f"  Cleanup checkpoint is unusable, starting over: {e}")
+            return 0, None
 
-        log.i("Cleanup completed.")
-        return result
+    @staticmethod
+    def __parse_key_value(column: Column, value: str):
+        python_type = column.type.python_type
+        return datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+
+    def __save_checkpoint(self, phase: CleanupPhase, last_key: tuple | None):
+        after = None if last_key is None else [str(value) for value in last_key]
+        self.__di.tools_cache_crud.save(
+            ToolsCacheSave(
+                key = CHECKPOINT_CACHE_KEY,
+                value = json.dumps({"phase": phase.name, "after": after}),
+                created_at = datetime.now(),
+                expires_at = datetime.now() + CHECKPOINT_MAX_AGE,
+            ),
+        )
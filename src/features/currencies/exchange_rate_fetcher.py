@@ -1,6 +1,5 @@
 import json
 from datetime import datetime, timedelta
-from time import sleep
 from typing import Any, Dict
 
 from db.schema.tools_cache import ToolsCache, ToolsCacheSave
@@ -10,13 +9,15 @@ from features.external_tools.configured_tool import ConfiguredTool
 from features.external_tools.external_tool import ToolType
 from features.external_tools.external_tool_library import CRYPTO_CURRENCY_EXCHANGE, FIAT_CURRENCY_EXCHANGE
 from util import log
+from util.config import config
 from util.error_codes import EXCHANGE_RATE_NOT_FOUND, INVALID_CURRENCY, UNSUPPORTED_CURRENCY_PAIR
 from util.errors import NotFoundError, ValidationError
+from util.rate_limiter import RateLimiter
 
 DEFAULT_FIAT = "USD"
 CACHE_PREFIX = "exchange-rate-fetcher"
 CACHE_TTL = timedelta(minutes = 5)
-RATE_LIMIT_DELAY_S = 1
+RATE_LIMIT = RateLimiter.Budget(rate_per_s = config.exchange_rate_api_rate_per_s, burst = config.exchange_rate_api_burst)
 
 
 class ExchangeRateFetcher:
@@ -128,43 +129,16 @@ class ExchangeRateFetcher:
             return cached_rate
 
         rate: float
-        api_url = f"https://pro-api.coinmarketcap.com/{CRYPTO_CURRENCY_EXCHANGE.id.replace(".", "/")}"
-        resolved = self.__di.access_token_resolver.require_access_token_for_tool(CRYPTO_CURRENCY_EXCHANGE)
-        headers = {"Accept": "application/json", "X-CMC_PRO_API_KEY": resolved.token.get_secret_value()}
-        crypto_tool: ConfiguredTool = ConfiguredTool(
-            definition = CRYPTO_CURRENCY_EXCHANGE,
-            token = resolved.token,
-            purpose = ToolType.api_crypto_exchange,
-            payer_id = resolved.payer_id,
-            uses_credits = resolved.uses_credits,
-        )
-
+        crypto_tool, api_url, headers = self.__crypto_api()
         if base_currency_code != DEFAULT_FIAT and desired_currency_code != DEFAULT_FIAT:
             # due to API limitations, we must traverse both cryptos through USD
-            params_base = {"symbol": base_currency_code, "convert": DEFAULT_FIAT}
-            sleep(RATE_LIMIT_DELAY_S)
-            fetcher_base = self.__di.tracked_web_fetcher(crypto_tool, api_url, headers, params_base, cache_ttl_json = CACHE_TTL)
-            response_base = fetcher_base.fetch_json() or {}
-
-            params_desired = {"symbol": desired_currency_code, "convert": DEFAULT_FIAT}
-            sleep(RATE_LIMIT_DELAY_S)
-            fetcher_desired = self.__di.tracked_web_fetcher(
-                crypto_tool, api_url, headers, params_desired, cache_ttl_json = CACHE_TTL,
-            )
-            response_desired = fetcher_desired.fetch_json() or {}
-
-            base_rate = float(response_base["data"][base_currency_code]["quote"][DEFAULT_FIAT]["price"])
-            desired_rate = float(response_desired["data"][desired_currency_code]["quote"][DEFAULT_FIAT]["price"])
+            base_rate = self.__get_usd_price(base_currency_code, crypto_tool, api_url, headers)
+            desired_rate = self.__get_usd_price(desired_currency_code, crypto_tool, api_url, headers)
             rate = base_rate / desired_rate
         else:
             # one of the currencies is USD, we can fetch the rate directly
             symbol = desired_currency_code if base_currency_code == DEFAULT_FIAT else base_currency_code
-            params = {"symbol": symbol, "convert": DEFAULT_FIAT}
-            sleep(RATE_LIMIT_DELAY_S)
-            fetcher = self.__di.tracked_web_fetcher(crypto_tool, api_url, headers, params, cache_ttl_json = CACHE_TTL)
-            response = fetcher.fetch_json() or {}
-
-            rate = float(response["data"][symbol]["quote"][DEFAULT_FIAT]["price"])
+            rate = self.__get_usd_price(symbol, crypto_tool, api_url, headers)
             if base_currency_code == DEFAULT_FIAT:
                 rate = 1 / rate
         if rate:
@@ -172,6 +146,49 @@ class ExchangeRateFetcher:
             return rate
         raise NotFoundError(f"No rate found for {base_currency_code}/{desired_currency_code}", EXCHANGE_RATE_NOT_FOUND)
 
+    def prefetch_crypto_prices(self, currency_codes: list[str]) -> int:
+        """Caches the USD prices of many cryptos using a single multi-symbol quote request."""
+        symbols = sorted({code for code in currency_codes if code in SUPPORTED_CRYPTO and code != DEFAULT_FIAT})
+        missing_symbols = [symbol for symbol in symbols if not self.__get_cached_rate_of_one(symbol, DEFAULT_FIAT)]
+        if not missing_symbols:
+            return 0
+        log.t(f"Prefetching crypto prices for {len(missing_symbols)} symbols")
+        crypto_tool, api_url, headers = self.__crypto_api()
+        params = {"symbol": ",".join(missing_symbols), "convert": DEFAULT_FIAT}
+        self.__di.rate_limiter.acquire(CRYPTO_CURRENCY_EXCHANGE.id, RATE_LIMIT)
+        fetcher = self.__di.tracked_web_fetcher(crypto_tool, api_url, headers, params, cache_ttl_json = CACHE_TTL)
+        data = (fetcher.fetch_json() or {}).get("data") or {}
+        prefetched = 0
+        for symbol in missing_symbols:
+            price = (((data.get(symbol) or {}).get("quote") or {}).get(DEFAULT_FIAT) or {}).get("price")
+            if price:
+                self.__save_rate_to_cache(symbol, DEFAULT_FIAT, float(price))
+                prefetched += 1
+        return prefetched
+
+    def __crypto_api(self) -> tuple[ConfiguredTool, str, dict[str, str]]:
+        api_url = f"https://pro-api.coinmarketcap.com/{CRYPTO_CURRENCY_EXCHANGE.id.replace(".", "/")}"
+        resolved = self.__di.access_token_resolver.require_access_token_for_tool(CRYPTO_CURRENCY_EXCHANGE)
+        headers = {"Accept": "application/json", "X-CMC_PRO_API_KEY": resolved.token.get_secret_value()}
+        crypto_tool: ConfiguredTool = ConfiguredTool(
+            definition = CRYPTO_CURRENCY_EXCHANGE,
+            token = resolved.token,
+            purpose = ToolType.api_crypto_exchange,
+            payer_id = resolved.payer_id,
+            uses_credits = resolved.uses_credits,
+        )
+        return crypto_tool, api_url, headers
+
+    def __get_usd_price(self, symbol: str, crypto_tool: ConfiguredTool, api_url: str, headers: dict[str, str]) -> float:
+        cached_price = self.__get_cached_rate_of_one(symbol, DEFAULT_FIAT)
+        if cached_price:
+            return cached_price
+        params = {"symbol": symbol, "convert": DEFAULT_FIAT}
+        self.__di.rate_limiter.acquire(CRYPTO_CURRENCY_EXCHANGE.id, RATE_LIMIT)
+        fetcher = self.__di.tracked_web_fetcher(crypto_tool, api_url, headers, params, cache_ttl_json = CACHE_TTL)
+        response = fetcher.fetch_json() or {}
+        return float(response["data"][symbol]["quote"][DEFAULT_FIAT]["price"])
+
     def get_fiat_conversion_rate(self, base_currency_code: str, desired_currency_code: str) -> float:
         log.t(f"Fetching fiat conversion rate {base_currency_code}/{desired_currency_code}")
         if base_currency_code not in SUPPORTED_FIAT:
@@ -185,7 +202,7 @@ class ExchangeRateFetcher:
         if cached_rate:
             return cached_rate
 
-        sleep(RATE_LIMIT_DELAY_S)
+        self.__di.rate_limiter.acquire(FIAT_CURRENCY_EXCHANGE.id, RATE_LIMIT)
         api_url = f"https://{FIAT_CURRENCY_EXCHANGE.id}/currency/convert"
         params = {"format": "json", "from": base_currency_code, "to": desired_currency_code, "amount": "1.0"}
         resolved = self.__di.access_token_resolver.require_access_token_for_tool(FIAT_CURRENCY_EXCHANGE)
@@ -0,0 +1,127 @@
+import hashlib
+import math
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from db.schema.document_embedding import DocumentEmbeddingSave
+from di.di import DI
+from util import log
+
+EMBEDDING_BATCH_SIZE = 64
+TOUCH_INTERVAL = timedelta(days = 1)
+
+
+class DocumentEmbeddingIndex:
+    """
+    Persistent page-embedding index keyed by document content hash and embedding model.
+    Only documents that were never seen before go through the (batched) embedding pipeline.
+    Only the vectors are stored, the page text always comes from the document being searched.
+    """
+
+    @dataclass(frozen = True)
+    class IndexedPage:
+        document: Document
+        vector: list[float]
+
+    __di: DI
+
+    def __init__(self, di: DI):
+        self.__di = di
+
+    def load_or_embed(self, pages: list[Document], embeddings: Embeddings, embedding_model: str) -> list[IndexedPage]:
+        content_hash = DocumentEmbeddingIndex.content_hash_of(pages)
+        stored_pages_db = self.__di.document_embedding_crud.get_document(content_hash, embedding_model)
+        if stored_pages_db and len(stored_pages_db) == len(pages):
+            log.t(f"Document index hit for '{content_hash}' ({len(pages)} pages)")
+            self.__touch(content_hash, embedding_model, stored_pages_db[0].last_used_at)
+            return [
+                DocumentEmbeddingIndex.IndexedPage(document = page, vector = unpack_vector(stored_page_db.embedding))
+                for page, stored_page_db in zip(pages, stored_pages_db)
+            ]
+
+        log.t(f"Document index miss for '{content_hash}', embedding {len(pages)} pages")
+        vectors: list[list[float]] = []
+        for start in range(0, len(pages), EMBEDDING_BATCH_SIZE):
+            batch = pages[start:start + EMBEDDING_BATCH_SIZE]
+            vectors.extend(embeddings.embed_documents([page.page_content for page in batch]))
+
+        try:
+            # a savepoint, so that a failure here doesn't roll back the other pending writes of the unit of work
+            with self.__di.db.begin_nested():
+                if stored_pages_db:
+                    # a partial index is useless, replace it completely
+                    self.__di.document_embedding_crud.delete_document(content_hash, embedding_model, commit = False)
+                now = datetime.now()
+                self.__di.document_embedding_crud.create_all(
+                    [
+                        DocumentEmbeddingSave(
+                            content_hash = content_hash,
+                            embedding_model = embedding_model,
+                            page_index = page_index,
+                            page_number = page.metadata.get("page"),
+                            embedding = pack_vector(vector),
+                            last_used_at = now,
+                        )
+                        for page_index, (page, vector) in enumerate(zip(pages, vectors))
+                    ],
+                    commit = False,
+                )
+            self.__di.db.commit()
+        except Exception as e:
+            # a concurrent request might have indexed the same document already
+            log.w(f"Failed to store document index for '{content_hash}'", e)
+        return [
+            DocumentEmbeddingIndex.IndexedPage(document = page, vector = vector)
+            for page, vector in zip(pages, vectors)
+        ]
+
+    def __touch(self, content_hash: str, embedding_model: str, last_used_at: datetime):
+        # documents in use must not expire, but a write on every hit is not needed to keep them
+        now = datetime.now()
+        if now - last_used_at < TOUCH_INTERVAL:
+            return
+        try:
+            with self.__di.db.begin_nested():
+                self.__di.document_embedding_crud.touch_document(content_hash, embedding_model, now, commit = False)
+            self.__di.db.commit()
+        except Exception as e:
+            log.w(f"Failed to refresh document index timestamp for '{content_hash}'", e)
+
+    @staticmethod
+    def search(indexed_pages: list[IndexedPage], query_vector: list[float], k: int) -> list[Document]:
+        scored_pages = [
+            (cosine_similarity(query_vector, indexed_page.vector), index)
+            for index, indexed_page in enumerate(indexed_pages)
+        ]
+        scored_pages.sort(key = lambda scored_page: scored_page[0], reverse = True)
+        return [indexed_pages[index].document for _, index in scored_pages[:k]]
+
+    @staticmethod
+    def content_hash_of(pages: list[Document]) -> str:
+        hash_object = hashlib.sha256()
+        for page in pages:
+            hash_object.update(str(page.metadata.get("page")).encode("utf-8"))
+            hash_object.update(b"\x00")
+            hash_object.update(page.page_content.encode("utf-8"))
+            hash_object.update(b"\x01")
+        return hash_object.hexdigest()
+
+
+def pack_vector(vector: list[float]) -> bytes:
+    return struct.pack(f"<{len(vector)}f", *vector)
+
+
+def unpack_vector(packed: bytes) -> list[float]:
+    return list(struct.unpack(f"<{len(packed) // 4}f", packed))
+
+
+def cosine_similarity(a: list[float], b: list[float]) -> float:
+    norm_a = math.sqrt(math.sumprod(a, a))
+    norm_b = math.sqrt(math.sumprod(b, b))
+    if not norm_a or not norm_b:
+        return 0.0
+    return math.sumprod(a, b) / (norm_a * norm_b)
@@ -3,9 +3,9 @@ from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_core.vectorstores import InMemoryVectorStore
 
 from di.di import DI
+from features.documents.document_embedding_index import DocumentEmbeddingIndex
 from features.external_tools.configured_tool import ConfiguredTool
 from features.external_tools.external_tool import ToolType
 from features.integrations import prompt_resolvers
@@ -26,6 +26,7 @@ class DocumentSearch:
     error: str | None
     __job_id: str
     __embeddings: Embeddings
+    __embedding_model: str
     __loaded_pages: list[Document]
     __additional_context: str
     __copywriter: BaseChatModel
@@ -45,6 +46,7 @@ class DocumentSearch:
         log.t(f"Loaded document pages: {len(self.__loaded_pages)}")
         self.__additional_context = additional_context or DEFAULT_QUESTION
         self.__embeddings = di.openai_embeddings(embedding_tool)
+        self.__embedding_model = embedding_tool.definition.id
         self.__copywriter = di.chat_langchain_model(copywriter_tool)
         self.__di = di
 
@@ -52,10 +54,14 @@ class DocumentSearch:
         log.d(f"Starting document search for job '{self.__job_id}'")
         self.error = None
         try:
-            # run the raw search first
-            document_index = InMemoryVectorStore(self.__embeddings)
-            document_index.add_documents(self.__loaded_pages)
-            results = document_index.similarity_search(query = self.__additional_context, k = SEARCH_RESULT_PAGES)
+            # run the raw search first, only unseen documents get embedded
+            indexed_pages = self.__di.document_embedding_index.load_or_embed(
+                self.__loaded_pages,
+                self.__embeddings,
+                self.__embedding_model,
+            )
+            query_vector = self.__embeddings.embed_query(self.__additional_context)
+            results = DocumentEmbeddingIndex.search(indexed_pages, query_vector, k = SEARCH_RESULT_PAGES)
             log.t(f"Document search returned {len(results)} similarity search results")
             search_results: str = "[Raw Document Search Results]\n\n"
             found_content = False
@@ -4,7 +4,6 @@ import os
 import tempfile
 from urllib.parse import urlparse
 
-import requests
 from google.genai.types import GenerateContentConfig, ImageConfig
 from PIL import Image
 
@@ -21,6 +20,7 @@ from util.config import config
 from util.error_codes import EXTERNAL_EMPTY_RESPONSE, TOO_MANY_INPUT_IMAGES, UNEXPECTED_ERROR, UNSUPPORTED_PROVIDER
 from util.errors import ConfigurationError, ExternalServiceError, InternalError, ValidationError
 from util.functions import extract_url_from_replicate_result, first_key_with_value
+from util.http_transport import http_transport
 
 BOOT_AND_RUN_TIMEOUT_S = 120
 
@@ -80,7 +80,7 @@ class ImageEditor:
             for url, mime_type in zip(self.__image_urls, self.__input_mime_types):
                 suffix = self.__get_suffix(url, mime_type)
                 temp_file = tempfile.NamedTemporaryFile(delete = False, suffix = suffix)
-                response = requests.get(url, headers = DEFAULT_HEADERS)
+                response = http_transport.get(url, headers = DEFAULT_HEADERS)
                 temp_file.write(response.content)
                 temp_file.flush()
                 temp_file.close()
@@ -1,13 +1,13 @@
 import base64
 import re
 
-import requests
 from requests import Response
 
 from util import log
 from util.config import config
 from util.error_codes import EXTERNAL_EMPTY_RESPONSE, FILE_UPLOAD_FAILED, MISSING_IMAGE_INPUTS
 from util.errors import ExternalServiceError, ValidationError
+from util.http_transport import http_transport
 
 UPLOAD_URL = "https://api.imgbb.com/1/upload"
 DEFAULT_EXPIRATION_M = 5  # minutes
@@ -51,7 +51,7 @@ class ImageUploader:
             }
             if self.__name:
                 data["name"] = self.__name
-            response = requests.post(UPLOAD_URL, data = data, timeout = config.web_timeout_s * 2)
+            response = http_transport.post(UPLOAD_URL, data = data, timeout = config.web_timeout_s * 2)
             log.t(f"Response HTTP-{response.status_code} received!")
             response.raise_for_status()
             response_data = response.json()
@@ -3,8 +3,6 @@ from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import Literal
 
-import requests
-
 from db.model.chat_config import ChatConfigDB
 from db.schema.chat_config import ChatConfig
 from db.schema.chat_message import ChatMessage
@@ -18,6 +16,7 @@ from util import log
 from util.error_codes import UNSUPPORTED_CHAT_TYPE
 from util.errors import ConfigurationError
 from util.functions import delete_file_safe
+from util.http_transport import http_transport
 
 
 class ChatAccess(Enum):
@@ -213,7 +212,7 @@ class PlatformBotSDK:
 
         try:
             try:
-                head_response = requests.head(photo_url, timeout = 10, allow_redirects = True)
+                head_response = http_transport.head(photo_url, timeout = 10, allow_redirects = True)
                 content_length = head_response.headers.get("Content-Length")
 
                 if content_length:
@@ -228,7 +227,7 @@ class PlatformBotSDK:
             with NamedTemporaryFile(delete = False, suffix = Path(photo_url).suffix or ".img") as tmp:
                 temp_path = tmp.name
                 log.t(f"Downloading image to temp file: {temp_path}")
-                with requests.get(photo_url, timeout = 30, stream = True) as response:
+                with http_transport.get(photo_url, timeout = 30, stream = True) as response:
                     response.raise_for_status()
                     for chunk in response.iter_content(chunk_size = 1024 * 256):
                         if not chunk:
@@ -14,12 +14,13 @@ from features.external_tools.external_tool_provider_library import (
     PERPLEXITY,
     XAI,
 )
+from features.llm.llm_client_pool import LLMClientPool, shared_client_pool
 from util.config import config
 from util.error_codes import UNSUPPORTED_PROVIDER
 from util.errors import ConfigurationError
 
 
-def create(configured_tool: ConfiguredTool) -> BaseChatModel:
+def create(configured_tool: ConfiguredTool, pool: LLMClientPool = shared_client_pool) -> BaseChatModel:
     definition = configured_tool.definition
     purpose = configured_tool.purpose
 
@@ -31,7 +32,19 @@ def create(configured_tool: ConfiguredTool) -> BaseChatModel:
         "max_retries": config.web_retries,
         "api_key": configured_tool.token,
     }
+    key = LLMClientPool.Key(
+        provider_id = definition.provider.id,
+        model_id = definition.id,
+        token_fingerprint = LLMClientPool.fingerprint(configured_tool.token.get_secret_value()),
+        temperature = model_args["temperature"],
+        max_tokens = model_args["max_tokens"],
+        timeout_s = model_args["timeout"],
+        max_retries = model_args["max_retries"],
+    )
+    return pool.get_or_create(key, lambda: __build_client(definition, model_args))
 
+
+def __build_client(definition: ExternalTool, model_args: dict) -> BaseChatModel:
     match definition.provider.id:
         case OPEN_AI.id:
             return ChatOpenAI(**model_args)
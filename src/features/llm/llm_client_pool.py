@@ -0,0 +1,100 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from langchain_core.language_models import BaseChatModel
+
+from util.config import config
+
+
+class LLMClientPool:
+    """
+    Process-wide, bounded LRU of LangChain chat clients.
+    Clients are keyed by provider, model, API-key fingerprint and request settings, so each one
+    keeps its HTTP connection pool across turns. Raw API keys never become part of a pool key,
+    and a rotated key simply misses the pool while the old client ages out.
+    """
+
+    @dataclass(frozen = True)
+    class Key:
+        provider_id: str
+        model_id: str
+        token_fingerprint: str
+        temperature: float
+        max_tokens: int
+        timeout_s: float
+        max_retries: int
+
+    @dataclass(frozen = True)
+    class Entry:
+        client: BaseChatModel
+        created_at: datetime
+
+    __entries: OrderedDict[Key, Entry]
+    __max_entries: int
+    __max_age: timedelta
+    __now: Callable[[], datetime]
+    __lock: threading.Lock
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_age_s: int,
+        now: Callable[[], datetime] = datetime.now,
+    ):
+        self.__entries = OrderedDict()
+        self.__max_entries = max_entries
+        self.__max_age = timedelta(seconds = max_age_s)
+        self.__now = now
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get_or_create(self, key: Key, factory: Callable[[], BaseChatModel]) -> BaseChatModel:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and not self.__is_stale(entry):
+                self.__entries.move_to_end(key)
+                return entry.client
+        # building a client is slow-ish, don't hold the lock while doing it
+        client = factory()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and not self.__is_stale(entry):
+                # another thread won the race, keep a single client per key
+                self.__entries.move_to_end(key)
+                return entry.client
+            self.__entries[key] = LLMClientPool.Entry(client = client, created_at = self.__now())
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last = False)
+            return client
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def reset_after_fork(self):
+        # clients hold the parent's connection pools, and the lock may have been held by a thread that didn't fork
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        return len(self.__entries)
+
+    def __is_stale(self, entry: Entry) -> bool:
+        return self.__now() - entry.created_at > self.__max_age
+
+
+shared_client_pool = LLMClientPool(
+    max_entries = config.llm_client_pool_max_entries,
+    max_age_s = config.llm_client_pool_max_age_s,
+)
+os.register_at_fork(after_in_child = shared_client_pool.reset_after_fork)
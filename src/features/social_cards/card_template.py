@@ -3,9 +3,8 @@ import io
 import re
 import urllib.request
 from datetime import datetime, timezone
-from pathlib import Path
 
-from PIL import Image, ImageFont
+from PIL import Image
 
 from features.social_cards.card_layout import (
     AVATAR_GAP,
@@ -29,11 +28,12 @@ from features.social_cards.card_layout import (
     PHOTO_GAP,
     X_ICON_SIZE,
 )
+from features.social_cards.font_registry import font_registry
 from features.social_cards.theme import ThemeColors
 from features.web_browsing.twitter_status_fetcher import TweetData
 from util.config import config
 
-_FONT_PATH = Path(config.fonts_dir) / "Heebo-Variable.ttf"
+_FONT_PATH = font_registry.font_path
 _FONT_NAME = "Heebo"
 _EMOJI_FONT_NAME = "Noto Color Emoji"
 
@@ -153,27 +153,12 @@ def _photo_sort_key(data: bytes) -> int:
         return 1
 
 
-def _pillow_font(size: int) -> ImageFont.FreeTypeFont:
-    return ImageFont.truetype(str(_FONT_PATH), size)
-
-
-def _emoji_pillow_font(size: int) -> ImageFont.FreeTypeFont | None:
-    for p in Path(config.fonts_dir).glob("*.ttf"):
-        if "emoji" in p.name.lower() or "colr" in p.name.lower():
-            return ImageFont.truetype(str(p), size)
-    return None
-
-
 def _text_width(text: str, size: int) -> int:
-    font = _pillow_font(size)
-    return round(font.getlength(text))
+    return round(font_registry.text_length(text, size))
 
 
 def _emoji_text_width(text: str, size: int) -> int:
-    emoji_font = _emoji_pillow_font(size)
-    if emoji_font is None:
-        return _text_width(text, size)
-    return round(emoji_font.getlength(text))
+    return round(font_registry.text_length(text, size, is_emoji = True))
 
 
 def _word_wrap(text: str, max_width: int, font_size: int) -> list[str]:
@@ -184,14 +169,22 @@ def _word_wrap(text: str, max_width: int, font_size: int) -> list[str]:
             continue
         words = paragraph.split(" ")
         current = ""
+        current_length = 0.0
         for word in words:
             candidate = (current + " " + word).strip()
-            if _text_width(candidate, font_size) <= max_width:
+            if current and candidate == current + " " + word:
+                # glyph advances are additive, so only the new word needs measuring
+                candidate_length = current_length + font_registry.text_length(" " + word, font_size)
+            else:
+                candidate_length = font_registry.text_length(candidate, font_size)
+            if round(candidate_length) <= max_width:
                 current = candidate
+                current_length = candidate_length
             else:
                 if current:
                     lines.append(current)
                 current = word
+                current_length = font_registry.text_length(word, font_size)
         if current:
             lines.append(current)
     return lines or [""]
@@ -0,0 +1,70 @@
+import threading
+from pathlib import Path
+
+from PIL import ImageFont
+
+from util.config import config
+
+MAX_CACHED_WIDTHS = 50_000
+
+
+class FontRegistry:
+    """
+    Process-wide cache for card text layout: fonts are parsed once per (file, size) and text widths are memoized.
+    The fonts directory is scanned only once, when the registry is created.
+    """
+
+    font_path: Path
+    emoji_font_path: Path | None
+    font_files: list[str]
+    __fonts: dict[tuple[Path, int], ImageFont.FreeTypeFont]
+    __lengths: dict[tuple[str, int, bool], float]
+    __max_cached_widths: int
+    __lock: threading.Lock
+
+    def __init__(self, fonts_dir: Path, font_file_name: str, max_cached_widths: int = MAX_CACHED_WIDTHS):
+        self.font_path = fonts_dir / font_file_name
+        font_paths = sorted(path for path in fonts_dir.glob("*.ttf") if path.is_file())
+        self.font_files = [str(path) for path in font_paths]
+        self.emoji_font_path = next(
+            (path for path in font_paths if "emoji" in path.name.lower() or "colr" in path.name.lower()),
+            None,
+        )
+        self.__fonts = {}
+        self.__lengths = {}
+        self.__max_cached_widths = max_cached_widths
+        self.__lock = threading.Lock()
+
+    def font(self, size: int) -> ImageFont.FreeTypeFont:
+        return self.__load(self.font_path, size)
+
+    def emoji_font(self, size: int) -> ImageFont.FreeTypeFont | None:
+        if self.emoji_font_path is None:
+            return None
+        return self.__load(self.emoji_font_path, size)
+
+    def text_length(self, text: str, size: int, is_emoji: bool = False) -> float:
+        key = (text, size, is_emoji)
+        length = self.__lengths.get(key)
+        if length is None:
+            font = (self.emoji_font(size) if is_emoji else None) or self.font(size)
+            with self.__lock:
+                length = font.getlength(text)
+                if len(self.__lengths) >= self.__max_cached_widths:
+                    self.__lengths.clear()
+                self.__lengths[key] = length
+        return length
+
+    def __load(self, path: Path, size: int) -> ImageFont.FreeTypeFont:
+        key = (path, size)
+        font = self.__fonts.get(key)
+        if font is None:
+            with self.__lock:
+                font = self.__fonts.get(key)
+                if font is None:
+                    font = ImageFont.truetype(str(path), size)
+                    self.__fonts[key] = font
+        return font
+
+
+font_registry = FontRegistry(Path(config.fonts_dir), "Heebo-Variable.ttf")
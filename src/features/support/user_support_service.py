@@ -1,7 +1,6 @@
 import os
 from enum import Enum
 
-import requests
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
@@ -14,6 +13,7 @@ from util import log
 from util.config import config
 from util.error_codes import LLM_UNEXPECTED_RESPONSE
 from util.errors import ExternalServiceError
+from util.http_transport import http_transport
 
 GITHUB_BASE_URL = "https://api.github.com"
 
@@ -117,7 +117,7 @@ class UserSupportService:
         issue_description = self.__generate_issue_description()
         issue_title = self.__generate_issue_title(issue_description)
         github_token = config.github_issues_token.get_secret_value()
-        response = requests.post(
+        response = http_transport.post(
             f"{GITHUB_BASE_URL}/repos/{config.github_issues_repo}/issues",
             json = {
                 "title": issue_title,
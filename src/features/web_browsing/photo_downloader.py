@@ -1,9 +1,8 @@
-import requests
-
 from util import log
 from util.config import config
 from util.error_codes import WEB_FETCH_FAILED
 from util.errors import ExternalServiceError
+from util.http_transport import http_transport
 
 
 class PhotoDownloader:
@@ -18,7 +17,7 @@ class PhotoDownloader:
             headers = {"User-Agent": "Mozilla/5.0 (compatible; AppifyHub-Agent/1.0)"}
             if self.__bearer_token:
                 headers["Authorization"] = f"Bearer {self.__bearer_token}"
-            response = requests.get(url, headers = headers, timeout = config.web_timeout_s)
+            response = http_transport.get(url, headers = headers, timeout = config.web_timeout_s)
             response.raise_for_status()
             return response.content
         except Exception as e:
@@ -1,7 +1,6 @@
 import json
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from time import sleep
 from typing import Any
 
 from db.schema.tools_cache import ToolsCache, ToolsCacheSave
@@ -14,11 +13,12 @@ from util import log
 from util.config import config
 from util.error_codes import EXTERNAL_EMPTY_RESPONSE
 from util.errors import ExternalServiceError
+from util.rate_limiter import RateLimiter
 
 CACHE_PREFIX = "twitter-status-fetcher"
 CACHE_PREFIX_STRUCTURED = "twitter-status-fetcher-json"
 CACHE_TTL = timedelta(weeks = 1)
-RATE_LIMIT_DELAY_S = 2
+RATE_LIMIT = RateLimiter.Budget(rate_per_s = config.twitter_api_rate_per_s, burst = config.twitter_api_burst)
 
 
 @dataclass
@@ -112,7 +112,7 @@ class TwitterStatusFetcher:
             "media.fields": "url,type,preview_image_url",
         }
 
-        sleep(RATE_LIMIT_DELAY_S)
+        self.__di.rate_limiter.acquire(self.__x_api_tool.definition.id, RATE_LIMIT)
         response = self.__http_client.get(api_url, headers = headers, params = params, timeout = config.web_timeout_s)
         response.raise_for_status()
         response_json = response.json() or {}
@@ -1,8 +1,7 @@
-import requests
-
 from features.web_browsing.uri_cleanup import simplify_url
 from util import log
 from util.config import config
+from util.http_transport import http_transport
 
 
 def resolve_tweet_id(url: str) -> str | None:
@@ -12,7 +11,7 @@ def resolve_tweet_id(url: str) -> str | None:
         shorteners = ["t.co", "x.co", "bit.ly", "tinyurl.com", "ow.ly", "buff.ly"]
         # follow redirects and unfurl first (if needed)
         if any(simple_domain == shortener for shortener in shorteners):
-            simple_url = simplify_url(requests.get(url, timeout = config.web_timeout_s).url)
+            simple_url = simplify_url(http_transport.get(url, timeout = config.web_timeout_s).url)
         if simple_url.startswith("twitter.com") or simple_url.startswith("x.com"):
             parts = simple_url.split("/")
             if len(parts) > 3 and parts[2] == "status":
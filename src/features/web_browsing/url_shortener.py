@@ -1,12 +1,12 @@
 from datetime import datetime
 
-import requests
 from requests import Response
 
 from util import log
 from util.config import config
 from util.error_codes import EXTERNAL_EMPTY_RESPONSE, MISSING_URL, URL_SHORTENER_FAILED
 from util.errors import ExternalServiceError, ValidationError
+from util.http_transport import http_transport
 
 
 class UrlShortener:
@@ -57,7 +57,7 @@ class UrlShortener:
                 payload["maxVisits"] = self.__max_visits
             log.t("  Sending payload", payload)
 
-            response = requests.post(api_endpoint, json = payload, headers = headers, timeout = config.web_timeout_s * 2)
+            response = http_transport.post(api_endpoint, json = payload, headers = headers, timeout = config.web_timeout_s * 2)
             log.t(f"Response HTTP-{response.status_code} received!")
             response.raise_for_status()
             response_data = response.json()
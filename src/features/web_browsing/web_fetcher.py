@@ -4,7 +4,6 @@ import time
 from datetime import datetime, timedelta
 from typing import Any
 
-import requests
 from requests.exceptions import RequestException, Timeout
 
 from db.schema.tools_cache import ToolsCache, ToolsCacheSave
@@ -15,6 +14,7 @@ from features.web_browsing.twitter_utils import resolve_tweet_id
 from features.web_browsing.uri_cleanup import simplify_url
 from util import log
 from util.config import config
+from util.http_transport import http_transport
 
 PLATFORM = f"{platform.python_implementation()}/{platform.python_version()}"
 USER_AGENT = f"Mozilla/5.0 (compatible; TheAgent/1.0; {PLATFORM})"
@@ -106,7 +106,7 @@ class WebFetcher:
                     self.html = f"<html><body>\n<p>\n{response_text}\n</p>\n</body></html>"
                 else:
                     # run a standard request for a web page
-                    response = requests.get(
+                    response = http_transport.get(
                         self.url,
                         headers = self.__headers,
                         params = self.__params,
@@ -160,7 +160,7 @@ class WebFetcher:
                     response_text = self.__tweet_fetcher.execute()
                     self.json = {"content": response_text}
                 else:
-                    response = requests.get(
+                    response = http_transport.get(
                         self.url,
                         headers = self.__headers,
                         params = self.__params,
@@ -45,8 +45,10 @@ from db.sql import get_session, initialize_db
 from di.di import DI
 from features.accounting.purchases.purchase_aggregates import PurchaseAggregates
 from features.accounting.purchases.purchase_record import PurchaseRecord
+from features.accounting.purchases.purchase_record_page import PurchaseRecordPage
 from features.accounting.usage.usage_aggregates import UsageAggregates
 from features.accounting.usage.usage_record import UsageRecord
+from features.accounting.usage.usage_record_page import UsageRecordPage
 from features.chat.telegram.currency_alert_responder import respond_with_currency_alerts
 from features.chat.telegram.model.update import Update as TelegramUpdate
 from features.chat.telegram.release_summary_responder import respond_with_summary
@@ -59,6 +61,7 @@ from util.config import Config, config
 from util.error_codes import INVALID_CHAT_TYPE_TOKEN, UNEXPECTED_ERROR
 from util.errors import ServiceError, ValidationError
 from util.functions import parse_gumroad_form
+from util.worker_server import WorkerServer
 
 
 # noinspection PyUnusedLocal
@@ -68,7 +71,8 @@ async def lifespan(owner: FastAPI):
     worker_type = "main" if process_name == "MainProcess" else "worker"
     worker_info = f"[{worker_type}-{os.getpid()}] {process_name}"
     log.i(f"Lifecycle: Starting up {worker_info}")
-    initialize_db()
+    # with several workers, the schema is left to the migrations that ran once before the workers started
+    initialize_db(create_schema = config.web_workers == 1)
     yield  # this holds the app alive until the server is shut down
     log.i(f"Lifecycle: Shutting down {worker_info}...")
 
@@ -403,6 +407,44 @@ def get_usage_records(
     )
 
 
+@app.get("/user/{user_id}/usage/page")
+def get_usage_record_page(
+    user_id: str,
+    cursor: str | None = None,
+    limit: int = 50,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    exclude_self: bool = False,
+    include_sponsored: bool = False,
+    include_transfers: bool = True,
+    only_transfers: bool = False,
+    tool_id: str | None = None,
+    purpose: str | None = None,
+    provider_id: str | None = None,
+    db = Depends(get_session),
+    token: dict[str, Any] = Depends(verify_jwt_credentials),
+) -> UsageRecordPage:
+    invoker_id_hex = get_user_id_from_jwt(token)
+    log.d(f"  Invoker ID: {invoker_id_hex}")
+    start_date_obj = datetime.fromisoformat(start_date) if start_date else None
+    end_date_obj = datetime.fromisoformat(end_date) if end_date else None
+    di = DI(db, invoker_id_hex)
+    return di.usage_controller.fetch_usage_record_page(
+        user_id_hex = user_id,
+        cursor = cursor,
+        limit = limit,
+        start_date = start_date_obj,
+        end_date = end_date_obj,
+        exclude_self = exclude_self,
+        include_sponsored = include_sponsored,
+        include_transfers = include_transfers,
+        only_transfers = only_transfers,
+        tool_id = tool_id,
+        purpose = purpose,
+        provider_id = provider_id,
+    )
+
+
 @app.get("/user/{user_id}/usage/stats")
 def get_usage_stats(
     user_id: str,
@@ -463,6 +505,32 @@ def get_purchase_records(
     )
 
 
+@app.get("/user/{user_id}/purchases/page")
+def get_purchase_record_page(
+    user_id: str,
+    cursor: str | None = None,
+    limit: int = 50,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    product_id: str | None = None,
+    db = Depends(get_session),
+    token: dict[str, Any] = Depends(verify_jwt_credentials),
+) -> PurchaseRecordPage:
+    invoker_id_hex = get_user_id_from_jwt(token)
+    log.d(f"  Invoker ID: {invoker_id_hex}")
+    start_date_obj = datetime.fromisoformat(start_date) if start_date else None
+    end_date_obj = datetime.fromisoformat(end_date) if end_date else None
+    di = DI(db, invoker_id_hex)
+    return di.purchases_controller.fetch_purchase_record_page(
+        user_id_hex = user_id,
+        cursor = cursor,
+        limit = limit,
+        start_date = start_date_obj,
+        end_date = end_date_obj,
+        product_id = product_id,
+    )
+
+
 @app.get("/user/{user_id}/purchases/stats")
 def get_purchase_stats(
     user_id: str,
@@ -562,9 +630,9 @@ if __name__ == "__main__":
             os.environ["API_KEY"] = api_key
             config.api_key = SecretStr(api_key)
             print("WARN:     Generated a new API key!", config.api_key.get_secret_value(), file = sys.stderr)
-        workers = 1
+        workers = config.web_workers
         reload = False
-        # and run the database migrations
+        # and run the database migrations (once, before any worker starts)
         print("INFO:     Running database migrations...")
         subprocess.run(["./tools/db_apply_migration.sh", "-y"], check = True)
         print("INFO:     Launching in production mode...")
@@ -585,11 +653,15 @@ if __name__ == "__main__":
         print("WARN:     pyproject.toml not found, using dev version", file = sys.stderr)
 
     # finally, start the server
-    uvicorn.run(
-        "main:app",
-        host = "0.0.0.0",
-        port = 80,
-        log_level = uvicorn_log_level,
-        workers = workers,
-        reload = reload,
-    )
+    if workers > 1:
+        print(f"INFO:     Starting {workers} workers from a preloaded app...")
+        WorkerServer("main:app", workers = workers, port = 80, log_level = uvicorn_log_level).run()
+    else:
+        uvicorn.run(
+            "main:app",
+            host = "0.0.0.0",
+            port = 80,
+            log_level = uvicorn_log_level,
+            workers = workers,
+            reload = reload,
+        )
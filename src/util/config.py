@@ -31,8 +31,17 @@ class Config(metaclass = Singleton):
     web_retries: int
     web_retry_delay_s: int
     web_timeout_s: int
+    http_pool_connections: int
+    http_pool_maxsize: int
+    http_connect_timeout_s: int
+    exchange_rate_api_rate_per_s: float
+    exchange_rate_api_burst: int
+    twitter_api_rate_per_s: float
+    twitter_api_burst: int
     max_users: int
     max_chatbot_iterations: int
+    chat_tool_concurrency: int
+    chat_tool_timeout_s: float
     website_url: str
     parent_organization: str
     agent_bot_name: str
@@ -52,9 +61,15 @@ class Config(metaclass = Singleton):
     whatsapp_bot_phone_number: str
     chat_history_depth: int
     chat_debounce_delay_s: float
+    chat_debounce_workers: int
+    chat_access_cache_ttl_s: int
+    chat_access_cache_max_entries: int
     cleanup_message_retention_days: int
     cleanup_price_alert_staleness_days: int
     cleanup_sponsorship_staleness_days: int
+    cleanup_document_embedding_retention_days: int
+    cleanup_chunk_size: int
+    cleanup_time_budget_s: int
     github_issues_repo: str
     issue_templates_abs_path: str
     jwt_expires_in_minutes: int
@@ -71,6 +86,15 @@ class Config(metaclass = Singleton):
     logos_config_path: str
     logos: dict[str, str]
     fonts_dir: str
+    tools_cache_memory_max_entries: int
+    tools_cache_memory_max_size_bytes: int
+    tools_cache_memory_max_age_s: int
+    llm_client_pool_max_entries: int
+    llm_client_pool_max_age_s: int
+    db_encryption_backend: str
+    db_encryption_key_version: int
+    web_workers: int
+    db_connection_budget: int
 
     platform_open_ai_key: SecretStr
     platform_anthropic_key: SecretStr
@@ -96,6 +120,7 @@ class Config(metaclass = Singleton):
     token_encrypt_secret: SecretStr
     uploadcare_private_key: SecretStr
     url_shortener_api_key: SecretStr
+    db_encryption_keys: SecretStr
 
     def all_secrets(self) -> list[SecretStr]:
         return [
@@ -113,6 +138,7 @@ class Config(metaclass = Singleton):
             self.token_encrypt_secret,
             self.uploadcare_private_key,
             self.url_shortener_api_key,
+            self.db_encryption_keys,
             self.platform_open_ai_key,
             self.platform_anthropic_key,
             self.platform_google_ai_key,
@@ -133,8 +159,17 @@ class Config(metaclass = Singleton):
         def_web_retries: int = 3,
         def_web_retry_delay_s: int = 1,
         def_web_timeout_s: int = 10,
+        def_http_pool_connections: int = 32,
+        def_http_pool_maxsize: int = 16,
+        def_http_connect_timeout_s: int = 5,
+        def_exchange_rate_api_rate_per_s: float = 1.0,
+        def_exchange_rate_api_burst: int = 5,
+        def_twitter_api_rate_per_s: float = 0.5,
+        def_twitter_api_burst: int = 3,
         def_max_users: int = 100,
         def_max_chatbot_iterations: int = 20,
+        def_chat_tool_concurrency: int = 4,
+        def_chat_tool_timeout_s: float = 120.0,
         def_website_url: str = "https://agent.appifyhub.com",
         def_parent_organization: str = "AppifyHub",
         def_agent_bot_name: str = "The Agent",
@@ -154,9 +189,15 @@ class Config(metaclass = Singleton):
         def_whatsapp_bot_phone_number: str = "11234567890",
         def_chat_history_depth: int = 30,
         def_chat_debounce_delay_s: float = 1.0,
+        def_chat_debounce_workers: int = 8,
+        def_chat_access_cache_ttl_s: int = 300,
+        def_chat_access_cache_max_entries: int = 10000,
         def_cleanup_message_retention_days: int = 30,
         def_cleanup_price_alert_staleness_days: int = 360,
         def_cleanup_sponsorship_staleness_days: int = 30,
+        def_cleanup_document_embedding_retention_days: int = 90,
+        def_cleanup_chunk_size: int = 1000,
+        def_cleanup_time_budget_s: int = 60,
         def_github_issues_repo: str = "appifyhub/agent-backend",
         def_issue_templates_path: str = ".github/ISSUE_TEMPLATE",
         def_jwt_expires_in_minutes: int = 30,
@@ -171,6 +212,15 @@ class Config(metaclass = Singleton):
         def_products_config_path: str = "config/products.yaml",
         def_logos_config_path: str = "config/logos.yaml",
         def_fonts_dir: str = "src/assets/fonts",
+        def_tools_cache_memory_max_entries: int = 2048,
+        def_tools_cache_memory_max_size_bytes: int = 33554432,
+        def_tools_cache_memory_max_age_s: int = 300,
+        def_llm_client_pool_max_entries: int = 64,
+        def_llm_client_pool_max_age_s: int = 3600,
+        def_db_encryption_backend: str = "pgcrypto",
+        def_db_encryption_key_version: int = 1,
+        def_web_workers: int = 1,
+        def_db_connection_budget: int = 13,
         def_platform_open_ai_key: SecretStr = SecretStr("invalid"),
         def_platform_anthropic_key: SecretStr = SecretStr("invalid"),
         def_platform_google_ai_key: SecretStr = SecretStr("invalid"),
@@ -197,6 +247,7 @@ class Config(metaclass = Singleton):
         def_token_encrypt_secret: SecretStr = SecretStr("default"),
         def_uploadcare_private_key: SecretStr = SecretStr("invalid"),
         def_url_shortener_api_key: SecretStr = SecretStr("invalid"),
+        def_db_encryption_keys: SecretStr = SecretStr("invalid"),
     ):
         # @formatter:off
         self.max_sponsorships_per_user = int(self.__env("MAX_SPONSORSHIPS_PER_USER", lambda: str(def_max_sponsorships_per_user)))
@@ -206,8 +257,17 @@ class Config(metaclass = Singleton):
         self.web_retries = int(self.__env("WEB_RETRIES", lambda: str(def_web_retries)))
         self.web_retry_delay_s = int(self.__env("WEB_RETRY_DELAY_S", lambda: str(def_web_retry_delay_s)))
         self.web_timeout_s = int(self.__env("WEB_TIMEOUT_S", lambda: str(def_web_timeout_s)))
+        self.http_pool_connections = int(self.__env("HTTP_POOL_CONNECTIONS", lambda: str(def_http_pool_connections)))
+        self.http_pool_maxsize = int(self.__env("HTTP_POOL_MAXSIZE", lambda: str(def_http_pool_maxsize)))
+        self.http_connect_timeout_s = int(self.__env("HTTP_CONNECT_TIMEOUT_S", lambda: str(def_http_connect_timeout_s)))
+        self.exchange_rate_api_rate_per_s = float(self.__env("EXCHANGE_RATE_API_RATE_PER_S", lambda: str(def_exchange_rate_api_rate_per_s)))
+        self.exchange_rate_api_burst = int(self.__env("EXCHANGE_RATE_API_BURST", lambda: str(def_exchange_rate_api_burst)))
+        self.twitter_api_rate_per_s = float(self.__env("TWITTER_API_RATE_PER_S", lambda: str(def_twitter_api_rate_per_s)))
+        self.twitter_api_burst = int(self.__env("TWITTER_API_BURST", lambda: str(def_twitter_api_burst)))
         self.max_users = int(self.__env("MAX_USERS", lambda: str(def_max_users)))
         self.max_chatbot_iterations = int(self.__env("MAX_CHATBOT_ITERATIONS", lambda: str(def_max_chatbot_iterations)))
+        self.chat_tool_concurrency = int(self.__env("CHAT_TOOL_CONCURRENCY", lambda: str(def_chat_tool_concurrency)))
+        self.chat_tool_timeout_s = float(self.__env("CHAT_TOOL_TIMEOUT_S", lambda: str(def_chat_tool_timeout_s)))
         self.website_url = self.__env("WEBSITE_URL", lambda: def_website_url)
         self.parent_organization = self.__env("PARENT_ORGANIZATION", lambda: def_parent_organization)
         self.agent_bot_name = self.__env("AGENT_BOT_NAME", lambda: def_agent_bot_name)
@@ -227,9 +287,15 @@ class Config(metaclass = Singleton):
         self.whatsapp_bot_phone_number = self.__env("WHATSAPP_BOT_PHONE_NUMBER", lambda: def_whatsapp_bot_phone_number)
         self.chat_history_depth = int(self.__env("CHAT_HISTORY_DEPTH", lambda: str(def_chat_history_depth)))
         self.chat_debounce_delay_s = float(self.__env("CHAT_DEBOUNCE_DELAY_S", lambda: str(def_chat_debounce_delay_s)))
+        self.chat_debounce_workers = int(self.__env("CHAT_DEBOUNCE_WORKERS", lambda: str(def_chat_debounce_workers)))
+        self.chat_access_cache_ttl_s = int(self.__env("CHAT_ACCESS_CACHE_TTL_S", lambda: str(def_chat_access_cache_ttl_s)))
+        self.chat_access_cache_max_entries = int(self.__env("CHAT_ACCESS_CACHE_MAX_ENTRIES", lambda: str(def_chat_access_cache_max_entries)))
         self.cleanup_message_retention_days = int(self.__env("CLEANUP_MESSAGE_RETENTION_DAYS", lambda: str(def_cleanup_message_retention_days)))
         self.cleanup_price_alert_staleness_days = int(self.__env("CLEANUP_PRICE_ALERT_STALENESS_DAYS", lambda: str(def_cleanup_price_alert_staleness_days)))
         self.cleanup_sponsorship_staleness_days = int(self.__env("CLEANUP_SPONSORSHIP_STALENESS_DAYS", lambda: str(def_cleanup_sponsorship_staleness_days)))
+        self.cleanup_document_embedding_retention_days = int(self.__env("CLEANUP_DOCUMENT_EMBEDDING_RETENTION_DAYS", lambda: str(def_cleanup_document_embedding_retention_days)))
+        self.cleanup_chunk_size = int(self.__env("CLEANUP_CHUNK_SIZE", lambda: str(def_cleanup_chunk_size)))
+        self.cleanup_time_budget_s = int(self.__env("CLEANUP_TIME_BUDGET_S", lambda: str(def_cleanup_time_budget_s)))
         self.github_issues_repo = self.__env("THE_AGENT_ISSUES_REPO", lambda: def_github_issues_repo)
         self.issue_templates_abs_path = self.__env("THE_AGENT_ISSUE_TEMPLATES_PATH", lambda: def_issue_templates_path)
         self.jwt_expires_in_minutes = int(self.__env("JWT_EXPIRES_IN_MINUTES", lambda: str(def_jwt_expires_in_minutes)))
@@ -246,6 +312,15 @@ class Config(metaclass = Singleton):
         self.logos_config_path = self.__env("LOGOS_CONFIG_PATH", lambda: def_logos_config_path)
         self.logos = self.__load_logos()
         self.fonts_dir = self.__env("FONTS_DIR", lambda: def_fonts_dir)
+        self.tools_cache_memory_max_entries = int(self.__env("TOOLS_CACHE_MEMORY_MAX_ENTRIES", lambda: str(def_tools_cache_memory_max_entries)))
+        self.tools_cache_memory_max_size_bytes = int(self.__env("TOOLS_CACHE_MEMORY_MAX_SIZE_BYTES", lambda: str(def_tools_cache_memory_max_size_bytes)))
+        self.tools_cache_memory_max_age_s = int(self.__env("TOOLS_CACHE_MEMORY_MAX_AGE_S", lambda: str(def_tools_cache_memory_max_age_s)))
+        self.llm_client_pool_max_entries = int(self.__env("LLM_CLIENT_POOL_MAX_ENTRIES", lambda: str(def_llm_client_pool_max_entries)))
+        self.llm_client_pool_max_age_s = int(self.__env("LLM_CLIENT_POOL_MAX_AGE_S", lambda: str(def_llm_client_pool_max_age_s)))
+        self.db_encryption_backend = self.__env("DB_ENCRYPTION_BACKEND", lambda: def_db_encryption_backend).lower()
+        self.db_encryption_key_version = int(self.__env("DB_ENCRYPTION_KEY_VERSION", lambda: str(def_db_encryption_key_version)))
+        self.web_workers = int(self.__env("WEB_WORKERS", lambda: str(def_web_workers)))
+        self.db_connection_budget = int(self.__env("DB_CONNECTION_BUDGET", lambda: str(def_db_connection_budget)))
 
         self.__set_up_db(def_db_user, def_db_pass, def_db_host, def_db_name)
         self.api_key = self.__senv("API_KEY", lambda: def_api_key)
@@ -261,6 +336,7 @@ class Config(metaclass = Singleton):
         self.token_encrypt_secret = self.__senv("TOKEN_ENCRYPT_SECRET", lambda: def_token_encrypt_secret)
         self.uploadcare_private_key = self.__senv("UPLOADCARE_PRIVATE_KEY", lambda: def_uploadcare_private_key)
         self.url_shortener_api_key = self.__senv("URL_SHORTENER_API_KEY", lambda: def_url_shortener_api_key)
+        self.db_encryption_keys = self.__senv("DB_ENCRYPTION_KEYS", lambda: def_db_encryption_keys)
         self.platform_open_ai_key = self.__senv("PLATFORM_OPEN_AI_KEY", lambda: def_platform_open_ai_key)
         self.platform_anthropic_key = self.__senv("PLATFORM_ANTHROPIC_KEY", lambda: def_platform_anthropic_key)
         self.platform_google_ai_key = self.__senv("PLATFORM_GOOGLE_AI_KEY", lambda: def_platform_google_ai_key)
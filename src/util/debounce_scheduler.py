@@ -0,0 +1,55 @@
+import os
+import time
+from concurrent.futures import Executor
+from typing import Callable
+
+from util import log
+from util.config import config
+from util.timer_heap import TimerHeap
+
+
+class DebounceScheduler:
+    """
+    Coalesces bursts of work per key: only the last callback submitted for a key runs, once the key stays quiet for
+    the debounce delay. A single timer thread tracks all deadlines, so waiting bursts do not park any worker threads.
+    """
+
+    __timers: TimerHeap
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        use_timer: bool = True,
+    ):
+        self.__timers = TimerHeap(
+            name = "debounce",
+            workers = config.chat_debounce_workers,
+            failure_message = "Debounced work failed",
+            executor = executor,
+            clock = clock,
+            use_timer = use_timer,
+        )
+
+    def submit(self, key: str, delay_s: float, callback: Callable[[], None]):
+        if self.__timers.schedule(key, delay_s, callback):
+            log.d(f"Debounce: superseded pending work for '{key}'")
+
+    def cancel(self, key: str) -> bool:
+        return self.__timers.cancel(key)
+
+    def pending_count(self) -> int:
+        return self.__timers.pending_count()
+
+    def run_due(self) -> int:
+        return self.__timers.run_due()
+
+    def shutdown(self, wait: bool = True):
+        self.__timers.shutdown(wait = wait)
+
+    def reset_after_fork(self):
+        self.__timers.reset_after_fork()
+
+
+debounce_scheduler = DebounceScheduler()
+os.register_at_fork(after_in_child = debounce_scheduler.reset_after_fork)
@@ -36,6 +36,7 @@ SPONSORED_USER_TRANSFER_NOT_ALLOWED = 1035
 TOO_MANY_INPUT_IMAGES = 1037
 EMPTY_CHAT_SETTINGS_PAYLOAD = 1038
 UNSUPPORTED_MEDIA_TYPE = 1039
+INVALID_PAGE_CURSOR = 1040
 
 # Not found errors (2000-2999)
 USER_NOT_FOUND = 2001
@@ -80,6 +81,7 @@ IMAGE_EDIT_FAILED = 5009
 DOCUMENT_SEARCH_FAILED = 5010
 AUDIO_TRANSCRIPTION_FAILED = 5011
 ANNOUNCEMENT_NOT_RECEIVED = 5012
+TOOL_CALL_TIMED_OUT = 5013
 
 # Rate limit errors (6000-6999)
 USER_LIMIT_REACHED = 6001
@@ -88,6 +90,7 @@ USER_LIMIT_REACHED = 6001
 UNSUPPORTED_CHAT_TYPE = 7001
 UNSUPPORTED_PROVIDER = 7002
 MISSING_CHAT_CONTEXT = 7003
+INVALID_ENCRYPTION_CONFIG = 7004
 
 # Internal errors (8000-8999)
 DI_DEPENDENCY_NOT_MET = 8001
@@ -103,4 +106,5 @@ SPONSORSHIP_OPERATION_FAILED = 8011
 UNSPONSOR_SELF_FAILED = 8012
 PROFILE_CONNECT_FAILED = 8013
 TRANSFER_FAILED = 8014
+DECRYPTION_FAILED = 8015
 UNEXPECTED_ERROR = 8999
@@ -0,0 +1,73 @@
+import os
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from util.config import config
+
+
+class HTTPTransport:
+    """
+    Process-wide HTTP transport with per-host keep-alive connection pools.
+    Outbound clients share it instead of paying for a fresh TCP+TLS handshake on every call.
+    """
+
+    __session: requests.Session
+    __default_timeout: tuple[float, float]
+    __pool_connections: int
+    __pool_maxsize: int
+
+    def __init__(
+        self,
+        pool_connections: int,
+        pool_maxsize: int,
+        connect_timeout_s: float,
+        read_timeout_s: float,
+    ):
+        self.__default_timeout = (connect_timeout_s, read_timeout_s)
+        self.__pool_connections = pool_connections
+        self.__pool_maxsize = pool_maxsize
+        self.__session = self.__create_session()
+
+    def __create_session(self) -> requests.Session:
+        session = requests.Session()
+        # clients talk to unrelated services, cookies must never leak between them
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains = []))
+        adapter = HTTPAdapter(pool_connections = self.__pool_connections, pool_maxsize = self.__pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.__default_timeout
+        return self.__session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Response:
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> Response:
+        kwargs.setdefault("allow_redirects", False)  # same as requests.head
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self):
+        self.__session.close()
+
+    def reset_after_fork(self):
+        # pooled sockets belong to the parent process, a forked worker starts with pools of its own
+        self.__session = self.__create_session()
+
+
+http_transport = HTTPTransport(
+    pool_connections = config.http_pool_connections,
+    pool_maxsize = config.http_pool_maxsize,
+    connect_timeout_s = config.http_connect_timeout_s,
+    read_timeout_s = config.web_timeout_s,
+)
+os.register_at_fork(after_in_child = http_transport.reset_after_fork)
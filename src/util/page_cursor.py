@@ -0,0 +1,27 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from util.error_codes import INVALID_PAGE_CURSOR
+from util.errors import ValidationError
+
+CURSOR_SEPARATOR = "|"
+
+
+def encode_cursor(timestamp: datetime, record_id: UUID) -> str:
+    """
+    Packs the sort key of the last record on a page into an opaque token for fetching the next page.
+    Clients pass the token back as it is, so the format can change without breaking them.
+    """
+    raw = f"{timestamp.isoformat()}{CURSOR_SEPARATOR}{record_id.hex}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_timestamp, raw_id = base64.urlsafe_b64decode(padded.encode()).decode().split(CURSOR_SEPARATOR)
+        return datetime.fromisoformat(raw_timestamp), UUID(hex = raw_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValidationError(f"Invalid page cursor '{cursor}'", INVALID_PAGE_CURSOR) from e
@@ -0,0 +1,98 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from util import log
+from util.config import config
+
+
+class RateLimiter:
+    """
+    Thread-safe token-bucket rate limiter with one bucket per provider key.
+    Calls only wait when the provider's budget (sustained rate plus burst) is exhausted.
+    Budgets are per server, so each of the server's worker processes gets an equal share of them.
+    """
+
+    @dataclass(frozen = True)
+    class Budget:
+        rate_per_s: float
+        burst: int
+
+    @dataclass
+    class Stats:
+        acquired: int = 0
+        delayed: int = 0
+        total_wait_s: float = 0.0
+        max_wait_s: float = 0.0
+
+        @property
+        def average_wait_s(self) -> float:
+            return (self.total_wait_s / self.acquired) if self.acquired else 0.0
+
+    @dataclass
+    class Bucket:
+        tokens: float
+        updated_at: float
+
+    __buckets: dict[str, Bucket]
+    __stats: dict[str, Stats]
+    __now: Callable[[], float]
+    __sleep: Callable[[float], None]
+    __lock: threading.Lock
+    __workers: int
+
+    def __init__(
+        self,
+        now: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        workers: int = 1,
+    ):
+        self.__buckets = {}
+        self.__stats = {}
+        self.__now = now
+        self.__sleep = sleep
+        self.__lock = threading.Lock()
+        self.__workers = max(1, workers)
+
+    def acquire(self, key: str, budget: Budget) -> float:
+        budget = self.__worker_share(budget)
+        with self.__lock:
+            now = self.__now()
+            bucket = self.__buckets.get(key)
+            if bucket is None:
+                bucket = RateLimiter.Bucket(tokens = float(budget.burst), updated_at = now)
+                self.__buckets[key] = bucket
+            elapsed_s = max(0.0, now - bucket.updated_at)
+            bucket.tokens = min(float(budget.burst), bucket.tokens + elapsed_s * budget.rate_per_s)
+            bucket.updated_at = now
+            # reserve the token now, concurrent callers queue up behind each other
+            bucket.tokens -= 1
+            wait_s = (-bucket.tokens / budget.rate_per_s) if bucket.tokens < 0 else 0.0
+
+            stats = self.__stats.setdefault(key, RateLimiter.Stats())
+            stats.acquired += 1
+            stats.total_wait_s += wait_s
+            stats.max_wait_s = max(stats.max_wait_s, wait_s)
+            if wait_s > 0:
+                stats.delayed += 1
+
+        if wait_s > 0:
+            log.d(f"Rate limit reached for '{key}', waiting {wait_s:.2f}s")
+            self.__sleep(wait_s)
+        return wait_s
+
+    def __worker_share(self, budget: Budget) -> Budget:
+        if self.__workers == 1:
+            return budget
+        return RateLimiter.Budget(rate_per_s = budget.rate_per_s / self.__workers, burst = max(1, budget.burst // self.__workers))
+
+    def stats(self) -> dict[str, Stats]:
+        with self.__lock:
+            return {
+                key: RateLimiter.Stats(stats.acquired, stats.delayed, stats.total_wait_s, stats.max_wait_s)
+                for key, stats in self.__stats.items()
+            }
+
+
+rate_limiter = RateLimiter(workers = config.web_workers)
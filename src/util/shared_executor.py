@@ -0,0 +1,31 @@
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class SharedExecutor(Executor):
+    """
+    Process-wide bounded thread pool, shared by all requests instead of a fresh pool per call site.
+    The bound holds for the whole process, so it also caps whatever each task holds (e.g. a DB connection).
+    """
+
+    __max_workers: int
+    __thread_name_prefix: str
+    __executor: ThreadPoolExecutor
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self.__max_workers = max_workers
+        self.__thread_name_prefix = thread_name_prefix
+        self.__executor = self.__create_executor()
+
+    def __create_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers = self.__max_workers, thread_name_prefix = self.__thread_name_prefix)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return self.__executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self.__executor.shutdown(wait = wait, cancel_futures = cancel_futures)
+
+    def reset_after_fork(self):
+        # threads don't survive a fork, a forked worker starts with a pool of its own
+        self.__executor = self.__create_executor()
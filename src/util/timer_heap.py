@@ -0,0 +1,144 @@
+import heapq
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from util import log
+
+
+class TimerHeap:
+    """
+    Keyed deadlines on a heap, watched by a single timer thread that hands the due callbacks to a small worker pool,
+    so waiting work does not park any threads. Scheduling a key again replaces its pending callback.
+    The process-wide schedulers build on this and add their own semantics (debouncing, repeating ticks).
+    """
+
+    @dataclass
+    class Pending:
+        sequence: int
+        callback: Callable[[], None]
+
+    __name: str
+    __workers: int
+    __failure_message: str
+    __pending: dict[Hashable, Pending]
+    __deadlines: list[tuple[float, int, Hashable]]
+    __sequence: int
+    __executor: Executor
+    __clock: Callable[[], float]
+    __use_timer: bool
+    __timer: threading.Thread | None
+    __condition: threading.Condition
+    __is_shut_down: bool
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        failure_message: str,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        use_timer: bool = True,
+    ):
+        self.__name = name
+        self.__workers = workers
+        self.__failure_message = failure_message
+        self.__pending = {}
+        self.__deadlines = []
+        self.__sequence = 0
+        self.__executor = executor or self.__create_executor()
+        self.__clock = clock
+        self.__use_timer = use_timer
+        self.__timer = None
+        self.__condition = threading.Condition()
+        self.__is_shut_down = False
+
+    def now(self) -> float:
+        return self.__clock()
+
+    def schedule(self, key: Hashable, delay_s: float, callback: Callable[[], None]) -> bool:
+        """Returns whether a pending callback of the same key was replaced."""
+        with self.__condition:
+            if self.__is_shut_down:
+                raise RuntimeError(f"Timer heap '{self.__name}' is shut down")
+            self.__sequence += 1
+            superseded = key in self.__pending
+            self.__pending[key] = TimerHeap.Pending(self.__sequence, callback)
+            heapq.heappush(self.__deadlines, (self.__clock() + delay_s, self.__sequence, key))
+            if self.__use_timer and self.__timer is None:
+                self.__timer = threading.Thread(target = self.__run_timer, name = f"{self.__name}-timer", daemon = True)
+                self.__timer.start()
+            self.__condition.notify()
+            return superseded
+
+    def cancel(self, key: Hashable) -> bool:
+        with self.__condition:
+            # the stale heap entry is skipped once it comes due
+            return self.__pending.pop(key, None) is not None
+
+    def pending_count(self) -> int:
+        with self.__condition:
+            return len(self.__pending)
+
+    def dispatch(self, work: Callable[[], None]):
+        self.__executor.submit(self.__run_safely, work)
+
+    def run_due(self) -> int:
+        with self.__condition:
+            now = self.__clock()
+            due_callbacks: list[Callable[[], None]] = []
+            while self.__deadlines and self.__deadlines[0][0] <= now:
+                _, sequence, key = heapq.heappop(self.__deadlines)
+                pending = self.__pending.get(key)
+                if pending and pending.sequence == sequence:
+                    del self.__pending[key]
+                    due_callbacks.append(pending.callback)
+        for callback in due_callbacks:
+            self.dispatch(callback)
+        return len(due_callbacks)
+
+    def shutdown(self, wait: bool = True):
+        with self.__condition:
+            self.__is_shut_down = True
+            self.__pending.clear()
+            self.__deadlines.clear()
+            self.__condition.notify()
+        if self.__timer:
+            self.__timer.join()
+        if isinstance(self.__executor, ThreadPoolExecutor):
+            self.__executor.shutdown(wait = wait)
+
+    def reset_after_fork(self):
+        # threads don't survive a fork, so a forked worker starts with its own timer and executor, and no pending work
+        self.__pending = {}
+        self.__deadlines = []
+        self.__timer = None
+        self.__condition = threading.Condition()
+        if isinstance(self.__executor, ThreadPoolExecutor):
+            self.__executor = self.__create_executor()
+
+    def __create_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers = self.__workers, thread_name_prefix = self.__name)
+
+    def __run_timer(self):
+        while True:
+            with self.__condition:
+                if self.__is_shut_down:
+                    return
+                if self.__deadlines:
+                    wait_s = self.__deadlines[0][0] - self.__clock()
+                    if wait_s > 0:
+                        self.__condition.wait(wait_s)
+                        continue
+                else:
+                    self.__condition.wait()
+                    continue
+            self.run_due()
+
+    def __run_safely(self, work: Callable[[], None]):
+        try:
+            work()
+        except Exception as e:
+            log.e(self.__failure_message, e)
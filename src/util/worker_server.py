@@ -0,0 +1,53 @@
+import os
+from typing import Any
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+
+from util import log
+
+WORKER_CLASS = "uvicorn_worker.UvicornWorker"
+
+
+class WorkerServer(BaseApplication):
+    """
+    Serves the ASGI app from several worker processes, forked from a master that imports the app once.
+    Workers share the preloaded code copy-on-write, and open their own database pools in the app's lifespan.
+    Process-bound state (connection pools, timer threads) resets itself after the fork, see 'os.register_at_fork'.
+    """
+
+    __app_uri: str
+    __options: dict[str, Any]
+
+    def __init__(
+        self,
+        app_uri: str,
+        workers: int,
+        host: str = "0.0.0.0",
+        port: int = 80,
+        log_level: str = "info",
+        timeout_s: int = 120,
+    ):
+        self.__app_uri = app_uri
+        self.__options = {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "worker_class": WORKER_CLASS,
+            "preload_app": True,  # import once in the master, not once per worker
+            "loglevel": log_level,
+            "timeout": timeout_s,  # webhook replies can wait on slow LLM calls
+            "graceful_timeout": timeout_s,
+            "post_fork": WorkerServer.__on_worker_forked,
+        }
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.__options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return import_app(self.__app_uri)
+
+    @staticmethod
+    def __on_worker_forked(_, worker):
+        log.i(f"Worker {worker.age} forked as process {os.getpid()}")
@@ -459,7 +459,7 @@ class AuthorizationServiceTest(unittest.TestCase):
         result = service.update_chat_authorization(self.invoker_user, self.chat_config)
 
         self.assertIs(result, expected)
-        self.mock_di.chat_membership_service.sync.assert_called_once_with(self.invoker_user, self.chat_config)
+        self.mock_di.chat_membership_service.sync.assert_called_once_with(self.invoker_user, self.chat_config, fresh = True)
 
     def test_update_chat_authorization_propagates_authorization_error(self):
         self.mock_di.chat_membership_service.sync.side_effect = AuthorizationError(
@@ -16,6 +16,7 @@ from features.accounting.purchases.purchase_aggregates import (
     PurchaseAggregates,
 )
 from features.accounting.purchases.purchase_record import PurchaseRecord
+from features.accounting.purchases.purchase_record_page import PurchaseRecordPage
 from features.accounting.purchases.purchase_service import PurchaseService
 from util.error_codes import NOT_TARGET_USER
 from util.errors import AuthorizationError, ValidationError
@@ -197,6 +198,33 @@ class PurchasesControllerTest(unittest.TestCase):
         self.assertIn("Unauthorized", str(context.exception))
         self.mock_purchase_service.get_by_user.assert_not_called()
 
+    def test_fetch_purchase_record_page(self):
+        page = PurchaseRecordPage(records = [self._create_purchase_record(self.invoker_user.id)], next_cursor = "next")
+        self.mock_purchase_service.get_page_by_user.return_value = page
+
+        controller = PurchasesController(self.mock_di)
+        result = controller.fetch_purchase_record_page(self.invoker_user.id.hex, cursor = "current", limit = 1)
+
+        self.assertEqual(result, page)
+        self.mock_purchase_service.get_page_by_user.assert_called_once_with(
+            self.invoker_user.id,
+            cursor = "current",
+            limit = 1,
+            start_date = None,
+            end_date = None,
+            product_id = None,
+        )
+
+    def test_fetch_purchase_record_page_limit_below_minimum(self):
+        controller = PurchasesController(self.mock_di)
+
+        for limit in (0, -1):
+            with self.assertRaises(ValidationError) as context:
+                controller.fetch_purchase_record_page(self.invoker_user.id.hex, limit = limit)
+            self.assertIn("limit must be at least 1", str(context.exception))
+
+        self.mock_purchase_service.get_page_by_user.assert_not_called()
+
     def test_fetch_purchase_aggregates_success(self):
         aggregates = PurchaseAggregates(
             total_purchase_count = 10,
@@ -12,6 +12,7 @@ from db.schema.user import User
 from di.di import DI
 from features.accounting.usage.usage_aggregates import AggregateStats, ProviderInfo, ToolInfo, UsageAggregates
 from features.accounting.usage.usage_record import UsageRecord
+from features.accounting.usage.usage_record_page import UsageRecordPage
 from features.accounting.usage.usage_record_repo import UsageRecordRepository
 from features.external_tools.external_tool import ToolType
 from features.external_tools.external_tool_library import GPT_4O
@@ -228,6 +229,47 @@ class UsageControllerTest(unittest.TestCase):
             self.invoker_user, self.target_user.id.hex,
         )
 
+    def test_fetch_usage_record_page(self):
+        page = UsageRecordPage(records = [self._create_usage_record(self.invoker_user.id)], next_cursor = "next")
+        self.mock_usage_record_repo.get_page_by_user.return_value = page
+
+        controller = UsageController(self.mock_di)
+        result = controller.fetch_usage_record_page(self.invoker_user.id.hex, cursor = "current", limit = 1)
+
+        self.assertEqual(result, page)
+        self.mock_usage_record_repo.get_page_by_user.assert_called_once_with(
+            self.invoker_user.id,
+            cursor = "current",
+            limit = 1,
+            start_date = None,
+            end_date = None,
+            exclude_self = False,
+            include_sponsored = False,
+            include_transfers = True,
+            only_transfers = False,
+            tool_id = None,
+            purpose = None,
+            provider_id = None,
+        )
+
+    def test_fetch_usage_record_page_limit_exceeds_maximum(self):
+        controller = UsageController(self.mock_di)
+
+        with self.assertRaises(ValidationError):
+            controller.fetch_usage_record_page(self.invoker_user.id.hex, limit = 101)
+
+        self.mock_usage_record_repo.get_page_by_user.assert_not_called()
+
+    def test_fetch_usage_record_page_limit_below_minimum(self):
+        controller = UsageController(self.mock_di)
+
+        for limit in (0, -1):
+            with self.assertRaises(ValidationError) as context:
+                controller.fetch_usage_record_page(self.invoker_user.id.hex, limit = limit)
+            self.assertIn("limit must be at least 1", str(context.exception))
+
+        self.mock_usage_record_repo.get_page_by_user.assert_not_called()
+
     def test_fetch_usage_aggregates_success(self):
         aggregates = UsageAggregates(
             total_records = 10,
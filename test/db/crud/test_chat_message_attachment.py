@@ -1,5 +1,4 @@
 import unittest
-from datetime import datetime, timedelta
 from uuid import UUID
 
 from db.sql_util import SQLUtil
@@ -8,6 +7,7 @@ from db.model.chat_config import ChatConfigDB
 from db.schema.chat_config import ChatConfigSave
 from db.schema.chat_message import ChatMessage, ChatMessageSave
 from db.schema.chat_message_attachment import ChatMessageAttachment, ChatMessageAttachmentSave
+from util.errors import NotFoundError
 
 
 class ChatMessageAttachmentCRUDTest(unittest.TestCase):
@@ -173,6 +173,51 @@ class ChatMessageAttachmentCRUDTest(unittest.TestCase):
         fetched_attachment = self.sql.chat_message_attachment_crud().get_by_external_id("non_existent_external_id")
         self.assertIsNone(fetched_attachment)
 
+    def test_get_all_by_ids(self):
+        chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+        self.sql.chat_message_crud().create(ChatMessageSave(chat_id = chat.chat_id, message_id = "msg1", text = "Hello"))
+        for attachment_id in ["attach1", "attach2", "attach3"]:
+            self.sql.chat_message_attachment_crud().create(
+                ChatMessageAttachmentSave(id = attachment_id, chat_id = chat.chat_id, message_id = "msg1"),
+            )
+
+        fetched = self.sql.chat_message_attachment_crud().get_all_by_ids(["attach3", "attach1", "missing"])
+
+        self.assertEqual(sorted(attachment.id for attachment in fetched), ["attach1", "attach3"])
+
+    def test_get_all_by_ids_empty(self):
+        self.assertEqual(self.sql.chat_message_attachment_crud().get_all_by_ids([]), [])
+
+    def test_require_all_by_ids_keeps_the_requested_order(self):
+        chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+        self.sql.chat_message_crud().create(ChatMessageSave(chat_id = chat.chat_id, message_id = "msg1", text = "Hello"))
+        for attachment_id in ["attach1", "attach2"]:
+            self.sql.chat_message_attachment_crud().create(
+                ChatMessageAttachmentSave(id = attachment_id, chat_id = chat.chat_id, message_id = "msg1"),
+            )
+
+        fetched = self.sql.chat_message_attachment_crud().require_all_by_ids(["attach2", "attach1", "attach2"])
+
+        self.assertEqual([attachment.id for attachment in fetched], ["attach2", "attach1", "attach2"])
+
+    def test_require_all_by_ids_missing(self):
+        chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+        self.sql.chat_message_crud().create(ChatMessageSave(chat_id = chat.chat_id, message_id = "msg1", text = "Hello"))
+        self.sql.chat_message_attachment_crud().create(
+            ChatMessageAttachmentSave(id = "attach1", chat_id = chat.chat_id, message_id = "msg1"),
+        )
+
+        with self.assertRaises(NotFoundError) as context:
+            self.sql.chat_message_attachment_crud().require_all_by_ids(["attach1", "missing"])
+
+        self.assertIn("'missing' not found in DB", str(context.exception))
+
     def test_get_all_attachments(self):
         chat = self.sql.chat_config_crud().create(
             ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
@@ -265,6 +310,35 @@ class ChatMessageAttachmentCRUDTest(unittest.TestCase):
         )
         self.assertEqual(len(non_existent_attachments), 0)
 
+    def test_get_by_messages(self):
+        chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+        for message_id in ["msg1", "msg2", "msg3"]:
+            self.sql.chat_message_crud().create(
+                ChatMessageSave(chat_id = chat.chat_id, message_id = message_id, text = "Hello, world!"),
+            )
+            for i in range(2):
+                self.sql.chat_message_attachment_crud().create(
+                    ChatMessageAttachmentSave(
+                        id = f"{message_id}-attach{i}",
+                        chat_id = chat.chat_id,
+                        message_id = message_id,
+                    ),
+                )
+
+        fetched_attachments = self.sql.chat_message_attachment_crud().get_by_messages(
+            chat_id = chat.chat_id,
+            message_ids = ["msg1", "msg3", "non_existent_message"],
+        )
+
+        self.assertEqual(
+            sorted(attachment.id for attachment in fetched_attachments),
+            ["msg1-attach0", "msg1-attach1", "msg3-attach0", "msg3-attach1"],
+        )
+        self.assertEqual(self.sql.chat_message_attachment_crud().get_by_messages(chat.chat_id, []), [])
+        self.assertEqual(self.sql.chat_message_attachment_crud().get_by_messages(UUID(int = 999), ["msg1"]), [])
+
     def test_update_attachment(self):
         chat = self.sql.chat_config_crud().create(
             ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
@@ -395,6 +469,37 @@ class ChatMessageAttachmentCRUDTest(unittest.TestCase):
         self.assertEqual(saved_attachment.external_id, "telegram_file_save_auto")
         self.assertEqual(saved_attachment.size, 4096)
 
+    def test_save_all_attachments(self):
+        chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+        self.sql.chat_message_crud().create(
+            ChatMessageSave(chat_id = chat.chat_id, message_id = "msg1", text = "Hello, world!"),
+        )
+        self.sql.chat_message_attachment_crud().create(
+            ChatMessageAttachmentSave(id = "attach1", chat_id = chat.chat_id, message_id = "msg1", size = 1),
+        )
+
+        saved = self.sql.chat_message_attachment_crud().save_all(
+            [
+                ChatMessageAttachmentSave(id = "attach2", chat_id = chat.chat_id, message_id = "msg1", size = 2),
+                ChatMessageAttachmentSave(id = "attach1", chat_id = chat.chat_id, message_id = "msg1", size = 10),
+                ChatMessageAttachmentSave(chat_id = chat.chat_id, message_id = "msg1", size = 3),
+            ],
+        )
+
+        self.assertEqual([attachment.size for attachment in saved], [2, 10, 3])
+        self.assertEqual(saved[0].id, "attach2")
+        self.assertEqual(saved[1].id, "attach1")
+        self.assertEqual(len(saved[2].id), 8)  # Short UUID
+        stored = self.sql.chat_message_attachment_crud().get_by_message(chat.chat_id, "msg1")
+        self.assertEqual(len(stored), 3)
+        stored_by_id = {attachment.id: attachment for attachment in stored}
+        self.assertEqual(stored_by_id["attach1"].size, 10)
+
+    def test_save_all_empty(self):
+        self.assertEqual(self.sql.chat_message_attachment_crud().save_all([]), [])
+
     def test_delete_attachment(self):
         chat = self.sql.chat_config_crud().create(
             ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
@@ -465,46 +570,3 @@ class ChatMessageAttachmentCRUDTest(unittest.TestCase):
         # Both lookups should return the same record
         self.assertEqual(by_id.id, "custom_id_123")
         self.assertEqual(by_id.external_id, "telegram_external_456")
-
-    def test_delete_by_old_messages(self):
-        chat = self.sql.chat_config_crud().create(
-            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
-        )
-        old_message = self.sql.chat_message_crud().create(
-            ChatMessageSave(
-                chat_id = chat.chat_id,
-                message_id = "old_msg",
-                sent_at = datetime.now() - timedelta(days = 31),
-                text = "Old",
-            ),
-        )
-        recent_message = self.sql.chat_message_crud().create(
-            ChatMessageSave(
-                chat_id = chat.chat_id,
-                message_id = "recent_msg",
-                sent_at = datetime.now(),
-                text = "Recent",
-            ),
-        )
-        old_attachment = self.sql.chat_message_attachment_crud().create(
-            ChatMessageAttachmentSave(
-                id = "attach_old",
-                chat_id = old_message.chat_id,
-                message_id = old_message.message_id,
-            ),
-        )
-        recent_attachment = self.sql.chat_message_attachment_crud().create(
-            ChatMessageAttachmentSave(
-                id = "attach_recent",
-                chat_id = recent_message.chat_id,
-                message_id = recent_message.message_id,
-            ),
-        )
-        old_attachment_id, recent_attachment_id = old_attachment.id, recent_attachment.id
-        cutoff = datetime.now() - timedelta(days = 30)
-
-        deleted_count = self.sql.chat_message_attachment_crud().delete_by_old_messages(cutoff)
-
-        self.assertEqual(deleted_count, 1)
-        self.assertIsNone(self.sql.chat_message_attachment_crud().get(old_attachment_id))
-        self.assertIsNotNone(self.sql.chat_message_attachment_crud().get(recent_attachment_id))
@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime, timedelta
+
+from db.sql_util import SQLUtil
+
+from db.schema.document_embedding import DocumentEmbeddingSave
+
+
+class DocumentEmbeddingCRUDTest(unittest.TestCase):
+
+    sql: SQLUtil
+
+    def setUp(self):
+        self.sql = SQLUtil()
+
+    def tearDown(self):
+        self.sql.end_session()
+
+    @staticmethod
+    def _page(
+        content_hash: str,
+        page_index: int,
+        embedding_model: str = "model-a",
+        last_used_at: datetime | None = None,
+    ) -> DocumentEmbeddingSave:
+        return DocumentEmbeddingSave(
+            content_hash = content_hash,
+            embedding_model = embedding_model,
+            page_index = page_index,
+            page_number = page_index,
+            embedding = bytes([page_index] * 8),
+            last_used_at = last_used_at or datetime.now(),
+        )
+
+    def test_create_all_and_get_document(self):
+        created = self.sql.document_embedding_crud().create_all(
+            [self._page("hash1", 2), self._page("hash1", 0), self._page("hash1", 1)],
+        )
+
+        pages = self.sql.document_embedding_crud().get_document("hash1", "model-a")
+
+        self.assertEqual(created, 3)
+        self.assertEqual([page.page_index for page in pages], [0, 1, 2])
+        self.assertEqual(pages[1].page_number, 1)
+        self.assertEqual(pages[1].embedding, bytes([1] * 8))
+
+    def test_create_all_empty(self):
+        self.assertEqual(self.sql.document_embedding_crud().create_all([]), 0)
+
+    def test_get_document_is_scoped_to_embedding_model(self):
+        self.sql.document_embedding_crud().create_all([self._page("hash1", 0)])
+        self.sql.document_embedding_crud().create_all([self._page("hash1", 0, embedding_model = "model-b")])
+
+        self.assertEqual(len(self.sql.document_embedding_crud().get_document("hash1", "model-a")), 1)
+        self.assertEqual(len(self.sql.document_embedding_crud().get_document("hash1", "model-b")), 1)
+        self.assertEqual(self.sql.document_embedding_crud().get_document("hash2", "model-a"), [])
+
+    def test_delete_document(self):
+        self.sql.document_embedding_crud().create_all([self._page("hash1", 0), self._page("hash1", 1)])
+        self.sql.document_embedding_crud().create_all([self._page("hash2", 0)])
+
+        deleted = self.sql.document_embedding_crud().delete_document("hash1", "model-a")
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(self.sql.document_embedding_crud().get_document("hash1", "model-a"), [])
+        self.assertEqual(len(self.sql.document_embedding_crud().get_document("hash2", "model-a")), 1)
+
+    def test_touch_document(self):
+        now = datetime.now()
+        old = now - timedelta(days = 100)
+        self.sql.document_embedding_crud().create_all(
+            [self._page("hash1", 0, last_used_at = old), self._page("hash1", 1, last_used_at = old)],
+        )
+        self.sql.document_embedding_crud().create_all([self._page("hash2", 0, last_used_at = old)])
+
+        touched = self.sql.document_embedding_crud().touch_document("hash1", "model-a", now)
+
+        self.assertEqual(touched, 2)
+        self.assertEqual([page.last_used_at for page in self.sql.document_embedding_crud().get_document("hash1", "model-a")], [now, now])
+        self.assertEqual(self.sql.document_embedding_crud().get_document("hash2", "model-a")[0].last_used_at, old)
@@ -115,6 +115,32 @@ class PriceAlertCRUDTest(unittest.TestCase):
             self.assertEqual(fetched_price_alerts[i].base_currency, price_alerts[i].base_currency)
             self.assertEqual(fetched_price_alerts[i].desired_currency, price_alerts[i].desired_currency)
 
+    def test_get_all_after_pages_through_all_alerts(self):
+        user_id = self._create_test_user()
+        expected_keys: list[tuple] = []
+        for chat_index in range(3):
+            chat = self.sql.chat_config_crud().create(
+                ChatConfigSave(external_id = f"chat{chat_index}", chat_type = ChatConfigDB.ChatType.telegram),
+            )
+            for base_currency in ["BTC", "ETH"]:
+                self.sql.price_alert_crud().create(
+                    PriceAlertSave(
+                        chat_id = chat.chat_id, owner_id = user_id,
+                        base_currency = base_currency, desired_currency = "USD",
+                        threshold_percent = 5, last_price = 1.0,
+                    ),
+                )
+                expected_keys.append((chat.chat_id, base_currency, "USD"))
+
+        fetched_keys: list[tuple] = []
+        page = self.sql.price_alert_crud().get_all_after(limit = 4)
+        while page:
+            fetched_keys.extend((alert.chat_id, alert.base_currency, alert.desired_currency) for alert in page)
+            page = self.sql.price_alert_crud().get_all_after(page[-1], limit = 4)
+
+        self.assertEqual(len(fetched_keys), 6)
+        self.assertEqual(sorted(fetched_keys), sorted(expected_keys))
+
     def test_get_chat_alerts(self):
         chat1 = self.sql.chat_config_crud().create(
             ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
@@ -190,6 +216,52 @@ class PriceAlertCRUDTest(unittest.TestCase):
         self.assertEqual(updated_price_alert.last_price, update_data.last_price)
         self.assertEqual(updated_price_alert.last_price_time, update_data.last_price_time)
 
+    def test_update_last_prices(self):
+        chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+        user_id = self._create_test_user()
+        alerts = [
+            self.sql.price_alert_crud().create(
+                PriceAlertSave(
+                    chat_id = chat.chat_id,
+                    owner_id = user_id,
+                    base_currency = base_currency,
+                    desired_currency = "USD",
+                    threshold_percent = 5,
+                    last_price = 100.0,
+                    last_price_time = datetime(2026, 1, 1),
+                ),
+            )
+            for base_currency in ["BTC", "ETH", "SOL"]
+        ]
+        new_time = datetime(2026, 1, 2)
+        updates = [
+            PriceAlertSave(
+                chat_id = alert.chat_id,
+                owner_id = alert.owner_id,
+                base_currency = alert.base_currency,
+                desired_currency = alert.desired_currency,
+                threshold_percent = alert.threshold_percent,
+                last_price = 200.0 + index,
+                last_price_time = new_time,
+            )
+            for index, alert in enumerate(alerts[:2])
+        ]
+
+        updated_count = self.sql.price_alert_crud().update_last_prices(updates)
+
+        self.assertEqual(updated_count, 2)
+        btc = self.sql.price_alert_crud().get(chat.chat_id, "BTC", "USD")
+        eth = self.sql.price_alert_crud().get(chat.chat_id, "ETH", "USD")
+        sol = self.sql.price_alert_crud().get(chat.chat_id, "SOL", "USD")
+        self.assertEqual((btc.last_price, btc.last_price_time), (200.0, new_time))
+        self.assertEqual((eth.last_price, eth.last_price_time), (201.0, new_time))
+        self.assertEqual((sol.last_price, sol.last_price_time), (100.0, datetime(2026, 1, 1)))
+
+    def test_update_last_prices_empty(self):
+        self.assertEqual(self.sql.price_alert_crud().update_last_prices([]), 0)
+
     def test_save_price_alert(self):
         chat = self.sql.chat_config_crud().create(
             ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
@@ -266,40 +338,3 @@ class PriceAlertCRUDTest(unittest.TestCase):
                 created_price_alert.desired_currency,
             ),
         )
-
-    def test_delete_stale(self):
-        chat = self.sql.chat_config_crud().create(
-            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
-        )
-        user_id = self._create_test_user()
-        stale_alert = self.sql.price_alert_crud().create(
-            PriceAlertSave(
-                chat_id = chat.chat_id,
-                owner_id = user_id,
-                base_currency = "USD",
-                desired_currency = "EUR",
-                threshold_percent = 5,
-                last_price = 0.85,
-                last_price_time = datetime.now() - timedelta(days = 361),
-            ),
-        )
-        fresh_alert = self.sql.price_alert_crud().create(
-            PriceAlertSave(
-                chat_id = chat.chat_id,
-                owner_id = user_id,
-                base_currency = "BTC",
-                desired_currency = "USD",
-                threshold_percent = 10,
-                last_price = 50000.0,
-                last_price_time = datetime.now(),
-            ),
-        )
-        stale_chat_id, stale_base, stale_desired = stale_alert.chat_id, stale_alert.base_currency, stale_alert.desired_currency
-        fresh_chat_id, fresh_base, fresh_desired = fresh_alert.chat_id, fresh_alert.base_currency, fresh_alert.desired_currency
-        cutoff = datetime.now() - timedelta(days = 360)
-
-        deleted_count = self.sql.price_alert_crud().delete_stale(cutoff)
-
-        self.assertEqual(deleted_count, 1)
-        self.assertIsNone(self.sql.price_alert_crud().get(stale_chat_id, stale_base, stale_desired))
-        self.assertIsNotNone(self.sql.price_alert_crud().get(fresh_chat_id, fresh_base, fresh_desired))
@@ -2,9 +2,12 @@ import unittest
 from datetime import datetime, timedelta
 
 from db.sql_util import SQLUtil
+from sqlalchemy import event
 
 from db.crud.tools_cache import ToolsCacheCRUD
+from db.crud.tools_cache_memory_tier import ToolsCacheMemoryTier, shared_memory_tier
 from db.schema.tools_cache import ToolsCacheSave
+from db.unit_of_work import unit_of_work
 
 
 class ToolsCacheCRUDTest(unittest.TestCase):
@@ -116,27 +119,127 @@ class ToolsCacheCRUDTest(unittest.TestCase):
         self.assertEqual(deleted_tools_cache.key, created_tools_cache.key)
         self.assertIsNone(self.sql.tools_cache_crud().get(created_tools_cache.key))
 
-    def test_delete_expired_tools_cache(self):
-        # Creating tools cache entries with varying expiration times
-        tools_cache_not_expired = self.sql.tools_cache_crud().create(
+    def test_create_key(self):
+        key = ToolsCacheCRUD.create_key("prefix", "identifier")
+        self.assertEqual(key, "3fffc53e8c62753274ae6ff244f2f4a4")
+
+    def test_create_key_remembers_prefix_for_stats(self):
+        key = ToolsCacheCRUD.create_key("stats-prefix", "identifier")
+
+        shared_memory_tier.record_db_lookup(key, found = False)
+
+        self.assertGreaterEqual(shared_memory_tier.stats()["stats-prefix"].misses, 1)
+
+    def test_get_with_memory_tier_serves_hot_keys_from_memory(self):
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
+        tier.remember_prefix("tool1", "prefix")
+        crud.create(ToolsCacheSave(key = "tool1", value = "value1", expires_at = datetime.now() + timedelta(days = 1)))
+        executed_statements: list[str] = []
+
+        def count_statements(conn, cursor, statement, parameters, context, executemany):
+            executed_statements.append(statement)
+
+        engine = self.sql.get_session().get_bind()
+        event.listen(engine, "before_cursor_execute", count_statements)
+        try:
+            fetched = [crud.get("tool1") for _ in range(5)]
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statements)
+
+        self.assertEqual([entry.value for entry in fetched], ["value1"] * 5)
+        self.assertEqual(executed_statements, [])
+        self.assertEqual(tier.stats()["prefix"].memory_hits, 5)
+
+    def test_get_with_memory_tier_falls_through_to_table(self):
+        self.sql.tools_cache_crud().create(
             ToolsCacheSave(key = "tool1", value = "value1", expires_at = datetime.now() + timedelta(days = 1)),
         )
-        tools_cache_expired = self.sql.tools_cache_crud().create(
-            ToolsCacheSave(key = "tool2", value = "value2", expires_at = datetime.now() - timedelta(days = 1)),
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
+        tier.remember_prefix("tool1", "prefix")
+        tier.remember_prefix("tool2", "prefix")
+
+        self.assertEqual(crud.get("tool1").value, "value1")
+        self.assertIsNone(crud.get("tool2"))
+        self.assertEqual(crud.get("tool1").value, "value1")
+
+        self.assertEqual(tier.stats()["prefix"], ToolsCacheMemoryTier.PrefixStats(memory_hits = 1, db_hits = 1, misses = 1))
+
+    def test_get_with_memory_tier_skips_expired_entries(self):
+        self.sql.tools_cache_crud().create(
+            ToolsCacheSave(key = "tool1", value = "value1", expires_at = datetime.now() - timedelta(days = 1)),
         )
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
 
-        not_expired_key, expired_key = tools_cache_not_expired.key, tools_cache_expired.key
+        fetched = crud.get("tool1")
 
-        # Deleting expired cache entries
-        count_deleted = self.sql.tools_cache_crud().delete_expired()
-        self.assertEqual(count_deleted, 1)
+        self.assertIsNotNone(fetched)  # the table still returns it, callers check expiration
+        self.assertEqual(tier.size, 0)
 
-        # Asserting non-expired entry still exists
-        self.assertIsNotNone(self.sql.tools_cache_crud().get(not_expired_key))
+    def test_save_with_memory_tier_updates_both_tiers(self):
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
+        expires_at = datetime.now() + timedelta(days = 1)
 
-        # Asserting expired entry does not exist
-        self.assertIsNone(self.sql.tools_cache_crud().get(expired_key))
+        crud.save(ToolsCacheSave(key = "tool1", value = "value1", expires_at = expires_at))
+        crud.save(ToolsCacheSave(key = "tool1", value = "value2", expires_at = expires_at))
 
-    def test_create_key(self):
-        key = ToolsCacheCRUD.create_key("prefix", "identifier")
-        self.assertEqual(key, "3fffc53e8c62753274ae6ff244f2f4a4")
+        self.assertEqual(tier.peek("tool1").value, "value2")
+        self.assertEqual(self.sql.tools_cache_crud().get("tool1").value, "value2")
+
+    def test_save_with_memory_tier_skips_identical_writes(self):
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
+        data = ToolsCacheSave(key = "tool1", value = "value1", expires_at = datetime.now() + timedelta(days = 1))
+        crud.save(data)
+        executed_statements: list[str] = []
+
+        def count_statements(conn, cursor, statement, parameters, context, executemany):
+            executed_statements.append(statement)
+
+        engine = self.sql.get_session().get_bind()
+        event.listen(engine, "before_cursor_execute", count_statements)
+        try:
+            saved = crud.save(data)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statements)
+
+        self.assertEqual(saved.value, "value1")
+        self.assertEqual(executed_statements, [])
+
+    def test_delete_with_memory_tier_invalidates_memory(self):
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
+        crud.create(ToolsCacheSave(key = "tool1", value = "value1", expires_at = datetime.now() + timedelta(days = 1)))
+
+        crud.delete("tool1")
+
+        self.assertIsNone(tier.peek("tool1"))
+        self.assertIsNone(crud.get("tool1"))
+
+    def test_save_in_unit_of_work_reaches_memory_only_after_commit(self):
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
+
+        with unit_of_work(self.sql.get_session()):
+            crud.save(ToolsCacheSave(key = "tool1", value = "value1", expires_at = datetime.now() + timedelta(days = 1)))
+            self.assertIsNone(tier.peek("tool1"))
+
+        self.assertEqual(tier.peek("tool1").value, "value1")
+
+    def test_save_in_rolled_back_unit_of_work_does_not_reach_memory(self):
+        tier = ToolsCacheMemoryTier(max_entries = 10, max_size_bytes = 1000, max_age_s = 60)
+        crud = ToolsCacheCRUD(self.sql.get_session(), tier)
+
+        with self.assertRaises(ValueError):
+            with unit_of_work(self.sql.get_session()):
+                crud.save(ToolsCacheSave(key = "tool1", value = "value1", expires_at = datetime.now() + timedelta(days = 1)))
+                crud.create(ToolsCacheSave(key = "tool2", value = "value2", expires_at = datetime.now() + timedelta(days = 1)))
+                raise ValueError("Failed mid-update")
+
+        self.assertIsNone(tier.peek("tool1"))
+        self.assertIsNone(tier.peek("tool2"))
+        self.assertIsNone(crud.get("tool1"))
+        self.assertIsNone(crud.get("tool2"))
@@ -0,0 +1,136 @@
+import unittest
+from datetime import datetime, timedelta
+
+from db.crud.tools_cache_memory_tier import UNKNOWN_PREFIX, ToolsCacheMemoryTier
+
+
+class ToolsCacheMemoryTierTest(unittest.TestCase):
+
+    now: datetime
+    tier: ToolsCacheMemoryTier
+
+    def setUp(self):
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+        self.tier = ToolsCacheMemoryTier(
+            max_entries = 3,
+            max_size_bytes = 100,
+            max_age_s = 60,
+            now = lambda: self.now,
+        )
+
+    def __put(self, key: str, value: str = "value", expires_in: timedelta | None = timedelta(hours = 1)):
+        expires_at = self.now + expires_in if expires_in is not None else None
+        self.tier.put(key, value, self.now, expires_at)
+
+    def test_get_returns_stored_entry(self):
+        self.__put("key1", "value1")
+
+        entry = self.tier.get("key1")
+
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.key, "key1")
+        self.assertEqual(entry.value, "value1")
+        self.assertEqual(entry.expires_at, self.now + timedelta(hours = 1))
+
+    def test_get_missing_entry(self):
+        self.assertIsNone(self.tier.get("missing"))
+
+    def test_entry_respects_expires_at(self):
+        self.__put("key1", expires_in = timedelta(seconds = 10))
+
+        self.now += timedelta(seconds = 11)
+
+        self.assertIsNone(self.tier.get("key1"))
+        self.assertEqual(self.tier.size, 0)
+
+    def test_entry_respects_max_age(self):
+        self.__put("key1", expires_in = None)
+
+        self.now += timedelta(seconds = 30)
+        self.assertIsNotNone(self.tier.get("key1"))
+
+        self.now += timedelta(seconds = 31)
+        self.assertIsNone(self.tier.get("key1"))
+
+    def test_put_ignores_already_expired_entries(self):
+        self.__put("key1", expires_in = timedelta(seconds = -1))
+
+        self.assertIsNone(self.tier.get("key1"))
+        self.assertEqual(self.tier.size, 0)
+
+    def test_evicts_least_recently_used_entry_over_entry_cap(self):
+        self.__put("key1")
+        self.__put("key2")
+        self.__put("key3")
+        self.tier.get("key1")  # key2 becomes the least recently used
+
+        self.__put("key4")
+
+        self.assertEqual(self.tier.size, 3)
+        self.assertIsNotNone(self.tier.get("key1"))
+        self.assertIsNone(self.tier.get("key2"))
+        self.assertIsNotNone(self.tier.get("key3"))
+        self.assertIsNotNone(self.tier.get("key4"))
+
+    def test_evicts_entries_over_size_cap(self):
+        self.__put("key1", "a" * 40)
+        self.__put("key2", "b" * 40)
+
+        self.__put("key3", "c" * 40)
+
+        self.assertIsNone(self.tier.get("key1"))
+        self.assertIsNotNone(self.tier.get("key2"))
+        self.assertIsNotNone(self.tier.get("key3"))
+        self.assertEqual(self.tier.total_size_bytes, 80)
+
+    def test_skips_entries_larger_than_size_cap(self):
+        self.__put("key1", "a" * 101)
+
+        self.assertIsNone(self.tier.get("key1"))
+        self.assertEqual(self.tier.total_size_bytes, 0)
+
+    def test_put_replaces_existing_entry(self):
+        self.__put("key1", "a" * 10)
+        self.__put("key1", "b" * 20)
+
+        self.assertEqual(self.tier.get("key1").value, "b" * 20)
+        self.assertEqual(self.tier.size, 1)
+        self.assertEqual(self.tier.total_size_bytes, 20)
+
+    def test_invalidate_and_clear(self):
+        self.__put("key1")
+        self.__put("key2")
+
+        self.tier.invalidate("key1")
+        self.assertIsNone(self.tier.get("key1"))
+        self.assertEqual(self.tier.size, 1)
+
+        self.tier.clear()
+        self.assertEqual(self.tier.size, 0)
+        self.assertEqual(self.tier.total_size_bytes, 0)
+
+    def test_peek_does_not_count_as_hit(self):
+        self.tier.remember_prefix("key1", "prefix")
+        self.__put("key1")
+
+        self.assertIsNotNone(self.tier.peek("key1"))
+
+        self.assertEqual(self.tier.stats(), {})
+
+    def test_stats_per_prefix(self):
+        self.tier.remember_prefix("rate", "exchange-rate")
+        self.tier.remember_prefix("html", "html-cleaner")
+        self.__put("rate")
+
+        self.tier.get("rate")
+        self.tier.get("rate")
+        self.tier.record_db_lookup("html", found = True)
+        self.tier.record_db_lookup("html", found = False)
+        self.tier.record_db_lookup("other", found = False)
+
+        stats = self.tier.stats()
+        self.assertEqual(stats["exchange-rate"], ToolsCacheMemoryTier.PrefixStats(memory_hits = 2))
+        self.assertEqual(stats["html-cleaner"], ToolsCacheMemoryTier.PrefixStats(db_hits = 1, misses = 1))
+        self.assertEqual(stats[UNKNOWN_PREFIX], ToolsCacheMemoryTier.PrefixStats(misses = 1))
+        self.assertEqual(stats["exchange-rate"].hit_ratio, 1.0)
+        self.assertEqual(stats["html-cleaner"].hit_ratio, 0.0)
@@ -1,11 +1,18 @@
+import os
+import tempfile
+import threading
 import unittest
 import uuid
 
 from db.sql_util import SQLUtil
 from pydantic import SecretStr
+from sqlalchemy import inspect
 
-from db.model.user import UserDB
-from db.schema.user import UserSave
+from db.crud.user import UserCRUD
+from db.model.user import SECRET_COLUMNS, UserDB
+from db.model.user_count import UserCountDB
+from db.schema.user import LazySecretStr, User, UserSave
+from db.sql import initialize_db
 from util.errors import NotFoundError
 
 
@@ -151,6 +158,18 @@ class UserCRUDTest(unittest.TestCase):
         for i in range(len(users)):
             self.assertEqual(fetched_users[i].id, users[i].id)
 
+    def test_get_all_users_by_ids(self):
+        users = [
+            self.sql.user_crud().create(UserSave(connect_key = "KEY1-KEY1-KEY1")),
+            self.sql.user_crud().create(UserSave(connect_key = "KEY2-KEY2-KEY2")),
+            self.sql.user_crud().create(UserSave(connect_key = "KEY3-KEY3-KEY3")),
+        ]
+
+        fetched_users = self.sql.user_crud().get_all_by_ids([users[0].id, users[2].id, uuid.uuid4()])
+
+        self.assertEqual({user.id for user in fetched_users}, {users[0].id, users[2].id})
+        self.assertEqual(self.sql.user_crud().get_all_by_ids([]), [])
+
     def test_count_users(self):
         initial_count = self.sql.user_crud().count()
         self.assertEqual(initial_count, 0)
@@ -197,6 +216,33 @@ class UserCRUDTest(unittest.TestCase):
         user_count = self.sql.user_crud().count()
         self.assertEqual(user_count, 2)
 
+    def test_count_follows_creates_and_deletes(self):
+        first = self.sql.user_crud().create(UserSave())
+        self.sql.user_crud().create(UserSave())
+        self.sql.user_crud().delete(first.id)
+
+        self.assertEqual(self.sql.user_crud().count(), 1)
+        self.assertEqual(self.sql.get_session().query(UserCountDB).one().value, 1)
+
+    def test_count_starts_from_the_existing_users(self):
+        self.sql.user_crud().create(UserSave())
+        self.sql.user_crud().create(UserSave())
+        self.sql.get_session().query(UserCountDB).delete()
+        self.sql.get_session().commit()
+
+        self.assertEqual(self.sql.user_crud().count(), 2)
+        self.sql.user_crud().create(UserSave())
+        self.assertEqual(self.sql.user_crud().count(), 3)
+
+    def test_create_beyond_capacity_waitlists_the_user(self):
+        admitted = self.sql.user_crud().create(UserSave(), capacity = 1)
+        waitlisted = self.sql.user_crud().save(UserSave(), capacity = 1)
+        unlimited = self.sql.user_crud().create(UserSave())
+
+        self.assertFalse(admitted.is_on_waitlist)
+        self.assertTrue(waitlisted.is_on_waitlist)
+        self.assertFalse(unlimited.is_on_waitlist)
+
     def test_get_user_by_telegram_user_id(self):
         user_data = UserSave(
             full_name = "Test User",
@@ -664,6 +710,27 @@ class UserCRUDTest(unittest.TestCase):
         self.assertEqual(fetched_user.telegram_username, user_data.telegram_username)
         self.assertEqual(fetched_user.telegram_user_id, user_data.telegram_user_id)
 
+    def test_update_fields(self):
+        user_data = UserSave(
+            full_name = "Narrow User",
+            telegram_user_id = 55555,
+            telegram_chat_id = "c1",
+            open_ai_key = SecretStr("test-key"),
+            about_me = SecretStr("About me"),
+        )
+        created_user = self.sql.user_crud().create(user_data)
+
+        updated = self.sql.user_crud().update_fields(created_user.id, {"telegram_chat_id": "c2"})
+
+        assert updated is not None
+        self.assertEqual(updated.telegram_chat_id, "c2")
+        self.assertEqual(updated.full_name, "Narrow User")
+        self.assertEqual(updated.open_ai_key, "test-key")
+        self.assertEqual(updated.about_me, "About me")
+
+    def test_update_fields_user_not_found(self):
+        self.assertIsNone(self.sql.user_crud().update_fields(uuid.uuid4(), {"full_name": "Nobody"}))
+
     def test_update_locked(self):
         user_data = UserSave(
             full_name = "Credit User",
@@ -687,3 +754,110 @@ class UserCRUDTest(unittest.TestCase):
     def test_update_locked_user_not_found(self):
         with self.assertRaises(NotFoundError):
             self.sql.user_crud().update_locked(uuid.uuid4(), lambda u: None)
+
+    def test_get_defers_secret_columns(self):
+        created_user = self.sql.user_crud().create(
+            UserSave(full_name = "Secret User", open_ai_key = SecretStr("sk-open-ai"), about_me = SecretStr("About me")),
+        )
+        self.sql.get_session().expunge_all()
+
+        user_db = self.sql.user_crud().get(created_user.id)
+
+        assert user_db is not None
+        self.assertEqual(user_db.full_name, "Secret User")
+        self.assertTrue(set(SECRET_COLUMNS).issubset(inspect(user_db).unloaded))
+        self.assertTrue(user_db.has_open_ai_key)
+        self.assertFalse(user_db.has_anthropic_key)
+        # touching one secret loads the whole group at once
+        self.assertEqual(user_db.open_ai_key, "sk-open-ai")
+        self.assertFalse(set(SECRET_COLUMNS).intersection(inspect(user_db).unloaded))
+
+    def test_user_schema_reads_secrets_lazily(self):
+        created_user = self.sql.user_crud().create(
+            UserSave(full_name = "Lazy User", open_ai_key = SecretStr("sk-open-ai"), whatsapp_phone_number = SecretStr("123")),
+        )
+        self.sql.get_session().expunge_all()
+        user_db = self.sql.user_crud().get(created_user.id)
+
+        user = User.model_validate(user_db)
+
+        self.assertIsInstance(user.open_ai_key, LazySecretStr)
+        self.assertIsNone(user.anthropic_key)
+        self.assertTrue(user.has_any_api_key())
+        self.assertIn("open_ai_key", inspect(user_db).unloaded)
+        assert user.open_ai_key is not None
+        self.assertEqual(user.open_ai_key.get_secret_value(), "sk-open-ai")
+        self.assertEqual(user.open_ai_key, SecretStr("sk-open-ai"))
+        self.assertEqual(SecretStr("sk-open-ai"), user.open_ai_key)
+        self.assertNotIn("open_ai_key", inspect(user_db).unloaded)
+
+    def test_user_schema_reads_secrets_after_the_session_closed(self):
+        created_user = self.sql.user_crud().create(
+            UserSave(full_name = "Later User", open_ai_key = SecretStr("sk-open-ai")),
+        )
+        self.sql.get_session().expunge_all()
+        user = User.model_validate(self.sql.user_crud().get(created_user.id))
+
+        self.sql.end_session()
+
+        assert user.open_ai_key is not None
+        self.assertEqual(user.open_ai_key.get_secret_value(), "sk-open-ai")
+        self.assertIsNone(user.anthropic_key)
+
+    def test_unchanged_fields_keep_secrets_encrypted(self):
+        created_user = self.sql.user_crud().create(
+            UserSave(full_name = "Quiet User", telegram_username = "quiet", open_ai_key = SecretStr("sk-open-ai")),
+        )
+        self.sql.get_session().expunge_all()
+        user_db = self.sql.user_crud().get(created_user.id)
+        stored_user = User.model_validate(user_db)
+
+        incoming = UserSave(**stored_user.model_dump(exclude = {"created_at"}))
+        incoming.telegram_username = "renamed"
+
+        self.assertEqual(incoming.changed_fields(stored_user), {"telegram_username": "renamed"})
+        self.assertIn("open_ai_key", inspect(user_db).unloaded)
+
+
+class UserCRUDConcurrencyTest(unittest.TestCase):
+
+    REGISTRATIONS = 12
+    CAPACITY = 5
+
+    def setUp(self):
+        # a database file, so that every thread registers on a connection of its own
+        self.directory = tempfile.TemporaryDirectory()
+        db_url = f"sqlite:///{os.path.join(self.directory.name, 'users.db')}"
+        self.engine, self.local_session = initialize_db(db_url, multi_connection_setup = False)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_simultaneous_registrations_never_exceed_the_capacity(self):
+        start = threading.Barrier(self.REGISTRATIONS)
+        errors: list[Exception] = []
+
+        def register():
+            db = self.local_session()
+            try:
+                start.wait()
+                UserCRUD(db).create(UserSave(), capacity = self.CAPACITY)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target = register) for _ in range(self.REGISTRATIONS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db = self.local_session()
+        users = db.query(UserDB).all()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(users), self.REGISTRATIONS)
+        self.assertEqual(len([user for user in users if not user.is_on_waitlist]), self.CAPACITY)
+        self.assertEqual(UserCRUD(db).count(), self.REGISTRATIONS)
+        db.close()
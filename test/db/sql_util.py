@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from db.crud.chat_config import ChatConfigCRUD
 from db.crud.chat_message import ChatMessageCRUD
 from db.crud.chat_message_attachment import ChatMessageAttachmentCRUD
+from db.crud.document_embedding import DocumentEmbeddingCRUD
 from db.crud.price_alert import PriceAlertCRUD
 from db.crud.sponsorship import SponsorshipCRUD
 from db.crud.tools_cache import ToolsCacheCRUD
@@ -77,6 +78,11 @@ class SQLUtil:
             self.start_session()
         return UserCRUD(self.__session)
 
+    def document_embedding_crud(self) -> DocumentEmbeddingCRUD:
+        if not self.__is_session_active:
+            self.start_session()
+        return DocumentEmbeddingCRUD(self.__session)
+
     def price_alert_crud(self) -> PriceAlertCRUD:
         if not self.__is_session_active:
             self.start_session()
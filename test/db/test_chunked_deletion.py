@@ -0,0 +1,102 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from db.sql_util import SQLUtil
+
+from db.chunked_deletion import ChunkedDeletion
+from db.model.chat_config import ChatConfigDB
+from db.model.chat_message import ChatMessageDB
+from db.model.chat_message_attachment import ChatMessageAttachmentDB
+from db.schema.chat_config import ChatConfigSave
+from db.schema.chat_message import ChatMessageSave
+from db.schema.chat_message_attachment import ChatMessageAttachmentSave
+
+ATTACHMENTS = ChatMessageAttachmentDB.__table__
+MESSAGE_DEPENDENTS = [(ATTACHMENTS, [ATTACHMENTS.c.chat_id, ATTACHMENTS.c.message_id])]
+
+
+class ChunkedDeletionTest(unittest.TestCase):
+
+    sql: SQLUtil
+    cutoff: datetime
+
+    def setUp(self):
+        self.sql = SQLUtil()
+        self.cutoff = datetime.now() - timedelta(days = 30)
+
+    def tearDown(self):
+        self.sql.end_session()
+
+    def __seed_messages(self, old_count: int, new_count: int):
+        chat = self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+        for index in range(old_count + new_count):
+            sent_at = self.cutoff - timedelta(days = 1) if index < old_count else datetime.now()
+            self.sql.chat_message_crud().save(
+                ChatMessageSave(chat_id = chat.chat_id, message_id = f"{index:03d}", sent_at = sent_at, text = f"Message {index}"),
+            )
+            self.sql.chat_message_attachment_crud().save(
+                ChatMessageAttachmentSave(id = f"attachment-{index:03d}", chat_id = chat.chat_id, message_id = f"{index:03d}"),
+            )
+
+    def __remaining_message_ids(self) -> list[str]:
+        return [message.message_id for message in self.sql.get_session().query(ChatMessageDB).order_by(ChatMessageDB.message_id)]
+
+    def test_deletes_matching_rows_in_chunks(self):
+        self.__seed_messages(old_count = 5, new_count = 2)
+        deletion = ChunkedDeletion(self.sql.get_session(), chunk_size = 2)
+
+        progress = deletion.run(
+            ChatMessageDB.__table__,
+            ChatMessageDB.sent_at < self.cutoff,
+            deadline = time.monotonic() + 60,
+            dependents = MESSAGE_DEPENDENTS,
+        )
+
+        self.assertTrue(progress.finished)
+        self.assertIsNone(progress.last_key)
+        self.assertEqual(progress.deleted, 5)
+        self.assertEqual(progress.dependents_deleted, 5)
+        self.assertEqual(progress.chunks, 3)
+        self.assertEqual(self.__remaining_message_ids(), ["005", "006"])
+        self.assertEqual(self.sql.get_session().query(ChatMessageAttachmentDB).count(), 2)
+
+    def test_stops_at_the_deadline_and_resumes_after_the_last_key(self):
+        self.__seed_messages(old_count = 5, new_count = 0)
+        deletion = ChunkedDeletion(self.sql.get_session(), chunk_size = 2)
+        condition = ChatMessageDB.sent_at < self.cutoff
+
+        # started, one chunk fits in the budget, the deadline passes, elapsed
+        with patch("db.chunked_deletion.time.monotonic", side_effect = [0.0, 0.0, 10.0, 10.0]):
+            first = deletion.run(ChatMessageDB.__table__, condition, deadline = 5.0, dependents = MESSAGE_DEPENDENTS)
+
+        self.assertFalse(first.finished)
+        self.assertEqual(first.deleted, 2)
+        assert first.last_key is not None
+        self.assertEqual(first.last_key[1], "001")
+        self.assertEqual(self.__remaining_message_ids(), ["002", "003", "004"])
+
+        second = deletion.run(
+            ChatMessageDB.__table__, condition, deadline = time.monotonic() + 60, after = first.last_key, dependents = MESSAGE_DEPENDENTS,
+        )
+
+        self.assertTrue(second.finished)
+        self.assertEqual(second.deleted, 3)
+        self.assertEqual(self.__remaining_message_ids(), [])
+
+    def test_passed_deadline_deletes_nothing(self):
+        self.__seed_messages(old_count = 3, new_count = 0)
+        deletion = ChunkedDeletion(self.sql.get_session(), chunk_size = 2)
+
+        progress = deletion.run(
+            ChatMessageDB.__table__,
+            ChatMessageDB.sent_at < self.cutoff,
+            deadline = time.monotonic() - 1,
+            dependents = MESSAGE_DEPENDENTS,
+        )
+
+        self.assertFalse(progress.finished)
+        self.assertEqual(progress.deleted, 0)
+        self.assertEqual(progress.rows_per_second, 0.0)
+        self.assertEqual(len(self.__remaining_message_ids()), 3)
@@ -0,0 +1,113 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from db.sql_util import SQLUtil
+from pydantic import SecretStr
+from sqlalchemy import text
+
+from db.encryption_migration import EncryptionMigration
+from db.envelope_cipher import BACKEND_APP, BACKEND_PGCRYPTO, EnvelopeCipher
+from db.model.chat_config import ChatConfigDB
+from db.schema.chat_config import ChatConfigSave
+from db.schema.chat_message import ChatMessageSave
+from db.schema.user import UserSave
+from util.config import config
+
+
+class EncryptionMigrationTest(unittest.TestCase):
+
+    sql: SQLUtil
+    master_key: bytes
+    cipher: EnvelopeCipher
+
+    def setUp(self):
+        self.sql = SQLUtil()
+        self.master_key = os.urandom(32)
+        self.cipher = EnvelopeCipher({1: self.master_key}, active_version = 1)
+
+    def tearDown(self):
+        self.sql.end_session()
+
+    def __raw_texts(self) -> list:
+        return list(self.sql.get_session().execute(text("SELECT text FROM chat_messages ORDER BY message_id")).scalars())
+
+    def __seed_messages(self, count: int):
+        chat = self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+        for index in range(count):
+            self.sql.chat_message_crud().save(
+                ChatMessageSave(chat_id = chat.chat_id, message_id = f"{index:03d}", text = f"Message {index}"),
+            )
+        return chat
+
+    def test_app_backend_encrypts_in_the_app(self):
+        with patch.object(config, "db_encryption_backend", BACKEND_APP), patch("db.envelope_cipher.envelope_cipher", self.cipher):
+            chat = self.__seed_messages(1)
+            self.sql.get_session().expire_all()
+
+            raw_texts = self.__raw_texts()
+            stored = self.sql.chat_message_crud().get(chat.chat_id, "000")
+
+        self.assertTrue(EnvelopeCipher.is_envelope(raw_texts[0]))
+        assert stored is not None
+        self.assertEqual(stored.text, "Message 0")
+
+    def test_reads_both_formats(self):
+        with patch("db.envelope_cipher.envelope_cipher", self.cipher):
+            chat = self.__seed_messages(1)  # stored with the default backend
+            with patch.object(config, "db_encryption_backend", BACKEND_APP):
+                self.sql.chat_message_crud().save(ChatMessageSave(chat_id = chat.chat_id, message_id = "001", text = "Message 1"))
+            self.sql.get_session().expire_all()
+
+            messages = self.sql.chat_message_crud().get_latest_chat_messages(chat.chat_id)
+
+        self.assertEqual(sorted(message.text for message in messages), ["Message 0", "Message 1"])
+
+    def test_migrates_to_the_app_backend_in_batches(self):
+        with patch.object(config, "db_encryption_backend", BACKEND_APP), patch("db.envelope_cipher.envelope_cipher", self.cipher):
+            self.sql.user_crud().save(UserSave(full_name = "Keyed", open_ai_key = SecretStr("sk-open-ai")))
+            migration = EncryptionMigration(self.sql.get_session().get_bind(), BACKEND_APP, self.cipher, batch_size = 2)
+            with patch.object(config, "db_encryption_backend", BACKEND_PGCRYPTO):
+                chat = self.__seed_messages(5)
+            self.sql.get_session().commit()
+
+            progress = {item.table: item for item in migration.run()}
+            self.sql.get_session().expire_all()
+            raw_texts = self.__raw_texts()
+            messages = self.sql.chat_message_crud().get_latest_chat_messages(chat.chat_id)
+            rerun = {item.table: item.migrated for item in migration.run()}
+
+        self.assertEqual(progress["chat_messages"].migrated, 5)
+        self.assertEqual(progress["chat_messages"].batches, 3)
+        self.assertEqual(progress["simulants"].migrated, 0)  # already written in the app format
+        self.assertTrue(all(EnvelopeCipher.is_envelope(raw_text) for raw_text in raw_texts))
+        self.assertEqual(sorted(message.text for message in messages), [f"Message {index}" for index in range(5)])
+        self.assertEqual(rerun, {"simulants": 0, "chat_messages": 0})
+
+    def test_migrates_back_to_the_default_backend(self):
+        with patch("db.envelope_cipher.envelope_cipher", self.cipher):
+            with patch.object(config, "db_encryption_backend", BACKEND_APP):
+                chat = self.__seed_messages(3)
+            self.sql.get_session().commit()
+
+            progress = EncryptionMigration(self.sql.get_session().get_bind(), BACKEND_PGCRYPTO, self.cipher).run()
+            self.sql.get_session().expire_all()
+            raw_texts = self.__raw_texts()
+            messages = self.sql.chat_message_crud().get_latest_chat_messages(chat.chat_id)
+
+        self.assertEqual({item.table: item.migrated for item in progress}["chat_messages"], 3)
+        self.assertEqual(raw_texts, ["Message 0", "Message 1", "Message 2"])
+        self.assertEqual(sorted(message.text for message in messages), ["Message 0", "Message 1", "Message 2"])
+
+    def test_rotates_master_keys(self):
+        rotated_cipher = EnvelopeCipher({1: self.master_key, 2: os.urandom(32)}, active_version = 2)
+        with patch.object(config, "db_encryption_backend", BACKEND_APP):
+            with patch("db.envelope_cipher.envelope_cipher", self.cipher):
+                self.__seed_messages(2)
+            self.sql.get_session().commit()
+            with patch("db.envelope_cipher.envelope_cipher", rotated_cipher):
+                progress = EncryptionMigration(self.sql.get_session().get_bind(), BACKEND_APP, rotated_cipher).run()
+                raw_texts = self.__raw_texts()
+
+        self.assertEqual({item.table: item.migrated for item in progress}["chat_messages"], 2)
+        self.assertTrue(all(rotated_cipher.key_version(raw_text) == 2 for raw_text in raw_texts))
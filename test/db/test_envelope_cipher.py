@@ -0,0 +1,84 @@
+import base64
+import os
+import unittest
+
+from db.envelope_cipher import EnvelopeCipher
+from util.errors import ConfigurationError, InternalError
+
+
+class EnvelopeCipherTest(unittest.TestCase):
+
+    key_one: bytes
+    key_two: bytes
+
+    def setUp(self):
+        self.key_one = os.urandom(32)
+        self.key_two = os.urandom(32)
+
+    def test_round_trip(self):
+        cipher = EnvelopeCipher({1: self.key_one}, active_version = 1)
+
+        blob = cipher.encrypt("Hello, wörld 👋")
+
+        self.assertTrue(EnvelopeCipher.is_envelope(blob))
+        self.assertEqual(cipher.key_version(blob), 1)
+        self.assertEqual(cipher.decrypt(blob), "Hello, wörld 👋")
+
+    def test_values_are_randomized(self):
+        cipher = EnvelopeCipher({1: self.key_one}, active_version = 1)
+
+        self.assertNotEqual(cipher.encrypt("same"), cipher.encrypt("same"))
+
+    def test_header_carries_the_active_version(self):
+        cipher = EnvelopeCipher({1: self.key_one, 2: self.key_two}, active_version = 2)
+
+        blob = cipher.encrypt("rotated")
+
+        self.assertTrue(blob.startswith(cipher.header()))
+        self.assertEqual(cipher.key_version(blob), 2)
+
+    def test_reads_values_written_under_older_keys(self):
+        old_cipher = EnvelopeCipher({1: self.key_one}, active_version = 1)
+        new_cipher = EnvelopeCipher({1: self.key_one, 2: self.key_two}, active_version = 2)
+
+        self.assertEqual(new_cipher.decrypt(old_cipher.encrypt("legacy")), "legacy")
+
+    def test_rejects_unknown_key_versions(self):
+        old_cipher = EnvelopeCipher({1: self.key_one}, active_version = 1)
+        new_cipher = EnvelopeCipher({2: self.key_two}, active_version = 2)
+
+        with self.assertRaises(InternalError):
+            old_cipher.decrypt(new_cipher.encrypt("unreadable"))
+
+    def test_rejects_tampered_values(self):
+        cipher = EnvelopeCipher({1: self.key_one}, active_version = 1)
+        blob = bytearray(cipher.encrypt("original"))
+        blob[-1] ^= 0x01
+
+        with self.assertRaises(InternalError):
+            cipher.decrypt(bytes(blob))
+
+    def test_rejects_other_formats(self):
+        cipher = EnvelopeCipher({1: self.key_one}, active_version = 1)
+
+        self.assertFalse(EnvelopeCipher.is_envelope(b"plain text"))
+        self.assertFalse(EnvelopeCipher.is_envelope(None))
+        with self.assertRaises(InternalError):
+            cipher.decrypt(b"plain text")
+
+    def test_parse_keys(self):
+        raw_keys = f"1:{base64.b64encode(self.key_one).decode()}, 2:{base64.b64encode(self.key_two).decode()}"
+
+        self.assertEqual(EnvelopeCipher.parse_keys(raw_keys), {1: self.key_one, 2: self.key_two})
+
+    def test_parse_keys_invalid(self):
+        with self.assertRaises(ConfigurationError):
+            EnvelopeCipher.parse_keys("no-version-here")
+        with self.assertRaises(ConfigurationError):
+            EnvelopeCipher.parse_keys("1:not base64!")
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ConfigurationError):
+            EnvelopeCipher({1: self.key_one}, active_version = 2)
+        with self.assertRaises(ConfigurationError):
+            EnvelopeCipher({1: b"too short"}, active_version = 1)
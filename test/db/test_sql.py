@@ -0,0 +1,19 @@
+import unittest
+
+from db.sql import pool_limits
+
+
+class SQLTest(unittest.TestCase):
+
+    def test_pool_limits_for_a_single_worker(self):
+        self.assertEqual(pool_limits(13, 1), (3, 10))
+
+    def test_pool_limits_split_the_budget_between_workers(self):
+        pool_size, max_overflow = pool_limits(80, 4)
+
+        self.assertEqual((pool_size, max_overflow), (5, 15))
+        # the workers never exceed the budget together
+        self.assertLessEqual((pool_size + max_overflow) * 4, 80)
+
+    def test_pool_limits_keep_a_minimal_pool(self):
+        self.assertEqual(pool_limits(4, 8), (1, 1))
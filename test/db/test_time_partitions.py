@@ -0,0 +1,104 @@
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+from db.sql_util import SQLUtil
+from sqlalchemy.orm import Session
+
+from db.time_partitions import TimePartitions
+
+
+class TimePartitionsTest(unittest.TestCase):
+
+    db: MagicMock
+
+    def setUp(self):
+        self.db = MagicMock(spec = Session)
+        self.db.get_bind.return_value.dialect.name = "postgresql"
+
+    def __given_partitions(self, *names: str, default_has_rows: bool = False):
+        self.db.execute.return_value.scalars.return_value.all.return_value = list(names)
+        self.db.execute.return_value.scalar.return_value = default_has_rows
+
+    def __executed_sql(self) -> list[str]:
+        return [
+            str(call.args[0]) for call in self.db.execute.call_args_list
+            if not str(call.args[0]).startswith(("SELECT", "SET LOCAL"))
+        ]
+
+    def test_sqlite_tables_are_not_partitioned(self):
+        sql = SQLUtil()
+        try:
+            self.assertFalse(TimePartitions(sql.get_session(), "usage_records").is_partitioned())
+        finally:
+            sql.end_session()
+
+    def test_get_months_reads_the_partition_names(self):
+        self.__given_partitions("usage_records_2026_03", "usage_records_default", "usage_records_2025_12", "other_2026_01")
+
+        months = TimePartitions(self.db, "usage_records").get_months()
+
+        self.assertEqual(months, [date(2025, 12, 1), date(2026, 3, 1)])
+
+    def test_create_months_creates_only_the_missing_ones(self):
+        self.__given_partitions("usage_records_2026_12")
+
+        created = TimePartitions(self.db, "usage_records").create_months(date(2026, 11, 15), count = 3)
+
+        self.assertEqual(created, ["usage_records_2026_11", "usage_records_2027_01"])
+        self.assertEqual(
+            self.__executed_sql(),
+            [
+                'CREATE TABLE "usage_records_2026_11" PARTITION OF "usage_records" '
+                "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')",
+                'CREATE TABLE "usage_records_2027_01" PARTITION OF "usage_records" '
+                "FOR VALUES FROM ('2027-01-01') TO ('2027-02-01')",
+            ],
+        )
+
+    def test_create_months_moves_the_rows_of_the_month_out_of_the_default_partition(self):
+        self.__given_partitions("usage_records_default", default_has_rows = True)
+
+        created = TimePartitions(self.db, "usage_records").create_months(date(2026, 11, 15), count = 1)
+
+        self.assertEqual(created, ["usage_records_2026_11"])
+        self.assertEqual(
+            self.__executed_sql(),
+            [
+                'CREATE TABLE "usage_records_2026_11" (LIKE "usage_records" INCLUDING DEFAULTS)',
+                'WITH moved AS (DELETE FROM "usage_records_default" '
+                "WHERE \"timestamp\" >= '2026-11-01' AND \"timestamp\" < '2026-12-01' RETURNING *) "
+                'INSERT INTO "usage_records_2026_11" SELECT * FROM moved',
+                'ALTER TABLE "usage_records" ATTACH PARTITION "usage_records_2026_11" '
+                "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')",
+            ],
+        )
+
+    def test_create_months_without_a_default_partition_does_not_look_for_its_rows(self):
+        self.__given_partitions(default_has_rows = True)
+
+        TimePartitions(self.db, "usage_records").create_months(date(2026, 11, 15), count = 1)
+
+        self.assertEqual(
+            self.__executed_sql(),
+            [
+                'CREATE TABLE "usage_records_2026_11" PARTITION OF "usage_records" '
+                "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')",
+            ],
+        )
+
+    def test_drop_before_keeps_the_month_of_the_cutoff(self):
+        self.__given_partitions("usage_records_2026_01", "usage_records_2026_02", "usage_records_2026_03")
+
+        dropped = TimePartitions(self.db, "usage_records").drop_before(datetime(2026, 3, 1))
+
+        self.assertEqual(dropped, ["usage_records_2026_01", "usage_records_2026_02"])
+        self.assertEqual(self.__executed_sql(), ['DROP TABLE "usage_records_2026_01"', 'DROP TABLE "usage_records_2026_02"'])
+
+    def test_drop_before_the_oldest_month_drops_nothing(self):
+        self.__given_partitions("usage_records_2026_01")
+
+        dropped = TimePartitions(self.db, "usage_records").drop_before(datetime(2026, 1, 20))
+
+        self.assertEqual(dropped, [])
+        self.assertEqual(self.__executed_sql(), [])
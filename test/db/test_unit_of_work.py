@@ -0,0 +1,147 @@
+import unittest
+from types import SimpleNamespace
+
+from db.sql_util import SQLUtil
+
+from db.model.chat_config import ChatConfigDB
+from db.model.user import UserDB
+from db.schema.chat_config import ChatConfigSave
+from db.schema.chat_message import ChatMessageSave
+from db.schema.user import UserSave
+from db.unit_of_work import run_after_commit, unit_of_work
+from features.chat.telegram.telegram_data_resolver import TelegramDataResolver
+
+
+class UnitOfWorkTest(unittest.TestCase):
+
+    sql: SQLUtil
+
+    def setUp(self):
+        self.sql = SQLUtil()
+
+    def tearDown(self):
+        self.sql.end_session()
+
+    def test_commits_once_at_the_end(self):
+        db = self.sql.get_session()
+
+        with unit_of_work(db) as work:
+            chat = self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+            self.sql.chat_message_crud().save(ChatMessageSave(chat_id = chat.chat_id, message_id = "1", text = "Hi"))
+            self.sql.chat_message_crud().save(ChatMessageSave(chat_id = chat.chat_id, message_id = "2", text = "Hey"))
+            self.assertEqual(work.commits, 0)
+            # writes are visible inside the transaction before the commit
+            self.assertIsNotNone(self.sql.chat_message_crud().get(chat.chat_id, "2"))
+
+        self.assertEqual(work.commits, 1)
+        self.assertEqual(len(self.sql.chat_message_crud().get_all()), 2)
+
+    def test_checkpoint_commits(self):
+        db = self.sql.get_session()
+
+        with unit_of_work(db) as work:
+            self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+            work.checkpoint()
+            self.assertEqual(work.commits, 1)
+
+        self.assertEqual(work.commits, 2)
+
+    def test_rolls_back_on_error(self):
+        db = self.sql.get_session()
+
+        with self.assertRaises(ValueError):
+            with unit_of_work(db):
+                self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+                raise ValueError("Failed mid-update")
+
+        self.assertEqual(self.sql.chat_config_crud().get_all(), [])
+
+    def test_rolls_back_only_after_checkpoint(self):
+        db = self.sql.get_session()
+
+        with self.assertRaises(ValueError):
+            with unit_of_work(db) as work:
+                self.sql.chat_config_crud().save(ChatConfigSave(external_id = "kept", chat_type = ChatConfigDB.ChatType.telegram))
+                work.checkpoint()
+                self.sql.chat_config_crud().save(ChatConfigSave(external_id = "lost", chat_type = ChatConfigDB.ChatType.telegram))
+                raise ValueError("Failed mid-update")
+
+        chats = self.sql.chat_config_crud().get_all()
+        self.assertEqual([chat.external_id for chat in chats], ["kept"])
+
+    def test_locked_updates_are_durable_immediately(self):
+        db = self.sql.get_session()
+        user = self.sql.user_crud().save(UserSave(full_name = "Payer", credit_balance = 10.0))
+
+        with unit_of_work(db) as work:
+            def deduct(locked: UserDB):
+                locked.credit_balance = locked.credit_balance - 2.5
+
+            self.sql.user_crud().update_locked(user.id, deduct)
+            self.assertEqual(work.commits, 1)
+
+        self.assertEqual(work.commits, 2)
+        self.assertEqual(self.sql.user_crud().get(user.id).credit_balance, 7.5)
+
+    def test_nested_unit_defers_to_the_outer_one(self):
+        db = self.sql.get_session()
+
+        with unit_of_work(db) as outer:
+            with unit_of_work(db) as inner:
+                self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+            self.assertEqual(inner.commits, 0)
+            self.assertEqual(outer.commits, 0)
+
+        self.assertEqual(outer.commits, 1)
+
+    def test_commits_outside_of_a_unit_are_immediate(self):
+        db = self.sql.get_session()
+        with unit_of_work(db):
+            pass
+
+        self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+        db.rollback()
+
+        self.assertEqual(len(self.sql.chat_config_crud().get_all()), 1)
+
+    def test_run_after_commit_waits_for_the_unit(self):
+        db = self.sql.get_session()
+        ran: list[str] = []
+
+        run_after_commit(db, lambda: ran.append("outside"))
+        self.assertEqual(ran, ["outside"])
+        with unit_of_work(db):
+            run_after_commit(db, lambda: ran.append("inside"))
+            self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+            self.assertEqual(ran, ["outside"])
+
+        self.assertEqual(ran, ["outside", "inside"])
+
+    def test_run_after_commit_is_dropped_on_rollback(self):
+        db = self.sql.get_session()
+        ran: list[str] = []
+
+        with self.assertRaises(ValueError):
+            with unit_of_work(db):
+                run_after_commit(db, lambda: ran.append("rolled back"))
+                raise ValueError("Failed mid-update")
+        with unit_of_work(db):
+            self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+
+        self.assertEqual(ran, [])
+
+    def test_resolving_an_update_commits_once(self):
+        db = self.sql.get_session()
+        self.sql.user_crud().save(UserSave(full_name = "Member", telegram_user_id = 1, telegram_username = "old_name"))
+        resolver = TelegramDataResolver(SimpleNamespace(user_crud = self.sql.user_crud()))  # type: ignore[arg-type]
+
+        with unit_of_work(db) as work:
+            resolver.resolve_author(UserSave(full_name = "Member", telegram_user_id = 1, telegram_username = "new_name"))
+            self.assertEqual(work.commits, 0)
+            resolver.resolve_author(UserSave(full_name = "Newcomer", telegram_user_id = 2, telegram_username = "newcomer"))
+            # a registration releases the user count right away instead of holding it for the rest of the unit
+            self.assertEqual(work.commits, 1)
+
+        self.assertEqual(work.commits, 2)
+        self.assertEqual(self.sql.user_crud().get_by_telegram_user_id(1).telegram_username, "new_name")
+        self.assertIsNotNone(self.sql.user_crud().get_by_telegram_user_id(2))
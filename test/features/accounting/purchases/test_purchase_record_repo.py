@@ -103,6 +103,23 @@ class PurchaseRecordRepositoryTest(unittest.TestCase):
         records = self.repo.get_by_user(self.user.id, skip = 2, limit = 10)
         self.assertEqual(len(records), 3)
 
+    def test_get_page_by_user_walks_all_records_newest_first(self):
+        now = datetime.now(timezone.utc)
+        for days_ago in range(3):
+            self.repo.save(self._create_record(timestamp = now - timedelta(days = days_ago), price = days_ago))
+        self.repo.save(self._create_record(timestamp = now - timedelta(days = 1), price = 1))  # a timestamp tie
+
+        first_page = self.repo.get_page_by_user(self.user.id, limit = 2)
+        assert first_page.next_cursor is not None
+        second_page = self.repo.get_page_by_user(self.user.id, cursor = first_page.next_cursor, limit = 2)
+
+        self.assertEqual([record.price for record in first_page.records + second_page.records], [0, 1, 1, 2])
+        self.assertIsNone(second_page.next_cursor)
+
+    def test_get_page_by_user_rejects_malformed_cursor(self):
+        with self.assertRaises(ValidationError):
+            self.repo.get_page_by_user(self.user.id, cursor = "not-a-cursor")
+
     def test_get_by_user_start_date_filter(self):
         now = datetime.now(timezone.utc)
         self.repo.save(self._create_record(timestamp = now - timedelta(days = 2)))
@@ -269,6 +269,18 @@ class PurchaseServiceTest(unittest.TestCase):
             product_id = None,
         )
 
+    def test_get_page_by_user_delegates_to_repo(self):
+        self.service.get_page_by_user(self.user_id, cursor = "cursor")
+
+        self.mock_di.purchase_record_repo.get_page_by_user.assert_called_once_with(
+            self.user_id,
+            cursor = "cursor",
+            limit = 50,
+            start_date = None,
+            end_date = None,
+            product_id = None,
+        )
+
     def test_get_aggregates_by_user_delegates_to_repo(self):
         self.service.get_aggregates_by_user(self.user_id)
 
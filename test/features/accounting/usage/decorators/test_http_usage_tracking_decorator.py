@@ -12,6 +12,8 @@ from features.accounting.usage.usage_tracking_service import UsageTrackingServic
 from features.external_tools.configured_tool import ConfiguredTool
 from features.external_tools.external_tool import ExternalTool, ToolType
 
+HTTP_GET_TARGET = "features.accounting.usage.decorators.http_usage_tracking_decorator.http_transport.get"
+
 
 class HTTPUsageTrackingDecoratorTest(unittest.TestCase):
 
@@ -40,7 +42,7 @@ class HTTPUsageTrackingDecoratorTest(unittest.TestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"data": "test"}
 
-        with unittest.mock.patch("requests.get", return_value = mock_response) as mock_get:
+        with unittest.mock.patch(HTTP_GET_TARGET, return_value = mock_response) as mock_get:
             result = self.decorator.get("https://api.example.com/test", headers = {"X-API-Key": "test"})
 
         self.assertEqual(result, mock_response)
@@ -60,7 +62,7 @@ class HTTPUsageTrackingDecoratorTest(unittest.TestCase):
             sleep(0.01)
             return mock_response
 
-        with unittest.mock.patch("requests.get", side_effect = slow_get):
+        with unittest.mock.patch(HTTP_GET_TARGET, side_effect = slow_get):
             self.decorator.get("https://api.example.com/test")
 
         call_args = self.mock_tracking_service.track_api_call.call_args
@@ -69,7 +71,7 @@ class HTTPUsageTrackingDecoratorTest(unittest.TestCase):
     def test_get_passes_kwargs_correctly(self):
         mock_response = Mock(spec = requests.Response)
 
-        with unittest.mock.patch("requests.get", return_value = mock_response) as mock_get:
+        with unittest.mock.patch(HTTP_GET_TARGET, return_value = mock_response) as mock_get:
             self.decorator.get(
                 "https://api.example.com/test",
                 headers = {"X-API-Key": "test"},
@@ -85,7 +87,7 @@ class HTTPUsageTrackingDecoratorTest(unittest.TestCase):
         )
 
     def test_get_failure_tracks_without_deduction(self):
-        with unittest.mock.patch("requests.get", side_effect = requests.exceptions.HTTPError("404")):
+        with unittest.mock.patch(HTTP_GET_TARGET, side_effect = requests.exceptions.HTTPError("404")):
             with self.assertRaises(requests.exceptions.HTTPError):
                 self.decorator.get("https://api.example.com/test")
 
@@ -97,7 +99,7 @@ class HTTPUsageTrackingDecoratorTest(unittest.TestCase):
     def test_get_calls_validate_pre_flight(self):
         mock_response = Mock(spec = requests.Response)
 
-        with unittest.mock.patch("requests.get", return_value = mock_response):
+        with unittest.mock.patch(HTTP_GET_TARGET, return_value = mock_response):
             self.decorator.get("https://api.example.com/test")
 
         self.mock_spending_service.validate_pre_flight.assert_called_once()
@@ -4,6 +4,7 @@ from uuid import uuid4
 
 from db.sql_util import SQLUtil
 
+from db.model.usage_daily_rollup import UsageDailyRollupDB
 from db.model.usage_record import UsageRecordDB
 from db.model.user import UserDB
 from db.schema.user import UserSave
@@ -112,6 +113,77 @@ class UsageRecordRepositoryTest(unittest.TestCase):
         records = self.repo.get_by_user(self.user.id, skip = 2, limit = 10)
         self.assertEqual(len(records), 3)
 
+    def test_get_page_by_user_walks_all_records_newest_first(self):
+        now = datetime.now(timezone.utc)
+        for minutes_ago in range(5):
+            self.repo.create(self._create_record(timestamp = now - timedelta(minutes = minutes_ago), total_cost_credits = minutes_ago))
+        self.repo.create(self._create_record(timestamp = now - timedelta(minutes = 2), total_cost_credits = 2))  # a timestamp tie
+
+        costs: list[float] = []
+        cursor: str | None = None
+        pages = 0
+        while True:
+            page = self.repo.get_page_by_user(self.user.id, cursor = cursor, limit = 2)
+            costs += [record.total_cost_credits for record in page.records]
+            pages += 1
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(costs, [0, 1, 2, 2, 3, 4])
+
+    def test_get_page_by_user_merges_owned_records_and_incoming_transfers(self):
+        other_user = self.sql.user_crud().create(UserSave(connect_key = "OTHER-KEY"))
+        now = datetime.now(timezone.utc)
+        self.repo.create(self._create_record(timestamp = now - timedelta(minutes = 3)))
+        self.repo.create(self._create_record(
+            user_id = other_user.id,
+            payer_id = other_user.id,
+            tool = TRANSFER_TOOL,
+            tool_purpose = ToolType.credit_transfer,
+            timestamp = now - timedelta(minutes = 2),
+            counterpart_id = self.user.id,
+        ))
+        self.repo.create(self._create_record(timestamp = now - timedelta(minutes = 1)))
+        self.repo.create(self._create_record(user_id = other_user.id, timestamp = now))
+
+        first_page = self.repo.get_page_by_user(self.user.id, limit = 2)
+        assert first_page.next_cursor is not None
+        second_page = self.repo.get_page_by_user(self.user.id, cursor = first_page.next_cursor, limit = 2)
+
+        self.assertEqual(
+            [record.tool_purpose for record in first_page.records + second_page.records],
+            [ToolType.chat, ToolType.credit_transfer, ToolType.chat],
+        )
+        self.assertIsNone(second_page.next_cursor)
+        only_transfers = self.repo.get_page_by_user(self.user.id, only_transfers = True)
+        self.assertEqual([record.counterpart_id for record in only_transfers.records], [self.user.id])
+        without_transfers = self.repo.get_page_by_user(self.user.id, include_transfers = False)
+        self.assertEqual(len(without_transfers.records), 2)
+
+    def test_get_page_by_user_matches_offset_pages_with_filters(self):
+        sponsored_user = self.sql.user_crud().create(UserSave(connect_key = "SPONSORED-KEY"))
+        now = datetime.now(timezone.utc)
+        for minutes_ago in range(4):
+            self.repo.create(self._create_record(timestamp = now - timedelta(minutes = minutes_ago)))
+            self.repo.create(self._create_record(
+                user_id = sponsored_user.id,
+                payer_id = self.user.id,
+                tool = CLAUDE_4_5_HAIKU,
+                timestamp = now - timedelta(minutes = minutes_ago, seconds = 30),
+            ))
+
+        for filters in (
+            dict(include_sponsored = True),
+            dict(include_sponsored = True, exclude_self = True),
+            dict(include_sponsored = True, tool_id = GPT_4O.id),
+        ):
+            expected = self.repo.get_by_user(self.user.id, limit = 100, **filters)
+            first_page = self.repo.get_page_by_user(self.user.id, limit = 3, **filters)
+            second_page = self.repo.get_page_by_user(self.user.id, cursor = first_page.next_cursor, limit = 100, **filters)
+            self.assertEqual(first_page.records + second_page.records, expected, filters)
+
     def test_get_by_user_start_date_filter(self):
         now = datetime.now(timezone.utc)
         self.repo.create(self._create_record(timestamp = now - timedelta(days = 2)))
@@ -478,14 +550,114 @@ class UsageRecordRepositoryTest(unittest.TestCase):
         self.assertEqual(stats.total_records, 2)
         self.assertEqual(stats.total_cost_credits, 35.0)
 
-    def test_delete_older_than(self):
-        self.repo.create(self._create_record(timestamp = datetime.now(timezone.utc) - timedelta(days = 31)))
-        self.repo.create(self._create_record(timestamp = datetime.now(timezone.utc) - timedelta(days = 31)))
-        self.repo.create(self._create_record(timestamp = datetime.now(timezone.utc)))
-        cutoff = datetime.now(timezone.utc) - timedelta(days = 30)
+    def _rollups(self) -> list[UsageDailyRollupDB]:
+        return self.sql.get_session().query(UsageDailyRollupDB).order_by(UsageDailyRollupDB.day).all()
+
+    def test_create_maintains_daily_rollups(self):
+        today = datetime.now(timezone.utc)
+        yesterday = today - timedelta(days = 1)
+        self.repo.create(self._create_record(timestamp = yesterday, total_cost_credits = 2))
+        self.repo.create(self._create_record(timestamp = yesterday, total_cost_credits = 3))
+        self.repo.create_all([
+            self._create_record(timestamp = today, total_cost_credits = 4),
+            self._create_record(timestamp = today, tool = CLAUDE_4_5_HAIKU, total_cost_credits = 5),
+        ])
+
+        rollups = self._rollups()
+
+        self.assertEqual(len(rollups), 3)
+        self.assertEqual(rollups[0].day, yesterday.date())
+        self.assertEqual(rollups[0].record_count, 2)
+        self.assertEqual(rollups[0].total_cost_credits, 5.0)
+        self.assertEqual(rollups[0].runtime_seconds, 2.0)
+        self.assertEqual(rollups[0].counterpart_id, UsageDailyRollupDB.NO_COUNTERPART)
+        self.assertEqual({rollup.tool_id for rollup in rollups[1:]}, {GPT_4O.id, CLAUDE_4_5_HAIKU.id})
+
+    def test_get_aggregates_serves_closed_days_from_rollups(self):
+        now = datetime.now(timezone.utc)
+        self.repo.create(self._create_record(timestamp = now - timedelta(days = 3), total_cost_credits = 10))
+        self.repo.create(self._create_record(timestamp = now, total_cost_credits = 1))
+        # rollups are the source of truth for closed days, raw records only for the current day
+        self.sql.get_session().query(UsageDailyRollupDB).filter(
+            UsageDailyRollupDB.day == (now - timedelta(days = 3)).date(),
+        ).update({UsageDailyRollupDB.record_count: 7})
+
+        stats = self.repo.get_aggregates_by_user(self.user.id)
+
+        self.assertEqual(stats.total_records, 8)
+        self.assertEqual(stats.total_cost_credits, 11.0)
+        self.assertEqual(stats.by_tool[GPT_4O.id].record_count, 8)
+
+    def test_get_aggregates_partial_days_use_raw_records(self):
+        day_start = datetime.combine((datetime.now(timezone.utc) - timedelta(days = 5)).date(), datetime.min.time())
+        self.repo.create(self._create_record(timestamp = day_start + timedelta(hours = 2), total_cost_credits = 1))
+        self.repo.create(self._create_record(timestamp = day_start + timedelta(hours = 10), total_cost_credits = 2))
+        self.repo.create(self._create_record(timestamp = day_start + timedelta(days = 1, hours = 3), total_cost_credits = 4))
+        self.repo.create(self._create_record(timestamp = day_start + timedelta(days = 2, hours = 9), total_cost_credits = 8))
 
-        deleted_count = self.repo.delete_older_than(cutoff)
+        stats = self.repo.get_aggregates_by_user(
+            self.user.id,
+            start_date = day_start + timedelta(hours = 6),
+            end_date = day_start + timedelta(days = 2, hours = 8),
+        )
+
+        self.assertEqual(stats.total_records, 2)
+        self.assertEqual(stats.total_cost_credits, 6.0)
+
+    def test_get_aggregates_filters_apply_to_rollups(self):
+        old = datetime.now(timezone.utc) - timedelta(days = 10)
+        self.repo.create(self._create_record(timestamp = old, tool = GPT_4O, total_cost_credits = 10))
+        self.repo.create(self._create_record(timestamp = old, tool = CLAUDE_4_5_HAIKU, total_cost_credits = 20))
+        self.repo.create(self._create_record(tool = CLAUDE_4_5_HAIKU, total_cost_credits = 5))
+
+        stats = self.repo.get_aggregates_by_user(self.user.id, tool_id = CLAUDE_4_5_HAIKU.id)
+
+        self.assertEqual(stats.total_records, 2)
+        self.assertEqual(stats.total_cost_credits, 25.0)
+        self.assertEqual(list(stats.by_tool.keys()), [CLAUDE_4_5_HAIKU.id])
+        self.assertEqual({tool.id for tool in stats.all_tools_used}, {GPT_4O.id, CLAUDE_4_5_HAIKU.id})
+
+    def test_get_aggregates_incoming_transfer_from_rollups(self):
+        other_user = self.sql.user_crud().create(UserSave(connect_key = "OTHER-KEY"))
+        self.repo.create(self._create_record(
+            user_id = other_user.id,
+            payer_id = other_user.id,
+            tool = TRANSFER_TOOL,
+            tool_purpose = ToolType.credit_transfer,
+            total_cost_credits = 25,
+            counterpart_id = self.user.id,
+            timestamp = datetime.now(timezone.utc) - timedelta(days = 4),
+        ))
 
-        self.assertEqual(deleted_count, 2)
-        remaining = self.repo.get_by_user(self.user.id)
-        self.assertEqual(len(remaining), 1)
+        stats = self.repo.get_aggregates_by_user(self.user.id, only_transfers = True)
+        other_stats = self.repo.get_aggregates_by_user(other_user.id, include_transfers = False)
+
+        self.assertEqual(stats.total_records, 1)
+        self.assertEqual(stats.total_cost_credits, 25.0)
+        self.assertEqual(other_stats.total_records, 0)
+
+    def test_prune_rollups_rebuilds_the_cutoff_day(self):
+        day_start = datetime.combine((datetime.now(timezone.utc) - timedelta(days = 40)).date(), datetime.min.time())
+        self.repo.create(self._create_record(timestamp = day_start - timedelta(days = 1)))
+        self.repo.create(self._create_record(timestamp = day_start + timedelta(hours = 1), total_cost_credits = 2))
+        self.repo.create(self._create_record(timestamp = day_start + timedelta(hours = 20), total_cost_credits = 3))
+        cutoff = day_start + timedelta(hours = 12)
+        # the cleanup deletes the records before the cutoff, then prunes the rollups
+        self.sql.get_session().query(UsageRecordDB).filter(UsageRecordDB.timestamp < cutoff).delete()
+
+        self.repo.prune_rollups(cutoff)
+
+        rollups = self._rollups()
+        self.assertEqual(len(rollups), 1)
+        self.assertEqual(rollups[0].day, day_start.date())
+        self.assertEqual(rollups[0].record_count, 1)
+        self.assertEqual(rollups[0].total_cost_credits, 3.0)
+        self.assertEqual(self.repo.get_aggregates_by_user(self.user.id).total_records, 1)
+
+    def test_maintain_partitions_without_partitioning_keeps_the_records(self):
+        self.repo.create(self._create_record(timestamp = datetime.now(timezone.utc) - timedelta(days = 400)))
+
+        dropped = self.repo.maintain_partitions(datetime.now(timezone.utc) - timedelta(days = 30))
+
+        self.assertEqual(dropped, 0)
+        self.assertEqual(self.repo.get_aggregates_by_user(self.user.id).total_records, 1)
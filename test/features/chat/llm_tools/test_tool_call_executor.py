@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import Mock, patch
+from uuid import UUID
+
+from langchain_core.messages import ToolCall
+
+from db.model.chat_config import ChatConfigDB
+from db.model.user import UserDB
+from db.schema.chat_config import ChatConfig
+from db.schema.user import User
+from features.chat.llm_tools.tool_call_executor import ToolCallExecutor
+from util.error_codes import TOOL_CALL_TIMED_OUT
+
+
+class ToolCallExecutorTest(unittest.TestCase):
+
+    user: User
+    chat_config: ChatConfig
+    tool_delays_s: dict[str, float]
+    sessions: list[Mock]
+    scoped_dis: list[Mock]
+    active_calls: int
+    max_active_calls: int
+    lock: threading.Lock
+    mock_di: Mock
+    mock_config: Mock
+    executor: ToolCallExecutor
+
+    def setUp(self):
+        self.user = User(
+            id = UUID(int = 1),
+            full_name = "Test User",
+            telegram_username = "test_username",
+            telegram_chat_id = "test_chat_id",
+            telegram_user_id = 1,
+            open_ai_key = "test_api_key",
+            group = UserDB.Group.standard,
+            created_at = date.today(),
+        )
+        self.chat_config = ChatConfig(
+            chat_id = UUID(int = 2),
+            external_id = "test_chat_id",
+            chat_type = ChatConfigDB.ChatType.telegram,
+        )
+        self.tool_delays_s = {}
+        self.sessions = []
+        self.scoped_dis = []
+        self.active_calls = 0
+        self.max_active_calls = 0
+        self.lock = threading.Lock()
+
+        self.mock_di = Mock()
+        # noinspection PyPropertyAccess
+        self.mock_di.invoker = self.user
+        # noinspection PyPropertyAccess
+        self.mock_di.invoker_chat = self.chat_config
+        self.mock_di.clone.side_effect = self.__clone
+
+        config_patcher = patch("features.chat.llm_tools.tool_call_executor.config")
+        self.mock_config = config_patcher.start()
+        self.mock_config.chat_tool_concurrency = 4
+        self.mock_config.chat_tool_timeout_s = 5.0
+        self.addCleanup(config_patcher.stop)
+
+        session_patcher = patch(
+            "features.chat.llm_tools.tool_call_executor.get_detached_session",
+            side_effect = self.__detached_session,
+        )
+        session_patcher.start()
+        self.addCleanup(session_patcher.stop)
+
+        self.executor = ToolCallExecutor(self.mock_di)
+
+    @contextmanager
+    def __detached_session(self):
+        session = Mock()
+        with self.lock:
+            self.sessions.append(session)
+        yield session
+        session.closed = True
+
+    def __clone(self, db: Mock) -> Mock:
+        scoped_di = Mock()
+        scoped_di.db = db
+        scoped_di.llm_tool_library.invoke.side_effect = self.__slow_tool
+        with self.lock:
+            self.scoped_dis.append(scoped_di)
+        return scoped_di
+
+    def __slow_tool(self, tool_name: str, args: dict) -> str:
+        with self.lock:
+            self.active_calls += 1
+            self.max_active_calls = max(self.max_active_calls, self.active_calls)
+        try:
+            time.sleep(self.tool_delays_s.get(tool_name, 0.0))
+            if tool_name == "broken_tool":
+                raise ValueError("Tool exploded")
+            return f"{tool_name} result for {args['value']}"
+        finally:
+            with self.lock:
+                self.active_calls -= 1
+
+    @staticmethod
+    def __tool_call(index: int, name: str) -> ToolCall:
+        return ToolCall(id = str(index), name = name, args = {"value": index})
+
+    def test_no_tool_calls(self):
+        self.assertEqual(self.executor.execute([]), [])
+        self.mock_di.clone.assert_not_called()
+
+    def test_wall_time_is_close_to_slowest_call(self):
+        self.tool_delays_s = {"fetch_web_content": 0.3, "get_exchange_rate": 0.1, "ai_web_search": 0.2}
+        tool_calls = [
+            self.__tool_call(1, "fetch_web_content"),
+            self.__tool_call(2, "get_exchange_rate"),
+            self.__tool_call(3, "ai_web_search"),
+        ]
+
+        start = time.perf_counter()
+        results = self.executor.execute(tool_calls)
+        elapsed_s = time.perf_counter() - start
+
+        # sequential execution would take 0.6s
+        self.assertLess(elapsed_s, 0.45)
+        self.assertGreaterEqual(elapsed_s, 0.3)
+        self.assertEqual(
+            results,
+            [
+                "fetch_web_content result for 1",
+                "get_exchange_rate result for 2",
+                "ai_web_search result for 3",
+            ],
+        )
+
+    def test_each_call_gets_own_scope(self):
+        tool_calls = [self.__tool_call(index, "get_version") for index in range(3)]
+
+        self.executor.execute(tool_calls)
+
+        self.assertEqual(len(self.sessions), 3)
+        self.assertEqual(len(self.scoped_dis), 3)
+        self.assertTrue(all(session.closed for session in self.sessions))
+        for scoped_di in self.scoped_dis:
+            scoped_di.inject_invoker.assert_called_once_with(self.user)
+            scoped_di.inject_invoker_chat.assert_called_once_with(self.chat_config)
+            scoped_di.llm_tool_library.invoke.assert_called_once()
+        self.assertEqual({scoped_di.db for scoped_di in self.scoped_dis}, set(self.sessions))
+        self.mock_di.llm_tool_library.invoke.assert_not_called()
+
+    def test_concurrency_is_bounded_by_the_pool(self):
+        self.tool_delays_s = {"get_version": 0.05}
+        tool_calls = [self.__tool_call(index, "get_version") for index in range(6)]
+        pool = ThreadPoolExecutor(max_workers = 2)
+        self.addCleanup(pool.shutdown)
+
+        results = ToolCallExecutor(self.mock_di, executor = pool).execute(tool_calls)
+
+        self.assertEqual(self.max_active_calls, 2)
+        self.assertEqual(results, [f"get_version result for {index}" for index in range(6)])
+
+    def test_timed_out_call_returns_error(self):
+        self.mock_config.chat_tool_timeout_s = 0.1
+        self.tool_delays_s = {"fetch_web_content": 1.0}
+        tool_calls = [self.__tool_call(1, "fetch_web_content"), self.__tool_call(2, "get_version")]
+
+        start = time.perf_counter()
+        results = self.executor.execute(tool_calls)
+        elapsed_s = time.perf_counter() - start
+
+        self.assertLess(elapsed_s, 0.5)
+        error = json.loads(results[0] or "")
+        self.assertEqual(error["result"], "Error")
+        self.assertEqual(error["error_code"], TOOL_CALL_TIMED_OUT)
+        self.assertEqual(results[1], "get_version result for 2")
+
+    def test_deadlines_count_from_submission(self):
+        self.mock_config.chat_tool_timeout_s = 0.2
+        self.tool_delays_s = {"get_exchange_rate": 0.15, "fetch_web_content": 0.35}
+        tool_calls = [self.__tool_call(1, "get_exchange_rate"), self.__tool_call(2, "fetch_web_content")]
+
+        start = time.perf_counter()
+        results = self.executor.execute(tool_calls)
+        elapsed_s = time.perf_counter() - start
+
+        # waiting for the calls one after another would have given the second one 0.35s
+        self.assertLess(elapsed_s, 0.3)
+        self.assertEqual(results[0], "get_exchange_rate result for 1")
+        self.assertEqual(json.loads(results[1] or "")["error_code"], TOOL_CALL_TIMED_OUT)
+
+    def test_slow_tools_get_more_time(self):
+        self.mock_config.chat_tool_timeout_s = 0.05
+        self.tool_delays_s = {"generate_image": 0.15}
+        tool_calls = [self.__tool_call(1, "generate_image"), self.__tool_call(2, "get_version")]
+
+        results = self.executor.execute(tool_calls)
+
+        self.assertEqual(results, ["generate_image result for 1", "get_version result for 2"])
+
+    def test_lone_slow_call_times_out(self):
+        self.mock_config.chat_tool_timeout_s = 0.1
+        self.tool_delays_s = {"fetch_web_content": 1.0}
+
+        start = time.perf_counter()
+        results = self.executor.execute([self.__tool_call(1, "fetch_web_content")])
+        elapsed_s = time.perf_counter() - start
+
+        self.assertLess(elapsed_s, 0.5)
+        self.assertEqual(json.loads(results[0] or "")["error_code"], TOOL_CALL_TIMED_OUT)
+        self.mock_di.llm_tool_library.invoke.assert_not_called()
+
+    def test_failed_call_raises(self):
+        tool_calls = [self.__tool_call(1, "get_version"), self.__tool_call(2, "broken_tool")]
+
+        with self.assertRaises(ValueError):
+            self.executor.execute(tool_calls)
@@ -0,0 +1,100 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from uuid import UUID
+
+from features.chat.membership.chat_access_cache import ChatAccessCache
+from features.integrations.platform_bot_sdk import ChatAccess
+
+
+class ChatAccessCacheTest(unittest.TestCase):
+
+    now: datetime
+    cache: ChatAccessCache
+
+    def setUp(self):
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+        self.cache = ChatAccessCache(
+            max_entries = 2,
+            ttl_s = 60,
+            now = lambda: self.now,
+        )
+
+    def test_resolves_once_per_ttl_window(self):
+        resolve = Mock(return_value = ChatAccess.member)
+
+        first = self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        second = self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+
+        self.assertEqual(first, ChatAccess.member)
+        self.assertEqual(second, ChatAccess.member)
+        resolve.assert_called_once()
+
+    def test_does_not_cache_missing_access(self):
+        # the first lookup fails (the SDK returns None on errors), the next message retries it
+        resolve = Mock(side_effect = [None, ChatAccess.admin])
+
+        first = self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        second = self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+
+        self.assertIsNone(first)
+        self.assertEqual(second, ChatAccess.admin)
+        self.assertEqual(resolve.call_count, 2)
+        self.assertEqual(self.cache.size, 1)
+
+    def test_expires_after_ttl(self):
+        resolve = Mock(side_effect = [ChatAccess.member, ChatAccess.admin])
+
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        self.now += timedelta(seconds = 61)
+        result = self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+
+        self.assertEqual(result, ChatAccess.admin)
+        self.assertEqual(resolve.call_count, 2)
+
+    def test_invalidate_single_member(self):
+        resolve = Mock(return_value = ChatAccess.member)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 11), resolve)
+
+        self.cache.invalidate(UUID(int = 1), UUID(int = 10))
+
+        self.assertEqual(self.cache.size, 1)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        self.assertEqual(resolve.call_count, 3)
+
+    def test_invalidate_chat(self):
+        resolve = Mock(return_value = ChatAccess.member)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        self.cache.get_or_resolve(UUID(int = 2), UUID(int = 10), resolve)
+
+        self.cache.invalidate_chat(UUID(int = 1))
+
+        self.assertEqual(self.cache.size, 1)
+        self.cache.get_or_resolve(UUID(int = 2), UUID(int = 10), resolve)
+        self.assertEqual(resolve.call_count, 2)
+
+    def test_evicts_least_recently_used(self):
+        resolve = Mock(return_value = ChatAccess.member)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 11), resolve)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 12), resolve)
+
+        self.assertEqual(self.cache.size, 2)
+        self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+        self.assertEqual(resolve.call_count, 4)
+
+    def test_stats(self):
+        resolve = Mock(return_value = ChatAccess.member)
+        for _ in range(4):
+            self.cache.get_or_resolve(UUID(int = 1), UUID(int = 10), resolve)
+
+        stats = self.cache.stats()
+
+        self.assertEqual(stats.hits, 3)
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.saved_calls, 3)
+        self.assertAlmostEqual(stats.hit_ratio, 0.75)
+
+    def test_stats_empty(self):
+        self.assertEqual(self.cache.stats().hit_ratio, 0.0)
@@ -10,6 +10,7 @@ from db.model.user import UserDB
 from db.schema.chat_config import ChatConfig, ChatConfigSave
 from db.schema.user import User, UserSave
 from di.di import DI
+from features.chat.membership.chat_access_cache import ChatAccessCache
 from features.chat.membership.chat_membership import ChatMembership
 from features.chat.membership.chat_membership_service import ChatMembershipService
 from features.integrations.platform_bot_sdk import ChatAccess
@@ -54,6 +55,8 @@ class ChatMembershipServiceTest(unittest.TestCase):
         self.mock_di = Mock(spec = DI)
         # noinspection PyPropertyAccess
         self.mock_di.chat_membership_repo = self.sql.chat_membership_repo()
+        # noinspection PyPropertyAccess
+        self.mock_di.chat_access_cache = ChatAccessCache(max_entries = 100, ttl_s = 60)
         self.mock_di.platform_bot_sdk.return_value = self.mock_sdk
         self.service = ChatMembershipService(self.mock_di)
 
@@ -236,6 +239,26 @@ class ChatMembershipServiceTest(unittest.TestCase):
         self.assertFalse(result.is_admin)
         self.assertTrue(result.use_about_me)
 
+    def test_sync_reuses_cached_access(self):
+        self.mock_sdk.resolve_chat_access.return_value = ChatAccess.member
+
+        self.service.sync(self.user, self.chat)
+        result = self.service.sync(self.user, self.chat)
+
+        self.assertFalse(result.is_admin)
+        self.mock_sdk.resolve_chat_access.assert_called_once_with(self.chat, self.user)
+        self.assertEqual(self.mock_di.chat_access_cache.stats().saved_calls, 1)
+
+    def test_sync_fresh_bypasses_cached_access(self):
+        self.mock_sdk.resolve_chat_access.return_value = ChatAccess.member
+        self.service.sync(self.user, self.chat)
+        self.mock_sdk.resolve_chat_access.return_value = ChatAccess.admin
+
+        result = self.service.sync(self.user, self.chat, fresh = True)
+
+        self.assertTrue(result.is_admin)
+        self.assertEqual(self.mock_sdk.resolve_chat_access.call_count, 2)
+
     # === refresh_chat_memberships ===
 
     def test_refresh_chat_memberships_promotes_new_admin(self):
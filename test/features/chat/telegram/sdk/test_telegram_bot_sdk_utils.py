@@ -1,3 +1,4 @@
+import threading
 import unittest
 from datetime import datetime
 from unittest.mock import Mock, patch
@@ -5,8 +6,9 @@ from uuid import UUID
 
 from db.schema.chat_message_attachment import ChatMessageAttachment, ChatMessageAttachmentSave
 from di.di import DI
-from features.chat.telegram.sdk.telegram_bot_sdk import TelegramBotSDK
-from util.errors import InternalError
+from features.chat.telegram.sdk.telegram_bot_sdk import MAX_REFRESH_WORKERS, TelegramBotSDK
+from util.error_codes import ATTACHMENT_NOT_FOUND
+from util.errors import InternalError, NotFoundError
 
 
 class TelegramBotSDKUtilsTest(unittest.TestCase):
@@ -37,6 +39,7 @@ class TelegramBotSDKUtilsTest(unittest.TestCase):
         self.mock_di.telegram_bot_api.get_file_info.return_value = self.api_file_info
 
     def test_refresh_attachments_by_ids_empty_list(self):
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.return_value = []
         sdk = TelegramBotSDK(self.mock_di)
         result = sdk.refresh_attachments_by_ids(
             attachment_ids = [],
@@ -44,35 +47,34 @@ class TelegramBotSDKUtilsTest(unittest.TestCase):
         self.assertEqual(result, [])
 
     def test_refresh_attachments_by_ids_with_attachments(self):
-        attachment_ids = ["short1", "short2"]
+        attachment_ids = ["short1", "short2", "short1"]
 
-        # Mock the get method to return attachment data
-        self.mock_di.chat_message_attachment_crud.get.side_effect = [
+        # one query for all IDs, rows come back in the requested order
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.return_value = [
             {"id": "short1", "external_id": "ext1", "chat_id": UUID(int = 1), "message_id": "msg1"},
             {"id": "short2", "external_id": "ext2", "chat_id": UUID(int = 1), "message_id": "msg2"},
+            {"id": "short1", "external_id": "ext1", "chat_id": UUID(int = 1), "message_id": "msg1"},
         ]
 
         sdk = TelegramBotSDK(self.mock_di)
-        with patch.object(TelegramBotSDK, "refresh_attachment") as mock_refresh:
-            mock_attachment1 = ChatMessageAttachment(
-                id = "short1",
-                external_id = "ext1",
-                chat_id = UUID(int = 1),
-                message_id = "msg1",
-            )
-            mock_attachment2 = ChatMessageAttachment(
-                id = "short2",
-                external_id = "ext2",
-                chat_id = UUID(int = 1),
-                message_id = "msg2",
-            )
-            mock_refresh.side_effect = [mock_attachment1, mock_attachment2]
-
+        with patch.object(TelegramBotSDK, "refresh_attachment_instances", side_effect = lambda attachments: attachments):
             result = sdk.refresh_attachments_by_ids(attachment_ids = attachment_ids)
 
-            self.assertEqual(len(result), 2)
-            self.assertEqual(result[0].id, "short1")
-            self.assertEqual(result[1].id, "short2")
+        self.assertEqual([attachment.id for attachment in result], ["short1", "short2", "short1"])
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.assert_called_once_with(attachment_ids)
+        self.mock_di.chat_message_attachment_crud.get.assert_not_called()
+
+    def test_refresh_attachments_by_ids_missing_attachment(self):
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.side_effect = NotFoundError(
+            "Attachment with ID 'short2' not found in DB", ATTACHMENT_NOT_FOUND,
+        )
+
+        sdk = TelegramBotSDK(self.mock_di)
+        with self.assertRaises(NotFoundError) as context:
+            sdk.refresh_attachments_by_ids(attachment_ids = ["short1", "short2"])
+
+        self.assertIn("'short2' not found in DB", str(context.exception))
+        self.mock_di.telegram_bot_api.get_file_info.assert_not_called()
 
     def test_refresh_attachment_with_attachment_instance(self):
         attachment = ChatMessageAttachment(
@@ -204,21 +206,89 @@ class TelegramBotSDKUtilsTest(unittest.TestCase):
         self.assertEqual(result.mime_type, "image/png")
 
     def test_refresh_attachment_instances(self):
+        fresh_until = int(datetime.now().timestamp()) + 3600
+        attachments = [
+            ChatMessageAttachment(id = "id1", external_id = "ext1", chat_id = UUID(int = 1), message_id = "msg1", extension = "png"),
+            ChatMessageAttachment(
+                id = "id2",
+                external_id = "ext2",
+                chat_id = UUID(int = 1),
+                message_id = "msg2",
+                last_url = "http://fresh.url",
+                last_url_until = fresh_until,
+            ),
+            ChatMessageAttachment(id = "id3", external_id = "ext3", chat_id = UUID(int = 1), message_id = "msg3", extension = "png"),
+        ]
+        self.mock_di.chat_message_attachment_crud.save_all.side_effect = lambda saves: [save.model_dump() for save in saves]
+
+        sdk = TelegramBotSDK(self.mock_di)
+        result = sdk.refresh_attachment_instances(attachments = attachments)
+
+        self.assertEqual([attachment.id for attachment in result], ["id1", "id2", "id3"])
+        # only the stale ones are looked up remotely, all of them are stored at once
+        self.assertEqual(
+            sorted(call.args[0] for call in self.mock_di.telegram_bot_api.get_file_info.call_args_list),
+            ["ext1", "ext3"],
+        )
+        self.mock_di.chat_message_attachment_crud.save_all.assert_called_once()
+        self.mock_di.chat_message_attachment_crud.save.assert_not_called()
+        self.assertTrue(str(result[0].last_url).endswith("/files/test.png"))
+        self.assertEqual(result[1].last_url, "http://fresh.url")
+        self.assertEqual(result[1].last_url_until, fresh_until)
+
+    def test_refresh_attachment_instances_looks_up_repeated_attachments_once(self):
         attachments = [
             ChatMessageAttachment(id = "id1", external_id = "ext1", chat_id = UUID(int = 1), message_id = "msg1"),
             ChatMessageAttachment(id = "id2", external_id = "ext2", chat_id = UUID(int = 1), message_id = "msg2"),
+            ChatMessageAttachment(id = "id1", external_id = "ext1", chat_id = UUID(int = 1), message_id = "msg1"),
+        ]
+        self.mock_di.chat_message_attachment_crud.save_all.side_effect = lambda saves: [save.model_dump() for save in saves]
+
+        sdk = TelegramBotSDK(self.mock_di)
+        result = sdk.refresh_attachment_instances(attachments = attachments)
+
+        self.assertEqual([attachment.id for attachment in result], ["id1", "id2", "id1"])
+        self.assertEqual(
+            sorted(call.args[0] for call in self.mock_di.telegram_bot_api.get_file_info.call_args_list),
+            ["ext1", "ext2"],
+        )
+        self.assertTrue(str(result[2].last_url).endswith("/files/test.png"))
+
+    def test_refresh_attachment_instances_looks_up_concurrently(self):
+        attachments = [
+            ChatMessageAttachment(id = f"id{index}", external_id = f"ext{index}", chat_id = UUID(int = 1), message_id = "msg")
+            for index in range(MAX_REFRESH_WORKERS)
         ]
+        # every lookup waits for all of the others, which only completes if they run at the same time
+        barrier = threading.Barrier(MAX_REFRESH_WORKERS, timeout = 5)
+
+        def get_file_info(_external_id: str):
+            barrier.wait()
+            return self.api_file_info
+
+        self.mock_di.telegram_bot_api.get_file_info.side_effect = get_file_info
+        self.mock_di.chat_message_attachment_crud.save_all.side_effect = lambda saves: [save.model_dump() for save in saves]
 
         sdk = TelegramBotSDK(self.mock_di)
-        with patch.object(TelegramBotSDK, "refresh_attachment") as mock_refresh:
-            mock_refresh.side_effect = attachments  # Return the same attachments
+        result = sdk.refresh_attachment_instances(attachments = attachments)
+
+        self.assertEqual(len(result), MAX_REFRESH_WORKERS)
+        self.assertEqual(self.mock_di.telegram_bot_api.get_file_info.call_count, MAX_REFRESH_WORKERS)
+
+    def test_refresh_attachment_instances_failed_lookup_stores_nothing(self):
+        attachments = [
+            ChatMessageAttachment(id = "id1", external_id = "ext1", chat_id = UUID(int = 1), message_id = "msg1"),
+            ChatMessageAttachment(id = "id2", external_id = None, chat_id = UUID(int = 1), message_id = "msg2"),
+        ]
 
-            result = sdk.refresh_attachment_instances(attachments = attachments)
+        sdk = TelegramBotSDK(self.mock_di)
+        with self.assertRaises(InternalError) as context:
+            sdk.refresh_attachment_instances(attachments = attachments)
 
-            self.assertEqual(len(result), 2)
-            self.assertEqual(mock_refresh.call_count, 2)
+        self.assertIn("No external ID provided", str(context.exception))
+        self.mock_di.chat_message_attachment_crud.save_all.assert_not_called()
 
-    @patch("features.chat.telegram.sdk.telegram_bot_sdk.requests.get")
+    @patch("features.chat.telegram.sdk.telegram_bot_sdk.http_transport.get")
     @patch.object(TelegramBotSDK, "_detect_image_format_from_bytes")
     def test_detect_and_set_image_format_jpeg_success(self, mock_detect_format, mock_requests):
         # Mock successful response with JPEG content
@@ -261,7 +331,7 @@ class TelegramBotSDKUtilsTest(unittest.TestCase):
         mock_requests.assert_called_once_with("http://example.com/image.jpg", timeout = 10)
         mock_detect_format.assert_called_once_with(b"fake_jpeg_content")
 
-    @patch("features.chat.telegram.sdk.telegram_bot_sdk.requests.get")
+    @patch("features.chat.telegram.sdk.telegram_bot_sdk.http_transport.get")
     @patch.object(TelegramBotSDK, "_detect_image_format_from_bytes")
     def test_refresh_attachment_detects_image_format_when_missing(self, mock_detect_format, mock_requests):
         """Test that refresh_attachment detects image format when extension and mime_type are None"""
@@ -306,7 +376,7 @@ class TelegramBotSDKUtilsTest(unittest.TestCase):
         mock_requests.assert_called_once_with("http://example.com/image.jpg", timeout = 10)
         mock_detect_format.assert_called_once_with(b"fake_jpeg_content")
 
-    @patch("features.chat.telegram.sdk.telegram_bot_sdk.requests.get")
+    @patch("features.chat.telegram.sdk.telegram_bot_sdk.http_transport.get")
     def test_refresh_attachment_handles_image_detection_failure(self, mock_requests):
         """Test that refresh_attachment handles image detection failures gracefully"""
         # Mock request failure
@@ -4,7 +4,7 @@ from unittest.mock import MagicMock, Mock, patch
 from uuid import UUID
 
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import Runnable
 from pydantic import SecretStr
 
@@ -18,6 +18,7 @@ from features.chat.chat_agent import ChatAgent
 from features.chat.chat_progress_notifier import ChatProgressNotifier
 from features.chat.command_processor import CommandProcessor
 from features.chat.llm_tools.llm_tool_library import LLMToolLibrary
+from features.chat.llm_tools.tool_call_executor import ToolCallExecutor
 from features.external_tools.tool_choice_resolver import ConfiguredTool
 from features.integrations.integrations import resolve_agent_user
 from util.error_codes import UNEXPECTED_ERROR, WAITLIST_ACCOUNT_NOT_ACTIVE, WAITLIST_INVITED_POLICIES_REQUIRED
@@ -77,6 +78,8 @@ class ChatAgentTest(unittest.TestCase):
         # noinspection PyPropertyAccess
         self.mock_di.llm_tool_library = Mock(spec = LLMToolLibrary)
         # noinspection PyPropertyAccess
+        self.mock_di.tool_call_executor = Mock(spec = ToolCallExecutor)
+        # noinspection PyPropertyAccess
         self.mock_di.chat_membership_service = Mock()
         self.mock_di.chat_membership_service.get.return_value = None
         # noinspection PyPropertyAccess
@@ -102,9 +105,6 @@ class ChatAgentTest(unittest.TestCase):
         )
         self.mock_di.chat_message_crud.get_latest_chat_messages.return_value = [mock_latest_message]
 
-        self.sleep_patcher = patch("features.chat.chat_agent.time.sleep")
-        self.mock_sleep = self.sleep_patcher.start()
-
         self.agent = ChatAgent(
             messages = [HumanMessage("Test message")],
             raw_last_message = "Test message",
@@ -264,6 +264,26 @@ class ChatAgentTest(unittest.TestCase):
         result = self.agent.execute()
         self.assertIn("Failed to process command.", result.content)
 
+    @patch("features.chat.chat_agent.ChatAgent.process_commands")
+    def test_handle_commands_leaves_unhandled_messages_for_reply(self, mock_process_commands):
+        self.chat_config.is_private = True
+        mock_process_commands.return_value = ChatAgent.CommandHandlingResult(is_handled = False)
+
+        result = self.agent.handle_commands()
+
+        self.assertFalse(result.is_handled)
+        mock_process_commands.assert_called_once()
+
+    @patch("features.chat.chat_agent.ChatAgent.process_commands")
+    def test_handle_commands_consumes_undispatchable_messages(self, mock_process_commands):
+        self.agent._ChatAgent__raw_last_message = ""
+
+        result = self.agent.handle_commands()
+
+        self.assertTrue(result.is_handled)
+        self.assertIsNone(result.reply)
+        mock_process_commands.assert_not_called()
+
     @patch("features.chat.chat_agent.ChatAgent.process_commands")
     @patch("features.chat.chat_agent.ChatAgent.should_reply")
     def test_execute_no_api_key(self, mock_should_reply, mock_process_commands):
@@ -321,10 +341,15 @@ class ChatAgentTest(unittest.TestCase):
         mock_tools_model = Mock()
         mock_tools_model.invoke.side_effect = [ai_with_tools, ai_final]
         self.mock_di.llm_tool_library.bind_tools.return_value = mock_tools_model
-        self.mock_di.llm_tool_library.invoke.return_value = "Tool result"
+        self.mock_di.tool_call_executor.execute.return_value = ["Tool result"]
 
         result = self.agent.execute()
         self.assertEqual(result.content, "Final response")
+        self.mock_di.tool_call_executor.execute.assert_called_once_with([tool_call | {"type": "tool_call"}])
+        messages = mock_tools_model.invoke.call_args_list[1].args[0]
+        tool_message = next(message for message in messages if isinstance(message, ToolMessage))
+        self.assertEqual(tool_message.content, "Tool result")
+        self.assertEqual(tool_message.tool_call_id, "1")
 
     @patch("features.chat.chat_agent.ChatAgent.process_commands")
     @patch("features.chat.chat_agent.ChatAgent.should_reply")
@@ -365,7 +390,7 @@ class ChatAgentTest(unittest.TestCase):
         mock_tools_model = Mock()
         mock_tools_model.invoke.return_value = ai_with_tools
         self.mock_di.llm_tool_library.bind_tools.return_value = mock_tools_model
-        self.mock_di.llm_tool_library.invoke.return_value = "Tool result"
+        self.mock_di.tool_call_executor.execute.return_value = ["Tool result"]
 
         result = self.agent.execute()
 
@@ -427,9 +452,6 @@ class ChatAgentTest(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIn("policies", result.content.lower())
 
-    def tearDown(self):
-        self.sleep_patcher.stop()
-
     @patch("features.chat.chat_agent.config")
     @patch("features.chat.chat_agent.ChatAgent.process_commands")
     @patch("features.chat.chat_agent.ChatAgent.should_reply")
@@ -444,7 +466,6 @@ class ChatAgentTest(unittest.TestCase):
 
         self.agent.execute()
 
-        self.mock_sleep.assert_not_called()
         self.mock_di.chat_message_crud.get_latest_chat_messages.assert_not_called()
 
     @patch("features.chat.chat_agent.config")
@@ -463,7 +484,6 @@ class ChatAgentTest(unittest.TestCase):
 
         result = self.agent.execute()
 
-        self.mock_sleep.assert_called_once_with(1.0)
         self.assertEqual(result.content, "LLM response")
 
     @patch("features.chat.chat_agent.config")
@@ -482,7 +502,6 @@ class ChatAgentTest(unittest.TestCase):
 
         result = self.agent.execute()
 
-        self.mock_sleep.assert_called_once_with(1.0)
         self.assertIsNone(result)
         self.mock_di.llm_tool_library.bind_tools.assert_not_called()
 
@@ -666,7 +685,7 @@ class ChatAgentTest(unittest.TestCase):
     def test_should_reply_carries_mention_from_seconds_old_burst_message(self, mock_config):
         # Regression for prod bug: bot did not reply to msg3 (no tag) when msg2 (TAG)
         # arrived within seconds. The should_reply call always happens after a debounce
-        # sleep, so any prior burst message is older than debounce_delay_s by definition
+        # wait, so any prior burst message is older than debounce_delay_s by definition
         # — a cutoff of now - debounce_delay_s excludes exactly the messages we want to
         # carry the mention from.
         self.chat_config.is_private = False
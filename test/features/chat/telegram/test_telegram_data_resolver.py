@@ -304,9 +304,8 @@ class TelegramDataResolverTest(unittest.TestCase):
         self.assertEqual(result.group, existing_user.group)
         self.assertEqual(result.created_at, existing_user.created_at)
 
-    @patch("db.crud.user.UserCRUD.count")
-    def test_resolve_author_user_limit_reached_creates_waitlisted_user(self, mock_count):
-        mock_count.return_value = config.max_users  # reach maximum immediately
+    @patch.object(config, "max_users", 0)  # reach maximum immediately
+    def test_resolve_author_user_limit_reached_creates_waitlisted_user(self):
         mapped_data = UserSave(
             telegram_user_id = 1,
             full_name = "New User",
@@ -318,7 +317,7 @@ class TelegramDataResolverTest(unittest.TestCase):
         self.assertTrue(result.is_on_waitlist)
         self.assertFalse(result.is_invited_to_start)
         self.assertFalse(result.are_policies_accepted)
-        mock_count.assert_called_once()
+        self.assertEqual(self.sql.user_crud().count(), 1)
 
     def test_resolve_author_existing(self):
         existing_user_data = UserSave(
@@ -434,6 +433,58 @@ class TelegramDataResolverTest(unittest.TestCase):
         self.assertEqual(result.id, existing_user.id)
         self.assertEqual(result.full_name, existing_user.full_name)  # Should preserve existing name
 
+    def test_resolve_author_unchanged_skips_write(self):
+        existing_user_data = UserSave(
+            telegram_user_id = 1,
+            telegram_username = "existing",
+            full_name = "Existing User",
+            telegram_chat_id = "c1",
+            open_ai_key = SecretStr("sk-key"),
+            about_me = SecretStr("Personal info about me"),
+        )
+        existing_user = User.model_validate(self.sql.user_crud().save(existing_user_data))
+
+        mapped_data = UserSave(
+            telegram_user_id = 1,
+            telegram_username = "existing",
+            full_name = "Existing User",
+            telegram_chat_id = "c1",
+        )
+        with patch.object(self.mock_di.user_crud, "save") as mock_save, \
+                patch.object(self.mock_di.user_crud, "update_fields") as mock_update_fields:
+            result = self.resolver.resolve_author(mapped_data)
+
+        mock_save.assert_not_called()
+        mock_update_fields.assert_not_called()
+        self.assertEqual(result, existing_user)
+
+    def test_resolve_author_updates_only_changed_fields(self):
+        existing_user_data = UserSave(
+            telegram_user_id = 1,
+            telegram_username = "existing",
+            full_name = "Existing User",
+            telegram_chat_id = "c1",
+            open_ai_key = SecretStr("sk-key"),
+            about_me = SecretStr("Personal info about me"),
+        )
+        existing_user = User.model_validate(self.sql.user_crud().save(existing_user_data))
+
+        mapped_data = UserSave(
+            telegram_user_id = 1,
+            telegram_username = "renamed",
+            full_name = "Existing User",
+            telegram_chat_id = "c1",
+        )
+        user_crud = self.mock_di.user_crud
+        with patch.object(user_crud, "update_fields", wraps = user_crud.update_fields) as mock_update_fields:
+            result = self.resolver.resolve_author(mapped_data)
+
+        mock_update_fields.assert_called_once_with(existing_user.id, {"telegram_username": "renamed"})
+        assert result is not None
+        self.assertEqual(result.telegram_username, "renamed")
+        self.assertEqual(result.open_ai_key, existing_user.open_ai_key)
+        self.assertEqual(result.about_me, existing_user.about_me)
+
     @patch("db.crud.user.UserCRUD.get_by_telegram_user_id")
     @patch("db.crud.user.UserCRUD.get_by_telegram_username")
     def test_resolve_author_api_key_reset(self, mock_get_by_username, mock_get_by_user_id):
@@ -468,6 +519,7 @@ class TelegramDataResolverTest(unittest.TestCase):
             full_name = "Test User",
             telegram_chat_id = "c1",
         )
+        self.sql.user_crud().save(UserSave(**fake_user.model_dump()))  # the stored row matches the looked up user
         result = self.resolver.resolve_author(mapped_data)
         for field in secret_fields:
             self.assertIsNone(getattr(result, field), f"{field} should remain None when already None")
@@ -476,6 +528,7 @@ class TelegramDataResolverTest(unittest.TestCase):
         for field in secret_fields:
             setattr(mapped_data, field, SecretStr(""))
             setattr(fake_user, field, SecretStr(""))
+        self.sql.user_crud().save(UserSave(**fake_user.model_dump()))  # the stored row matches the looked up user
         result = self.resolver.resolve_author(mapped_data)
         for field in secret_fields:
             self.assertIsNone(getattr(result, field), f"{field} should be reset to None if empty")
@@ -484,6 +537,7 @@ class TelegramDataResolverTest(unittest.TestCase):
         for field in secret_fields:
             setattr(mapped_data, field, SecretStr("    "))
             setattr(fake_user, field, SecretStr("    "))
+        self.sql.user_crud().save(UserSave(**fake_user.model_dump()))  # the stored row matches the looked up user
         result = self.resolver.resolve_author(mapped_data)
         for field in secret_fields:
             self.assertIsNone(getattr(result, field), f"{field} should be reset to None if whitespace")
@@ -492,6 +546,7 @@ class TelegramDataResolverTest(unittest.TestCase):
         for field in secret_fields:
             setattr(mapped_data, field, SecretStr(f"valid_{field}"))
             setattr(fake_user, field, SecretStr(f"valid_{field}"))
+        self.sql.user_crud().save(UserSave(**fake_user.model_dump()))  # the stored row matches the looked up user
         result = self.resolver.resolve_author(mapped_data)
         for field in secret_fields:
             result_key = getattr(result, field)
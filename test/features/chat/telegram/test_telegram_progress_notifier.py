@@ -1,17 +1,30 @@
 import unittest
+from concurrent.futures import Executor, Future
 from unittest.mock import MagicMock, Mock, patch
 from uuid import UUID
 
 from db.model.chat_config import ChatConfigDB
 from db.schema.chat_config import ChatConfig
-from features.chat.chat_progress_notifier import ChatProgressNotifier
+from features.chat.chat_progress_notifier import MAX_CYCLES, TYPING_STATUS_INTERVAL_S, ChatProgressNotifier
+from features.chat.chat_progress_scheduler import ChatProgressScheduler
 from features.integrations.platform_bot_sdk import PlatformBotSDK
 
 
+class InlineExecutor(Executor):
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
 class ChatProgressNotifierTest(unittest.TestCase):
 
     chat_config: ChatConfig
     message_id: str
+    now_s: float
+    scheduler: ChatProgressScheduler
+    mock_platform_sdk: Mock
     mock_di: Mock
     notifier: ChatProgressNotifier
 
@@ -27,6 +40,9 @@ class ChatProgressNotifierTest(unittest.TestCase):
             chat_type = ChatConfigDB.ChatType.telegram,
         )
         self.message_id = "test_message_id"
+        self.now_s = 0.0
+        self.scheduler = ChatProgressScheduler(executor = InlineExecutor(), clock = lambda: self.now_s, use_timer = False)
+        self.mock_platform_sdk = Mock(spec = PlatformBotSDK)
 
         # Create mock DI with all necessary dependencies
         self.mock_di = Mock()
@@ -34,7 +50,9 @@ class ChatProgressNotifierTest(unittest.TestCase):
         self.mock_di.invoker_chat = self.chat_config
         self.mock_di.require_invoker_chat = MagicMock(return_value = self.chat_config)
         # noinspection PyPropertyAccess
-        self.mock_di.platform_bot_sdk = Mock(return_value = Mock(spec = PlatformBotSDK))
+        self.mock_di.platform_bot_sdk = Mock(return_value = self.mock_platform_sdk)
+        # noinspection PyPropertyAccess
+        self.mock_di.chat_progress_scheduler = self.scheduler
         self.mock_di.require_invoker_chat_type = MagicMock(return_value = ChatConfigDB.ChatType.telegram)
 
         self.notifier = ChatProgressNotifier(
@@ -43,193 +61,142 @@ class ChatProgressNotifierTest(unittest.TestCase):
             auto_start = False,
         )
 
+    def __create_notifier(self) -> ChatProgressNotifier:
+        return ChatProgressNotifier(message_id = self.message_id, di = self.mock_di, auto_start = False)
+
+    def __advance(self, seconds: float):
+        self.now_s += seconds
+        self.scheduler.run_due()
+
     # noinspection PyUnresolvedReferences
     def test_init(self):
         self.assertEqual(self.notifier._ChatProgressNotifier__message_id, self.message_id)
         self.assertEqual(self.notifier._ChatProgressNotifier__di, self.mock_di)
 
-    @patch("features.chat.chat_progress_notifier.Thread")
-    def test_start(self, mock_thread):
+    def test_start_schedules_without_threads(self):
+        self.notifier.start()
+
+        self.assertEqual(self.scheduler.active_count(), 1)
+        self.mock_platform_sdk.set_chat_action.assert_not_called()
+
+        self.scheduler.run_due()
+
+        self.mock_platform_sdk.set_chat_action.assert_called_once_with("test_chat_id", "typing")
+
+    def test_start_twice_schedules_once(self):
+        self.notifier.start()
         self.notifier.start()
-        mock_thread.assert_called_once()
-        mock_thread.return_value.start.assert_called_once()
 
-    @patch("features.chat.chat_progress_notifier.Thread")
-    def test_stop(self, mock_thread):
+        self.assertEqual(self.scheduler.active_count(), 1)
+
+    def test_stop(self):
         self.notifier.start()
+        self.scheduler.run_due()
+
         self.notifier.stop()
-        mock_thread.return_value.join.assert_called_once_with(timeout = 1)
 
-    @patch("features.chat.chat_progress_notifier.time.time")
-    def test_send_reaction(self, mock_time):
-        mock_time.return_value = 100
-        mock_platform_sdk = Mock(spec = PlatformBotSDK)
-        self.mock_di.platform_bot_sdk.return_value = mock_platform_sdk
-        # noinspection PyUnresolvedReferences
-        self.notifier._ChatProgressNotifier__send_reaction()
-        mock_platform_sdk.set_reaction.assert_called_once()
+        self.assertEqual(self.scheduler.active_count(), 0)
+        self.mock_platform_sdk.set_reaction.assert_called_once_with("test_chat_id", self.message_id, None)
 
-    @patch("features.chat.chat_progress_notifier.resolve_reaction_timing")
-    @patch("features.chat.chat_progress_notifier.time.time")
-    def test_no_reactions_when_intervals_not_set(self, mock_time, mock_resolve_timing):
-        mock_resolve_timing.return_value = None
-        mock_time.return_value = 0.0
-        mock_platform_sdk = Mock(spec = PlatformBotSDK)
-        self.mock_di.platform_bot_sdk.return_value = mock_platform_sdk
+        self.__advance(TYPING_STATUS_INTERVAL_S)
+        self.mock_platform_sdk.set_chat_action.assert_called_once()
 
-        notifier = ChatProgressNotifier(
-            message_id = self.message_id,
-            di = self.mock_di,
-            auto_start = False,
-        )
+    def test_stop_when_not_started(self):
+        self.notifier.stop()
 
-        # Simulate a few cycles
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal = Mock()
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.is_set.side_effect = [False, False, False, True]
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.wait = Mock()
+        self.mock_platform_sdk.set_reaction.assert_not_called()
 
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__run()
+    def test_stops_after_max_cycles(self):
+        self.notifier.start()
+        self.scheduler.run_due()
+        for _ in range(MAX_CYCLES + 2):
+            self.__advance(TYPING_STATUS_INTERVAL_S)
 
-        # Should only set typing action, never send reactions
-        mock_platform_sdk.set_chat_action.assert_called()
-        mock_platform_sdk.set_reaction.assert_not_called()
+        self.assertEqual(self.mock_platform_sdk.set_chat_action.call_count, MAX_CYCLES)
+        self.assertEqual(self.scheduler.active_count(), 0)
 
-    @patch("features.chat.chat_progress_notifier.resolve_reaction_timing")
-    @patch("features.chat.chat_progress_notifier.time.time")
-    def test_fires_immediately_when_initial_delay_zero(self, mock_time, mock_resolve_timing):
-        mock_resolve_timing.return_value = (0, 15)  # WhatsApp-like: 0s initial, 15s interval
-        mock_platform_sdk = Mock(spec = PlatformBotSDK)
-        self.mock_di.platform_bot_sdk.return_value = mock_platform_sdk
+    def test_typing_pings_are_coalesced_per_chat(self):
+        other_notifier = self.__create_notifier()
 
-        # Time progression: start at 0, then advance by small increments
-        mock_time.side_effect = [0.0, 0.0, 0.1, 0.2]
+        self.notifier.start()
+        other_notifier.start()
+        self.scheduler.run_due()
+        self.__advance(TYPING_STATUS_INTERVAL_S)
 
-        notifier = ChatProgressNotifier(
-            message_id = self.message_id,
-            di = self.mock_di,
-            auto_start = False,
-        )
+        self.assertEqual(self.mock_platform_sdk.set_chat_action.call_count, 2)
 
-        # Simulate one cycle
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal = Mock()
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.is_set.side_effect = [False, True]
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.wait = Mock()
+        self.notifier.stop()
+        self.__advance(TYPING_STATUS_INTERVAL_S)
 
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__run()
+        self.assertEqual(self.mock_platform_sdk.set_chat_action.call_count, 3)
 
-        # Should fire reaction immediately (elapsed = 7 at start due to offset)
-        mock_platform_sdk.set_reaction.assert_called()
+    def test_send_reaction(self):
+        # noinspection PyUnresolvedReferences
+        self.notifier._ChatProgressNotifier__send_reaction()
+        self.mock_platform_sdk.set_reaction.assert_called_once()
 
     @patch("features.chat.chat_progress_notifier.resolve_reaction_timing")
-    @patch("features.chat.chat_progress_notifier.time.time")
-    def test_fires_after_initial_delay(self, mock_time, mock_resolve_timing):
-        mock_resolve_timing.return_value = (15, 30)  # Telegram-like: 15s initial, 30s interval
-        mock_platform_sdk = Mock(spec = PlatformBotSDK)
-        self.mock_di.platform_bot_sdk.return_value = mock_platform_sdk
+    def test_no_reactions_when_intervals_not_set(self, mock_resolve_timing):
+        mock_resolve_timing.return_value = None
+        notifier = self.__create_notifier()
 
-        # Time progression: loop iterations
-        # 5.0: first cycle, initializes to 5, elapsed=0, should NOT fire
-        # 11.0: second cycle, elapsed=6, should NOT fire (need 15s)
-        # 16.0: third cycle, elapsed=11, should NOT fire (need 15s)
-        # 21.0: fourth cycle, elapsed=16, should fire
-        mock_time.side_effect = [5.0, 11.0, 16.0, 21.0]
+        notifier.start()
+        self.scheduler.run_due()
+        self.__advance(TYPING_STATUS_INTERVAL_S)
+        self.__advance(TYPING_STATUS_INTERVAL_S)
 
-        notifier = ChatProgressNotifier(
-            message_id = self.message_id,
-            di = self.mock_di,
-            auto_start = False,
-        )
+        # Should only set typing action, never send reactions
+        self.assertEqual(self.mock_platform_sdk.set_chat_action.call_count, 3)
+        self.mock_platform_sdk.set_reaction.assert_not_called()
 
-        # Simulate four cycles
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal = Mock()
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.is_set.side_effect = [False, False, False, False, True]
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.wait = Mock()
+    @patch("features.chat.chat_progress_notifier.resolve_reaction_timing")
+    def test_fires_immediately_when_initial_delay_zero(self, mock_resolve_timing):
+        mock_resolve_timing.return_value = (0, 15)  # WhatsApp-like: 0s initial, 15s interval
+        notifier = self.__create_notifier()
 
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__run()
+        notifier.start()
+        self.scheduler.run_due()
 
-        # First cycle at t=5: init to 5, elapsed=0, should NOT fire
-        # Second cycle at t=11: elapsed=6, should NOT fire (need 15s)
-        # Third cycle at t=16: elapsed=11, should NOT fire (need 15s)
-        # Fourth cycle at t=21: elapsed=16, should fire
-        self.assertEqual(mock_platform_sdk.set_reaction.call_count, 1)
+        self.mock_platform_sdk.set_reaction.assert_called_once()
 
     @patch("features.chat.chat_progress_notifier.resolve_reaction_timing")
-    @patch("features.chat.chat_progress_notifier.time.time")
-    def test_fires_when_initial_delay_greater_than_interval(self, mock_time, mock_resolve_timing):
-        mock_resolve_timing.return_value = (15, 7)  # delay=15s, interval=7s
-        mock_platform_sdk = Mock(spec = PlatformBotSDK)
-        self.mock_di.platform_bot_sdk.return_value = mock_platform_sdk
-
-        # Time progression:
-        # 0: start, elapsed=0, should NOT fire (need 15s)
-        # 10: elapsed=10, should NOT fire (need 15s)
-        # 15: elapsed=15, should fire (first reaction)
-        # 20: elapsed=5 from last, should NOT fire (need 7s)
-        # 22: elapsed=7 from last, should fire (second reaction)
-        mock_time.side_effect = [0.0, 10.0, 15.0, 20.0, 22.0]
-
-        notifier = ChatProgressNotifier(
-            message_id = self.message_id,
-            di = self.mock_di,
-            auto_start = False,
-        )
-
-        # Simulate five cycles
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal = Mock()
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.is_set.side_effect = [False, False, False, False, False, True]
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.wait = Mock()
+    def test_fires_after_initial_delay(self, mock_resolve_timing):
+        mock_resolve_timing.return_value = (15, 30)  # Telegram-like: 15s initial, 30s interval
+        notifier = self.__create_notifier()
 
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__run()
+        # ticks at t=0, 5, 10 should NOT fire (need 15s)
+        notifier.start()
+        self.scheduler.run_due()
+        self.__advance(5)
+        self.__advance(5)
+        self.mock_platform_sdk.set_reaction.assert_not_called()
 
-        # Should fire twice: once at t=15 (initial), once at t=22 (interval)
-        self.assertEqual(mock_platform_sdk.set_reaction.call_count, 2)
+        # tick at t=15 should fire
+        self.__advance(5)
+        self.assertEqual(self.mock_platform_sdk.set_reaction.call_count, 1)
 
     @patch("features.chat.chat_progress_notifier.resolve_reaction_timing")
-    @patch("features.chat.chat_progress_notifier.time.time")
-    def test_fires_when_initial_delay_less_than_interval(self, mock_time, mock_resolve_timing):
-        mock_resolve_timing.return_value = (3, 7)  # delay=3s, interval=7s
-        mock_platform_sdk = Mock(spec = PlatformBotSDK)
-        self.mock_di.platform_bot_sdk.return_value = mock_platform_sdk
+    def test_fires_when_initial_delay_greater_than_interval(self, mock_resolve_timing):
+        mock_resolve_timing.return_value = (15, 7)  # delay=15s, interval=7s
+        notifier = self.__create_notifier()
 
-        # Time progression:
-        # 0: start, elapsed=0, should NOT fire (need 3s)
-        # 3: elapsed=3, should fire (first reaction)
-        # 8: elapsed=5 from last, should NOT fire (need 7s)
-        # 10: elapsed=7 from last, should fire (second reaction)
-        mock_time.side_effect = [0.0, 3.0, 8.0, 10.0]
+        # ticks at t=0, 5, 10 don't fire, t=15 fires, t=20 doesn't (5s from last), t=25 fires (10s from last)
+        notifier.start()
+        self.scheduler.run_due()
+        for _ in range(5):
+            self.__advance(5)
 
-        notifier = ChatProgressNotifier(
-            message_id = self.message_id,
-            di = self.mock_di,
-            auto_start = False,
-        )
+        self.assertEqual(self.mock_platform_sdk.set_reaction.call_count, 2)
 
-        # Simulate four cycles
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal = Mock()
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.is_set.side_effect = [False, False, False, False, True]
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__signal.wait = Mock()
+    @patch("features.chat.chat_progress_notifier.resolve_reaction_timing")
+    def test_fires_when_initial_delay_less_than_interval(self, mock_resolve_timing):
+        mock_resolve_timing.return_value = (3, 7)  # delay=3s, interval=7s
+        notifier = self.__create_notifier()
 
-        # noinspection PyUnresolvedReferences
-        notifier._ChatProgressNotifier__run()
+        # tick at t=0 doesn't fire, t=5 fires, t=10 doesn't (5s from last), t=15 fires (10s from last)
+        notifier.start()
+        self.scheduler.run_due()
+        for _ in range(3):
+            self.__advance(5)
 
-        # Should fire twice: once at t=3 (initial), once at t=10 (interval)
-        self.assertEqual(mock_platform_sdk.set_reaction.call_count, 2)
+        self.assertEqual(self.mock_platform_sdk.set_reaction.call_count, 2)
@@ -1,5 +1,5 @@
 import unittest
-from datetime import date
+from datetime import date, datetime
 from unittest.mock import Mock, patch
 from uuid import UUID
 
@@ -11,10 +11,13 @@ from db.model.user import UserDB
 from db.schema.chat_config import ChatConfig
 from db.schema.chat_message import ChatMessage
 from db.schema.user import User
+from features.chat.chat_agent import ChatAgent
+from features.chat.chat_history_loader import ChatHistoryLoader
 from features.chat.telegram.model.update import Update
 from features.chat.telegram.telegram_data_resolver import TelegramDataResolver
 from features.chat.telegram.telegram_domain_mapper import TelegramDomainMapper
 from features.chat.telegram.telegram_update_responder import respond_to_update
+from util.config import config
 
 
 class TelegramUpdateResponderTest(unittest.TestCase):
@@ -27,6 +30,8 @@ class TelegramUpdateResponderTest(unittest.TestCase):
         # create all the mocks
         self.sql = SQLUtil()
         self.update = Mock(spec = Update)
+        self.update.chat_member = None
+        self.update.my_chat_member = None
 
         # mock the DI container
         patcher_di = patch("features.chat.telegram.telegram_update_responder.DI")
@@ -42,14 +47,14 @@ class TelegramUpdateResponderTest(unittest.TestCase):
         self.mock_get_detached_session.return_value.__enter__.return_value = self.sql.start_session()
 
         # patch the DI's chat_agent and telegram_bot_sdk mocks for use in tests
-        self.di.chat_agent.return_value.execute.return_value = Mock(spec = AIMessage, content = "Test response")
+        self.di.chat_agent.return_value.handle_commands.return_value = ChatAgent.CommandHandlingResult(is_handled = False)
+        self.di.chat_agent.return_value.reply.return_value = Mock(spec = AIMessage, content = "Test response")
         self.di.telegram_bot_sdk.send_text_message = Mock()
 
     def tearDown(self):
         self.sql.end_session()
 
-    def test_successful_response(self):
-        self.di.chat_agent.return_value.execute.return_value = Mock(spec = AIMessage, content = "Test response")
+    def _set_up_successful_update(self):
 
         self.di.telegram_domain_mapper.map_update.return_value = Mock(
             spec = TelegramDomainMapper.Result,
@@ -86,9 +91,15 @@ class TelegramUpdateResponderTest(unittest.TestCase):
                 chat_type = ChatConfigDB.ChatType.telegram,
             ),
             author = User.model_validate(author_db),
+            message = ChatMessage(
+                chat_id = UUID(int = 123),
+                message_id = "test-message-id",
+                author_id = UUID(int = 1),
+                sent_at = datetime(2026, 1, 1, 12, 0, 0),
+                text = "Test message text",
+            ),
         )
-        self.di.chat_message_crud.get_latest_chat_messages.return_value = []
-        self.di.user_crud.get.return_value = author_db  # Return author for all calls
+        self.di.chat_history_loader.load.return_value = ChatHistoryLoader.Result(messages = [], attachments = [], authors = {})
 
         self.di.domain_langchain_mapper.map_bot_message_to_storage.return_value = [
             Mock(chat_id = "123", text = "Test response"),
@@ -96,11 +107,47 @@ class TelegramUpdateResponderTest(unittest.TestCase):
 
         self.di.sponsorship_crud.get_by_receiver_id.return_value = []
 
+    def test_successful_response(self):
+        self._set_up_successful_update()
+
+        result = respond_to_update(self.update)
+
+        # the reply waits for the message burst to settle
+        self.assertFalse(result)
+        self.di.chat_agent.return_value.reply.assert_not_called()
+        self.di.telegram_bot_sdk.send_text_message.assert_not_called()
+        key, delay_s, callback = self.di.debounce_scheduler.submit.call_args.args
+        self.assertEqual(key, f"{UUID(int = 123)}/{UUID(int = 1)}")
+        self.assertEqual(delay_s, config.chat_debounce_delay_s)
+
+        self.assertTrue(callback())
+        self.di.chat_agent.return_value.reply.assert_called_once()
+        self.di.telegram_bot_sdk.send_text_message.assert_called_once_with("123", "Test response")
+
+    @patch("features.chat.telegram.telegram_update_responder.config")
+    def test_successful_response_without_debounce(self, mock_config):
+        mock_config.chat_debounce_delay_s = 0.0
+        self._set_up_successful_update()
+
         result = respond_to_update(self.update)
 
         self.assertTrue(result)
-        # Agent user creation logic was removed, so user_crud.save should not be called
-        self.di.chat_agent.return_value.execute.assert_called_once()
+        self.di.debounce_scheduler.submit.assert_not_called()
+        self.di.chat_agent.return_value.reply.assert_called_once()
+        self.di.telegram_bot_sdk.send_text_message.assert_called_once_with("123", "Test response")
+
+    def test_command_handled_eagerly(self):
+        self._set_up_successful_update()
+        self.di.chat_agent.return_value.handle_commands.return_value = ChatAgent.CommandHandlingResult(
+            is_handled = True,
+            reply = AIMessage("Command failed"),
+        )
+
+        result = respond_to_update(self.update)
+
+        self.assertTrue(result)
+        self.di.debounce_scheduler.submit.assert_not_called()
+        self.di.chat_agent.return_value.reply.assert_not_called()
         self.di.telegram_bot_sdk.send_text_message.assert_called_once_with("123", "Test response")
 
     def test_empty_response(self):
@@ -110,8 +157,8 @@ class TelegramUpdateResponderTest(unittest.TestCase):
             chat = Mock(spec = ChatConfig, chat_id = "123"),
             author = Mock(spec = User, id = UUID(int = 1)),
         )
-        self.di.chat_message_crud.get_latest_chat_messages.return_value = []
-        self.di.chat_agent.return_value.execute.return_value = Mock(content = "")
+        self.di.chat_history_loader.load.return_value = ChatHistoryLoader.Result(messages = [], attachments = [], authors = {})
+        self.di.chat_agent.return_value.reply.return_value = Mock(content = "")
 
         result = respond_to_update(self.update)
 
@@ -134,6 +181,32 @@ class TelegramUpdateResponderTest(unittest.TestCase):
         self.di.telegram_bot_sdk.send_text_message.assert_not_called()
         self.di.chat_message_crud.save.assert_not_called()
 
+    def test_chat_member_update_invalidates_member_access(self):
+        self.update.chat_member = Mock(chat = Mock(id = 456), new_chat_member = Mock(user = Mock(id = 1)))
+        self.di.chat_config_crud.get_by_external_identifiers.return_value = Mock(chat_id = UUID(int = 123))
+        self.di.user_crud.get_by_telegram_user_id.return_value = Mock(id = UUID(int = 1))
+
+        result = respond_to_update(self.update)
+
+        self.assertFalse(result)
+        self.di.chat_config_crud.get_by_external_identifiers.assert_called_once_with(
+            external_id = "456",
+            chat_type = ChatConfigDB.ChatType.telegram,
+        )
+        self.di.chat_access_cache.invalidate.assert_called_once_with(UUID(int = 123), UUID(int = 1))
+        self.di.telegram_domain_mapper.map_update.assert_not_called()
+
+    def test_my_chat_member_update_invalidates_whole_chat(self):
+        self.update.my_chat_member = Mock(chat = Mock(id = 456))
+        self.di.chat_config_crud.get_by_external_identifiers.return_value = Mock(chat_id = UUID(int = 123))
+
+        result = respond_to_update(self.update)
+
+        self.assertFalse(result)
+        self.di.chat_access_cache.invalidate_chat.assert_called_once_with(UUID(int = 123))
+        self.di.chat_access_cache.invalidate.assert_not_called()
+        self.di.telegram_domain_mapper.map_update.assert_not_called()
+
     def test_general_exception(self):
         from collections import namedtuple
         with patch("features.chat.telegram.telegram_update_responder.silent", lambda f: f):
@@ -149,7 +222,7 @@ class TelegramUpdateResponderTest(unittest.TestCase):
             ErrorMsg = namedtuple("ErrorMsg", ["chat_id", "text"])
             error_response = [ErrorMsg(chat_id = "123", text = "Error response")]
             # Raise exception during message fetching, after resolved_domain_data is set
-            self.di.chat_message_crud.get_latest_chat_messages.side_effect = Exception(error_message)
+            self.di.chat_history_loader.load.side_effect = Exception(error_message)
             self.di.domain_langchain_mapper.map_bot_message_to_storage.return_value = error_response
             self.di.telegram_bot_sdk.send_text_message = Mock()
 
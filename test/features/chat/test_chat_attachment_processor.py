@@ -17,6 +17,7 @@ from features.chat.telegram.sdk.telegram_bot_sdk import TelegramBotSDK
 from features.chat.url_attachment_resolver import UrlAttachmentResolver
 from features.integrations.platform_bot_sdk import PlatformBotSDK
 from util.config import config
+from util.error_codes import ATTACHMENT_NOT_FOUND
 from util.errors import NotFoundError, ValidationError
 
 
@@ -89,8 +90,8 @@ class ChatAttachmentProcessorTest(unittest.TestCase):
 
         self.mock_user_crud.get.return_value = self.invoker_user.model_dump()
         self.mock_chat_config_crud.get.return_value = self.chat_config.model_dump()
-        self.mock_chat_message_attachment_crud.get.return_value = self.attachment.model_dump()
-        self.mock_chat_message_attachment_crud.save.return_value = self.attachment.model_dump()
+        self.mock_chat_message_attachment_crud.require_all_by_ids.side_effect = lambda ids: [self.attachment.model_dump() for _ in ids]
+        self.mock_chat_message_attachment_crud.save_all.return_value = [self.attachment.model_dump()]
         self.mock_cache_crud.create_key.return_value = "test_cache_key"
         self.mock_di.require_invoker_chat_type = MagicMock(return_value = ChatConfigDB.ChatType.telegram)
 
@@ -169,7 +170,9 @@ class ChatAttachmentProcessorTest(unittest.TestCase):
         self.assertIn("Attachment ID cannot be empty", str(context.exception))
 
     def test_attachment_not_found_in_db(self):
-        self.mock_chat_message_attachment_crud.get.return_value = None
+        self.mock_chat_message_attachment_crud.require_all_by_ids.side_effect = NotFoundError(
+            "Attachment with ID 'nonexistent' not found in DB", ATTACHMENT_NOT_FOUND,
+        )
 
         with self.assertRaises(NotFoundError) as context:
             ChatAttachmentProcessor(
@@ -199,7 +202,7 @@ class ChatAttachmentProcessorTest(unittest.TestCase):
 
         resolver = ChatAttachmentProcessor(
             additional_context = "context",
-            attachment_ids = ["2"],
+            attachment_ids = ["1"],
             urls = None,
             di = self.mock_di,
         )
@@ -227,7 +230,7 @@ class ChatAttachmentProcessorTest(unittest.TestCase):
 
         resolver = ChatAttachmentProcessor(
             additional_context = "context",
-            attachment_ids = ["4"],
+            attachment_ids = ["1"],
             urls = None,
             di = self.mock_di,
         )
@@ -251,7 +254,7 @@ class ChatAttachmentProcessorTest(unittest.TestCase):
 
         resolver = ChatAttachmentProcessor(
             additional_context = "context",
-            attachment_ids = ["3"],
+            attachment_ids = ["1"],
             urls = None,
             di = self.mock_di,
         )
@@ -6,6 +6,7 @@ from uuid import UUID
 from db.model.chat_message_attachment import ChatMessageAttachmentDB
 from db.schema.chat_message_attachment import ChatMessageAttachment
 from features.chat.chat_attachment_utils import resolve_all_attachments, resolve_local_attachments
+from util.error_codes import ATTACHMENT_NOT_FOUND
 from util.errors import NotFoundError, ValidationError
 
 
@@ -44,13 +45,15 @@ class FetchAttachmentsTest(unittest.TestCase):
             extension = "png",
             mime_type = "image/png",
         )
-        self.mock_di.chat_message_attachment_crud.get.return_value = self.attachment_db
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.return_value = [self.attachment_db]
         self.mock_di.platform_bot_sdk.return_value.refresh_attachment_instances.side_effect = lambda x: x
 
     def test_empty_ids_returns_empty(self):
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.return_value = []
         result = resolve_local_attachments([], self.mock_di)
         self.assertEqual(result, [])
         self.mock_di.chat_message_attachment_crud.get.assert_not_called()
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.assert_called_once_with([])
 
     def test_valid_id_returns_attachment(self):
         result = resolve_local_attachments(["att1"], self.mock_di)
@@ -64,14 +67,20 @@ class FetchAttachmentsTest(unittest.TestCase):
         self.assertIn("Attachment ID cannot be empty", str(ctx.exception))
 
     def test_not_found_raises(self):
-        self.mock_di.chat_message_attachment_crud.get.return_value = None
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.side_effect = NotFoundError(
+            "Attachment with ID 'missing' not found in DB", ATTACHMENT_NOT_FOUND,
+        )
         with self.assertRaises(NotFoundError) as ctx:
-            resolve_local_attachments(["missing"], self.mock_di)
-        self.assertIn("not found in DB", str(ctx.exception))
+            resolve_local_attachments(["att1", "missing"], self.mock_di)
+        self.assertIn("Malformed LLM Input Error", str(ctx.exception))
+        self.assertIn("'missing' not found in DB", str(ctx.exception))
 
     def test_multiple_ids_fetches_all(self):
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.return_value = [self.attachment_db, self.attachment_db]
         result = resolve_local_attachments(["att1", "att1"], self.mock_di)
         self.assertEqual(len(result), 2)
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.assert_called_once_with(["att1", "att1"])
+        self.mock_di.chat_message_attachment_crud.get.assert_not_called()
 
 
 class ResolveAllAttachmentsTest(unittest.TestCase):
@@ -90,7 +99,7 @@ class ResolveAllAttachmentsTest(unittest.TestCase):
             mime_type = "image/png",
         )
         self.attachment = ChatMessageAttachment.model_validate(self.attachment_db)
-        self.mock_di.chat_message_attachment_crud.get.return_value = self.attachment_db
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.side_effect = lambda ids: [self.attachment_db for _ in ids]
 
         self.mock_platform_sdk = MagicMock()
         self.mock_di.platform_bot_sdk = MagicMock(return_value = self.mock_platform_sdk)
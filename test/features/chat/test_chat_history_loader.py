@@ -0,0 +1,128 @@
+import unittest
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from db.sql_util import SQLUtil
+from sqlalchemy import event
+
+from db.model.chat_config import ChatConfigDB
+from db.schema.chat_config import ChatConfigSave
+from db.schema.chat_message import ChatMessageSave
+from db.schema.chat_message_attachment import ChatMessageAttachmentSave
+from db.schema.user import UserSave
+from di.di import DI
+from features.chat.chat_history_loader import ChatHistoryLoader
+
+
+class ChatHistoryLoaderTest(unittest.TestCase):
+
+    sql: SQLUtil
+    loader: ChatHistoryLoader
+    executed_statements: list[str]
+
+    def setUp(self):
+        self.sql = SQLUtil()
+        self.loader = ChatHistoryLoader(DI(self.sql.get_session()))
+        self.executed_statements = []
+        self.chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat1", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+        self.authors = [
+            self.sql.user_crud().create(UserSave(full_name = f"Author {i}", telegram_user_id = i))
+            for i in range(1, 6)
+        ]
+        start = datetime(2026, 1, 1, 12, 0, 0)
+        for i in range(60):
+            self.sql.chat_message_crud().create(
+                ChatMessageSave(
+                    chat_id = self.chat.chat_id,
+                    message_id = f"msg{i}",
+                    author_id = self.authors[i % len(self.authors)].id,
+                    sent_at = start + timedelta(minutes = i),
+                    text = f"Message {i}",
+                ),
+            )
+            for j in range(2):
+                self.sql.chat_message_attachment_crud().create(
+                    ChatMessageAttachmentSave(
+                        id = f"attach{i}-{j}",
+                        chat_id = self.chat.chat_id,
+                        message_id = f"msg{i}",
+                    ),
+                )
+
+    def tearDown(self):
+        self.sql.end_session()
+
+    def __count_statements(self, conn, cursor, statement, parameters, context, executemany):
+        self.executed_statements.append(statement)
+
+    def __load_counting_queries(self, chat_id: UUID, limit: int) -> tuple[ChatHistoryLoader.Result, int]:
+        engine = self.sql.get_session().get_bind()
+        self.executed_statements = []
+        event.listen(engine, "before_cursor_execute", self.__count_statements)
+        try:
+            result = self.loader.load(chat_id, limit = limit)
+        finally:
+            event.remove(engine, "before_cursor_execute", self.__count_statements)
+        return result, len(self.executed_statements)
+
+    def test_load_returns_messages_newest_first(self):
+        result = self.loader.load(self.chat.chat_id, limit = 3)
+
+        self.assertEqual([m.message_id for m in result.messages], ["msg59", "msg58", "msg57"])
+
+    def test_load_returns_attachments_in_message_order(self):
+        result = self.loader.load(self.chat.chat_id, limit = 2)
+
+        self.assertEqual(
+            [a.id for a in result.attachments],
+            ["attach59-0", "attach59-1", "attach58-0", "attach58-1"],
+        )
+
+    def test_load_returns_distinct_authors(self):
+        result = self.loader.load(self.chat.chat_id, limit = 30)
+
+        self.assertEqual(set(result.authors.keys()), {author.id for author in self.authors})
+        for message in result.messages:
+            author = result.author_of(message)
+            self.assertIsNotNone(author)
+            self.assertEqual(author.id, message.author_id)
+
+    def test_author_of_message_without_author(self):
+        self.sql.chat_message_crud().create(
+            ChatMessageSave(
+                chat_id = self.chat.chat_id,
+                message_id = "anonymous",
+                sent_at = datetime(2026, 2, 1),
+                text = "No author",
+            ),
+        )
+
+        result = self.loader.load(self.chat.chat_id, limit = 1)
+
+        self.assertEqual(result.messages[0].message_id, "anonymous")
+        self.assertIsNone(result.author_of(result.messages[0]))
+        self.assertEqual(result.authors, {})
+
+    def test_load_empty_chat(self):
+        empty_chat = self.sql.chat_config_crud().create(
+            ChatConfigSave(external_id = "chat2", chat_type = ChatConfigDB.ChatType.telegram),
+        )
+
+        result, query_count = self.__load_counting_queries(empty_chat.chat_id, limit = 30)
+
+        self.assertEqual(result.messages, [])
+        self.assertEqual(result.attachments, [])
+        self.assertEqual(result.authors, {})
+        self.assertEqual(query_count, 1)
+
+    def test_query_count_is_constant_as_depth_grows(self):
+        query_counts: list[int] = []
+        for depth in [1, 5, 30, 60]:
+            result, query_count = self.__load_counting_queries(self.chat.chat_id, limit = depth)
+            self.assertEqual(len(result.messages), depth)
+            self.assertEqual(len(result.attachments), depth * 2)
+            query_counts.append(query_count)
+
+        self.assertEqual(query_counts, [3, 3, 3, 3])
@@ -62,7 +62,6 @@ class ChatImageEditServiceTest(unittest.TestCase):
             extension = "png",
             mime_type = "image/png",
         )
-        self.mock_di.chat_message_attachment_crud.get.return_value = self.mock_attachment_db
         self.attachment = ChatMessageAttachment.model_validate(self.mock_attachment_db)
 
         self.mock_attachment_db2 = ChatMessageAttachmentDB(
@@ -90,6 +89,8 @@ class ChatImageEditServiceTest(unittest.TestCase):
             mime_type = "image/png",
         )
         self.attachment_no_url = ChatMessageAttachment.model_validate(self.mock_attachment_no_url_db)
+        attachments_db = {attachment_db.id: attachment_db for attachment_db in [self.mock_attachment_db, self.mock_attachment_db2]}
+        self.mock_di.chat_message_attachment_crud.require_all_by_ids.side_effect = lambda ids: [attachments_db[i] for i in ids]
 
         self.mock_di.url_attachment_resolver.side_effect = lambda url: UrlAttachmentResolver(url, self.mock_di)
 
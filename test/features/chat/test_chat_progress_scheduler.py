@@ -0,0 +1,124 @@
+import threading
+import unittest
+from concurrent.futures import Executor, Future
+from unittest.mock import patch
+
+from features.chat.chat_progress_scheduler import ChatProgressScheduler
+
+
+class InlineExecutor(Executor):
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class ChatProgressSchedulerTest(unittest.TestCase):
+
+    now_s: float
+    ticks: list[float]
+    scheduler: ChatProgressScheduler
+
+    def setUp(self):
+        self.now_s = 100.0
+        self.ticks = []
+        self.scheduler = ChatProgressScheduler(executor = InlineExecutor(), clock = lambda: self.now_s, use_timer = False)
+
+    def __repeating_tick(self, times: int):
+        def tick(now: float) -> float | None:
+            self.ticks.append(now)
+            return 5.0 if len(self.ticks) < times else None
+
+        return tick
+
+    def test_tick_repeats_until_finished(self):
+        self.scheduler.schedule(self.__repeating_tick(3))
+
+        for _ in range(5):
+            self.scheduler.run_due()
+            self.now_s += 5.0
+
+        self.assertEqual(self.ticks, [100.0, 105.0, 110.0])
+        self.assertEqual(self.scheduler.active_count(), 0)
+
+    def test_tick_waits_for_delay(self):
+        self.scheduler.schedule(self.__repeating_tick(3), delay_s = 2.0)
+
+        self.assertEqual(self.scheduler.run_due(), 0)
+        self.now_s += 2.0
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.now_s += 4.9
+        self.assertEqual(self.scheduler.run_due(), 0)
+
+    def test_cancel(self):
+        job_id = self.scheduler.schedule(self.__repeating_tick(3))
+        self.scheduler.run_due()
+
+        self.assertTrue(self.scheduler.cancel(job_id))
+        self.assertFalse(self.scheduler.cancel(job_id))
+
+        self.now_s += 5.0
+        self.assertEqual(self.scheduler.run_due(), 0)
+        self.assertEqual(self.ticks, [100.0])
+
+    def test_cancel_during_tick_stops_rescheduling(self):
+        job_ids: list[int] = []
+
+        def tick(_: float) -> float | None:
+            self.scheduler.cancel(job_ids[0])
+            return 5.0
+
+        job_ids.append(self.scheduler.schedule(tick))
+        self.scheduler.run_due()
+
+        self.assertEqual(self.scheduler.active_count(), 0)
+
+    def test_claim_ping_coalesces_within_interval(self):
+        self.assertTrue(self.scheduler.claim_ping("chat/typing", 5.0))
+        self.assertFalse(self.scheduler.claim_ping("chat/typing", 5.0))
+        self.assertTrue(self.scheduler.claim_ping("other/typing", 5.0))
+
+        self.now_s += 5.0
+        self.assertTrue(self.scheduler.claim_ping("chat/typing", 5.0))
+
+    @patch("features.chat.chat_progress_scheduler.log")
+    def test_failing_tick_is_dropped(self, mock_log):
+        def fail(_: float) -> float | None:
+            raise ValueError("boom")
+
+        self.scheduler.schedule(fail)
+        self.scheduler.schedule(self.__repeating_tick(1))
+        self.scheduler.run_due()
+
+        self.assertEqual(self.ticks, [100.0])
+        self.assertEqual(self.scheduler.active_count(), 0)
+        mock_log.e.assert_called_once()
+
+    def test_schedule_after_shutdown_fails(self):
+        self.scheduler.shutdown()
+
+        with self.assertRaises(RuntimeError):
+            self.scheduler.schedule(self.__repeating_tick(1))
+
+    def test_timer_thread_runs_due_ticks(self):
+        done = threading.Event()
+        scheduler = ChatProgressScheduler(executor = InlineExecutor())
+        try:
+            scheduler.schedule(lambda _: done.set(), delay_s = 0.05)
+
+            self.assertTrue(done.wait(timeout = 2.0))
+        finally:
+            scheduler.shutdown()
+
+    def test_reset_after_fork_drops_inherited_pings(self):
+        self.scheduler.schedule(self.__repeating_tick(3))
+        self.scheduler.claim_ping("chat/typing", 5.0)
+
+        self.scheduler.reset_after_fork()
+
+        self.assertEqual(self.scheduler.active_count(), 0)
+        self.assertTrue(self.scheduler.claim_ping("chat/typing", 5.0))
+        self.scheduler.schedule(self.__repeating_tick(1))
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.ticks, [100.0])
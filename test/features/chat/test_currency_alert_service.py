@@ -16,7 +16,7 @@ from db.schema.chat_config import ChatConfig
 from db.schema.price_alert import PriceAlert
 from db.schema.user import User
 from di.di import DI
-from features.chat.currency_alert_service import CurrencyAlertService
+from features.chat.currency_alert_service import ALERTS_PAGE_SIZE, CurrencyAlertService
 from features.chat.telegram.sdk.telegram_bot_sdk import TelegramBotSDK
 from features.currencies.exchange_rate_fetcher import ExchangeRateFetcher
 
@@ -215,3 +215,103 @@ class CurrencyAlertServiceTest(unittest.TestCase):
         self.assertEqual(triggered_alerts[0].base_currency, "BTC")
         self.assertEqual(triggered_alerts[0].desired_currency, "USD")
         self.assertEqual(triggered_alerts[0].price_change_percent, 100000)
+
+    def __alert(self, chat_id: UUID, owner_id: UUID, base_currency: str, desired_currency: str, last_price: float) -> PriceAlert:
+        return PriceAlert(
+            chat_id = chat_id,
+            owner_id = owner_id,
+            base_currency = base_currency,
+            desired_currency = desired_currency,
+            threshold_percent = 5,
+            last_price = last_price,
+            last_price_time = datetime.now(),
+        )
+
+    def test_get_triggered_alerts_resolves_each_pair_once(self):
+        alerts = [
+            self.__alert(UUID(int = 10 + i), UUID(int = 20 + i), "BTC", "USD", last_price)
+            for i, last_price in enumerate([100.0, 104.0, 120.0, 0.0])
+        ] + [self.__alert(UUID(int = 30), UUID(int = 40), "EUR", "USD", 1.0)]
+        self.mock_di.price_alert_crud.get_all_after.return_value = alerts
+        scoped_di = MagicMock()
+        scoped_di.exchange_rate_fetcher.execute.side_effect = lambda base, desired: {"rate": 110.0 if base == "BTC" else 1.01}
+        self.mock_di.clone.return_value = scoped_di
+        service = CurrencyAlertService(None, self.mock_di)
+
+        triggered_alerts = service.get_triggered_alerts()
+
+        self.assertEqual(scoped_di.exchange_rate_fetcher.execute.call_count, 2)
+        scoped_di.exchange_rate_fetcher.prefetch_crypto_prices.assert_called_once_with(["BTC"])
+        self.assertEqual(
+            [(alert.chat_id, alert.price_change_percent) for alert in triggered_alerts],
+            [(UUID(int = 10), 10), (UUID(int = 11), 6), (UUID(int = 12), -8), (UUID(int = 13), 11000)],
+        )
+        self.mock_di.price_alert_crud.update_last_prices.assert_called_once()
+        updates = self.mock_di.price_alert_crud.update_last_prices.call_args.args[0]
+        self.assertEqual([update.chat_id for update in updates], [UUID(int = 10 + i) for i in range(4)])
+        self.assertTrue(all(update.last_price == 110.0 for update in updates))
+        self.mock_di.price_alert_crud.update.assert_not_called()
+
+    def test_get_triggered_alerts_prefetches_only_the_symbols_of_each_owner(self):
+        alerts = [
+            self.__alert(UUID(int = 10), UUID(int = 20), "BTC", "USD", 100.0),
+            self.__alert(UUID(int = 11), UUID(int = 21), "ETH", "USD", 100.0),
+            self.__alert(UUID(int = 12), UUID(int = 22), "BTC", "ETH", 100.0),
+        ]
+        self.mock_di.price_alert_crud.get_all_after.return_value = alerts
+        scoped_dis = [MagicMock() for _ in range(3)]
+        for scoped_di in scoped_dis:
+            scoped_di.exchange_rate_fetcher.execute.return_value = {"rate": 100.0}
+        self.mock_di.clone.side_effect = scoped_dis
+        service = CurrencyAlertService(None, self.mock_di)
+
+        service.get_triggered_alerts()
+
+        scoped_dis[0].exchange_rate_fetcher.prefetch_crypto_prices.assert_called_once_with(["BTC"])
+        scoped_dis[1].exchange_rate_fetcher.prefetch_crypto_prices.assert_called_once_with(["ETH"])
+        # both symbols of the third owner are already prefetched by the others
+        scoped_dis[2].exchange_rate_fetcher.prefetch_crypto_prices.assert_not_called()
+
+    def test_get_triggered_alerts_falls_back_to_other_owners(self):
+        alerts = [
+            self.__alert(UUID(int = 10), UUID(int = 20), "EUR", "USD", 1.0),
+            self.__alert(UUID(int = 11), UUID(int = 21), "EUR", "USD", 1.0),
+        ]
+        self.mock_di.price_alert_crud.get_all_after.return_value = alerts
+        failing_di = MagicMock()
+        failing_di.exchange_rate_fetcher.execute.side_effect = Exception("No API key")
+        working_di = MagicMock()
+        working_di.exchange_rate_fetcher.execute.return_value = {"rate": 1.2}
+        self.mock_di.clone.side_effect = [failing_di, working_di]
+        service = CurrencyAlertService(None, self.mock_di)
+
+        triggered_alerts = service.get_triggered_alerts()
+
+        self.assertEqual(len(triggered_alerts), 2)
+        self.assertEqual(self.mock_di.clone.call_count, 2)
+        working_di.exchange_rate_fetcher.execute.assert_called_once_with("EUR", "USD")
+
+    def test_get_triggered_alerts_skips_pair_when_rate_unavailable(self):
+        alerts = [self.__alert(UUID(int = 10), UUID(int = 20), "EUR", "USD", 1.0)]
+        self.mock_di.price_alert_crud.get_all_after.return_value = alerts
+        scoped_di = MagicMock()
+        scoped_di.exchange_rate_fetcher.execute.side_effect = Exception("API down")
+        self.mock_di.clone.return_value = scoped_di
+        service = CurrencyAlertService(None, self.mock_di)
+
+        triggered_alerts = service.get_triggered_alerts()
+
+        self.assertEqual(triggered_alerts, [])
+        self.mock_di.price_alert_crud.update_last_prices.assert_not_called()
+
+    def test_get_active_alerts_pages_through_all_alerts(self):
+        first_page = [self.__alert(UUID(int = i), UUID(int = 1), "BTC", "USD", 1.0) for i in range(ALERTS_PAGE_SIZE)]
+        second_page = [self.__alert(UUID(int = 9999), UUID(int = 1), "BTC", "USD", 1.0)]
+        self.mock_di.price_alert_crud.get_all_after.side_effect = [first_page, second_page]
+        service = CurrencyAlertService(None, self.mock_di)
+
+        active_alerts = service.get_active_alerts()
+
+        self.assertEqual(len(active_alerts), ALERTS_PAGE_SIZE + 1)
+        self.assertEqual(self.mock_di.price_alert_crud.get_all_after.call_count, 2)
+        self.assertEqual(self.mock_di.price_alert_crud.get_all_after.call_args.args[0], first_page[-1])
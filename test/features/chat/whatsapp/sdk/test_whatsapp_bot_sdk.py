@@ -108,7 +108,7 @@ class WhatsAppBotSDKTest(unittest.TestCase):
         self.assertEqual(result.text, text)
         self.assertEqual(result.chat_id, self.chat_uuid)
 
-    @patch("requests.get")
+    @patch("features.chat.whatsapp.sdk.whatsapp_bot_sdk.http_transport.get")
     @patch.object(WhatsAppDomainMapper, "map_update")
     @patch("db.schema.chat_config.ChatConfig.model_validate")
     @patch("db.schema.chat_message.ChatMessage.model_validate")
@@ -152,7 +152,7 @@ class WhatsAppBotSDKTest(unittest.TestCase):
         self.assertEqual(result.message_id, self.message_id)
         self.assertEqual(result.chat_id, self.chat_uuid)
 
-    @patch("requests.get")
+    @patch("features.chat.whatsapp.sdk.whatsapp_bot_sdk.http_transport.get")
     @patch.object(WhatsAppDomainMapper, "map_update")
     @patch("db.schema.chat_config.ChatConfig.model_validate")
     @patch("db.schema.chat_message.ChatMessage.model_validate")
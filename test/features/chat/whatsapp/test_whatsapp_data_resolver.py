@@ -292,9 +292,8 @@ class WhatsAppDataResolverTest(unittest.TestCase):
         self.assertEqual(result.group, existing_user.group)
         self.assertEqual(result.created_at, existing_user.created_at)
 
-    @patch("db.crud.user.UserCRUD.count")
-    def test_resolve_author_user_limit_reached_creates_waitlisted_user(self, mock_count):
-        mock_count.return_value = config.max_users  # reach maximum immediately
+    @patch.object(config, "max_users", 0)  # reach maximum immediately
+    def test_resolve_author_user_limit_reached_creates_waitlisted_user(self):
         mapped_data = UserSave(
             whatsapp_user_id = "1",
             full_name = "New User",
@@ -305,7 +304,7 @@ class WhatsAppDataResolverTest(unittest.TestCase):
         self.assertTrue(result.is_on_waitlist)
         self.assertFalse(result.is_invited_to_start)
         self.assertFalse(result.are_policies_accepted)
-        mock_count.assert_called_once()
+        self.assertEqual(self.sql.user_crud().count(), 1)
 
     def test_resolve_author_existing(self):
         existing_user_data = UserSave(
@@ -417,6 +416,55 @@ class WhatsAppDataResolverTest(unittest.TestCase):
         self.assertEqual(result.id, existing_user.id)
         self.assertEqual(result.full_name, existing_user.full_name)  # Should preserve existing name
 
+    def test_resolve_author_unchanged_skips_write(self):
+        existing_user_data = UserSave(
+            whatsapp_user_id = "1",
+            whatsapp_phone_number = SecretStr("1234567890"),
+            full_name = "Existing User",
+            open_ai_key = SecretStr("sk-key"),
+            about_me = SecretStr("Personal info about me"),
+        )
+        existing_user = User.model_validate(self.sql.user_crud().save(existing_user_data))
+
+        mapped_data = UserSave(
+            whatsapp_user_id = "1",
+            whatsapp_phone_number = SecretStr("1234567890"),
+            full_name = "Existing User",
+        )
+        with patch.object(self.mock_di.user_crud, "save") as mock_save, \
+                patch.object(self.mock_di.user_crud, "update_fields") as mock_update_fields:
+            result = self.resolver.resolve_author(mapped_data)
+
+        mock_save.assert_not_called()
+        mock_update_fields.assert_not_called()
+        self.assertEqual(result, existing_user)
+
+    def test_resolve_author_updates_only_changed_fields(self):
+        existing_user_data = UserSave(
+            whatsapp_user_id = "1",
+            whatsapp_phone_number = SecretStr("1234567890"),
+            full_name = "Existing User",
+            open_ai_key = SecretStr("sk-key"),
+            about_me = SecretStr("Personal info about me"),
+        )
+        existing_user = User.model_validate(self.sql.user_crud().save(existing_user_data))
+
+        mapped_data = UserSave(
+            whatsapp_user_id = "1",
+            whatsapp_phone_number = SecretStr("1234567891"),
+            full_name = "Existing User",
+        )
+        user_crud = self.mock_di.user_crud
+        with patch.object(user_crud, "update_fields", wraps = user_crud.update_fields) as mock_update_fields:
+            result = self.resolver.resolve_author(mapped_data)
+
+        mock_update_fields.assert_called_once_with(existing_user.id, {"whatsapp_phone_number": "1234567891"})
+        assert result is not None
+        assert result.whatsapp_phone_number is not None
+        self.assertEqual(result.whatsapp_phone_number.get_secret_value(), "1234567891")
+        self.assertEqual(result.open_ai_key, existing_user.open_ai_key)
+        self.assertEqual(result.about_me, existing_user.about_me)
+
     @patch("db.crud.user.UserCRUD.get_by_whatsapp_phone_number")
     @patch("db.crud.user.UserCRUD.get_by_whatsapp_user_id")
     def test_resolve_author_api_key_reset(self, mock_get_by_user_id, mock_get_by_phone):
@@ -11,10 +11,13 @@ from db.model.user import UserDB
 from db.schema.chat_config import ChatConfig
 from db.schema.chat_message import ChatMessage
 from db.schema.user import User
+from features.chat.chat_agent import ChatAgent
+from features.chat.chat_history_loader import ChatHistoryLoader
 from features.chat.whatsapp.model.update import Update
 from features.chat.whatsapp.whatsapp_data_resolver import WhatsAppDataResolver
 from features.chat.whatsapp.whatsapp_domain_mapper import WhatsAppDomainMapper
 from features.chat.whatsapp.whatsapp_update_responder import respond_to_update
+from util.config import config
 
 
 class WhatsAppUpdateResponderTest(unittest.TestCase):
@@ -42,14 +45,14 @@ class WhatsAppUpdateResponderTest(unittest.TestCase):
         self.mock_get_detached_session.return_value.__enter__.return_value = self.sql.start_session()
 
         # patch the DI's chat_agent and whatsapp_bot_sdk mocks for use in tests
-        self.di.chat_agent.return_value.execute.return_value = Mock(spec = AIMessage, content = "Test response")
+        self.di.chat_agent.return_value.handle_commands.return_value = ChatAgent.CommandHandlingResult(is_handled = False)
+        self.di.chat_agent.return_value.reply.return_value = Mock(spec = AIMessage, content = "Test response")
         self.di.whatsapp_bot_sdk.send_text_message = Mock()
 
     def tearDown(self):
         self.sql.end_session()
 
-    def test_successful_response(self):
-        self.di.chat_agent.return_value.execute.return_value = Mock(spec = AIMessage, content = "Test response")
+    def _set_up_successful_update(self):
 
         message = Mock(spec = ChatMessage, message_id = "test-message-id", text = "Test message text", sent_at = datetime.now())
         self.di.whatsapp_domain_mapper.map_update.return_value = [
@@ -91,8 +94,7 @@ class WhatsAppUpdateResponderTest(unittest.TestCase):
                 message = Mock(sent_at = datetime.now()),
             ),
         ]
-        self.di.chat_message_crud.get_latest_chat_messages.return_value = []
-        self.di.user_crud.get.return_value = author_db  # Return author for all calls
+        self.di.chat_history_loader.load.return_value = ChatHistoryLoader.Result(messages = [], attachments = [], authors = {})
 
         self.di.domain_langchain_mapper.map_bot_message_to_storage.return_value = [
             Mock(chat_id = "123", text = "Test response"),
@@ -100,11 +102,47 @@ class WhatsAppUpdateResponderTest(unittest.TestCase):
 
         self.di.sponsorship_crud.get_by_receiver_id.return_value = []
 
+    def test_successful_response(self):
+        self._set_up_successful_update()
+
+        result = respond_to_update(self.update)
+
+        # the reply waits for the message burst to settle
+        self.assertFalse(result)
+        self.di.chat_agent.return_value.reply.assert_not_called()
+        self.di.whatsapp_bot_sdk.send_text_message.assert_not_called()
+        key, delay_s, callback = self.di.debounce_scheduler.submit.call_args.args
+        self.assertEqual(key, f"{UUID(int = 123)}/{UUID(int = 1)}")
+        self.assertEqual(delay_s, config.chat_debounce_delay_s)
+
+        self.assertTrue(callback())
+        self.di.chat_agent.return_value.reply.assert_called_once()
+        self.di.whatsapp_bot_sdk.send_text_message.assert_called_once_with("123", "Test response")
+
+    @patch("features.chat.whatsapp.whatsapp_update_responder.config")
+    def test_successful_response_without_debounce(self, mock_config):
+        mock_config.chat_debounce_delay_s = 0.0
+        self._set_up_successful_update()
+
+        result = respond_to_update(self.update)
+
+        self.assertTrue(result)
+        self.di.debounce_scheduler.submit.assert_not_called()
+        self.di.chat_agent.return_value.reply.assert_called_once()
+        self.di.whatsapp_bot_sdk.send_text_message.assert_called_once_with("123", "Test response")
+
+    def test_command_handled_eagerly(self):
+        self._set_up_successful_update()
+        self.di.chat_agent.return_value.handle_commands.return_value = ChatAgent.CommandHandlingResult(
+            is_handled = True,
+            reply = AIMessage("Command failed"),
+        )
+
         result = respond_to_update(self.update)
 
         self.assertTrue(result)
-        # Agent user creation logic was removed, so user_crud.save should not be called
-        self.di.chat_agent.return_value.execute.assert_called_once()
+        self.di.debounce_scheduler.submit.assert_not_called()
+        self.di.chat_agent.return_value.reply.assert_not_called()
         self.di.whatsapp_bot_sdk.send_text_message.assert_called_once_with("123", "Test response")
 
     def test_empty_response(self):
@@ -114,8 +152,8 @@ class WhatsAppUpdateResponderTest(unittest.TestCase):
             chat = Mock(spec = ChatConfig, chat_id = "123"),
             author = Mock(spec = User, id = UUID(int = 1)),
         )
-        self.di.chat_message_crud.get_latest_chat_messages.return_value = []
-        self.di.chat_agent.return_value.execute.return_value = Mock(content = "")
+        self.di.chat_history_loader.load.return_value = ChatHistoryLoader.Result(messages = [], attachments = [], authors = {})
+        self.di.chat_agent.return_value.reply.return_value = Mock(content = "")
 
         result = respond_to_update(self.update)
 
@@ -166,7 +204,7 @@ class WhatsAppUpdateResponderTest(unittest.TestCase):
             ErrorMsg = namedtuple("ErrorMsg", ["chat_id", "text"])
             error_response = [ErrorMsg(chat_id = "123", text = "Error response")]
             # Raise exception during message fetching, after resolved_domain_data is set
-            self.di.chat_message_crud.get_latest_chat_messages.side_effect = Exception(error_message)
+            self.di.chat_history_loader.load.side_effect = Exception(error_message)
             self.di.domain_langchain_mapper.map_bot_message_to_storage.return_value = error_response
             self.di.whatsapp_bot_sdk.send_text_message = Mock()
 
@@ -1,81 +1,198 @@
+import json
 import unittest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
-from features.cleanup.cleanup_service import CleanupResult, CleanupService
+from db.sql_util import SQLUtil
+
+from db.chunked_deletion import ChunkedDeletion
+from db.model.chat_config import ChatConfigDB
+from db.model.chat_message import ChatMessageDB
+from db.model.chat_message_attachment import ChatMessageAttachmentDB
+from db.model.tools_cache import ToolsCacheDB
+from db.model.usage_daily_rollup import UsageDailyRollupDB
+from db.model.usage_record import UsageRecordDB
+from db.schema.chat_config import ChatConfigSave
+from db.schema.chat_message import ChatMessageSave
+from db.schema.chat_message_attachment import ChatMessageAttachmentSave
+from db.schema.document_embedding import DocumentEmbeddingSave
+from db.schema.tools_cache import ToolsCacheSave
+from db.schema.user import UserSave
+from features.accounting.usage.usage_record import UsageRecord
+from features.cleanup.cleanup_service import CHECKPOINT_CACHE_KEY, CleanupResult, CleanupService
+from features.external_tools.external_tool import ToolType
+from features.external_tools.external_tool_library import GPT_4O
+from util.config import config
 
 
 class CleanupServiceTest(unittest.TestCase):
 
-    def _make_service(
-        self,
-        attachments_deleted = 0,
-        messages_deleted = 0,
-        cache_cleared = 0,
-        usage_deleted = 0,
-        alerts_deleted = 0,
-        sponsorships_deleted = 0,
-    ) -> CleanupService:
-        di = MagicMock()
-        di.chat_message_attachment_crud.delete_by_old_messages.return_value = attachments_deleted
-        di.chat_message_crud.delete_older_than.return_value = messages_deleted
-        di.tools_cache_crud.delete_expired.return_value = cache_cleared
-        di.usage_record_repo.delete_older_than.return_value = usage_deleted
-        di.price_alert_crud.delete_stale.return_value = alerts_deleted
-        di.sponsorship_crud.delete_unaccepted_older_than.return_value = sponsorships_deleted
-        return CleanupService(di)
+    sql: SQLUtil
+    di: MagicMock
+    old: datetime
+
+    def setUp(self):
+        self.sql = SQLUtil()
+        self.di = MagicMock()
+        self.di.db = self.sql.get_session()
+        self.di.tools_cache_crud = self.sql.tools_cache_crud()
+        self.di.usage_record_repo = self.sql.usage_record_repo()
+        self.old = datetime.now() - timedelta(days = 400)
+
+    def tearDown(self):
+        self.sql.end_session()
+
+    def __seed_messages(self, old_count: int, new_count: int, attachments_per_message: int = 1):
+        chat = self.sql.chat_config_crud().save(ChatConfigSave(chat_type = ChatConfigDB.ChatType.telegram))
+        for index in range(old_count + new_count):
+            message_id = f"{index:03d}"
+            self.sql.chat_message_crud().save(
+                ChatMessageSave(
+                    chat_id = chat.chat_id,
+                    message_id = message_id,
+                    sent_at = self.old if index < old_count else datetime.now(),
+                    text = f"Message {index}",
+                ),
+            )
+            for attachment_index in range(attachments_per_message):
+                self.sql.chat_message_attachment_crud().save(
+                    ChatMessageAttachmentSave(id = f"{message_id}-{attachment_index}", chat_id = chat.chat_id, message_id = message_id),
+                )
+
+    def __seed_usage(self, timestamp: datetime):
+        user = self.sql.user_crud().create(UserSave())
+        self.sql.usage_record_repo().create(
+            UsageRecord(
+                user_id = user.id,
+                payer_id = user.id,
+                tool = GPT_4O,
+                tool_purpose = ToolType.chat,
+                timestamp = timestamp,
+                runtime_seconds = 1.0,
+                model_cost_credits = 0,
+                remote_runtime_cost_credits = 0,
+                api_call_cost_credits = 0,
+                maintenance_fee_credits = 0,
+                total_cost_credits = 1.0,
+            ),
+        )
+
+    def __count(self, model) -> int:
+        return self.sql.get_session().query(model).count()
 
     @patch("features.cleanup.cleanup_service.log")
-    def test_run_returns_all_phase_counts(self, _):
-        service = self._make_service(
-            attachments_deleted = 5,
-            messages_deleted = 10,
-            cache_cleared = 3,
-            usage_deleted = 7,
-            alerts_deleted = 2,
-            sponsorships_deleted = 1,
+    def test_run_deletes_expired_data_of_all_phases(self, _):
+        self.__seed_messages(old_count = 3, new_count = 2, attachments_per_message = 2)
+        self.sql.tools_cache_crud().create(ToolsCacheSave(key = "expired", value = "v", expires_at = datetime.now() - timedelta(hours = 1)))
+        self.sql.tools_cache_crud().create(ToolsCacheSave(key = "fresh", value = "v", expires_at = datetime.now() + timedelta(hours = 1)))
+        self.__seed_usage(datetime.now(timezone.utc) - timedelta(days = 400))
+        self.__seed_usage(datetime.now(timezone.utc))
+        self.sql.document_embedding_crud().create_all(
+            [
+                DocumentEmbeddingSave(
+                    content_hash = "old",
+                    embedding_model = "model-a",
+                    page_index = 0,
+                    embedding = b"\x00" * 8,
+                    last_used_at = self.old,
+                ),
+            ],
+        )
+
+        with patch.object(config, "cleanup_chunk_size", 2):
+            result = CleanupService(self.di).run()
+
+        self.assertTrue(result.completed)
+        self.assertEqual(result.messages_deleted, 3)
+        self.assertEqual(result.attachments_deleted, 6)
+        self.assertEqual(result.cache_entries_cleared, 1)
+        self.assertEqual(result.usage_records_deleted, 1)
+        self.assertEqual(result.document_embeddings_deleted, 1)
+        self.assertEqual(result.price_alerts_deleted, 0)
+        self.assertEqual(result.sponsorships_deleted, 0)
+        self.assertEqual(
+            set(result.rows_per_second.keys()),
+            {"messages", "tools_cache", "usage_records", "price_alerts", "sponsorships", "document_embeddings"},
         )
+        self.assertEqual(self.__count(ChatMessageDB), 2)
+        self.assertEqual(self.__count(ChatMessageAttachmentDB), 4)
+        self.assertEqual([entry.key for entry in self.sql.get_session().query(ToolsCacheDB)], ["fresh"])
+        self.assertEqual(self.__count(UsageRecordDB), 1)
+        self.assertEqual(self.__count(UsageDailyRollupDB), 1)  # rollups of deleted days are pruned
+
+    @patch("features.cleanup.cleanup_service.log")
+    def test_run_out_of_time_saves_a_checkpoint_and_the_next_run_resumes(self, _):
+        self.__seed_messages(old_count = 5, new_count = 1)
+
+        with patch.object(config, "cleanup_chunk_size", 2):
+            with patch.object(config, "cleanup_time_budget_s", 5):
+                # run deadline, phase start, one chunk fits in the budget, the deadline passes, phase elapsed
+                with patch("time.monotonic", side_effect = [0.0, 0.0, 0.0, 10.0, 10.0]):
+                    first = CleanupService(self.di).run()
+
+            self.assertFalse(first.completed)
+            self.assertEqual(first.messages_deleted, 2)
+            checkpoint = self.sql.tools_cache_crud().get(CHECKPOINT_CACHE_KEY)
+            assert checkpoint is not None
+            self.assertEqual(json.loads(checkpoint.value)["phase"], "messages")
+            self.assertEqual(json.loads(checkpoint.value)["after"][1], "001")
 
-        result = service.run()
+            second = CleanupService(self.di).run()
 
-        self.assertIsInstance(result, CleanupResult)
-        self.assertEqual(result.attachments_deleted, 5)
-        self.assertEqual(result.messages_deleted, 10)
-        self.assertEqual(result.cache_entries_cleared, 3)
-        self.assertEqual(result.usage_records_deleted, 7)
-        self.assertEqual(result.price_alerts_deleted, 2)
-        self.assertEqual(result.sponsorships_deleted, 1)
+        self.assertTrue(second.completed)
+        self.assertEqual(second.messages_deleted, 3)
+        self.assertEqual(self.__count(ChatMessageDB), 1)
+        self.assertIsNone(self.sql.tools_cache_crud().get(CHECKPOINT_CACHE_KEY))
 
     @patch("features.cleanup.cleanup_service.log")
-    def test_attachment_failure_skips_message_deletion(self, _):
-        service = self._make_service()
-        service._CleanupService__di.chat_message_attachment_crud.delete_by_old_messages.side_effect = RuntimeError("DB error")
+    def test_run_resumes_usage_records_after_a_timestamped_key(self, _):
+        self.__seed_usage(datetime.now(timezone.utc) - timedelta(days = 400))
+        self.__seed_usage(datetime.now(timezone.utc) - timedelta(days = 399))
+        first_key = min((record.id, record.timestamp) for record in self.sql.get_session().query(UsageRecordDB))
+        self.sql.tools_cache_crud().save(
+            ToolsCacheSave(
+                key = CHECKPOINT_CACHE_KEY,
+                value = json.dumps({"phase": "usage_records", "after": [str(value) for value in first_key]}),
+                expires_at = datetime.now() + timedelta(days = 1),
+            ),
+        )
 
-        result = service.run()
+        result = CleanupService(self.di).run()
 
-        service._CleanupService__di.chat_message_crud.delete_older_than.assert_not_called()
-        self.assertEqual(result.attachments_deleted, 0)
-        self.assertEqual(result.messages_deleted, 0)
+        self.assertTrue(result.completed)
+        self.assertEqual(result.usage_records_deleted, 1)  # the first record counts as deleted by the previous run
+        self.assertEqual(result.usage_partitions_dropped, 0)
+        self.assertEqual([record.id for record in self.sql.get_session().query(UsageRecordDB)], [first_key[0]])
 
     @patch("features.cleanup.cleanup_service.log")
     def test_phase_failure_does_not_block_subsequent_phases(self, _):
-        service = self._make_service(
-            cache_cleared = 3,
-            alerts_deleted = 2,
-            sponsorships_deleted = 1,
-        )
-        service._CleanupService__di.usage_record_repo.delete_older_than.side_effect = RuntimeError("DB error")
+        self.__seed_messages(old_count = 2, new_count = 0)
+        self.sql.tools_cache_crud().create(ToolsCacheSave(key = "expired", value = "v", expires_at = datetime.now() - timedelta(hours = 1)))
+        failing_deletion = MagicMock()
+
+        with patch("features.cleanup.cleanup_service.ChunkedDeletion") as deletion_class:
+            real_deletion = ChunkedDeletion(self.sql.get_session())
 
-        result = service.run()
+            def run(table, *args, **kwargs):
+                if table.name == "chat_messages":
+                    raise RuntimeError("DB error")
+                return real_deletion.run(table, *args, **kwargs)
 
-        self.assertEqual(result.cache_entries_cleared, 3)
-        self.assertEqual(result.usage_records_deleted, 0)
-        self.assertEqual(result.price_alerts_deleted, 2)
-        self.assertEqual(result.sponsorships_deleted, 1)
+            failing_deletion.run.side_effect = run
+            deletion_class.return_value = failing_deletion
+            result = CleanupService(self.di).run()
+
+        self.assertTrue(result.completed)
+        self.assertEqual(result.messages_deleted, 0)
+        self.assertEqual(result.cache_entries_cleared, 1)
+        self.assertEqual(self.__count(ChatMessageDB), 2)
 
     @patch("features.cleanup.cleanup_service.log")
     def test_run_with_zero_deletions(self, _):
-        service = self._make_service()
+        result = CleanupService(self.di).run()
 
-        result = service.run()
-
-        self.assertEqual(result, CleanupResult())
+        self.assertEqual(
+            result,
+            CleanupResult(rows_per_second = {phase: 0.0 for phase in result.rows_per_second}),
+        )
+        self.assertEqual(len(result.rows_per_second), 6)
@@ -15,7 +15,8 @@ from db.schema.tools_cache import ToolsCache
 from db.schema.user import User
 from di.di import DI
 from features.chat.telegram.sdk.telegram_bot_sdk import TelegramBotSDK
-from features.currencies.exchange_rate_fetcher import CACHE_TTL, ExchangeRateFetcher
+from features.currencies.exchange_rate_fetcher import CACHE_TTL, RATE_LIMIT, ExchangeRateFetcher
+from features.external_tools.external_tool_library import FIAT_CURRENCY_EXCHANGE
 from features.web_browsing.web_fetcher import WebFetcher
 from util.config import config
 from util.errors import ValidationError
@@ -82,36 +83,32 @@ class ExchangeRateFetcherTest(unittest.TestCase):
         self.mock_telegram_sdk = MagicMock()
 
     # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
     @requests_mock.Mocker()
-    def test_execute_same_currency(self, m: Mocker, mock_sleep):
+    def test_execute_same_currency(self, m: Mocker):
         fetcher = ExchangeRateFetcher(self.mock_di)
         result = fetcher.execute("USD", "USD", 100)
         self.assertEqual(result, {"from": "USD", "to": "USD", "rate": 1.0, "amount": 100, "value": 100})
 
     # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
     @patch("features.currencies.exchange_rate_fetcher.ExchangeRateFetcher.get_fiat_conversion_rate")
-    def test_execute_fiat_to_fiat(self, mock_get_fiat, mock_sleep):
+    def test_execute_fiat_to_fiat(self, mock_get_fiat):
         mock_get_fiat.return_value = 0.85
         fetcher = ExchangeRateFetcher(self.mock_di)
         result = fetcher.execute("USD", "EUR", 100)
         self.assertEqual(result, {"from": "USD", "to": "EUR", "rate": 0.85, "amount": 100, "value": 85})
 
     # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
     @patch("features.currencies.exchange_rate_fetcher.ExchangeRateFetcher.get_crypto_conversion_rate")
-    def test_execute_crypto_to_crypto(self, mock_get_crypto, mock_sleep):
+    def test_execute_crypto_to_crypto(self, mock_get_crypto):
         mock_get_crypto.return_value = 15.5
         fetcher = ExchangeRateFetcher(self.mock_di)
         result = fetcher.execute("BTC", "ETH", 1)
         self.assertEqual(result, {"from": "BTC", "to": "ETH", "rate": 15.5, "amount": 1, "value": 15.5})
 
     # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
     @patch("features.currencies.exchange_rate_fetcher.ExchangeRateFetcher.get_fiat_conversion_rate")
     @patch("features.currencies.exchange_rate_fetcher.ExchangeRateFetcher.get_crypto_conversion_rate")
-    def test_execute_fiat_to_crypto(self, mock_get_crypto, mock_get_fiat, mock_sleep):
+    def test_execute_fiat_to_crypto(self, mock_get_crypto, mock_get_fiat):
         mock_get_fiat.return_value = 1.2  # EUR to USD
         mock_get_crypto.return_value = 0.000025  # USD to BTC (1 BTC = 40,000 USD)
         fetcher = ExchangeRateFetcher(self.mock_di)
@@ -120,27 +117,21 @@ class ExchangeRateFetcherTest(unittest.TestCase):
         expected_result = {"from": "EUR", "to": "BTC", "rate": expected_rate, "amount": 1000000, "value": 30}
         self.assertEqual(result, expected_result)
 
-    # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
-    def test_execute_unsupported_currency(self, mock_sleep):
+    def test_execute_unsupported_currency(self):
         fetcher = ExchangeRateFetcher(self.mock_di)
         with self.assertRaises(ValidationError):
             fetcher.execute("USD", "UNSUPPORTED", 100)
 
-    # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
     @requests_mock.Mocker()
-    def test_get_crypto_conversion_rate_cache_hit(self, m: Mocker, mock_sleep):
+    def test_get_crypto_conversion_rate_cache_hit(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = self.cache_entry
         fetcher = ExchangeRateFetcher(self.mock_di)
         rate = fetcher.get_crypto_conversion_rate("BTC", "ETH")
         self.assertEqual(rate, 1.5)
-        # noinspection PyUnresolvedReferences
-        m.assert_not_called()
+        self.assertFalse(m.called)
+        self.mock_di.rate_limiter.acquire.assert_not_called()
 
-    # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
-    def test_get_crypto_conversion_rate_cache_miss_crypto_to_crypto(self, mock_sleep):
+    def test_get_crypto_conversion_rate_cache_miss_crypto_to_crypto(self):
         self.mock_di.tools_cache_crud.get.return_value = None
         self.mock_web_fetcher.fetch_json.side_effect = [
             {"data": {"BTC": {"quote": {"USD": {"price": 40000}}}}},
@@ -151,10 +142,9 @@ class ExchangeRateFetcherTest(unittest.TestCase):
         self.assertEqual(rate, 20)  # 40000 / 2000 = 20
         # noinspection PyUnresolvedReferences
         self.mock_di.tools_cache_crud.save.assert_called_once()
+        self.assertEqual(self.mock_di.rate_limiter.acquire.call_count, 2)
 
-    # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
-    def test_get_crypto_conversion_rate_cache_miss_crypto_to_usd(self, mock_sleep):
+    def test_get_crypto_conversion_rate_cache_miss_crypto_to_usd(self):
         self.mock_di.tools_cache_crud.get.return_value = None
         self.mock_web_fetcher.fetch_json.return_value = {"data": {"BTC": {"quote": {"USD": {"price": 40000}}}}}
         fetcher = ExchangeRateFetcher(self.mock_di)
@@ -163,20 +153,16 @@ class ExchangeRateFetcherTest(unittest.TestCase):
         # noinspection PyUnresolvedReferences
         self.mock_di.tools_cache_crud.save.assert_called_once()
 
-    # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
     @requests_mock.Mocker()
-    def test_get_fiat_conversion_rate_cache_hit(self, m: Mocker, mock_sleep):
+    def test_get_fiat_conversion_rate_cache_hit(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = self.cache_entry
         fetcher = ExchangeRateFetcher(self.mock_di)
         rate = fetcher.get_fiat_conversion_rate("USD", "EUR")
         self.assertEqual(rate, 1.5)
-        # noinspection PyUnresolvedReferences
-        m.assert_not_called()
+        self.assertFalse(m.called)
+        self.mock_di.rate_limiter.acquire.assert_not_called()
 
-    # noinspection PyUnusedLocal
-    @patch("features.currencies.exchange_rate_fetcher.sleep", return_value = None)
-    def test_get_fiat_conversion_rate_cache_miss(self, mock_sleep):
+    def test_get_fiat_conversion_rate_cache_miss(self):
         self.mock_di.tools_cache_crud.get.return_value = None
         self.mock_web_fetcher.fetch_json.return_value = {"rates": {"EUR": {"rate_for_amount": "0.85"}}}
         fetcher = ExchangeRateFetcher(self.mock_di)
@@ -184,3 +170,33 @@ class ExchangeRateFetcherTest(unittest.TestCase):
         self.assertEqual(rate, 0.85)
         # noinspection PyUnresolvedReferences
         self.mock_di.tools_cache_crud.save.assert_called_once()
+        self.mock_di.rate_limiter.acquire.assert_called_once_with(FIAT_CURRENCY_EXCHANGE.id, RATE_LIMIT)
+
+    def test_prefetch_crypto_prices_uses_single_request(self):
+        self.mock_di.tools_cache_crud.get.return_value = None
+        self.mock_web_fetcher.fetch_json.return_value = {
+            "data": {
+                "BTC": {"quote": {"USD": {"price": 40000}}},
+                "ETH": {"quote": {"USD": {"price": 2000}}},
+            },
+        }
+        fetcher = ExchangeRateFetcher(self.mock_di)
+
+        prefetched = fetcher.prefetch_crypto_prices(["ETH", "BTC", "USD", "EUR", "BTC"])
+
+        self.assertEqual(prefetched, 2)
+        self.mock_di.tracked_web_fetcher.assert_called_once()
+        params = self.mock_di.tracked_web_fetcher.call_args.args[3]
+        self.assertEqual(params, {"symbol": "BTC,ETH", "convert": "USD"})
+        self.assertEqual(self.mock_di.tools_cache_crud.save.call_count, 2)
+        self.mock_di.rate_limiter.acquire.assert_called_once()
+
+    def test_prefetch_crypto_prices_skips_cached_symbols(self):
+        self.mock_di.tools_cache_crud.get.return_value = self.cache_entry
+        fetcher = ExchangeRateFetcher(self.mock_di)
+
+        prefetched = fetcher.prefetch_crypto_prices(["BTC", "ETH"])
+
+        self.assertEqual(prefetched, 0)
+        self.mock_di.tracked_web_fetcher.assert_not_called()
+        self.mock_di.rate_limiter.acquire.assert_not_called()
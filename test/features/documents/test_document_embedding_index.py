@@ -0,0 +1,167 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from db.sql_util import SQLUtil
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from db.crud.document_embedding import DocumentEmbeddingCRUD
+from db.schema.document_embedding import DocumentEmbeddingSave
+from db.schema.tools_cache import ToolsCacheSave
+from db.unit_of_work import unit_of_work
+from di.di import DI
+from features.documents import document_embedding_index
+from features.documents.document_embedding_index import DocumentEmbeddingIndex, pack_vector, unpack_vector
+
+
+class CountingEmbeddings(Embeddings):
+
+    document_requests: list[int]
+
+    def __init__(self):
+        self.document_requests = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.document_requests.append(len(texts))
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [float(len(text)), float(text.count("a")), 1.0]
+
+
+class DocumentEmbeddingIndexTest(unittest.TestCase):
+
+    sql: SQLUtil
+    index: DocumentEmbeddingIndex
+    embeddings: CountingEmbeddings
+
+    def setUp(self):
+        self.sql = SQLUtil()
+        self.index = DocumentEmbeddingIndex(DI(self.sql.get_session()))
+        self.embeddings = CountingEmbeddings()
+
+    def tearDown(self):
+        self.sql.end_session()
+
+    @staticmethod
+    def _pages(*contents: str) -> list[Document]:
+        return [Document(page_content = content, metadata = {"page": i}) for i, content in enumerate(contents)]
+
+    def test_first_load_embeds_and_stores_pages(self):
+        pages = self._pages("aaa", "bb", "c")
+
+        indexed_pages = self.index.load_or_embed(pages, self.embeddings, "model-a")
+
+        self.assertEqual(self.embeddings.document_requests, [3])
+        self.assertEqual([indexed_page.document for indexed_page in indexed_pages], pages)
+        self.assertEqual(indexed_pages[0].vector, [3.0, 3.0, 1.0])
+        content_hash = DocumentEmbeddingIndex.content_hash_of(pages)
+        stored = self.sql.document_embedding_crud().get_document(content_hash, "model-a")
+        self.assertEqual([unpack_vector(page.embedding) for page in stored], [[3.0, 3.0, 1.0], [2.0, 0.0, 1.0], [1.0, 0.0, 1.0]])
+
+    def test_repeat_load_reuses_stored_embeddings(self):
+        self.index.load_or_embed(self._pages("aaa", "bb"), self.embeddings, "model-a")
+
+        indexed_pages = self.index.load_or_embed(self._pages("aaa", "bb"), self.embeddings, "model-a")
+
+        self.assertEqual(self.embeddings.document_requests, [2])
+        self.assertEqual(indexed_pages[1].vector, [2.0, 0.0, 1.0])
+
+    def test_repeat_load_refreshes_the_timestamp_of_old_documents(self):
+        pages = self._pages("aaa", "bb")
+        content_hash = DocumentEmbeddingIndex.content_hash_of(pages)
+        self.index.load_or_embed(pages, self.embeddings, "model-a")
+        last_week = datetime.now() - timedelta(days = 7)
+        self.sql.document_embedding_crud().touch_document(content_hash, "model-a", last_week)
+
+        self.index.load_or_embed(pages, self.embeddings, "model-a")
+
+        stored = self.sql.document_embedding_crud().get_document(content_hash, "model-a")
+        self.assertTrue(all(page.last_used_at > last_week + timedelta(days = 6) for page in stored))
+        self.assertEqual(self.embeddings.document_requests, [2])
+
+    def test_repeat_load_keeps_the_timestamp_of_recent_documents(self):
+        pages = self._pages("aaa")
+        content_hash = DocumentEmbeddingIndex.content_hash_of(pages)
+        self.index.load_or_embed(pages, self.embeddings, "model-a")
+        recently = datetime.now() - timedelta(hours = 1)
+        self.sql.document_embedding_crud().touch_document(content_hash, "model-a", recently)
+
+        self.index.load_or_embed(pages, self.embeddings, "model-a")
+
+        stored = self.sql.document_embedding_crud().get_document(content_hash, "model-a")
+        self.assertEqual(stored[0].last_used_at, recently)
+
+    def test_different_model_embeds_again(self):
+        self.index.load_or_embed(self._pages("aaa"), self.embeddings, "model-a")
+        self.index.load_or_embed(self._pages("aaa"), self.embeddings, "model-b")
+
+        self.assertEqual(self.embeddings.document_requests, [1, 1])
+
+    def test_partial_index_is_replaced(self):
+        pages = self._pages("aaa", "bb")
+        content_hash = DocumentEmbeddingIndex.content_hash_of(pages)
+        self.sql.document_embedding_crud().create_all(
+            [
+                DocumentEmbeddingSave(
+                    content_hash = content_hash,
+                    embedding_model = "model-a",
+                    page_index = 0,
+                    embedding = pack_vector([0.0, 0.0, 0.0]),
+                ),
+            ],
+        )
+
+        indexed_pages = self.index.load_or_embed(pages, self.embeddings, "model-a")
+
+        self.assertEqual(self.embeddings.document_requests, [2])
+        self.assertEqual(indexed_pages[0].vector, [3.0, 3.0, 1.0])
+        stored = self.sql.document_embedding_crud().get_document(content_hash, "model-a")
+        self.assertEqual([unpack_vector(page.embedding) for page in stored], [[3.0, 3.0, 1.0], [2.0, 0.0, 1.0]])
+
+    def test_failed_store_keeps_the_other_writes_of_the_unit_of_work(self):
+        pages = self._pages("aaa")
+        self.index.load_or_embed(pages, self.embeddings, "model-a")
+
+        with unit_of_work(self.sql.get_session()):
+            self.sql.tools_cache_crud().save(ToolsCacheSave(key = "pending", value = "kept"))
+            # a concurrent request indexed the same document in the meantime, so storing it collides
+            with patch.object(DocumentEmbeddingCRUD, "get_document", return_value = []):
+                indexed_pages = self.index.load_or_embed(pages, self.embeddings, "model-a")
+
+        self.assertEqual(indexed_pages[0].vector, [3.0, 3.0, 1.0])
+        cached = self.sql.tools_cache_crud().get("pending")
+        assert cached is not None
+        self.assertEqual(cached.value, "kept")
+
+    def test_embeddings_are_requested_in_batches(self):
+        original_batch_size = document_embedding_index.EMBEDDING_BATCH_SIZE
+        document_embedding_index.EMBEDDING_BATCH_SIZE = 2
+        try:
+            self.index.load_or_embed(self._pages("a", "b", "c", "d", "e"), self.embeddings, "model-a")
+        finally:
+            document_embedding_index.EMBEDDING_BATCH_SIZE = original_batch_size
+
+        self.assertEqual(self.embeddings.document_requests, [2, 2, 1])
+
+    def test_search_ranks_by_cosine_similarity(self):
+        pages = self._pages("aaaa", "bbbb", "aabb")
+        indexed_pages = self.index.load_or_embed(pages, self.embeddings, "model-a")
+
+        results = DocumentEmbeddingIndex.search(indexed_pages, self.embeddings.embed_query("aaaa"), k = 2)
+
+        self.assertEqual([result.page_content for result in results], ["aaaa", "aabb"])
+
+    def test_content_hash_depends_on_content(self):
+        self.assertEqual(
+            DocumentEmbeddingIndex.content_hash_of(self._pages("a", "b")),
+            DocumentEmbeddingIndex.content_hash_of(self._pages("a", "b")),
+        )
+        self.assertNotEqual(
+            DocumentEmbeddingIndex.content_hash_of(self._pages("a", "b")),
+            DocumentEmbeddingIndex.content_hash_of(self._pages("ab")),
+        )
+
+    def test_pack_unpack_round_trip(self):
+        self.assertEqual(unpack_vector(pack_vector([0.5, -1.25, 3.0])), [0.5, -1.25, 3.0])
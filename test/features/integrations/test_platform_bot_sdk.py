@@ -55,8 +55,8 @@ class PlatformBotSDKTest(unittest.TestCase):
         uploader.execute.return_value = "uploaded-url"
         di.image_uploader.return_value = uploader
         sdk = PlatformBotSDK(di = di)
-        with patch("features.integrations.platform_bot_sdk.requests.head") as mock_head, \
-                patch("features.integrations.platform_bot_sdk.requests.get") as mock_get, \
+        with patch("features.integrations.platform_bot_sdk.http_transport.head") as mock_head, \
+                patch("features.integrations.platform_bot_sdk.http_transport.get") as mock_get, \
                 patch("features.integrations.platform_bot_sdk.resize_file") as mock_resize:
             mock_head.return_value = _mock_response(content_length = 6 * 1024 * 1024)
             mock_get.return_value = _mock_response(body = b"x" * (6 * 1024 * 1024))
@@ -74,8 +74,8 @@ class PlatformBotSDKTest(unittest.TestCase):
         uploader.execute.return_value = "uploaded-url"
         di.image_uploader.return_value = uploader
         sdk = PlatformBotSDK(di = di)
-        with patch("features.integrations.platform_bot_sdk.requests.head") as mock_head, \
-                patch("features.integrations.platform_bot_sdk.requests.get") as mock_get, \
+        with patch("features.integrations.platform_bot_sdk.http_transport.head") as mock_head, \
+                patch("features.integrations.platform_bot_sdk.http_transport.get") as mock_get, \
                 patch("features.integrations.platform_bot_sdk.resize_file") as mock_resize:
             mock_head.side_effect = Exception("head failed")
             mock_get.return_value = _mock_response(body = b"x" * (6 * 1024 * 1024))
@@ -92,8 +92,8 @@ class PlatformBotSDKTest(unittest.TestCase):
         uploader.execute.return_value = "uploaded-url"
         di.image_uploader.return_value = uploader
         sdk = PlatformBotSDK(di = di)
-        with patch("features.integrations.platform_bot_sdk.requests.head") as mock_head, \
-                patch("features.integrations.platform_bot_sdk.requests.get") as mock_get, \
+        with patch("features.integrations.platform_bot_sdk.http_transport.head") as mock_head, \
+                patch("features.integrations.platform_bot_sdk.http_transport.get") as mock_get, \
                 patch("features.integrations.platform_bot_sdk.resize_file") as mock_resize:
             mock_head.return_value = _mock_response(content_length = 6 * 1024 * 1024)
             mock_get.return_value = _mock_response(body = b"x" * (6 * 1024 * 1024))
@@ -110,8 +110,8 @@ class PlatformBotSDKTest(unittest.TestCase):
         uploader.execute.side_effect = Exception("upload failed")
         di.image_uploader.return_value = uploader
         sdk = PlatformBotSDK(di = di)
-        with patch("features.integrations.platform_bot_sdk.requests.head") as mock_head, \
-                patch("features.integrations.platform_bot_sdk.requests.get") as mock_get, \
+        with patch("features.integrations.platform_bot_sdk.http_transport.head") as mock_head, \
+                patch("features.integrations.platform_bot_sdk.http_transport.get") as mock_get, \
                 patch("features.integrations.platform_bot_sdk.resize_file") as mock_resize:
             mock_head.return_value = _mock_response(content_length = 6 * 1024 * 1024)
             mock_get.return_value = _mock_response(body = b"x" * (6 * 1024 * 1024))
@@ -12,12 +12,14 @@ from features.external_tools.configured_tool import ConfiguredTool
 from features.external_tools.external_tool import CostEstimate, ExternalTool, ExternalToolProvider, ToolType
 from features.external_tools.external_tool_provider_library import ANTHROPIC, GOOGLE_AI, OPEN_AI, PERPLEXITY
 from features.llm.langchain_creator import create
+from features.llm.llm_client_pool import shared_client_pool
 from util.errors import ConfigurationError
 
 
 class LangchainCreatorTest(unittest.TestCase):
 
     def setUp(self):
+        shared_client_pool.clear()
         self.mock_openai_provider = OPEN_AI
         self.mock_anthropic_provider = ANTHROPIC
         self.mock_google_ai_provider = GOOGLE_AI
@@ -361,3 +363,24 @@ class LangchainCreatorTest(unittest.TestCase):
         configured_tool_chat_only = self._make_configured_tool(chat_only_tool, api_key, ToolType.chat)
         result_chat_only = create(configured_tool_chat_only)
         self.assertEqual(result_chat_only.request_timeout, 10)  # 10 * 1
+
+    @patch("features.llm.langchain_creator.config")
+    def test_create_reuses_pooled_client(self, mock_config):
+        mock_config.web_retries = 3
+        mock_config.web_timeout_s = 10
+
+        api_key = SecretStr("test-key")
+        first = create(self._make_configured_tool(self.mock_openai_tool, api_key, ToolType.chat))
+        second = create(self._make_configured_tool(self.mock_openai_tool, api_key, ToolType.chat))
+
+        self.assertIs(first, second)
+
+    @patch("features.llm.langchain_creator.config")
+    def test_create_does_not_share_clients_across_keys(self, mock_config):
+        mock_config.web_retries = 3
+        mock_config.web_timeout_s = 10
+
+        first = create(self._make_configured_tool(self.mock_openai_tool, SecretStr("key-one"), ToolType.chat))
+        second = create(self._make_configured_tool(self.mock_openai_tool, SecretStr("key-two"), ToolType.chat))
+
+        self.assertIsNot(first, second)
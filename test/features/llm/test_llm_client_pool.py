@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from features.llm.llm_client_pool import LLMClientPool
+
+
+class LLMClientPoolTest(unittest.TestCase):
+
+    now: datetime
+    pool: LLMClientPool
+
+    def setUp(self):
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+        self.pool = LLMClientPool(
+            max_entries = 2,
+            max_age_s = 60,
+            now = lambda: self.now,
+        )
+
+    @staticmethod
+    def __key(model_id: str = "model", token: str = "token", temperature: float = 0.5) -> LLMClientPool.Key:
+        return LLMClientPool.Key(
+            provider_id = "provider",
+            model_id = model_id,
+            token_fingerprint = LLMClientPool.fingerprint(token),
+            temperature = temperature,
+            max_tokens = 1000,
+            timeout_s = 10.0,
+            max_retries = 3,
+        )
+
+    def test_same_key_reuses_client(self):
+        factory = Mock(side_effect = lambda: Mock())
+
+        first = self.pool.get_or_create(self.__key(), factory)
+        second = self.pool.get_or_create(self.__key(), factory)
+
+        self.assertIs(first, second)
+        factory.assert_called_once()
+
+    def test_different_settings_get_different_clients(self):
+        first = self.pool.get_or_create(self.__key(temperature = 0.5), Mock)
+        second = self.pool.get_or_create(self.__key(temperature = 1.0), Mock)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.pool.size, 2)
+
+    def test_rotated_token_gets_new_client(self):
+        old_client = self.pool.get_or_create(self.__key(token = "old"), Mock)
+        new_client = self.pool.get_or_create(self.__key(token = "new"), Mock)
+
+        self.assertIsNot(old_client, new_client)
+
+    def test_fingerprint_does_not_contain_token(self):
+        fingerprint = LLMClientPool.fingerprint("sk-secret-token")
+
+        self.assertNotIn("sk-secret-token", fingerprint)
+        self.assertEqual(fingerprint, LLMClientPool.fingerprint("sk-secret-token"))
+        self.assertNotEqual(fingerprint, LLMClientPool.fingerprint("sk-other-token"))
+
+    def test_evicts_least_recently_used(self):
+        first = self.pool.get_or_create(self.__key("a"), Mock)
+        self.pool.get_or_create(self.__key("b"), Mock)
+        # touch "a" so "b" becomes the oldest
+        self.pool.get_or_create(self.__key("a"), Mock)
+        self.pool.get_or_create(self.__key("c"), Mock)
+
+        self.assertEqual(self.pool.size, 2)
+        self.assertIs(self.pool.get_or_create(self.__key("a"), Mock), first)
+        factory = Mock(side_effect = lambda: Mock())
+        self.pool.get_or_create(self.__key("b"), factory)
+        factory.assert_called_once()
+
+    def test_stale_client_is_rebuilt(self):
+        first = self.pool.get_or_create(self.__key(), Mock)
+
+        self.now += timedelta(seconds = 61)
+        second = self.pool.get_or_create(self.__key(), Mock)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_clear(self):
+        self.pool.get_or_create(self.__key(), Mock)
+
+        self.pool.clear()
+
+        self.assertEqual(self.pool.size, 0)
@@ -0,0 +1,111 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from PIL import ImageFont
+
+from features.social_cards.card_template import _word_wrap
+from features.social_cards.font_registry import FontRegistry, font_registry
+
+TRUETYPE_TARGET = "features.social_cards.font_registry.ImageFont.truetype"
+
+
+class FontRegistryTest(unittest.TestCase):
+
+    fonts_dir: Path
+
+    def setUp(self):
+        self.fonts_dir = Path(tempfile.mkdtemp())
+        shutil.copy(font_registry.font_path, self.fonts_dir / "Heebo-Variable.ttf")
+
+    def tearDown(self):
+        shutil.rmtree(self.fonts_dir)
+
+    @staticmethod
+    def _fake_font() -> MagicMock:
+        font = MagicMock()
+        font.getlength.side_effect = lambda text: float(len(text) * 10)
+        return font
+
+    def test_scans_fonts_dir_once(self):
+        (self.fonts_dir / "NotoColorEmoji.ttf").write_bytes(b"")
+
+        registry = FontRegistry(self.fonts_dir, "Heebo-Variable.ttf")
+        (self.fonts_dir / "Late.ttf").write_bytes(b"")
+
+        self.assertEqual(registry.font_path, self.fonts_dir / "Heebo-Variable.ttf")
+        self.assertEqual(registry.emoji_font_path, self.fonts_dir / "NotoColorEmoji.ttf")
+        self.assertEqual(
+            registry.font_files,
+            [str(self.fonts_dir / "Heebo-Variable.ttf"), str(self.fonts_dir / "NotoColorEmoji.ttf")],
+        )
+
+    def test_font_loaded_once_per_size(self):
+        registry = FontRegistry(self.fonts_dir, "Heebo-Variable.ttf")
+
+        with patch(TRUETYPE_TARGET, wraps = ImageFont.truetype) as truetype:
+            first = registry.font(20)
+            second = registry.font(20)
+            other = registry.font(30)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(truetype.call_count, 2)
+
+    def test_text_length_memoized(self):
+        registry = FontRegistry(self.fonts_dir, "Heebo-Variable.ttf")
+        font = self._fake_font()
+
+        with patch(TRUETYPE_TARGET, return_value = font):
+            self.assertEqual(registry.text_length("hello", 20), 50.0)
+            self.assertEqual(registry.text_length("hello", 20), 50.0)
+            self.assertEqual(registry.text_length("hi", 20), 20.0)
+
+        self.assertEqual(font.getlength.call_count, 2)
+
+    def test_emoji_falls_back_to_main_font(self):
+        registry = FontRegistry(self.fonts_dir, "Heebo-Variable.ttf")
+
+        self.assertIsNone(registry.emoji_font_path)
+        self.assertIsNone(registry.emoji_font(20))
+        self.assertEqual(registry.text_length("abc", 20, is_emoji = True), registry.text_length("abc", 20))
+
+    def test_width_cache_is_bounded(self):
+        registry = FontRegistry(self.fonts_dir, "Heebo-Variable.ttf", max_cached_widths = 2)
+        font = self._fake_font()
+
+        with patch(TRUETYPE_TARGET, return_value = font):
+            registry.text_length("a", 20)
+            registry.text_length("b", 20)
+            registry.text_length("c", 20)
+            registry.text_length("a", 20)
+
+        self.assertEqual(font.getlength.call_count, 4)
+
+    def test_word_wrap_matches_full_line_measurement(self):
+        font = ImageFont.truetype(str(font_registry.font_path), 24)
+        text = (
+            "Wrapping a  long tweet with @mentions, #hashtags and https://example.com/a/very/long/link "
+            "should produce\tthe same lines as measuring every candidate line from scratch. " * 4
+        ).strip() + "\n\n Leading space and AVAWAY kerning pairs"
+
+        expected: list[str] = []
+        for paragraph in text.splitlines():
+            if not paragraph.strip():
+                expected.append("")
+                continue
+            current = ""
+            for word in paragraph.split(" "):
+                candidate = (current + " " + word).strip()
+                if round(font.getlength(candidate)) <= 400:
+                    current = candidate
+                else:
+                    if current:
+                        expected.append(current)
+                    current = word
+            if current:
+                expected.append(current)
+
+        self.assertEqual(_word_wrap(text, 400, 24), expected)
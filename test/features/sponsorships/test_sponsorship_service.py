@@ -205,7 +205,7 @@ class SponsorshipServiceTest(unittest.TestCase):
         self.assertEqual(result, SponsorshipService.Result.success)
         self.assertIn("Sponsorship sent", msg)
 
-    def test_sponsor_user_at_capacity_creates_waitlisted_user(self):
+    def test_sponsor_user_creates_the_receiver_within_capacity(self):
         sponsor_user_id_hex = self.user.id.hex
         receiver_telegram_username = "receiver_username"
         receiver_user_db = UserDB(
@@ -226,7 +226,6 @@ class SponsorshipServiceTest(unittest.TestCase):
         self.mock_sponsorship_dao.get_all_by_sponsor.return_value = []
         self.mock_sponsorship_dao.get_all_by_receiver.return_value = []
         self.mock_user_dao.get_by_telegram_username.return_value = None
-        self.mock_user_dao.count.return_value = config.max_users
         self.mock_user_dao.save.return_value = receiver_user_db
         self.mock_sponsorship_dao.save.return_value = {
             "sponsor_id": self.user.id,
@@ -243,7 +242,9 @@ class SponsorshipServiceTest(unittest.TestCase):
 
         self.assertEqual(result, SponsorshipService.Result.success)
         saved_user_payload = self.mock_user_dao.save.call_args.args[0]
-        self.assertTrue(saved_user_payload.is_on_waitlist)
+        # the waitlist is decided by the CRUD against the capacity, atomically with the creation
+        self.assertEqual(self.mock_user_dao.save.call_args.kwargs["capacity"], config.max_users)
+        self.assertFalse(saved_user_payload.is_on_waitlist)
         self.assertFalse(saved_user_payload.is_invited_to_start)
         self.assertFalse(saved_user_payload.are_policies_accepted)
 
@@ -111,7 +111,7 @@ class UserSupportServiceTest(unittest.TestCase):
 
     @patch("features.support.user_support_service.UserSupportService._UserSupportService__generate_issue_description")
     @patch("features.support.user_support_service.UserSupportService._UserSupportService__generate_issue_title")
-    @patch("requests.post")
+    @patch("features.support.user_support_service.http_transport.post")
     def test_execute_success(self, mock_post, mock_generate_title, mock_generate_description):
         mock_generate_description.return_value = "Test description"
         mock_generate_title.return_value = "Test title"
@@ -127,7 +127,7 @@ class UserSupportServiceTest(unittest.TestCase):
 
     @patch("features.support.user_support_service.UserSupportService._UserSupportService__generate_issue_description")
     @patch("features.support.user_support_service.UserSupportService._UserSupportService__generate_issue_title")
-    @patch("requests.post")
+    @patch("features.support.user_support_service.http_transport.post")
     def test_execute_failure(self, mock_post, mock_generate_title, mock_generate_description):
         mock_generate_description.return_value = "Test description"
         mock_generate_title.return_value = "Test title"
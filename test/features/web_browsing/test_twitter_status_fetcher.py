@@ -1,6 +1,6 @@
 import unittest
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock
 from uuid import UUID
 
 import requests
@@ -79,8 +79,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
 
     # noinspection PyUnusedLocal
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_execute_cache_hit(self, m: Mocker, mock_sleep):
+    def test_execute_cache_hit(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = self.cache_entry.model_dump()
 
         fetcher = TwitterStatusFetcher(
@@ -94,8 +93,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
 
     # noinspection PyUnusedLocal
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_execute_cache_miss(self, m: Mocker, mock_sleep):
+    def test_execute_cache_miss(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
 
         # Mock the X API v2 response
@@ -133,8 +131,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
 
     # noinspection PyUnusedLocal
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_execute_api_error(self, m: Mocker, mock_sleep):
+    def test_execute_api_error(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
 
         # Mock API error response
@@ -151,8 +148,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
 
     # noinspection PyUnusedLocal
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_api_call_parameters(self, m: Mocker, mock_sleep):
+    def test_api_call_parameters(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
 
         # Mock the X API v2 response
@@ -194,8 +190,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
 
     # noinspection PyUnusedLocal
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_resolve_photo_contents(self, m: Mocker, mock_sleep):
+    def test_resolve_photo_contents(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
 
         # Mock computer vision analyzer
@@ -248,8 +243,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
         self.mock_di.computer_vision_analyzer.assert_called_once()
 
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_format_tweet_content_handles_missing_data(self, m: Mocker, _):
+    def test_format_tweet_content_handles_missing_data(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
 
         # Mock X API v2 response with missing data
@@ -285,8 +279,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
         self.assertIn("<No text posted>", result)
 
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_as_structured_returns_typed_data(self, m: Mocker, _):
+    def test_as_structured_returns_typed_data(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
         m.get(
             self.api_url,
@@ -353,8 +346,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
         self.assertEqual(result.media[2].preview_url, "https://pbs.twimg.com/media/video_preview.jpg")
 
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_as_structured_uses_structured_cache_prefix(self, m: Mocker, _):
+    def test_as_structured_uses_structured_cache_prefix(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
         m.get(
             self.api_url,
@@ -374,8 +366,7 @@ class TwitterStatusFetcherTest(unittest.TestCase):
         self.assertNotIn("twitter-status-fetcher", prefixes_used)
 
     @requests_mock.Mocker()
-    @patch("features.web_browsing.twitter_status_fetcher.sleep", return_value = None)
-    def test_as_structured_does_not_invoke_cv(self, m: Mocker, _):
+    def test_as_structured_does_not_invoke_cv(self, m: Mocker):
         self.mock_di.tools_cache_crud.get.return_value = None
         m.get(
             self.api_url,
@@ -10,7 +10,7 @@ class TwitterUtilsTest(unittest.TestCase):
     def setUp(self):
         config.web_timeout_s = 0
 
-    @patch("requests.get")
+    @patch("features.web_browsing.twitter_utils.http_transport.get")
     def test_detect_tweet_id(self, mock_get):
         mock_response = MagicMock()
         mock_response.url = "https://twitter.com/username/status/123456789"
@@ -0,0 +1,134 @@
+import threading
+import unittest
+from concurrent.futures import Executor, Future
+from unittest.mock import patch
+
+from util.debounce_scheduler import DebounceScheduler
+
+
+class InlineExecutor(Executor):
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class DebounceSchedulerTest(unittest.TestCase):
+
+    now_s: float
+    ran: list[str]
+    scheduler: DebounceScheduler
+
+    def setUp(self):
+        self.now_s = 1000.0
+        self.ran = []
+        self.scheduler = DebounceScheduler(executor = InlineExecutor(), clock = lambda: self.now_s, use_timer = False)
+
+    def __work(self, name: str):
+        return lambda: self.ran.append(name)
+
+    def test_not_due_before_delay(self):
+        self.scheduler.submit("chat/user", 1.0, self.__work("first"))
+
+        self.now_s += 0.9
+
+        self.assertEqual(self.scheduler.run_due(), 0)
+        self.assertEqual(self.ran, [])
+        self.assertEqual(self.scheduler.pending_count(), 1)
+
+    def test_runs_after_delay(self):
+        self.scheduler.submit("chat/user", 1.0, self.__work("first"))
+
+        self.now_s += 1.0
+
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.ran, ["first"])
+        self.assertEqual(self.scheduler.pending_count(), 0)
+
+    def test_burst_coalesces_to_last_callback(self):
+        self.scheduler.submit("chat/user", 1.0, self.__work("first"))
+        self.now_s += 0.5
+        self.scheduler.submit("chat/user", 1.0, self.__work("second"))
+        self.now_s += 0.5
+        self.scheduler.submit("chat/user", 1.0, self.__work("third"))
+
+        self.now_s += 0.9
+        self.assertEqual(self.scheduler.run_due(), 0)
+
+        self.now_s += 0.1
+        self.assertEqual(self.scheduler.run_due(), 1)
+        self.assertEqual(self.ran, ["third"])
+
+    def test_keys_are_independent(self):
+        self.scheduler.submit("chat/user1", 1.0, self.__work("user1"))
+        self.now_s += 0.5
+        self.scheduler.submit("chat/user2", 1.0, self.__work("user2"))
+
+        self.now_s += 0.5
+        self.scheduler.run_due()
+        self.assertEqual(self.ran, ["user1"])
+
+        self.now_s += 0.5
+        self.scheduler.run_due()
+        self.assertEqual(self.ran, ["user1", "user2"])
+
+    def test_cancel(self):
+        self.scheduler.submit("chat/user", 1.0, self.__work("first"))
+
+        self.assertTrue(self.scheduler.cancel("chat/user"))
+        self.assertFalse(self.scheduler.cancel("chat/user"))
+
+        self.now_s += 1.0
+        self.assertEqual(self.scheduler.run_due(), 0)
+        self.assertEqual(self.ran, [])
+
+    @patch("util.timer_heap.log")
+    def test_failing_callback_does_not_block_others(self, mock_log):
+        def fail():
+            raise ValueError("boom")
+
+        self.scheduler.submit("chat/user1", 1.0, fail)
+        self.scheduler.submit("chat/user2", 1.0, self.__work("user2"))
+
+        self.now_s += 1.0
+
+        self.assertEqual(self.scheduler.run_due(), 2)
+        self.assertEqual(self.ran, ["user2"])
+        mock_log.e.assert_called_once()
+
+    def test_submit_after_shutdown_fails(self):
+        self.scheduler.submit("chat/user", 1.0, self.__work("first"))
+
+        self.scheduler.shutdown()
+
+        self.assertEqual(self.scheduler.pending_count(), 0)
+        with self.assertRaises(RuntimeError):
+            self.scheduler.submit("chat/user", 1.0, self.__work("second"))
+
+    def test_timer_thread_runs_due_work(self):
+        done = threading.Event()
+        scheduler = DebounceScheduler(executor = InlineExecutor())
+        try:
+            scheduler.submit("chat/user", 0.05, lambda: self.ran.append("stale"))
+            scheduler.submit("chat/user", 0.05, done.set)
+
+            self.assertTrue(done.wait(timeout = 2.0))
+            self.assertEqual(self.ran, [])
+            self.assertEqual(scheduler.pending_count(), 0)
+        finally:
+            scheduler.shutdown()
+
+    def test_reset_after_fork_drops_inherited_work(self):
+        scheduler = DebounceScheduler(clock = lambda: self.now_s, use_timer = False)
+        scheduler.submit("chat/user", 1.0, self.__work("parent"))
+
+        scheduler.reset_after_fork()
+        done = threading.Event()
+        scheduler.submit("chat/user", 1.0, done.set)
+        self.now_s += 1.0
+
+        self.assertEqual(scheduler.run_due(), 1)
+        self.assertTrue(done.wait(timeout = 2.0))
+        self.assertEqual(self.ran, [])
+        scheduler.shutdown()
@@ -0,0 +1,94 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests_mock
+
+from util.http_transport import HTTPTransport
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    connection_ports: set[int] = set()
+
+    def do_GET(self):
+        KeepAliveHandler.connection_ports.add(self.client_address[1])
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HTTPTransportTest(unittest.TestCase):
+
+    transport: HTTPTransport
+
+    def setUp(self):
+        self.transport = HTTPTransport(pool_connections = 2, pool_maxsize = 2, connect_timeout_s = 3, read_timeout_s = 7)
+
+    def tearDown(self):
+        self.transport.close()
+
+    @requests_mock.Mocker()
+    def test_default_timeout_applied(self, m: requests_mock.Mocker):
+        m.get("https://example.com/a", text = "ok")
+
+        self.transport.get("https://example.com/a")
+
+        self.assertEqual(m.last_request.timeout, (3, 7))
+
+    @requests_mock.Mocker()
+    def test_explicit_timeout_respected(self, m: requests_mock.Mocker):
+        m.post("https://example.com/a", text = "ok")
+
+        self.transport.post("https://example.com/a", json = {"a": 1}, timeout = 20)
+
+        self.assertEqual(m.last_request.timeout, 20)
+        self.assertEqual(m.last_request.json(), {"a": 1})
+
+    @requests_mock.Mocker()
+    def test_head_does_not_follow_redirects_by_default(self, m: requests_mock.Mocker):
+        m.head("https://example.com/a", status_code = 302, headers = {"Location": "https://example.com/b"})
+        m.head("https://example.com/b", status_code = 200)
+
+        self.assertEqual(self.transport.head("https://example.com/a").status_code, 302)
+        self.assertEqual(self.transport.head("https://example.com/a", allow_redirects = True).status_code, 200)
+
+    @requests_mock.Mocker()
+    def test_cookies_not_shared_between_calls(self, m: requests_mock.Mocker):
+        m.get("https://example.com/login", text = "ok", headers = {"Set-Cookie": "session=secret; Path=/"})
+        m.get("https://example.com/other", text = "ok")
+
+        self.transport.get("https://example.com/login")
+        self.transport.get("https://example.com/other")
+
+        self.assertNotIn("Cookie", m.last_request.headers)
+
+    def test_connections_reused_for_same_host(self):
+        KeepAliveHandler.connection_ports = set()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target = server.serve_forever, daemon = True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/"
+            for _ in range(5):
+                self.assertEqual(self.transport.get(url).text, "ok")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(len(KeepAliveHandler.connection_ports), 1)
+
+    @requests_mock.Mocker()
+    def test_reset_after_fork_keeps_working(self, m: requests_mock.Mocker):
+        m.get("https://example.com/a", text = "ok")
+
+        self.transport.reset_after_fork()
+
+        self.assertEqual(self.transport.get("https://example.com/a").text, "ok")
+        self.assertEqual(m.last_request.timeout, (3, 7))
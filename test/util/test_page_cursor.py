@@ -0,0 +1,26 @@
+import unittest
+from datetime import datetime
+from uuid import uuid4
+
+from util.error_codes import INVALID_PAGE_CURSOR
+from util.errors import ValidationError
+from util.page_cursor import decode_cursor, encode_cursor
+
+
+class PageCursorTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        timestamp = datetime(2026, 3, 14, 15, 9, 26, 535897)
+        record_id = uuid4()
+
+        cursor = encode_cursor(timestamp, record_id)
+
+        self.assertEqual(decode_cursor(cursor), (timestamp, record_id))
+        self.assertNotIn("=", cursor)
+        self.assertNotIn(record_id.hex, cursor)
+
+    def test_decode_rejects_malformed_cursors(self):
+        for cursor in ["", "not-a-cursor", encode_cursor(datetime(2026, 1, 1), uuid4())[:-4], "bm90aGluZw"]:
+            with self.assertRaises(ValidationError) as context:
+                decode_cursor(cursor)
+            self.assertEqual(context.exception.error_code, INVALID_PAGE_CURSOR)
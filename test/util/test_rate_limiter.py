@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+from util.rate_limiter import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    now_s: float
+    slept: list[float]
+    limiter: RateLimiter
+    budget: RateLimiter.Budget
+
+    def setUp(self):
+        self.now_s = 1000.0
+        self.slept = []
+        self.limiter = RateLimiter(now = lambda: self.now_s, sleep = self.__sleep)
+        self.budget = RateLimiter.Budget(rate_per_s = 2.0, burst = 3)
+
+    def __sleep(self, seconds: float):
+        self.slept.append(seconds)
+
+    def test_burst_does_not_wait(self):
+        waits = [self.limiter.acquire("api", self.budget) for _ in range(3)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.0])
+        self.assertEqual(self.slept, [])
+
+    def test_waits_only_when_budget_exhausted(self):
+        for _ in range(3):
+            self.limiter.acquire("api", self.budget)
+
+        waits = [self.limiter.acquire("api", self.budget) for _ in range(2)]
+
+        # callers queue up: the first waits for one token, the second for two
+        self.assertEqual(waits, [0.5, 1.0])
+        self.assertEqual(self.slept, [0.5, 1.0])
+
+    def test_tokens_refill_over_time(self):
+        for _ in range(3):
+            self.limiter.acquire("api", self.budget)
+
+        self.now_s += 1.0  # two tokens refilled
+
+        self.assertEqual(self.limiter.acquire("api", self.budget), 0.0)
+        self.assertEqual(self.limiter.acquire("api", self.budget), 0.0)
+        self.assertEqual(self.limiter.acquire("api", self.budget), 0.5)
+
+    def test_idle_time_does_not_exceed_burst(self):
+        self.limiter.acquire("api", self.budget)
+
+        self.now_s += 3600.0
+
+        waits = [self.limiter.acquire("api", self.budget) for _ in range(4)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0, 0.5])
+
+    def test_keys_have_independent_buckets(self):
+        for _ in range(3):
+            self.limiter.acquire("api-1", self.budget)
+
+        self.assertEqual(self.limiter.acquire("api-2", self.budget), 0.0)
+        self.assertEqual(self.limiter.acquire("api-1", self.budget), 0.5)
+
+    def test_stats(self):
+        for _ in range(5):
+            self.limiter.acquire("api", self.budget)
+        self.limiter.acquire("other", self.budget)
+
+        stats = self.limiter.stats()
+
+        self.assertEqual(stats["api"].acquired, 5)
+        self.assertEqual(stats["api"].delayed, 2)
+        self.assertAlmostEqual(stats["api"].total_wait_s, 1.5)
+        self.assertAlmostEqual(stats["api"].max_wait_s, 1.0)
+        self.assertAlmostEqual(stats["api"].average_wait_s, 0.3)
+        self.assertEqual(stats["other"], RateLimiter.Stats(acquired = 1))
+
+    def test_concurrent_callers_reserve_distinct_slots(self):
+        budget = RateLimiter.Budget(rate_per_s = 10.0, burst = 1)
+        threads = [threading.Thread(target = self.limiter.acquire, args = ("api", budget)) for _ in range(20)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(round(wait, 6) for wait in self.slept), [round(i / 10.0, 6) for i in range(1, 20)])
+        self.assertEqual(self.limiter.stats()["api"].acquired, 20)
+
+    def test_workers_share_the_budget(self):
+        limiter = RateLimiter(now = lambda: self.now_s, sleep = self.__sleep, workers = 2)
+        budget = RateLimiter.Budget(rate_per_s = 2.0, burst = 4)
+
+        waits = [limiter.acquire("api", budget) for _ in range(3)]
+
+        # each of the two workers bursts 2 calls and sustains 1 call per second
+        self.assertEqual(waits, [0.0, 0.0, 1.0])
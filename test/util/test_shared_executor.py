@@ -0,0 +1,51 @@
+import threading
+import unittest
+
+from util.shared_executor import SharedExecutor
+
+
+class SharedExecutorTest(unittest.TestCase):
+
+    def test_submit_runs_on_named_pool_threads(self):
+        executor = SharedExecutor(max_workers = 2, thread_name_prefix = "shared-test")
+        try:
+            thread_name = executor.submit(lambda: threading.current_thread().name).result(timeout = 2.0)
+
+            self.assertTrue(thread_name.startswith("shared-test"))
+        finally:
+            executor.shutdown()
+
+    def test_work_is_bounded(self):
+        executor = SharedExecutor(max_workers = 2, thread_name_prefix = "shared-test")
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+        release = threading.Event()
+
+        def work():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            release.wait(timeout = 2.0)
+            with lock:
+                active[0] -= 1
+
+        try:
+            futures = [executor.submit(work) for _ in range(5)]
+            release.set()
+            for future in futures:
+                future.result(timeout = 2.0)
+
+            self.assertLessEqual(peak[0], 2)
+        finally:
+            executor.shutdown()
+
+    def test_reset_after_fork_starts_a_fresh_pool(self):
+        executor = SharedExecutor(max_workers = 1, thread_name_prefix = "shared-test")
+        executor.submit(lambda: None).result(timeout = 2.0)
+        executor.shutdown()
+
+        executor.reset_after_fork()
+
+        self.assertEqual(executor.submit(lambda: 42).result(timeout = 2.0), 42)
+        executor.shutdown()
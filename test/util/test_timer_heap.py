@@ -0,0 +1,95 @@
+import threading
+import unittest
+from concurrent.futures import Executor, Future
+from unittest.mock import patch
+
+from util.timer_heap import TimerHeap
+
+
+class InlineExecutor(Executor):
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class TimerHeapTest(unittest.TestCase):
+
+    now_s: float
+    ran: list[str]
+    timers: TimerHeap
+
+    def setUp(self):
+        self.now_s = 10.0
+        self.ran = []
+        self.timers = TimerHeap(
+            name = "test",
+            workers = 1,
+            failure_message = "Test work failed",
+            executor = InlineExecutor(),
+            clock = lambda: self.now_s,
+            use_timer = False,
+        )
+
+    def __work(self, name: str):
+        return lambda: self.ran.append(name)
+
+    def test_due_callbacks_run_in_deadline_order(self):
+        self.timers.schedule("b", 2.0, self.__work("b"))
+        self.timers.schedule("a", 1.0, self.__work("a"))
+        self.timers.schedule("c", 3.0, self.__work("c"))
+
+        self.now_s += 2.0
+
+        self.assertEqual(self.timers.run_due(), 2)
+        self.assertEqual(self.ran, ["a", "b"])
+        self.assertEqual(self.timers.pending_count(), 1)
+
+    def test_schedule_replaces_the_pending_callback_of_a_key(self):
+        self.assertFalse(self.timers.schedule(1, 1.0, self.__work("first")))
+        self.assertTrue(self.timers.schedule(1, 2.0, self.__work("second")))
+
+        self.now_s += 1.0
+        self.assertEqual(self.timers.run_due(), 0)
+        self.now_s += 1.0
+        self.assertEqual(self.timers.run_due(), 1)
+        self.assertEqual(self.ran, ["second"])
+
+    def test_cancel(self):
+        self.timers.schedule("a", 1.0, self.__work("a"))
+
+        self.assertTrue(self.timers.cancel("a"))
+        self.assertFalse(self.timers.cancel("a"))
+
+        self.now_s += 1.0
+        self.assertEqual(self.timers.run_due(), 0)
+
+    @patch("util.timer_heap.log")
+    def test_failing_callback_is_logged(self, mock_log):
+        def fail():
+            raise ValueError("boom")
+
+        self.timers.dispatch(fail)
+
+        mock_log.e.assert_called_once()
+        self.assertEqual(mock_log.e.call_args.args[0], "Test work failed")
+
+    def test_schedule_after_shutdown_fails(self):
+        self.timers.schedule("a", 1.0, self.__work("a"))
+
+        self.timers.shutdown()
+
+        self.assertEqual(self.timers.pending_count(), 0)
+        with self.assertRaises(RuntimeError):
+            self.timers.schedule("a", 1.0, self.__work("a"))
+
+    def test_timer_thread_runs_due_work(self):
+        done = threading.Event()
+        timers = TimerHeap(name = "test", workers = 1, failure_message = "Test work failed")
+        try:
+            timers.schedule("a", 0.05, done.set)
+
+            self.assertTrue(done.wait(timeout = 2.0))
+        finally:
+            timers.shutdown()
@@ -0,0 +1,20 @@
+import unittest
+
+from util.worker_server import WORKER_CLASS, WorkerServer
+
+
+class WorkerServerTest(unittest.TestCase):
+
+    def test_configures_preloaded_workers(self):
+        server = WorkerServer("main:app", workers = 4, port = 8080, log_level = "warning")
+
+        self.assertEqual(server.cfg.bind, ["0.0.0.0:8080"])
+        self.assertEqual(server.cfg.workers, 4)
+        self.assertEqual(server.cfg.worker_class_str, WORKER_CLASS)
+        self.assertTrue(server.cfg.preload_app)
+        self.assertEqual(server.cfg.loglevel, "warning")
+
+    def test_worker_class_is_importable(self):
+        server = WorkerServer("main:app", workers = 2)
+
+        self.assertEqual(server.cfg.worker_class.__name__, "UvicornWorker")
@@ -0,0 +1,101 @@
+"""
+Compares re-embedding a document on every query with the persistent page-embedding index.
+Uses an in-memory SQLite database and a stubbed embeddings provider with a fixed per-request latency.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_document_search.py [--pages 200] [--queries 5] [--request-ms 150]
+"""
+import argparse
+import random
+import time
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+
+# noinspection PyUnresolvedReferences
+from db.model.document_embedding import DocumentEmbeddingDB  # registers the table  # noqa: F401
+from db.sql import initialize_db
+from di.di import DI
+from features.documents.document_embedding_index import DocumentEmbeddingIndex
+
+DIMENSIONS = 1536
+WORDS = ["invoice", "contract", "payment", "delivery", "warranty", "liability", "term", "party", "notice", "fee"]
+
+
+class StubEmbeddings(Embeddings):
+
+    requests: int
+    embedded_texts: int
+    request_s: float
+
+    def __init__(self, request_ms: float):
+        self.requests = 0
+        self.embedded_texts = 0
+        self.request_s = request_ms / 1000
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.requests += 1
+        self.embedded_texts += len(texts)
+        time.sleep(self.request_s)
+        return [self.__vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    @staticmethod
+    def __vector(text: str) -> list[float]:
+        generator = random.Random(text)
+        return [generator.uniform(-1, 1) for _ in range(DIMENSIONS)]
+
+
+def make_pages(page_count: int) -> list[Document]:
+    generator = random.Random(42)
+    return [
+        Document(page_content = " ".join(generator.choices(WORDS, k = 300)), metadata = {"page": i})
+        for i in range(page_count)
+    ]
+
+
+def run(label: str, page_count: int, query_count: int, request_ms: float, indexed: bool):
+    engine, local_session = initialize_db("sqlite:///:memory:", multi_connection_setup = False)
+    db = local_session()
+    index = DocumentEmbeddingIndex(DI(db))
+    pages = make_pages(page_count)
+    embeddings = StubEmbeddings(request_ms)
+
+    latencies_s: list[float] = []
+    for query in range(query_count):
+        question = f"What does the contract say about fee number {query}?"
+        start = time.perf_counter()
+        if indexed:
+            indexed_pages = index.load_or_embed(pages, embeddings, "stub-model")
+            DocumentEmbeddingIndex.search(indexed_pages, embeddings.embed_query(question), k = 2)
+        else:
+            # the previous implementation: a fresh vector store on every query
+            vector_store = InMemoryVectorStore(embeddings)
+            vector_store.add_documents(pages)
+            vector_store.similarity_search(query = question, k = 2)
+        latencies_s.append(time.perf_counter() - start)
+
+    print(
+        f"{label:<10} pages={page_count:<5} queries={query_count:<3} requests={embeddings.requests:<5} "
+        f"embedded={embeddings.embedded_texts:<6} first={latencies_s[0]:7.3f}s "
+        f"repeat_avg={sum(latencies_s[1:]) / max(1, len(latencies_s) - 1):7.3f}s",
+    )
+    db.close()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Per-query re-embedding vs persistent page-embedding index")
+    parser.add_argument("--pages", type = int, default = 200)
+    parser.add_argument("--queries", type = int, default = 5)
+    parser.add_argument("--request-ms", type = float, default = 150.0)
+    args = parser.parse_args()
+
+    run("re-embed", args.pages, args.queries, args.request_ms, indexed = False)
+    run("indexed", args.pages, args.queries, args.request_ms, indexed = True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compares per-call HTTPS requests with the pooled keep-alive transport.
+Runs against a local HTTPS stand-in server with a throwaway self-signed certificate.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_http_transport.py [--requests 200]
+"""
+import argparse
+import datetime
+import ipaddress
+import os
+import ssl
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from util.http_transport import HTTPTransport
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b"{\"ok\": true, \"result\": true}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_self_signed_cert(directory: str) -> tuple[str, str]:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes = 1))
+        .not_valid_after(now + datetime.timedelta(hours = 1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical = False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as cert_file:
+        cert_file.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as key_file:
+        key_file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ),
+        )
+    return cert_path, key_path
+
+
+def measure(label: str, count: int, call: Callable[[], None]):
+    call()  # warm-up
+    latencies_ms: list[float] = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call()
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    latencies_ms.sort()
+    p95 = latencies_ms[int(len(latencies_ms) * 0.95) - 1]
+    print(
+        f"{label:<12} n={count:<5} mean={statistics.mean(latencies_ms):7.3f}ms "
+        f"p50={statistics.median(latencies_ms):7.3f}ms p95={p95:7.3f}ms total={sum(latencies_ms):8.1f}ms",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Pooled vs per-call HTTPS latency")
+    parser.add_argument("--requests", type = int, default = 200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = write_self_signed_cert(directory)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        server.socket = context.wrap_socket(server.socket, server_side = True)
+        threading.Thread(target = server.serve_forever, daemon = True).start()
+
+        url = f"https://127.0.0.1:{server.server_address[1]}/sendChatAction"
+        payload = {"chat_id": 1, "action": "typing"}
+        transport = HTTPTransport(pool_connections = 4, pool_maxsize = 4, connect_timeout_s = 5, read_timeout_s = 10)
+        try:
+            measure("per-call", args.requests, lambda: requests.post(url, json = payload, verify = cert_path, timeout = 10))
+            measure("pooled", args.requests, lambda: transport.post(url, json = payload, verify = cert_path))
+        finally:
+            transport.close()
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
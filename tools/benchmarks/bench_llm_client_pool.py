@@ -0,0 +1,121 @@
+"""
+Compares per-turn overhead of fresh LangChain clients with pooled ones.
+A "turn" builds (or fetches) four clients (chat, copywriter, vision, router) and invokes each once,
+against a local OpenAI-compatible stand-in server.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_llm_client_pool.py [--turns 50]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+from pydantic import SecretStr
+
+from features.llm.llm_client_pool import LLMClientPool
+
+TURN_PURPOSES = {"chat": 0.5, "copywriter": 0.8, "vision": 0.2, "router": 0.0}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        body = json.dumps(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "bench-model"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "ok"},
+                        "finish_reason": "stop",
+                    },
+                ],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+            },
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def build_client(base_url: str, temperature: float) -> BaseChatModel:
+    return ChatOpenAI(
+        model = "bench-model",
+        temperature = temperature,
+        max_tokens = 16,
+        timeout = 10,
+        max_retries = 0,
+        api_key = SecretStr("bench-key"),
+        base_url = base_url,
+    )
+
+
+def measure(label: str, turns: int, turn: Callable[[], None]):
+    turn()  # warm-up
+    latencies_ms: list[float] = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        turn()
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    latencies_ms.sort()
+    p95 = latencies_ms[int(len(latencies_ms) * 0.95) - 1]
+    print(
+        f"{label:<8} turns={turns:<5} mean={statistics.mean(latencies_ms):7.3f}ms "
+        f"p50={statistics.median(latencies_ms):7.3f}ms p95={p95:7.3f}ms total={sum(latencies_ms):8.1f}ms",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Pooled vs fresh LLM client per-turn overhead")
+    parser.add_argument("--turns", type = int, default = 50)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    pool = LLMClientPool(max_entries = 16, max_age_s = 3600)
+
+    def fresh_turn():
+        for temperature in TURN_PURPOSES.values():
+            build_client(base_url, temperature).invoke("ping")
+
+    def pooled_turn():
+        for temperature in TURN_PURPOSES.values():
+            key = LLMClientPool.Key(
+                provider_id = "open-ai",
+                model_id = "bench-model",
+                token_fingerprint = LLMClientPool.fingerprint("bench-key"),
+                temperature = temperature,
+                max_tokens = 16,
+                timeout_s = 10,
+                max_retries = 0,
+            )
+            pool.get_or_create(key, lambda: build_client(base_url, temperature)).invoke("ping")
+
+    try:
+        measure("fresh", args.turns, fresh_turn)
+        measure("pooled", args.turns, pooled_turn)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
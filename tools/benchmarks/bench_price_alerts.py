@@ -0,0 +1,154 @@
+"""
+Compares per-alert price alert evaluation with the pair-deduplicated, batched engine.
+Uses an in-memory SQLite database with thousands of synthetic alerts and a stubbed rate provider.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_price_alerts.py [--alerts 2000] [--pairs 20] [--lookup-ms 5]
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from db.crud.price_alert import PriceAlertCRUD
+from db.model.chat_config import ChatConfigDB
+from db.model.price_alert import PriceAlertDB
+from db.schema.chat_config import ChatConfigSave
+from db.schema.price_alert import PriceAlertSave
+from db.schema.user import UserSave
+from db.sql import initialize_db
+from di.di import DI
+from features.chat.currency_alert_service import CurrencyAlertService
+
+CRYPTO_SYMBOLS = ["BTC", "ETH", "SOL", "XRP", "DOGE", "ADA", "DOT", "LTC", "LINK", "AVAX"]
+FIAT_SYMBOLS = ["USD", "EUR", "GBP", "JPY", "CHF"]
+
+
+class StubRateProvider:
+
+    lookups: int
+    lookup_s: float
+    rates: dict[tuple[str, str], float]
+
+    def __init__(self, lookup_ms: float, rates: dict[tuple[str, str], float]):
+        self.lookups = 0
+        self.lookup_s = lookup_ms / 1000
+        self.rates = rates
+
+    def execute(self, base_currency_code: str, desired_currency_code: str) -> dict[str, Any]:
+        self.lookups += 1
+        time.sleep(self.lookup_s)
+        return {"rate": self.rates[(base_currency_code, desired_currency_code)]}
+
+    def prefetch_crypto_prices(self, currency_codes: list[str]) -> int:
+        self.lookups += 1
+        time.sleep(self.lookup_s)
+        return len(currency_codes)
+
+
+class BenchDI(DI):
+
+    stub_provider: StubRateProvider
+
+    def __init__(self, db: Session, stub_provider: StubRateProvider):
+        super().__init__(db)
+        self.stub_provider = stub_provider
+
+    def clone(self, db: Session | None = None, invoker_id: str | None = None, invoker_chat_id: str | None = None) -> "DI":
+        return self
+
+    @property
+    def exchange_rate_fetcher(self) -> Any:
+        return self.stub_provider
+
+
+def seed(db: Session, alert_count: int, pair_count: int) -> dict[tuple[str, str], float]:
+    pairs = [(base, desired) for base in CRYPTO_SYMBOLS for desired in FIAT_SYMBOLS][:pair_count]
+    rates = {pair: random.uniform(1, 50_000) for pair in pairs}
+    di = DI(db)
+    owner = di.user_crud.create(UserSave(full_name = "Bench User", telegram_user_id = 1))
+    chats_needed = math.ceil(alert_count / len(pairs))
+    chats = [
+        di.chat_config_crud.create(ChatConfigSave(external_id = f"chat{i}", chat_type = ChatConfigDB.ChatType.telegram))
+        for i in range(chats_needed)
+    ]
+    for i in range(alert_count):
+        pair = pairs[i % len(pairs)]
+        alert = PriceAlertSave(
+            chat_id = chats[i // len(pairs)].chat_id,
+            owner_id = owner.id,
+            base_currency = pair[0],
+            desired_currency = pair[1],
+            threshold_percent = random.randint(1, 10),
+            last_price = rates[pair] * random.uniform(0.85, 1.15),
+            last_price_time = datetime.now(),
+        )
+        db.add(PriceAlertDB(**alert.model_dump()))
+    db.commit()
+    return rates
+
+
+def evaluate_per_alert(db: Session, provider: StubRateProvider) -> int:
+    # the previous implementation: one rate lookup and one update per alert
+    crud = PriceAlertCRUD(db)
+    triggered = 0
+    for alert in crud.get_all_after(limit = 1_000_000):
+        rate = provider.execute(alert.base_currency, alert.desired_currency)["rate"]
+        change_percent = int(math.ceil((rate - alert.last_price) / alert.last_price * 100))
+        if abs(change_percent) >= alert.threshold_percent:
+            triggered += 1
+            crud.update(
+                PriceAlertSave(
+                    chat_id = alert.chat_id,
+                    owner_id = alert.owner_id,
+                    base_currency = alert.base_currency,
+                    desired_currency = alert.desired_currency,
+                    threshold_percent = alert.threshold_percent,
+                    last_price = rate,
+                    last_price_time = datetime.now(),
+                ),
+            )
+    return triggered
+
+
+def run(label: str, alert_count: int, pair_count: int, lookup_ms: float, batched: bool):
+    random.seed(42)
+    engine, local_session = initialize_db("sqlite:///:memory:", multi_connection_setup = False)
+    db = local_session()
+    rates = seed(db, alert_count, pair_count)
+    provider = StubRateProvider(lookup_ms, rates)
+    commits = [0]
+    event.listen(db, "after_commit", lambda _: commits.__setitem__(0, commits[0] + 1))
+
+    start = time.perf_counter()
+    if batched:
+        triggered = len(CurrencyAlertService(None, BenchDI(db, provider)).get_triggered_alerts())
+    else:
+        triggered = evaluate_per_alert(db, provider)
+    elapsed_s = time.perf_counter() - start
+
+    print(
+        f"{label:<10} alerts={alert_count:<6} pairs={pair_count:<4} triggered={triggered:<6} "
+        f"lookups={provider.lookups:<6} commits={commits[0]:<6} time={elapsed_s:8.3f}s",
+    )
+    db.close()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Per-alert vs batched price alert evaluation")
+    parser.add_argument("--alerts", type = int, default = 2000)
+    parser.add_argument("--pairs", type = int, default = 20)
+    parser.add_argument("--lookup-ms", type = float, default = 5.0)
+    args = parser.parse_args()
+
+    run("per-alert", args.alerts, args.pairs, args.lookup_ms, batched = False)
+    run("batched", args.alerts, args.pairs, args.lookup_ms, batched = True)
+
+
+if __name__ == "__main__":
+    main()
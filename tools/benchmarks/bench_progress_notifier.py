@@ -0,0 +1,162 @@
+"""
+Load test for chat progress notifications: one thread per conversation vs the shared progress scheduler.
+Keeps many conversations "thinking" at once against a stubbed platform SDK, then stops them all,
+reporting peak thread count, CPU time, platform API calls and the total time spent in stop().
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_progress_notifier.py [--conversations 500] [--chats 100]
+    [--interval-s 0.2] [--duration-s 3] [--api-ms 2]
+"""
+import argparse
+import threading
+import time
+from threading import Event, Thread
+from uuid import UUID
+
+from db.model.chat_config import ChatConfigDB
+from db.schema.chat_config import ChatConfig
+from features.chat import chat_progress_notifier
+from features.chat.chat_progress_notifier import ChatProgressNotifier
+from features.chat.chat_progress_scheduler import ChatProgressScheduler
+
+
+class StubPlatformSDK:
+
+    calls: int
+    api_s: float
+    lock: threading.Lock
+
+    def __init__(self, api_ms: float):
+        self.calls = 0
+        self.api_s = api_ms / 1000
+        self.lock = threading.Lock()
+
+    def set_chat_action(self, chat_id: str, action: str):
+        self.__call()
+
+    def set_reaction(self, chat_id: str, message_id: str, reaction: str | None):
+        self.__call()
+
+    def __call(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.api_s)
+
+
+class StubDI:
+
+    chat: ChatConfig
+    sdk: StubPlatformSDK
+    chat_progress_scheduler: ChatProgressScheduler
+
+    def __init__(self, chat: ChatConfig, sdk: StubPlatformSDK, scheduler: ChatProgressScheduler):
+        self.chat = chat
+        self.sdk = sdk
+        self.chat_progress_scheduler = scheduler
+
+    def require_invoker_chat(self) -> ChatConfig:
+        return self.chat
+
+    def require_invoker_chat_type(self) -> ChatConfigDB.ChatType:
+        return ChatConfigDB.ChatType.telegram
+
+    def platform_bot_sdk(self) -> StubPlatformSDK:
+        return self.sdk
+
+
+# the previous implementation: a dedicated thread per message, joined on stop
+class LegacyNotifier:
+
+    chat: ChatConfig
+    sdk: StubPlatformSDK
+    interval_s: float
+    signal: Event
+    thread: Thread | None
+
+    def __init__(self, chat: ChatConfig, sdk: StubPlatformSDK, interval_s: float):
+        self.chat = chat
+        self.sdk = sdk
+        self.interval_s = interval_s
+        self.signal = Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = Thread(target = self.run, daemon = True)
+        self.thread.start()
+
+    def stop(self):
+        self.signal.set()
+        if self.thread:
+            self.thread.join(timeout = 1)
+        self.sdk.set_reaction(self.chat.external_id or "", "message", None)
+
+    def run(self):
+        cycles = 0
+        while not self.signal.is_set() and cycles < chat_progress_notifier.MAX_CYCLES:
+            self.sdk.set_chat_action(self.chat.external_id or "", "typing")
+            cycles += 1
+            self.signal.wait(self.interval_s)
+
+
+def create_chats(count: int) -> list[ChatConfig]:
+    return [
+        ChatConfig(chat_id = UUID(int = i + 1), external_id = str(i + 1), chat_type = ChatConfigDB.ChatType.telegram)
+        for i in range(count)
+    ]
+
+
+def run(label: str, args: argparse.Namespace, shared: bool):
+    chats = create_chats(args.chats)
+    sdk = StubPlatformSDK(args.api_ms)
+    scheduler = ChatProgressScheduler()
+    baseline_threads = threading.active_count()
+    cpu_start_s = time.process_time()
+
+    notifiers: list[ChatProgressNotifier | LegacyNotifier] = []
+    for i in range(args.conversations):
+        chat = chats[i % len(chats)]
+        if shared:
+            # noinspection PyTypeChecker
+            notifiers.append(ChatProgressNotifier(f"message{i}", StubDI(chat, sdk, scheduler), auto_start = True))
+        else:
+            notifier = LegacyNotifier(chat, sdk, args.interval_s)
+            notifier.start()
+            notifiers.append(notifier)
+
+    peak_threads = 0
+    deadline_s = time.monotonic() + args.duration_s
+    while time.monotonic() < deadline_s:
+        peak_threads = max(peak_threads, threading.active_count() - baseline_threads)
+        time.sleep(0.05)
+
+    stop_start_s = time.perf_counter()
+    for notifier in notifiers:
+        notifier.stop()
+    stop_s = time.perf_counter() - stop_start_s
+    scheduler.shutdown()
+    cpu_s = time.process_time() - cpu_start_s
+
+    print(
+        f"{label:<10} conversations={args.conversations:<5} peak_threads={peak_threads:<5} "
+        f"cpu={cpu_s:6.2f}s api_calls={sdk.calls:<6} stop_total={stop_s * 1000:8.1f}ms",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Thread-per-conversation vs shared progress scheduler")
+    parser.add_argument("--conversations", type = int, default = 500)
+    parser.add_argument("--chats", type = int, default = 100)
+    parser.add_argument("--interval-s", type = float, default = 0.2)
+    parser.add_argument("--duration-s", type = float, default = 3.0)
+    parser.add_argument("--api-ms", type = float, default = 2.0)
+    args = parser.parse_args()
+
+    # compress time: the real typing interval is 5s
+    chat_progress_notifier.TYPING_STATUS_INTERVAL_S = args.interval_s
+    chat_progress_notifier.MAX_CYCLES = int(args.duration_s / args.interval_s) * 2
+
+    run("threads", args, shared = False)
+    run("shared", args, shared = True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compares social card SVG layout with per-call font loading against the shared font registry.
+Renders a batch of long-text cards; logos are stubbed so no network access is needed.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_social_cards.py [--cards 50]
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+
+from PIL import ImageFont
+
+from features.social_cards import card_template
+from features.social_cards.card_layout import card_width_from_text
+from features.social_cards.theme import ThemeColors
+from features.web_browsing.twitter_status_fetcher import TweetData, TweetUserData
+from util.config import config
+
+WORDS = [
+    "the", "market", "is", "moving", "fast", "today", "@trader", "#crypto", "https://example.com/thread",
+    "while", "everyone", "keeps", "asking", "about", "rates", "and", "liquidity", "🚀", "across", "chains",
+]
+THEMES = [
+    ThemeColors(gradient_start = "#1d2b64", gradient_end = "#f8cdda", text_color = "#ffffff"),
+    ThemeColors(gradient_start = "#f5f5f5", gradient_end = "#dddddd", text_color = "#000000"),
+]
+LOGO_SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1"/>'
+
+
+def legacy_text_width(text: str, size: int) -> int:
+    font = ImageFont.truetype(str(card_template._FONT_PATH), size)
+    return round(font.getlength(text))
+
+
+def legacy_emoji_text_width(text: str, size: int) -> int:
+    for path in Path(config.fonts_dir).glob("*.ttf"):
+        if "emoji" in path.name.lower() or "colr" in path.name.lower():
+            return round(ImageFont.truetype(str(path), size).getlength(text))
+    return legacy_text_width(text, size)
+
+
+def legacy_word_wrap(text: str, max_width: int, font_size: int) -> list[str]:
+    lines: list[str] = []
+    for paragraph in text.splitlines():
+        if not paragraph.strip():
+            lines.append("")
+            continue
+        current = ""
+        for word in paragraph.split(" "):
+            candidate = (current + " " + word).strip()
+            if legacy_text_width(candidate, font_size) <= max_width:
+                current = candidate
+            else:
+                if current:
+                    lines.append(current)
+                current = word
+        if current:
+            lines.append(current)
+    return lines or [""]
+
+
+def make_tweets(count: int) -> list[TweetData]:
+    generator = random.Random(42)
+    return [
+        TweetData(
+            user = TweetUserData(name = f"Trader {i} 📈", handle = f"trader{i}", bio = None, profile_image_url = None),
+            text = " ".join(generator.choices(WORDS, k = generator.randint(60, 110))),
+            language = "en",
+            created_at = "2026-01-15T10:30:00Z",
+        )
+        for i in range(count)
+    ]
+
+
+def run(label: str, tweets: list[TweetData]) -> list[str]:
+    start = time.perf_counter()
+    svgs = [
+        card_template.build_svg(tweet, THEMES[i % len(THEMES)], card_width_from_text(tweet.text), None, [], "https://x.co/a")
+        for i, tweet in enumerate(tweets)
+    ]
+    elapsed_s = time.perf_counter() - start
+    print(f"{label:<9} cards={len(tweets):<5} total={elapsed_s:8.3f}s per_card={elapsed_s / len(tweets) * 1000:8.2f}ms")
+    return svgs
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Per-call font loading vs shared font registry for card layout")
+    parser.add_argument("--cards", type = int, default = 50)
+    args = parser.parse_args()
+
+    for key in config.logos:
+        card_template._LOGO_CACHE[key] = LOGO_SVG
+    tweets = make_tweets(args.cards)
+
+    registry_functions = (card_template._text_width, card_template._emoji_text_width, card_template._word_wrap)
+    card_template._text_width = legacy_text_width
+    card_template._emoji_text_width = legacy_emoji_text_width
+    card_template._word_wrap = legacy_word_wrap
+    legacy_svgs = run("per-call", tweets)
+
+    card_template._text_width, card_template._emoji_text_width, card_template._word_wrap = registry_functions
+    registry_svgs = run("registry", tweets)
+    run("warm", tweets)
+    print(f"identical output: {legacy_svgs == registry_svgs}")
+
+
+if __name__ == "__main__":
+    main()
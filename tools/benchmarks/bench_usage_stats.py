@@ -0,0 +1,129 @@
+"""
+Compares the per-query usage stats aggregation over raw records with the daily rollup path, as history grows.
+Seeds an in-memory SQLite database with synthetic usage records spread over a year of history.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_usage_stats.py [--sizes 10000,100000,1000000] [--users 20] [--repeat 5]
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+
+from db.model.usage_daily_rollup import UsageDailyRollupDB
+from db.model.usage_record import UsageRecordDB
+from db.sql import initialize_db
+from features.accounting.usage.usage_record_repo import UsageRecordRepository
+
+TOOLS = [("gpt-4o", "GPT-4o", "open-ai", "OpenAI"), ("claude-haiku", "Claude Haiku", "anthropic", "Anthropic")]
+PURPOSES = ["chat", "images_gen", "search", "embedding"]
+HISTORY_DAYS = 365
+SEED_BATCH_SIZE = 50_000
+
+
+def record_id() -> uuid.UUID:
+    # SQLite gives UUID columns a numeric affinity, so hex values that read as numbers could collide
+    while True:
+        value = uuid.uuid4()
+        if any(character in "abcdf" for character in value.hex):
+            return value
+
+
+def seed(db: Session, record_count: int, user_ids: list[uuid.UUID]):
+    generator = random.Random(42)
+    now = datetime.now(timezone.utc).replace(tzinfo = None)
+    for batch_start in range(0, record_count, SEED_BATCH_SIZE):
+        rows = []
+        for _ in range(min(SEED_BATCH_SIZE, record_count - batch_start)):
+            tool_id, tool_name, provider_id, provider_name = generator.choice(TOOLS)
+            user_id = generator.choice(user_ids)
+            rows.append(
+                {
+                    "id": record_id(),
+                    "user_id": user_id,
+                    "payer_id": user_id,
+                    "tool_id": tool_id,
+                    "tool_name": tool_name,
+                    "provider_id": provider_id,
+                    "provider_name": provider_name,
+                    "purpose": generator.choice(PURPOSES),
+                    "timestamp": now - timedelta(seconds = generator.randint(0, HISTORY_DAYS * 86400)),
+                    "runtime_seconds": generator.uniform(0.1, 5),
+                    "model_cost_credits": 0.0,
+                    "remote_runtime_cost_credits": 0.0,
+                    "api_call_cost_credits": 0.0,
+                    "maintenance_fee_credits": 0.0,
+                    "total_cost_credits": generator.uniform(0.01, 2),
+                },
+            )
+        db.execute(insert(UsageRecordDB), rows)
+    # same backfill as the migration does
+    db.execute(
+        text(
+            "INSERT INTO usage_daily_rollups "
+            "SELECT DATE(timestamp), payer_id, user_id, :no_counterpart, tool_id, tool_name, provider_id, provider_name, "
+            "purpose, COUNT(*), SUM(total_cost_credits), SUM(runtime_seconds) "
+            "FROM usage_records GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9",
+        ),
+        {"no_counterpart": UsageDailyRollupDB.NO_COUNTERPART.hex},
+    )
+    db.commit()
+
+
+def legacy_aggregates(repo: UsageRecordRepository, db: Session, user_id: uuid.UUID) -> int:
+    # the previous implementation: nine queries over the raw records
+    query = repo._build_user_query(user_id, None, None, False, False)
+    subquery = query.subquery()
+    total_records = int(db.query(func.count(subquery.c.id)).scalar() or 0)
+    db.query(func.sum(subquery.c.total_cost_credits)).scalar()
+    db.query(func.sum(subquery.c.runtime_seconds)).scalar()
+    for column in (subquery.c.tool_id, subquery.c.purpose, subquery.c.provider_id):
+        db.query(column, func.count(subquery.c.id), func.sum(subquery.c.total_cost_credits)).group_by(column).all()
+    db.query(subquery.c.tool_id, subquery.c.tool_name).distinct().all()
+    db.query(subquery.c.purpose).distinct().all()
+    db.query(subquery.c.provider_id, subquery.c.provider_name).distinct().all()
+    return total_records
+
+
+def measure(repeat: int, call) -> tuple[float, int]:
+    result = call()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def run(record_count: int, user_count: int, repeat: int):
+    engine, local_session = initialize_db("sqlite:///:memory:", multi_connection_setup = False)
+    db = local_session()
+    user_ids = [uuid.uuid4() for _ in range(user_count)]
+    seed(db, record_count, user_ids)
+    repo = UsageRecordRepository(db)
+    user_id = user_ids[0]
+
+    legacy_ms, legacy_total = measure(repeat, lambda: legacy_aggregates(repo, db, user_id))
+    rollup_ms, rollup_total = measure(repeat, lambda: repo.get_aggregates_by_user(user_id).total_records)
+    print(
+        f"records={record_count:<9} user_records={legacy_total:<7} raw={legacy_ms:9.2f}ms "
+        f"rollups={rollup_ms:7.2f}ms same_totals={legacy_total == rollup_total}",
+    )
+    db.close()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Raw vs rolled up usage stats as history grows")
+    parser.add_argument("--sizes", type = str, default = "10000,100000,1000000")
+    parser.add_argument("--users", type = int, default = 20)
+    parser.add_argument("--repeat", type = int, default = 5)
+    args = parser.parse_args()
+
+    for size in [int(size) for size in args.sizes.split(",")]:
+        run(size, args.users, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
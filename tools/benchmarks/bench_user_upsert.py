@@ -0,0 +1,128 @@
+"""
+Compares the full-row user rewrite with the diff-aware author resolution during a group message burst.
+Seeds an in-memory SQLite database with group members (all API keys set) and replays a burst of messages,
+counting commits and UPDATE statements issued for the authors.
+
+Note that SQLite skips pgcrypto, so the time saved on Postgres (one pgp_sym_encrypt per encrypted column
+per rewrite) is larger than the wall time shown here; the commit and UPDATE counts carry over as-is.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_user_upsert.py [--messages 1000] [--members 25]
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from pydantic import SecretStr
+from sqlalchemy import event
+
+from db.crud.user import UserCRUD
+from db.schema.user import User, UserSave
+from db.sql import initialize_db
+from features.chat.telegram.telegram_data_resolver import TelegramDataResolver
+
+API_KEY_FIELDS = [
+    "open_ai_key",
+    "anthropic_key",
+    "google_ai_key",
+    "perplexity_key",
+    "replicate_key",
+    "rapid_api_key",
+    "coinmarketcap_key",
+    "x_key",
+    "x_ai_key",
+]
+
+
+class StatementCounter:
+
+    commits: int
+    updates: int
+
+    def __init__(self):
+        self.commits = 0
+        self.updates = 0
+
+    def on_statement(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE"):
+            self.updates += 1
+
+    def on_commit(self, session):
+        self.commits += 1
+
+
+def seed(user_crud: UserCRUD, members: int):
+    for member in range(members):
+        keys = {field: SecretStr(f"sk-{field}-{member}") for field in API_KEY_FIELDS}
+        user_crud.save(
+            UserSave(
+                telegram_user_id = member + 1,
+                telegram_username = f"member_{member}",
+                telegram_chat_id = f"chat_{member}",
+                full_name = f"Member {member}",
+                about_me = SecretStr("About me " * 20),
+                custom_prompt = SecretStr("Custom prompt " * 20),
+                **keys,
+            ),
+        )
+
+
+def incoming_author(member: int) -> UserSave:
+    # what the Telegram mapper produces for a group message
+    return UserSave(
+        telegram_user_id = member + 1,
+        telegram_username = f"member_{member}",
+        full_name = f"Member {member}",
+    )
+
+
+def legacy_resolve(user_crud: UserCRUD, mapped_data: UserSave) -> User:
+    # the previous implementation: copy every stored field over and write the whole row back
+    old_user = User.model_validate(user_crud.get_by_telegram_user_id(mapped_data.telegram_user_id or -1))
+    full_data = UserSave(**old_user.model_dump(exclude = {"created_at"}))
+    full_data.telegram_username = mapped_data.telegram_username
+    full_data.telegram_chat_id = mapped_data.telegram_chat_id or old_user.telegram_chat_id
+    return User.model_validate(user_crud.save(full_data))
+
+
+def run(label: str, messages: int, members: int, resolve_for: str):
+    engine, local_session = initialize_db("sqlite:///:memory:", multi_connection_setup = False)
+    db = local_session()
+    user_crud = UserCRUD(db)
+    seed(user_crud, members)
+
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter.on_statement)
+    event.listen(db, "after_commit", counter.on_commit)
+    resolver = TelegramDataResolver(SimpleNamespace(user_crud = user_crud))  # type: ignore[arg-type]
+    generator = random.Random(42)
+
+    start = time.perf_counter()
+    for _ in range(messages):
+        mapped_data = incoming_author(generator.randrange(members))
+        if resolve_for == "legacy":
+            legacy_resolve(user_crud, mapped_data)
+        else:
+            resolver.resolve_author(mapped_data)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        f"{label:<12} messages={messages:<6} commits={counter.commits:<6} updates={counter.updates:<6} "
+        f"total={elapsed_ms:8.1f}ms per-message={elapsed_ms / messages:6.3f}ms",
+    )
+    db.close()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Full-row vs diff-aware user upsert")
+    parser.add_argument("--messages", type = int, default = 1000)
+    parser.add_argument("--members", type = int, default = 25)
+    args = parser.parse_args()
+
+    run("full-row", args.messages, args.members, "legacy")
+    run("diff-aware", args.messages, args.members, "diff")
+
+
+if __name__ == "__main__":
+    main()
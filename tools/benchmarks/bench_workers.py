@@ -0,0 +1,129 @@
+"""
+Compares request throughput of the preloaded worker server with 1, 2 and 4 workers on a CPU-heavy mix of social card
+rendering and HTML cleaning. The benchmark serves a small app with just those two endpoints on a local port, so no
+database or external services are needed (logos are stubbed), and fires concurrent requests at it.
+
+Usage: PYTHONPATH=src python tools/benchmarks/bench_workers.py [--requests 200] [--concurrency 16] [--workers 1 2 4]
+"""
+import argparse
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from fastapi import FastAPI, Response
+from readabilipy import simple_json_from_html_string
+
+from features.social_cards import card_renderer, card_template
+from features.social_cards.theme import ThemeColors
+from features.web_browsing.twitter_status_fetcher import TweetData, TweetUserData
+from util.config import config
+from util.worker_server import WorkerServer
+
+WORDS = [
+    "the", "market", "is", "moving", "fast", "today", "@trader", "#crypto", "https://example.com/thread",
+    "while", "everyone", "keeps", "asking", "about", "rates", "and", "liquidity", "across", "chains",
+]
+THEME = ThemeColors(gradient_start = "#1d2b64", gradient_end = "#f8cdda", text_color = "#ffffff")
+LOGO_SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1"/>'
+
+
+def make_article(paragraphs: int) -> str:
+    generator = random.Random(7)
+    body = "".join(
+        f"<h2>Section {index}</h2><p>{' '.join(generator.choices(WORDS, k = 80))}</p>"
+        f"<ul><li><a href='https://example.com/{index}'>related {index}</a></li></ul>"
+        for index in range(paragraphs)
+    )
+    return f"<html><head><title>Article</title></head><body><nav><a href='/'>Home</a></nav><article>{body}</article></body></html>"
+
+
+ARTICLE = make_article(40)
+TWEET = TweetData(
+    user = TweetUserData(name = "Trader 📈", handle = "trader", bio = None, profile_image_url = None),
+    text = " ".join(random.Random(42).choices(WORDS, k = 90)),
+    language = "en",
+    created_at = "2026-01-15T10:30:00Z",
+)
+
+for logo_key in config.logos:
+    card_template._LOGO_CACHE[logo_key] = LOGO_SVG
+
+app = FastAPI()
+
+
+@app.get("/health")
+def health() -> dict:
+    return {"status": "ok"}
+
+
+@app.get("/card")
+def card() -> Response:
+    return Response(content = card_renderer.render(TWEET, THEME), media_type = "image/png")
+
+
+@app.get("/clean")
+def clean() -> dict:
+    return {"length": len(str(simple_json_from_html_string(ARTICLE)["plain_content"]))}
+
+
+def serve(workers: int, port: int):
+    WorkerServer("bench_workers:app", workers = workers, host = "127.0.0.1", port = port, log_level = "warning").run()
+
+
+def wait_until_ready(base_url: str, timeout_s: float = 60.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout = 1).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Server at {base_url} did not start in time")
+
+
+def run(workers: int, port: int, total_requests: int, concurrency: int):
+    server = subprocess.Popen([sys.executable, __file__, "--serve", str(workers), "--port", str(port)], env = os.environ.copy())
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_ready(base_url)
+        paths = ["/card" if index % 2 == 0 else "/clean" for index in range(total_requests)]
+        with requests.Session() as session:
+            session.get(f"{base_url}/card").raise_for_status()  # warm up fonts and parsers
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers = concurrency) as executor:
+                statuses = list(executor.map(lambda path: session.get(f"{base_url}{path}").status_code, paths))
+            elapsed_s = time.perf_counter() - start
+        failed = sum(1 for status in statuses if status != 200)
+        print(
+            f"workers={workers:<3} requests={total_requests:<6} concurrency={concurrency:<4} total={elapsed_s:8.2f}s "
+            f"requests/s={total_requests / elapsed_s:8.1f} failed={failed}",
+        )
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout = 30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Preloaded worker server throughput on a CPU-heavy request mix")
+    parser.add_argument("--requests", type = int, default = 200)
+    parser.add_argument("--concurrency", type = int, default = 16)
+    parser.add_argument("--workers", type = int, nargs = "+", default = [1, 2, 4])
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--serve", type = int, default = 0, help = "internal: serve the app with this many workers")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+    for workers in args.workers:
+        run(workers, args.port, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
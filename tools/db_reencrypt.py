@@ -0,0 +1,38 @@
+"""
+Re-encrypts all encrypted columns into the configured DB_ENCRYPTION_BACKEND, online and in small batches.
+Run it after switching the backend to 'app' (or back to 'pgcrypto'), and after changing DB_ENCRYPTION_KEY_VERSION
+to rotate the master key. The app keeps reading both formats while this runs, and the run can be repeated safely.
+
+Usage: PYTHONPATH=src python tools/db_reencrypt.py [--batch-size 500] [--pause-s 0.1]
+"""
+import argparse
+
+import db.envelope_cipher as envelope
+from db.encryption_migration import EncryptionMigration
+from db.sql import initialize_db
+from util.config import config
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Re-encrypt stored values into the configured encryption backend")
+    parser.add_argument("--batch-size", type = int, default = 500)
+    parser.add_argument("--pause-s", type = float, default = 0.1, help = "pause between batches, keeps the load on the database low")
+    args = parser.parse_args()
+
+    engine, _ = initialize_db()
+    try:
+        migration = EncryptionMigration(
+            engine,
+            backend = config.db_encryption_backend,
+            cipher = envelope.envelope_cipher,
+            batch_size = args.batch_size,
+            pause_s = args.pause_s,
+        )
+        for progress in migration.run():
+            print(f"{progress.table:<28} migrated={progress.migrated:<8} batches={progress.batches}")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()